@@ -0,0 +1 @@
+# Benchmarks do Aldemarvin Extractor (executar a partir da raiz do projeto)
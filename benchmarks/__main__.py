@@ -0,0 +1,102 @@
+"""
+Runner dos benchmarks.
+
+Uso (na raiz do projeto):
+    python -m benchmarks                    # roda tudo e compara com a baseline
+    python -m benchmarks --quick            # tamanhos reduzidos
+    python -m benchmarks -k db              # só benchmarks cujo nome contém "db"
+    python -m benchmarks --save-baseline    # grava os resultados como baseline
+    python -m benchmarks --json out.json    # exporta os resultados
+
+Sai com código 1 se algum resultado regredir além da tolerância.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# Registra os benchmarks
+from benchmarks import bench_db, bench_ocr, bench_pdf, bench_text, bench_translation  # noqa: F401
+from benchmarks.harness import Result, SkipBenchmark, compare, registered
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+
+
+def _load_baseline(path: str) -> dict:
+    if not os.path.exists(path):
+        return {"tolerance": 0.3, "min_delta_s": 0.002, "tolerances": {}, "results": {}}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _tolerance(baseline: dict, name: str) -> float:
+    """Tolerância específica (por prefixo do nome) ou a padrão."""
+    for prefix, value in baseline.get("tolerances", {}).items():
+        if name.startswith(prefix):
+            return value
+    return baseline.get("tolerance", 0.3)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks do Aldemarvin Extractor")
+    parser.add_argument("-k", dest="filter", default="", help="Filtro por nome")
+    parser.add_argument("--quick", action="store_true", help="Tamanhos reduzidos")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--json", dest="json_path", help="Exporta resultados em JSON")
+    args = parser.parse_args(argv)
+
+    baseline = _load_baseline(args.baseline)
+    results: list[Result] = []
+    regressions = []
+
+    for name, fn in registered():
+        if args.filter and args.filter not in name:
+            continue
+        try:
+            output = fn(args.quick)
+        except SkipBenchmark as e:
+            print(f"[pulado] {e}")
+            continue
+        for result in output if isinstance(output, list) else [output]:
+            results.append(result)
+            line = result.format()
+            reference = baseline["results"].get(result.name)
+            if reference:
+                message = compare(
+                    result,
+                    reference,
+                    _tolerance(baseline, result.name),
+                    baseline.get("min_delta_s", 0.0),
+                )
+                if message:
+                    regressions.append(message)
+                    line += "  ⚠ REGRESSÃO"
+                else:
+                    delta = result.median / reference["median_s"] - 1
+                    line += f"  ({delta:+.0%} vs baseline)"
+            print(line)
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({r.name: r.as_dict() for r in results}, f, indent=2, ensure_ascii=False)
+
+    if args.save_baseline:
+        baseline["results"].update({r.name: r.as_dict() for r in results})
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, ensure_ascii=False, sort_keys=True)
+            f.write("\n")
+        print(f"\nBaseline gravada em {args.baseline}")
+        return 0
+
+    if regressions:
+        print("\nRegressões:")
+        for message in regressions:
+            print(f"  - {message}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""
+Benchmarks do DatabaseManager com 100, 1 000 e 10 000 páginas, e dos
+serializadores JSON do banco com 5 000 páginas.
+"""
+
+import json
+import os
+import tempfile
+
+from benchmarks.fixtures import make_db_file, make_text
+from benchmarks.harness import benchmark, measure
+from src.database.db_manager import DatabaseManager
+from src.database.maintenance import SnapshotStore, take_snapshot
+from src.database.serializer import available, get_serializer
+from src.database.storage import load_state, write_checkpoint
+
+SIZES = (100, 1_000, 10_000)
+QUICK_SIZES = (100, 1_000)
+SERIALIZER_SIZE = 5_000
+QUICK_SERIALIZER_SIZE = 1_000
+
+
+def _bench_size(size: int) -> list:
+    results = []
+    repeat = 3 if size >= 10_000 else 5
+    text = make_text(200, seed=42)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.json")
+        extraction_id = make_db_file(path, size)
+
+        results.append(
+            measure(
+                f"db.open[{size}]",
+                lambda: DatabaseManager(path).close(),
+                repeat=repeat,
+            )
+        )
+
+        db = DatabaseManager(path)
+        try:
+            results.append(
+                measure(f"db.get_all_extractions[{size}]", db.get_all_extractions, repeat=repeat)
+            )
+            results.append(
+                measure(
+                    f"db.get_pages[{size}]",
+                    lambda: db.get_pages(extraction_id),
+                    repeat=repeat,
+                    # Sem o cache de consultas do TinyDB
+                    setup=db.pages.clear_cache,
+                    items=size,
+                    unit="páginas",
+                )
+            )
+            results.append(
+                measure(
+                    f"db.add_page[{size}]",
+                    lambda: db.add_page(extraction_id, size + 1, text),
+                    repeat=repeat,
+                )
+            )
+            results.append(
+                measure(
+                    f"db.update_page[{size}]",
+                    lambda: db.update_page(1, translated_text=text),
+                    repeat=repeat,
+                )
+            )
+
+            # Com o cache write-back, update_page não toca o disco; aqui com a gravação
+            results.append(
+                measure(
+                    f"db.update_page+flush[{size}]",
+                    lambda: (db.update_page(1, translated_text=text), db.flush()),
+                    repeat=repeat,
+                    setup=lambda: (db.update_page(1, translated_text=""), db.flush()),
+                )
+            )
+
+            added = []
+            results.append(
+                measure(
+                    f"db.delete_page[{size}]",
+                    lambda: db.delete_page(added.pop()),
+                    repeat=repeat,
+                    setup=lambda: added.append(db.add_page(extraction_id, size + 2, text)),
+                )
+            )
+            # Snapshot completo (pasta vazia) x incremental (uma página alterada)
+            stores = []
+            edits = iter(range(1, 1_000_000))
+            results.append(
+                measure(
+                    f"db.snapshot[{size}, completo]",
+                    lambda: take_snapshot(db, stores[-1]),
+                    repeat=repeat,
+                    setup=lambda: stores.append(
+                        SnapshotStore(os.path.join(tmp, f"backups{len(stores)}"))
+                    ),
+                    items=size,
+                    unit="páginas",
+                )
+            )
+            results.append(
+                measure(
+                    f"db.snapshot[{size}, incremental]",
+                    lambda: take_snapshot(db, stores[-1]),
+                    repeat=repeat,
+                    setup=lambda: db.update_page(1, translated_text=make_text(50, seed=next(edits))),
+                    items=size,
+                    unit="páginas",
+                )
+            )
+            results.append(
+                measure(
+                    f"db.recompute_stats[{size}]",
+                    db.recompute_stats,
+                    repeat=repeat,
+                    items=size,
+                    unit="páginas",
+                )
+            )
+        finally:
+            db.close()
+    return results
+
+
+@benchmark
+def bench_database(quick: bool = False) -> list:
+    results = []
+    for size in QUICK_SIZES if quick else SIZES:
+        results.extend(_bench_size(size))
+    return results
+
+
+@benchmark
+def bench_serializer(quick: bool = False) -> list:
+    """
+    Gravar e abrir o checkpoint com cada serializador instalado, compacto e
+    indentado ("json, indentado" é o formato antigo: json com indent=4).
+    """
+    size = QUICK_SERIALIZER_SIZE if quick else SERIALIZER_SIZE
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.json")
+        make_db_file(path, size)
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+
+        for backend in available():
+            for compact in (True, False):
+                serializer = get_serializer(backend, compact)
+                label = f"{backend}, {'compacto' if compact else 'indentado'}"
+                save = measure(
+                    f"db.json.save[{size}, {label}]",
+                    lambda: write_checkpoint(path, data, serializer=serializer),
+                    items=size,
+                    unit="páginas",
+                )
+                save.size_bytes = os.path.getsize(path)
+                load = measure(
+                    f"db.json.open[{size}, {label}]",
+                    lambda: load_state(path, serializer=serializer),
+                    items=size,
+                    unit="páginas",
+                )
+                load.size_bytes = save.size_bytes
+                results.extend([save, load])
+    return results
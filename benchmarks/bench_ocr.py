@@ -0,0 +1,39 @@
+"""
+Benchmark do OCR (Tesseract) sobre um conjunto fixo de imagens sintéticas.
+Pulado quando o Tesseract não está instalado.
+"""
+
+from benchmarks.fixtures import make_text, make_text_image
+from benchmarks.harness import SkipBenchmark, benchmark, measure
+from src.services.ocr_service import OCRService
+
+
+def _image_set(quick: bool) -> list:
+    """Imagens determinísticas: páginas curtas e longas, larguras diferentes."""
+    specs = [(80, 900, 0), (250, 1200, 1)]
+    if not quick:
+        specs += [(500, 1600, 2), (250, 2400, 3)]
+    return [make_text_image(make_text(words, seed=seed), width=width) for words, width, seed in specs]
+
+
+@benchmark
+def bench_ocr(quick: bool = False) -> list:
+    ocr = OCRService()
+    if not ocr.is_tesseract_available():
+        raise SkipBenchmark("ocr: Tesseract não encontrado")
+
+    images = _image_set(quick)
+
+    def run():
+        for image in images:
+            ocr.extract_from_image(image)
+
+    return [
+        measure(
+            f"ocr.extract_from_image[{len(images)} imagens]",
+            run,
+            repeat=3,
+            items=len(images),
+            unit="imagens",
+        )
+    ]
@@ -0,0 +1,90 @@
+"""
+Benchmark de vazão do PDFService.generate_pdf.
+"""
+
+import os
+import tempfile
+
+from benchmarks.fixtures import make_pages
+from benchmarks.harness import benchmark, measure
+from src.config import PDF_PARALLEL_MIN_PAGES
+from src.services.pdf_fonts import FontManager
+from src.services.pdf_service import PDFService
+
+
+@benchmark
+def bench_generate_pdf(quick: bool = False) -> list:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        service = PDFService(exports_dir=tmp)
+        for count in (20,) if quick else (20, 200):
+            pages = make_pages(count, words_per_page=300)
+            results.append(
+                measure(
+                    f"pdf.generate_pdf[{count} páginas]",
+                    lambda: service.generate_pdf("Benchmark", pages, "bench"),
+                    repeat=3,
+                    items=count,
+                    unit="páginas",
+                )
+            )
+    return results
+
+
+@benchmark
+def bench_pdf_fonts(quick: bool = False) -> list:
+    """
+    Custo da fonte em PDFs pequenos (onde ele domina): fonte TTF em cache,
+    TTF analisada de novo a cada PDF (como o add_font) e Helvetica.
+    """
+    results = []
+    pages = make_pages(2, words_per_page=150)
+    with tempfile.TemporaryDirectory() as tmp:
+        cached = FontManager()
+        if not cached.unicode:
+            return results  # Sem TTF disponível: só a Helvetica
+        services = [
+            ("cache", lambda: PDFService(tmp, cached)),
+            ("sem_cache", lambda: PDFService(tmp, FontManager())),
+            ("helvetica", lambda: PDFService(tmp, FontManager(paths={"": None}, candidates=[]))),
+        ]
+        for label, make_service in services:
+            results.append(
+                measure(
+                    f"pdf.fonts[{label}]",
+                    lambda: make_service().generate_pdf("Benchmark", pages, "fonts"),
+                    repeat=5 if quick else 10,
+                    items=1,
+                    unit="PDFs",
+                )
+            )
+    return results
+
+
+@benchmark
+def bench_pdf_parallel(quick: bool = False) -> list:
+    """Escala do PDF em blocos paralelos: 1, 2, 4... processos até os núcleos."""
+    results = []
+    # Abaixo de PDF_PARALLEL_MIN_PAGES o serviço nem tenta o paralelo
+    count = PDF_PARALLEL_MIN_PAGES if quick else 2000
+    pages = make_pages(count, words_per_page=300)
+    cores = os.cpu_count() or 1
+    workers = [1]
+    while workers[-1] * 2 <= cores:
+        workers.append(workers[-1] * 2)
+    if workers[-1] != cores:
+        workers.append(cores)
+    with tempfile.TemporaryDirectory() as tmp:
+        service = PDFService(exports_dir=tmp)
+        for jobs in workers:
+            results.append(
+                measure(
+                    f"pdf.parallel[{count} páginas, {jobs} proc]",
+                    lambda: service.generate_pdf("Benchmark", pages, "parallel", workers=jobs),
+                    repeat=2,
+                    warmup=0,
+                    items=count,
+                    unit="páginas",
+                )
+            )
+    return results
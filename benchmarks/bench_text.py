@@ -0,0 +1,68 @@
+"""
+Benchmarks do processamento de texto: merge_texts, _split_text (segmentação
+em frases + empacotamento) e translate_many com um provedor local.
+"""
+
+from benchmarks.fixtures import make_text
+from benchmarks.harness import benchmark, measure
+from src.services.translation_providers import TranslationProvider
+from src.services.translation_service import TranslationService
+
+
+class _EchoProvider(TranslationProvider):
+    """Provedor sem rede: mede só o custo de segmentar/empacotar/remontar."""
+
+    name = "echo"
+
+    def translate(self, text: str) -> str:
+        return text
+
+
+@benchmark
+def bench_merge_texts(quick: bool = False) -> list:
+    results = []
+    for words in (1_000, 50_000) if quick else (1_000, 50_000, 250_000):
+        original = make_text(words, seed=1)
+        translated = make_text(words, seed=2)
+        results.append(
+            measure(
+                f"text.merge_texts[{words} palavras]",
+                lambda: TranslationService.merge_texts(original, translated),
+                items=len(original) + len(translated),
+                unit="chars",
+            )
+        )
+    return results
+
+
+@benchmark
+def bench_split_text(quick: bool = False) -> list:
+    service = TranslationService(provider=_EchoProvider("en", "pt"))
+    results = []
+    for words in (1_000, 50_000) if quick else (1_000, 50_000, 250_000):
+        text = make_text(words, seed=3)
+        results.append(
+            measure(
+                f"text.split_text[{words} palavras]",
+                lambda: service._split_text(text, 4500),
+                items=len(text),
+                unit="chars",
+            )
+        )
+    return results
+
+
+@benchmark
+def bench_translate_many(quick: bool = False) -> list:
+    service = TranslationService(provider=_EchoProvider("en", "pt"))
+    pages = 50 if quick else 500
+    texts = [make_text(300, seed=i) for i in range(pages)]
+    return [
+        measure(
+            f"text.translate_many[{pages} páginas]",
+            lambda: service.translate_many(texts),
+            repeat=3,
+            items=pages,
+            unit="páginas",
+        )
+    ]
@@ -0,0 +1,76 @@
+"""
+Benchmark de vazão dos provedores de tradução (Google online × Argos offline).
+
+Uso: python -m benchmarks.bench_translation [--providers google,argos] [--pages 5]
+
+Provedores indisponíveis (sem rede, sem modelo Argos) são pulados.
+"""
+
+import argparse
+import sys
+
+from benchmarks.fixtures import make_pages
+from benchmarks.harness import Result, SkipBenchmark, benchmark, measure
+from src.services.translation_providers import PROVIDERS, get_provider
+from src.services.translation_service import TranslationService
+
+
+def bench_provider(name: str, pages: list[dict], repeat: int = 3) -> Result:
+    """Mede chars/s traduzindo todas as páginas com o provedor."""
+    try:
+        provider = get_provider(name)
+        # Chamada de aquecimento: carrega modelo / valida rede
+        provider.translate("Hello world.")
+    except Exception as e:
+        raise SkipBenchmark(f"{name}: {e}")
+
+    service = TranslationService(provider=provider)
+    texts = [p["original_text"] for p in pages]
+    total_chars = sum(len(t) for t in texts)
+
+    def run():
+        for text in texts:
+            service.translate(text)
+
+    return measure(
+        f"translation.{name}[{len(pages)} páginas]",
+        run,
+        repeat=repeat,
+        warmup=0,
+        items=total_chars,
+        unit="chars",
+    )
+
+
+@benchmark
+def bench_translation_providers(quick: bool = False) -> list:
+    pages = make_pages(2 if quick else 5, words_per_page=250, translated=False)
+    results, skipped = [], []
+    for name in PROVIDERS:
+        try:
+            results.append(bench_provider(name, pages, repeat=1 if quick else 3))
+        except SkipBenchmark as e:
+            skipped.append(str(e))
+    if not results:
+        raise SkipBenchmark("; ".join(skipped))
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--providers", default=",".join(PROVIDERS))
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    pages = make_pages(args.pages, words_per_page=250, translated=False)
+    for name in args.providers.split(","):
+        try:
+            print(bench_provider(name.strip(), pages, args.repeat).format())
+        except SkipBenchmark as e:
+            print(f"[pulado] {e}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Dados sintéticos e determinísticos para os benchmarks.
+"""
+
+import random
+
+_WORDS = (
+    "the of and to in is that for it as was with be by on not he this are or "
+    "his from at which but have an they you were her she there been one all "
+    "would their we him has when who will more no if out so said what up its "
+    "about into than them can only other new some could time these two may "
+    "then do first any my now such like our over man me even most made after "
+    "also did many before must through back years where much your way well "
+    "down should because each just those people how too little state good very "
+    "make world still own see men work long get here between both life being "
+    "under never day same another know while last might us great old year off "
+    "come since against go came right used take three"
+).split()
+
+
+def make_sentence(rng: random.Random, min_words: int = 5, max_words: int = 20) -> str:
+    """Gera uma frase pseudo-inglesa terminada em pontuação."""
+    words = [rng.choice(_WORDS) for _ in range(rng.randint(min_words, max_words))]
+    words[0] = words[0].capitalize()
+    return " ".join(words) + rng.choice([".", ".", ".", "?", "!"])
+
+
+def make_text(words_target: int, seed: int = 0) -> str:
+    """Gera um texto com parágrafos e aproximadamente `words_target` palavras."""
+    rng = random.Random(seed)
+    lines, count = [], 0
+    while count < words_target:
+        sentences = [make_sentence(rng) for _ in range(rng.randint(1, 4))]
+        line = " ".join(sentences)
+        lines.append(line)
+        count += len(line.split())
+        if rng.random() < 0.2:
+            lines.append("")
+    return "\n".join(lines)
+
+
+def make_pages(count: int, words_per_page: int = 300, seed: int = 0, translated: bool = True) -> list[dict]:
+    """Gera páginas no formato gravado pelo DatabaseManager."""
+    pages = []
+    for number in range(1, count + 1):
+        original = make_text(words_per_page, seed=seed + number)
+        pages.append(
+            {
+                "page_number": number,
+                "original_text": original,
+                "translated_text": original.upper() if translated else "",
+            }
+        )
+    return pages
+
+
+def make_db_file(path: str, page_count: int, extractions: int = 1, seed: int = 0) -> int:
+    """
+    Grava diretamente um arquivo TinyDB com `page_count` páginas
+    (sem passar por add_page, que seria O(n²) para montar o fixture).
+
+    Returns:
+        doc_id da primeira extração.
+    """
+    import json
+
+    from src.database.stats import compute_stats
+
+    pages = make_pages(page_count, words_per_page=200, seed=seed)
+    now = "2026-01-01T00:00:00"
+    page_table = {}
+    for doc_id, page in enumerate(pages, start=1):
+        page_table[str(doc_id)] = {
+            "extraction_id": 1 + (doc_id - 1) % extractions,
+            "page_number": page["page_number"],
+            "original_text": page["original_text"],
+            "translated_text": page["translated_text"],
+            "created_at": now,
+            "updated_at": now,
+        }
+
+    extraction_table = {}
+    for doc_id in range(1, extractions + 1):
+        owned = [p for p in page_table.values() if p["extraction_id"] == doc_id]
+        extraction_table[str(doc_id)] = {
+            "name": f"Livro {doc_id}",
+            "version": "1",
+            "doc_type": "livro",
+            "created_at": now,
+            "updated_at": now,
+            **compute_stats(owned),
+        }
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"extractions": extraction_table, "pages": page_table}, f)
+    return 1
+
+
+def make_text_image(text: str, width: int = 1200, font_size: int = 28):
+    """Renderiza um texto em imagem (preto no branco) para o benchmark de OCR."""
+    import textwrap
+
+    from PIL import Image, ImageDraw, ImageFont
+
+    try:
+        font = ImageFont.load_default(size=font_size)
+    except TypeError:  # Pillow < 10.1
+        font = ImageFont.load_default()
+
+    chars_per_line = max(20, int(width / (font_size * 0.55)))
+    lines = []
+    for paragraph in text.splitlines():
+        lines.extend(textwrap.wrap(paragraph, chars_per_line) or [""])
+    line_height = int(font_size * 1.4)
+    image = Image.new("L", (width, 40 + line_height * len(lines)), color=255)
+    draw = ImageDraw.Draw(image)
+    for i, line in enumerate(lines):
+        draw.text((30, 20 + i * line_height), line, fill=0, font=font)
+    return image
@@ -0,0 +1,145 @@
+"""
+Utilitários mínimos de medição para os benchmarks (sem dependências externas).
+"""
+
+import statistics
+import time
+from typing import Callable, Optional
+
+
+class SkipBenchmark(Exception):
+    """Sinaliza que o benchmark não pode rodar neste ambiente."""
+
+
+class Result:
+    """
+    Tempos de um benchmark e, opcionalmente, a vazão (itens/s) e o tamanho
+    do que foi gerado (size_bytes, ex.: arquivo gravado).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        seconds: list[float],
+        items: int = 0,
+        unit: str = "itens",
+        size_bytes: int = 0,
+    ):
+        self.name = name
+        self.seconds = seconds
+        self.items = items
+        self.unit = unit
+        self.size_bytes = size_bytes
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.seconds)
+
+    @property
+    def best(self) -> float:
+        return min(self.seconds)
+
+    @property
+    def throughput(self) -> float:
+        """Itens processados por segundo (pela mediana)."""
+        if not self.items or not self.median:
+            return 0.0
+        return self.items / self.median
+
+    def as_dict(self) -> dict:
+        data = {
+            "median_s": round(self.median, 6),
+            "best_s": round(self.best, 6),
+            "runs": len(self.seconds),
+            "items": self.items,
+            "unit": self.unit,
+            "throughput": round(self.throughput, 2),
+        }
+        if self.size_bytes:
+            data["size_bytes"] = self.size_bytes
+        return data
+
+    def format(self) -> str:
+        line = f"{self.name:<45} mediana {self.median * 1000:10.2f} ms  melhor {self.best * 1000:10.2f} ms"
+        if self.items:
+            line += f"  {self.throughput:12.1f} {self.unit}/s"
+        if self.size_bytes:
+            line += f"  {self.size_bytes / 1024 / 1024:8.2f} MB"
+        return line
+
+
+def measure(
+    name: str,
+    fn: Callable[[], object],
+    repeat: int = 5,
+    warmup: int = 1,
+    items: int = 0,
+    unit: str = "itens",
+    setup: Optional[Callable[[], None]] = None,
+) -> Result:
+    """
+    Executa fn() `repeat` vezes (após `warmup` execuções descartadas).
+
+    Args:
+        name: Nome do benchmark.
+        fn: Função medida.
+        repeat: Número de execuções cronometradas.
+        warmup: Execuções iniciais não cronometradas.
+        items: Unidades processadas por execução (para calcular vazão).
+        unit: Nome da unidade (ex.: "páginas", "chars").
+        setup: Função executada (fora do cronômetro) antes de cada execução.
+    """
+    for _ in range(warmup):
+        if setup:
+            setup()
+        fn()
+
+    seconds = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        seconds.append(time.perf_counter() - start)
+    return Result(name, seconds, items=items, unit=unit)
+
+
+# ─── Registro e baselines ──────────────────────────────────────────────────
+
+# (nome da função, função) — cada função recebe quick: bool e retorna
+# um Result ou uma lista de Results
+_REGISTRY: list[tuple[str, Callable[[bool], object]]] = []
+
+
+def benchmark(fn: Callable[[bool], object]) -> Callable[[bool], object]:
+    """Registra uma função de benchmark para o runner (python -m benchmarks)."""
+    _REGISTRY.append((f"{fn.__module__}.{fn.__name__}", fn))
+    return fn
+
+
+def registered() -> list[tuple[str, Callable[[bool], object]]]:
+    return list(_REGISTRY)
+
+
+def compare(
+    result: Result, baseline: dict, tolerance: float, min_delta: float = 0.0
+) -> Optional[str]:
+    """
+    Compara um resultado com a baseline gravada.
+
+    Só é regressão se passar da tolerância relativa E da diferença
+    absoluta mínima (evita alarmes em medições de microssegundos).
+
+    Returns:
+        Mensagem de regressão, ou None se estiver dentro da tolerância.
+    """
+    reference = baseline.get("median_s")
+    if not reference:
+        return None
+    limit = max(reference * (1 + tolerance), reference + min_delta)
+    if result.median > limit:
+        return (
+            f"{result.name}: {result.median * 1000:.2f} ms > "
+            f"{limit * 1000:.2f} ms (baseline {reference * 1000:.2f} ms)"
+        )
+    return None
@@ -0,0 +1,737 @@
+"""
+Interface de linha de comando (sem Tkinter) para rodar OCR, tradução,
+exportação e estatísticas em lote — em servidores sem tela ou via cron.
+
+Uso:
+    aldemarvin-cli ingest  --extraction 3 imagens/*.png --jobs 4 --translate
+    aldemarvin-cli ingest  --new "Clean Code" "1ª Edição" livro imagens/*.png
+    aldemarvin-cli translate 3 --jobs 8
+    aldemarvin-cli export 3 --output /tmp [--format epub --content merged] [--force]
+    aldemarvin-cli stats [3] [--recompute]
+    aldemarvin-cli ocr-profile 3 [livro]
+    aldemarvin-cli tune-ocr 3 amostras/*.png --min-confidence 85
+    aldemarvin-cli watch 3 --folder ~/capturas --translate
+    aldemarvin-cli reocr 3 [--pages 4 5]
+    aldemarvin-cli images [--gc]
+    aldemarvin-cli exports [--evict]
+    aldemarvin-cli duplicates 3
+    aldemarvin-cli snapshot [--list] [--prune]
+    aldemarvin-cli verify [--snapshot ID]
+    aldemarvin-cli restore ID|latest
+    aldemarvin-cli compact
+    aldemarvin-cli serve --host 0.0.0.0 --port 8765
+
+Com --json, o progresso e o resultado saem como JSON Lines no stdout
+(um objeto por linha, com o campo "event"). Com --trace, mede OCR, tradução,
+PDF e banco e grava o trace (JSON + Chrome trace) em data/traces.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Adiciona o diretório raiz ao path para importações (execução direta)
+_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from src.config import (
+    BULK_TRANSLATE_BATCH_PAGES,
+    BULK_TRANSLATE_WORKERS,
+    DUPLICATE_POLICIES,
+    DUPLICATE_POLICY,
+    EXPORT_CONTENT_MODES,
+    EXPORT_FORMATS,
+    JOB_SERVER_HOST,
+    JOB_SERVER_OCR_WORKERS,
+    JOB_SERVER_PDF_WORKERS,
+    JOB_SERVER_PORT,
+    JOB_SERVER_TRANSLATE_WORKERS,
+    OCR_TUNE_MIN_CONFIDENCE,
+    PDF_EXPORT_WORKERS,
+    PROFILE_MODE,
+    WATCH_WORKERS,
+)
+from src.database.db_manager import DatabaseManager
+from src.utils import profiling, tracing
+
+
+class Reporter:
+    """Emite progresso legível (stderr) ou JSON Lines (stdout)."""
+
+    def __init__(self, json_mode: bool):
+        self.json_mode = json_mode
+        self._started = time.monotonic()
+
+    def _emit(self, event: str, **data) -> None:
+        if self.json_mode:
+            data = {"event": event, "elapsed": round(time.monotonic() - self._started, 3), **data}
+            sys.stdout.write(json.dumps(data, ensure_ascii=False) + "\n")
+            sys.stdout.flush()
+
+    def progress(self, stage: str, done: int, total: int, **extra) -> None:
+        self._emit("progress", stage=stage, done=done, total=total, **extra)
+        if not self.json_mode:
+            sys.stderr.write(f"\r{stage}: {done}/{total}")
+            if done >= total:
+                sys.stderr.write("\n")
+            sys.stderr.flush()
+
+    def result(self, **data) -> None:
+        self._emit("result", **data)
+        if not self.json_mode:
+            for key, value in data.items():
+                print(f"{key}: {value}")
+
+    def info(self, event: str, text: str, **data) -> None:
+        self._emit(event, **data)
+        if not self.json_mode:
+            sys.stderr.write(f"{text}\n")
+
+    def error(self, message: str) -> None:
+        self._emit("error", message=message)
+        if not self.json_mode:
+            sys.stderr.write(f"Erro: {message}\n")
+
+
+# ─── Comandos ──────────────────────────────────────────────────────────────
+
+
+def _require_extraction(db: DatabaseManager, extraction_id: int) -> dict:
+    extraction = db.get_extraction(extraction_id)
+    if not extraction:
+        raise ValueError(f"Extração {extraction_id} não encontrada.")
+    return extraction
+
+
+def cmd_ingest(args, db: DatabaseManager, reporter: Reporter) -> None:
+    """OCR de imagens em paralelo e inclusão como páginas (ordem dos argumentos)."""
+    from PIL import Image
+
+    from src.services.ocr_service import ocr_for_extraction
+
+    missing = [path for path in args.images if not os.path.isfile(path)]
+    if missing:
+        raise FileNotFoundError(f"Arquivo não encontrado: {missing[0]}")
+
+    if args.new:
+        extraction_id = db.create_extraction(*args.new)
+    else:
+        extraction_id = args.extraction
+        _require_extraction(db, extraction_id)
+
+    ocr = ocr_for_extraction(db, extraction_id)
+
+    def process(path: str) -> dict:
+        # OCR e cópia do original no armazenamento de imagens (para re-OCR)
+        with Image.open(path) as image:
+            image.load()
+            return {
+                "original_text": ocr.extract_from_image(image),
+                "image_hash": db.images.put(image),
+            }
+
+    total = len(args.images)
+    pages = [{}] * total
+    done = 0
+    reporter.progress("ocr", 0, total)
+    # O Tesseract roda em subprocesso: threads bastam para paralelizar
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        futures = {pool.submit(process, path): i for i, path in enumerate(args.images)}
+        for future in as_completed(futures):
+            pages[futures[future]] = future.result()
+            done += 1
+            reporter.progress("ocr", done, total, file=args.images[futures[future]])
+
+    existing = {page["id"] for page in db.get_pages(extraction_id)}
+    page_ids = db.add_pages(extraction_id, pages, on_duplicate=args.duplicates)
+    added = set(page_ids) - existing
+    duplicates = len(page_ids) - len(added)  # Descartadas ("skip")
+    duplicates += sum(1 for page_id in added if db.get_page(page_id).get("duplicate_of"))
+
+    if args.translate:
+        _translate(db, extraction_id, args.jobs, BULK_TRANSLATE_BATCH_PAGES, reporter)
+
+    reporter.result(extraction_id=extraction_id, pages_added=len(added), duplicates=duplicates)
+
+
+def _translate(db, extraction_id: int, workers: int, batch_pages: int, reporter) -> dict:
+    from src.services.bulk_translate import BulkTranslateJob
+
+    job = BulkTranslateJob(
+        db,
+        extraction_id,
+        workers=workers,
+        batch_pages=batch_pages,
+        on_progress=lambda done, total: reporter.progress("translate", done, total),
+    )
+    job.run()
+    if job.status == "failed":
+        raise RuntimeError(f"Falha na tradução: {job.error}")
+    return {"status": job.status, "pages_translated": job.done}
+
+
+def cmd_translate(args, db: DatabaseManager, reporter: Reporter) -> None:
+    """Traduz todas as páginas sem tradução de uma extração."""
+    _require_extraction(db, args.extraction)
+    outcome = _translate(db, args.extraction, args.jobs, args.batch_pages, reporter)
+    reporter.result(extraction_id=args.extraction, **outcome)
+
+
+def cmd_export(args, db: DatabaseManager, reporter: Reporter) -> None:
+    """Exporta uma extração (PDF, TXT, Markdown ou EPUB)."""
+    from src.config import EXPORTS_DIR
+    from src.services.exporters import export_extraction
+
+    _require_extraction(db, args.extraction)
+    total = db.get_stats(args.extraction)["page_count"]
+    if not total:
+        raise ValueError("Esta extração não possui páginas para exportar.")
+
+    reporter.progress("export", 0, total)
+    path = export_extraction(
+        db,
+        args.extraction,
+        args.format,
+        args.content,
+        exports_dir=args.output or EXPORTS_DIR,
+        workers=args.jobs,
+        use_cache=not args.force,
+    )
+    reporter.progress("export", total, total)
+    reporter.result(extraction_id=args.extraction, path=path, pages=total, format=args.format)
+
+
+def cmd_stats(args, db: DatabaseManager, reporter: Reporter) -> None:
+    """Mostra (e opcionalmente recalcula) as estatísticas das extrações."""
+    if args.recompute:
+        fixed = db.recompute_stats(args.extraction)
+        reporter.result(recomputed=fixed)
+
+    if args.extraction is not None:
+        extractions = [_require_extraction(db, args.extraction)]
+    else:
+        extractions = db.get_all_extractions()
+
+    for extraction in extractions:
+        stats = db.get_stats(extraction["id"])
+        reporter.result(
+            extraction_id=extraction["id"],
+            name=extraction.get("name", ""),
+            version=extraction.get("version", ""),
+            doc_type=extraction.get("doc_type", ""),
+            **stats,
+        )
+
+
+def cmd_ocr_profile(args, db: DatabaseManager, reporter: Reporter) -> None:
+    """Mostra ou define o perfil de OCR de uma extração."""
+    from src.config import OCR_PROFILES
+    from src.services.ocr_service import resolve_profile
+
+    extraction = _require_extraction(db, args.extraction)
+    if args.reset_lang:
+        # Refaz a detecção de escrita nas próximas páginas (perfil "auto")
+        db.update_extraction(args.extraction, ocr_auto_lang=None)
+        extraction = db.get_extraction(args.extraction)
+    if args.name:
+        if args.name not in OCR_PROFILES:
+            raise ValueError(
+                f"Perfil de OCR desconhecido: '{args.name}'. "
+                f"Disponíveis: {', '.join(OCR_PROFILES)}."
+            )
+        # Um perfil escolhido substitui o resultado do auto-tune
+        db.update_extraction(
+            args.extraction, ocr_profile=args.name, ocr_config=None, ocr_auto_lang=None
+        )
+        extraction = db.get_extraction(args.extraction)
+
+    auto_lang = extraction.get("ocr_auto_lang") or {}
+    reporter.result(
+        extraction_id=args.extraction,
+        ocr_profile=extraction.get("ocr_profile") or "",
+        auto_tuned=bool(extraction.get("ocr_config")),
+        detected_lang=auto_lang.get("lang") or "",
+        **resolve_profile(extraction),
+    )
+
+
+def cmd_tune_ocr(args, db: DatabaseManager, reporter: Reporter) -> None:
+    """Auto-tune do perfil de OCR com páginas de amostra."""
+    from src.services.ocr_tuner import tune_extraction
+
+    _require_extraction(db, args.extraction)
+    missing = [path for path in args.images if not os.path.isfile(path)]
+    if missing:
+        raise FileNotFoundError(f"Arquivo não encontrado: {missing[0]}")
+
+    evaluated = []
+
+    def on_result(result: dict):
+        evaluated.append(result)
+        profile = result["profile"]
+        reporter.info(
+            "candidate",
+            f"psm={profile['psm']} oem={profile['oem']}: {result['seconds']:.2f} s, "
+            f"confiança {result['confidence']:.1f}",
+            **result,
+        )
+
+    best, _ = tune_extraction(
+        db,
+        args.extraction,
+        args.images,
+        min_confidence=args.min_confidence,
+        on_result=on_result,
+    )
+    if best["confidence"] < args.min_confidence:
+        reporter.info(
+            "warning",
+            f"Nenhuma configuração atingiu {args.min_confidence:g}; "
+            "gravada a de maior confiança.",
+        )
+    reporter.result(
+        extraction_id=args.extraction,
+        **best["profile"],
+        seconds=best["seconds"],
+        confidence=best["confidence"],
+    )
+
+
+def cmd_watch(args, db: DatabaseManager, reporter: Reporter) -> None:
+    """Monitora a pasta de uma extração (ou de todas configuradas) até Ctrl+C."""
+    from src.services.folder_watcher import FolderWatcher
+
+    if args.extraction is None:
+        targets = [
+            (e["id"], e["watch_folder"])
+            for e in db.get_all_extractions()
+            if e.get("watch_folder")
+        ]
+        if not targets:
+            raise ValueError(
+                "Nenhuma extração com pasta monitorada. Use: watch <id> --folder <pasta>"
+            )
+    else:
+        extraction = _require_extraction(db, args.extraction)
+        folder = args.folder or extraction.get("watch_folder")
+        if not folder:
+            raise ValueError("Informe a pasta com --folder (fica salva na extração).")
+        folder = os.path.abspath(os.path.expanduser(folder))
+        if not os.path.isdir(folder):
+            raise FileNotFoundError(f"Pasta não encontrada: {folder}")
+        if folder != extraction.get("watch_folder"):
+            db.update_extraction(args.extraction, watch_folder=folder)
+        targets = [(args.extraction, folder)]
+
+    def on_event(event: str, **data):
+        prefix = f"[{data['extraction_id']}]"
+        if event == "started":
+            text = f"{prefix} Monitorando {data['folder']} ({data['mode']})"
+        elif event == "page":
+            text = f"{prefix} {data['file']} → página incluída"
+        elif event == "error":
+            text = f"{prefix} {data['file']}: {data['message']}"
+        else:
+            text = f"{prefix} Encerrado: {data['pages_added']} página(s)"
+        reporter.info(event, text, **data)
+
+    watchers = [
+        FolderWatcher(
+            db,
+            extraction_id,
+            folder,
+            translate=args.translate,
+            workers=args.jobs,
+            polling=args.poll,
+            on_event=on_event,
+        ).start(until_idle=args.once)
+        for extraction_id, folder in targets
+    ]
+    try:
+        while any(w.is_running for w in watchers):
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for watcher in watchers:
+            watcher.stop()
+        for watcher in watchers:
+            watcher.join()
+
+    reporter.result(
+        pages_added=sum(w.pages_added for w in watchers),
+        failed=sum(w.failed for w in watchers),
+    )
+
+
+def cmd_reocr(args, db: DatabaseManager, reporter: Reporter) -> None:
+    """Refaz o OCR das páginas a partir das imagens originais guardadas."""
+    from src.services.ocr_service import ocr_for_extraction
+
+    _require_extraction(db, args.extraction)
+    pages = db.get_pages(args.extraction)
+    if args.pages:
+        pages = [p for p in pages if p.get("page_number") in set(args.pages)]
+    without_image = [p["page_number"] for p in pages if not p.get("image_hash")]
+    pages = [p for p in pages if p.get("image_hash")]
+    if without_image:
+        reporter.info(
+            "skipped",
+            f"Páginas sem imagem guardada: {', '.join(map(str, without_image))}",
+            pages=without_image,
+        )
+    if not pages:
+        raise ValueError("Nenhuma página com imagem guardada para refazer o OCR.")
+
+    ocr = ocr_for_extraction(db, args.extraction)
+
+    def process(page: dict) -> str:
+        with db.images.open(page["image_hash"]) as image:
+            image.load()
+            return ocr.extract_from_image(image)
+
+    updates = {}
+    done = 0
+    reporter.progress("ocr", 0, len(pages))
+    with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        futures = {pool.submit(process, page): page for page in pages}
+        for future in as_completed(futures):
+            page = futures[future]
+            text = future.result()
+            if text != page.get("original_text", ""):
+                updates[page["id"]] = {"original_text": text}
+            done += 1
+            reporter.progress("ocr", done, len(pages), page=page["page_number"])
+
+    db.update_pages(updates)
+    reporter.result(extraction_id=args.extraction, pages=len(pages), changed=len(updates))
+
+
+def cmd_images(args, db: DatabaseManager, reporter: Reporter) -> None:
+    """Uso do armazenamento de imagens e coleta de lixo."""
+    if args.gc:
+        outcome = db.collect_image_garbage(args.grace)
+        reporter.result(removed=outcome["removed"], freed_bytes=outcome["freed_bytes"])
+    usage = db.images.usage()
+    reporter.result(referenced=len(db.get_image_hashes()), **usage)
+
+
+def cmd_exports(args, db: DatabaseManager, reporter: Reporter) -> None:
+    """Uso da pasta de exportações e limpeza pelos limites de idade e tamanho."""
+    from src.config import EXPORTS_DIR
+    from src.services.export_cache import ExportCache
+
+    cache = ExportCache(EXPORTS_DIR)
+    if args.evict:
+        outcome = cache.evict()
+        reporter.result(removed=outcome["removed"], freed_bytes=outcome["freed_bytes"])
+    reporter.result(**cache.usage())
+
+
+def cmd_duplicates(args, db: DatabaseManager, reporter: Reporter) -> None:
+    """Lista os pares de páginas quase idênticas de uma extração."""
+    _require_extraction(db, args.extraction)
+    pairs = db.find_duplicate_pages(args.extraction)
+    for first, second, similarity in pairs:
+        reporter.result(
+            page=first["page_number"],
+            duplicate_page=second["page_number"],
+            similarity=similarity,
+        )
+    if not pairs:
+        reporter.info("duplicates", "Nenhuma página repetida.", count=0)
+
+
+def cmd_compact(args, db: DatabaseManager, reporter: Reporter) -> None:
+    """Remove páginas/jobs órfãos, jobs antigos e tabelas vazias do banco."""
+    if args.job_retention is None:
+        outcome = db.compact()
+    else:
+        outcome = db.compact(args.job_retention)
+    reporter.result(**outcome)
+
+
+def cmd_snapshot(args, db: DatabaseManager, reporter: Reporter) -> None:
+    """Tira um snapshot incremental do banco (ou lista os existentes)."""
+    from src.database.maintenance import SnapshotStore, backups_dir_for, take_snapshot
+
+    store = SnapshotStore(backups_dir_for(db.db_path))
+    if args.list:
+        for manifest in store.snapshots():
+            reporter.result(
+                snapshot=manifest["id"],
+                created_at=manifest["created_at"],
+                reason=manifest.get("reason", ""),
+                documents=sum(t["docs"] for t in manifest["tables"].values()),
+                new_bytes=manifest.get("new_bytes", 0),
+            )
+        reporter.result(**store.usage())
+        return
+
+    manifest = take_snapshot(db, store)
+    reporter.result(
+        snapshot=manifest["id"],
+        unchanged=manifest.get("unchanged", False),
+        new_segments=manifest["new_segments"],
+        new_bytes=manifest["new_bytes"],
+    )
+    if args.prune:
+        reporter.result(**store.prune())
+
+
+def cmd_verify(args, db: DatabaseManager | None, reporter: Reporter) -> None:
+    """Confere o banco (direto do arquivo) ou um snapshot."""
+    from src.config import DB_PATH
+    from src.database.maintenance import (
+        SnapshotStore,
+        backups_dir_for,
+        read_database,
+        verify_data,
+    )
+
+    db_path = args.db or DB_PATH
+    if args.snapshot:
+        target = args.snapshot
+        problems = SnapshotStore(backups_dir_for(db_path)).verify(args.snapshot)
+    else:
+        target = db_path
+        try:
+            problems = verify_data(read_database(db_path))
+        except ValueError as e:
+            problems = [str(e)]
+    for problem in problems:
+        reporter.info("problem", problem, message=problem)
+    reporter.result(target=target, problems=len(problems))
+    if problems:
+        raise ValueError(f"{len(problems)} problema(s) encontrado(s).")
+
+
+def cmd_restore(args, db: DatabaseManager | None, reporter: Reporter) -> None:
+    """Restaura o banco de um snapshot (o app aberto recarrega o conteúdo restaurado)."""
+    from src.config import DB_PATH
+    from src.database.maintenance import restore_snapshot
+
+    outcome = restore_snapshot(args.snapshot, db_path=args.db or DB_PATH)
+    reporter.result(**outcome)
+
+
+def cmd_serve(args, db: DatabaseManager | None, reporter: Reporter) -> None:
+    """
+    Executa o servidor de jobs (OCR / tradução / PDF) até Ctrl+C.
+    Os jobs recebem tudo na requisição: o banco não é aberto.
+    """
+    from src.server.job_server import run_server
+
+    run_server(
+        host=args.host,
+        port=args.port,
+        ocr_workers=args.ocr_workers,
+        translate_workers=args.translate_workers,
+        pdf_workers=args.pdf_workers,
+    )
+
+
+# ─── Entrada ───────────────────────────────────────────────────────────────
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="aldemarvin-cli",
+        description="Aldemarvin Extractor — OCR, tradução e exportação em lote (sem interface gráfica).",
+    )
+    parser.add_argument("--json", action="store_true", help="Progresso em JSON Lines no stdout")
+    parser.add_argument("--db", help="Caminho do banco (padrão: data/db/aldemarvin.json)")
+    parser.add_argument(
+        "--trace", action="store_true", help="Mede as operações e grava o trace em data/traces"
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="session",
+        default=PROFILE_MODE or None,
+        choices=profiling.MODES,
+        help="Grava o perfil do comando em data/profiles (padrão: session)",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    ingest = sub.add_parser("ingest", help="OCR de imagens e inclusão como páginas")
+    target = ingest.add_mutually_exclusive_group(required=True)
+    target.add_argument("--extraction", type=int, help="ID da extração de destino")
+    target.add_argument(
+        "--new", nargs=3, metavar=("NOME", "VERSAO", "TIPO"), help="Cria uma nova extração"
+    )
+    ingest.add_argument("images", nargs="+", help="Arquivos de imagem (na ordem das páginas)")
+    ingest.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 2, help="OCRs em paralelo")
+    ingest.add_argument("--translate", action="store_true", help="Traduz as páginas após o OCR")
+    ingest.add_argument(
+        "--duplicates",
+        choices=DUPLICATE_POLICIES,
+        default=DUPLICATE_POLICY,
+        help="Páginas quase idênticas a outras: incluir, marcar ou descartar",
+    )
+    ingest.set_defaults(func=cmd_ingest)
+
+    translate = sub.add_parser("translate", help="Traduz as páginas sem tradução")
+    translate.add_argument("extraction", type=int)
+    translate.add_argument("--jobs", "-j", type=int, default=BULK_TRANSLATE_WORKERS)
+    translate.add_argument("--batch-pages", type=int, default=BULK_TRANSLATE_BATCH_PAGES)
+    translate.set_defaults(func=cmd_translate)
+
+    export = sub.add_parser("export", help="Exporta uma extração (PDF, TXT, Markdown, EPUB)")
+    export.add_argument("extraction", type=int)
+    export.add_argument("--output", "-o", help="Pasta de saída (padrão: data/exports)")
+    export.add_argument("--format", "-f", choices=EXPORT_FORMATS, default="pdf")
+    export.add_argument(
+        "--content",
+        choices=EXPORT_CONTENT_MODES,
+        default="translated",
+        help="Tradução (padrão), só o original ou os dois mesclados",
+    )
+    export.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=PDF_EXPORT_WORKERS,
+        help="Processos para gerar o PDF em paralelo (livros grandes)",
+    )
+    export.add_argument(
+        "--force", action="store_true", help="Gera de novo mesmo sem mudanças desde a última"
+    )
+    export.set_defaults(func=cmd_export)
+
+    stats = sub.add_parser("stats", help="Estatísticas das extrações")
+    stats.add_argument("extraction", type=int, nargs="?")
+    stats.add_argument("--recompute", action="store_true", help="Recalcula a partir das páginas")
+    stats.set_defaults(func=cmd_stats)
+
+    ocr_profile = sub.add_parser("ocr-profile", help="Mostra ou define o perfil de OCR")
+    ocr_profile.add_argument("extraction", type=int)
+    ocr_profile.add_argument("name", nargs="?", help="Nome do perfil (ver OCR_PROFILES)")
+    ocr_profile.add_argument(
+        "--reset-lang", action="store_true", help="Refaz a detecção de idioma (perfil multilingue)"
+    )
+    ocr_profile.set_defaults(func=cmd_ocr_profile)
+
+    tune_ocr = sub.add_parser("tune-ocr", help="Escolhe o perfil de OCR com páginas de amostra")
+    tune_ocr.add_argument("extraction", type=int)
+    tune_ocr.add_argument("images", nargs="+", help="Imagens de amostra")
+    tune_ocr.add_argument(
+        "--min-confidence",
+        type=float,
+        default=OCR_TUNE_MIN_CONFIDENCE,
+        help="Confiança média mínima (0–100)",
+    )
+    tune_ocr.set_defaults(func=cmd_tune_ocr)
+
+    watch = sub.add_parser("watch", help="Inclui como páginas as imagens salvas numa pasta")
+    watch.add_argument("extraction", type=int, nargs="?", help="Sem ID: todas as extrações com pasta")
+    watch.add_argument("--folder", "-f", help="Pasta monitorada (fica salva na extração)")
+    watch.add_argument("--translate", action="store_true", help="Traduz cada página incluída")
+    watch.add_argument("--jobs", "-j", type=int, default=WATCH_WORKERS, help="OCRs em paralelo")
+    watch.add_argument("--poll", action="store_true", help="Força varredura periódica (sem inotify)")
+    watch.add_argument("--once", action="store_true", help="Processa as imagens presentes e sai")
+    watch.set_defaults(func=cmd_watch)
+
+    reocr = sub.add_parser("reocr", help="Refaz o OCR a partir das imagens guardadas")
+    reocr.add_argument("extraction", type=int)
+    reocr.add_argument("--pages", type=int, nargs="+", help="Números das páginas (padrão: todas)")
+    reocr.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 2, help="OCRs em paralelo")
+    reocr.set_defaults(func=cmd_reocr)
+
+    images = sub.add_parser("images", help="Armazenamento das imagens das páginas")
+    images.add_argument("--gc", action="store_true", help="Remove imagens sem página")
+    images.add_argument(
+        "--grace",
+        type=float,
+        help="Poupa imagens gravadas há menos de N segundos (padrão: IMAGE_GC_GRACE_S)",
+    )
+    images.set_defaults(func=cmd_images)
+
+    exports = sub.add_parser("exports", help="Pasta de exportações (cache)")
+    exports.add_argument(
+        "--evict",
+        action="store_true",
+        help="Apaga as exportações além de EXPORTS_MAX_AGE_S / EXPORTS_MAX_BYTES",
+    )
+    exports.set_defaults(func=cmd_exports)
+
+    duplicates = sub.add_parser("duplicates", help="Páginas quase idênticas de uma extração")
+    duplicates.add_argument("extraction", type=int)
+    duplicates.set_defaults(func=cmd_duplicates)
+
+    snapshot = sub.add_parser("snapshot", help="Snapshot incremental do banco")
+    snapshot.add_argument("--list", action="store_true", help="Lista os snapshots existentes")
+    snapshot.add_argument(
+        "--prune", action="store_true", help="Mantém só os SNAPSHOT_KEEP mais recentes"
+    )
+    snapshot.set_defaults(func=cmd_snapshot)
+
+    verify = sub.add_parser("verify", help="Confere a consistência do banco ou de um snapshot")
+    verify.add_argument("--snapshot", help="ID do snapshot (ou latest); padrão: o banco")
+    verify.set_defaults(func=cmd_verify, open_db=False)
+
+    restore = sub.add_parser("restore", help="Restaura o banco de um snapshot")
+    restore.add_argument("snapshot", help="ID do snapshot (ver snapshot --list) ou latest")
+    restore.set_defaults(func=cmd_restore, open_db=False)
+
+    compact = sub.add_parser("compact", help="Remove dados órfãos e jobs antigos do banco")
+    compact.add_argument(
+        "--job-retention",
+        type=float,
+        help="Remove jobs terminados há mais de N segundos (padrão: DB_JOB_RETENTION_S)",
+    )
+    compact.set_defaults(func=cmd_compact)
+
+    serve = sub.add_parser("serve", help="Servidor de jobs HTTP (OCR, tradução, PDF)")
+    serve.add_argument("--host", default=JOB_SERVER_HOST)
+    serve.add_argument("--port", type=int, default=JOB_SERVER_PORT)
+    serve.add_argument("--ocr-workers", type=int, default=JOB_SERVER_OCR_WORKERS)
+    serve.add_argument("--translate-workers", type=int, default=JOB_SERVER_TRANSLATE_WORKERS)
+    serve.add_argument("--pdf-workers", type=int, default=JOB_SERVER_PDF_WORKERS)
+    serve.set_defaults(func=cmd_serve, open_db=False)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Função de entrada do aldemarvin-cli."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    reporter = Reporter(args.json)
+    if args.trace:
+        tracing.enable()
+
+    db = None
+    try:
+        if getattr(args, "open_db", True):
+            # verify/restore leem o arquivo direto (funcionam com o banco corrompido);
+            # serve não usa o banco (e não deve segurar o lock dele). Banco
+            # corrompido ou travado vira erro do reporter, como os demais
+            db = DatabaseManager(args.db) if args.db else DatabaseManager()
+        if args.profile:
+            profiling.enable(args.profile)
+        with profiling.profile_action(f"cli_{args.command}"):
+            args.func(args, db, reporter)
+        return 0
+    except (ValueError, OSError, RuntimeError) as e:
+        # OSError inclui arquivo ausente e Tesseract não instalado
+        reporter.error(str(e))
+        return 1
+    finally:
+        if db is not None:
+            db.close()
+        profile_path = profiling.finish(f"cli_{args.command}")
+        if profile_path:
+            reporter.info("profile", f"Perfil gravado em {profile_path}", path=profile_path)
+        if args.trace:
+            json_path, chrome_path = tracing.dump()
+            sys.stderr.write(f"{tracing.format_summary()}\n")
+            reporter.info("trace", f"Trace gravado em {json_path}", path=json_path, chrome=chrome_path)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -19,13 +19,83 @@ DATA_DIR = os.path.join(BASE_DIR, "data")
 DB_DIR = os.path.join(DATA_DIR, "db")
 ASSETS_DIR = os.path.join(BASE_DIR, "assets")
 EXPORTS_DIR = os.path.join(DATA_DIR, "exports")
+CACHE_DIR = os.path.join(DATA_DIR, "cache")
+LOGS_DIR = os.path.join(DATA_DIR, "logs")
+IMAGES_DIR = os.path.join(DATA_DIR, "images")
+BACKUPS_DIR = os.path.join(DATA_DIR, "backups")
 
 # Garante que os diretórios existam
-for d in [DATA_DIR, DB_DIR, ASSETS_DIR, EXPORTS_DIR]:
+for d in [DATA_DIR, DB_DIR, ASSETS_DIR, EXPORTS_DIR, CACHE_DIR, LOGS_DIR, IMAGES_DIR, BACKUPS_DIR]:
     os.makedirs(d, exist_ok=True)
 
 # ─── Banco de Dados ───────────────────────────────────────────────────────────
 DB_PATH = os.path.join(DB_DIR, "aldemarvin.json")
+# "log": checkpoint JSON + log de alterações (cada escrita grava só o que
+# mudou; ver database/storage.py). "json": JSONStorage do TinyDB (regrava o
+# arquivo inteiro a cada escrita).
+DB_STORAGE = "log"
+# Checkpoint em background quando o log passa dos dois limites
+DB_LOG_CHECKPOINT_BYTES = 4 * 1024 * 1024
+DB_LOG_CHECKPOINT_RATIO = 0.5  # Fração do tamanho do checkpoint
+DB_LOG_FSYNC = True  # fsync a cada escrita (o JSONStorage também faz)
+# Cache write-back: as escritas ficam em memória e vão para o disco juntas
+# depois de DB_WRITE_BACK_IDLE_S sem escrever, no máximo DB_WRITE_BACK_MAX_DELAY_S
+# depois da primeira pendente ou a cada DB_WRITE_BACK_MAX_PENDING escritas
+# (e ao fechar, no atexit e no SIGTERM). Uma queda perde no máximo essa janela.
+DB_WRITE_BACK = True
+DB_WRITE_BACK_IDLE_S = 0.5
+DB_WRITE_BACK_MAX_DELAY_S = 2.0
+DB_WRITE_BACK_MAX_PENDING = 100
+# Com o lock entre processos preso (ver abaixo), as pendentes vão para o disco
+# DB_WRITE_BACK_LEASE_S depois da primeira, assim que nenhuma escrita estiver
+# em andamento: outros processos não esperam a janela inteira do cache.
+DB_WRITE_BACK_LEASE_S = 0.2
+# Serialização do checkpoint e do log: "auto" usa orjson ou msgspec se
+# instalados (pip install orjson) e senão o json; ou "orjson"/"msgspec"/"json".
+# Compacto = sem indentação (arquivo menor e mais rápido de gravar e ler).
+DB_JSON_BACKEND = "auto"
+DB_JSON_COMPACT = True
+# Vários processos no mesmo banco (app, CLI, servidor de jobs): quem escreve
+# trava <banco>.lock enquanto tem escritas pendentes; os outros esperam até
+# DB_LOCK_TIMEOUT_S e as leituras recarregam o que outro processo gravou.
+DB_LOCK_TIMEOUT_S = 30.0
+DB_REFRESH_INTERVAL_S = 2.0  # A lista de extrações confere mudanças de outros processos
+
+# ─── Manutenção do banco ──────────────────────────────────────────────────────
+# Snapshots incrementais em BACKUPS_DIR: cada tabela é dividida em segmentos
+# de SNAPSHOT_SEGMENT_DOCS documentos e só os segmentos alterados são gravados.
+SNAPSHOT_INTERVAL_S = 30 * 60  # Snapshot em background (só se o banco mudou)
+SNAPSHOT_ON_CLOSE = True  # Snapshot ao fechar o app
+# O snapshot de fechamento roda na thread de manutenção: o fechamento espera
+# no máximo isto, e o pula se houve uma manutenção há menos de MIN_AGE
+SNAPSHOT_CLOSE_TIMEOUT_S = 5.0
+SNAPSHOT_CLOSE_MIN_AGE_S = 5 * 60
+SNAPSHOT_KEEP = 20  # Snapshots mantidos; os mais antigos saem na limpeza
+SNAPSHOT_SEGMENT_DOCS = 100
+DB_JOB_RETENTION_S = 30 * 24 * 3600  # Compactação: jobs terminados há mais tempo saem
+
+# ─── Páginas repetidas ────────────────────────────────────────────────────────
+# Páginas com semelhança (Jaccard de sequências de 3 palavras) a partir de
+# SIMILARITY_THRESHOLD contam como a mesma captura. A busca usa MinHash com
+# MINHASH_BANDS faixas de MINHASH_PERMUTATIONS / MINHASH_BANDS valores.
+SIMILARITY_THRESHOLD = 0.8
+SIMILARITY_MIN_WORDS = 8  # Textos menores não são comparados (falsos positivos)
+MINHASH_PERMUTATIONS = 64
+MINHASH_BANDS = 16
+# Ao incluir uma página repetida: "keep" (inclui), "flag" (inclui marcada com
+# "duplicate_of") ou "skip" (não inclui)
+DUPLICATE_POLICIES = ("keep", "flag", "skip")
+DUPLICATE_POLICY = "flag"
+
+# ─── Imagens das páginas ──────────────────────────────────────────────────────
+# Capturas originais guardadas por hash do conteúdo em IMAGES_DIR (permite
+# refazer o OCR sem capturar de novo); imagens repetidas são gravadas uma vez.
+IMAGE_STORE_FORMAT = "webp"  # "webp" (sem perdas) ou "png"
+IMAGE_WEBP_METHOD = 4  # 0 (rápido) a 6 (menor arquivo)
+IMAGE_THUMB_SIZE = (320, 320)  # Miniatura pré-gerada (tamanho máximo)
+IMAGE_THUMB_QUALITY = 80
+IMAGE_GC_GRACE_S = 3600  # A coleta de lixo poupa imagens gravadas há menos tempo
+IMAGE_PREVIEW_SIZE = (700, 150)  # Preview na tela de captura (tamanho máximo)
 
 # ─── Janela ────────────────────────────────────────────────────────────────────
 WINDOW_TITLE = f"{APP_NAME} - Extrator de Texto"
@@ -84,6 +154,192 @@ TESSERACT_PATHS_WIN = [
 TESSERACT_CMD_LINUX = "/usr/bin/tesseract"
 OCR_LANG = "eng"  # Idioma padrão para OCR
 
+# Perfis de OCR por tipo de documento (campo "ocr_profile" da extração;
+# sem perfil, usa o de mesmo nome do doc_type ou OCR_DEFAULT_PROFILE).
+#   psm: segmentação da página — 3 automática, 4 coluna única, 6 bloco
+#        uniforme de texto, 11 texto esparso
+#   oem: motor — 1 LSTM, 3 padrão do Tesseract
+OCR_PROFILES = {
+    "padrao": {"lang": OCR_LANG, "psm": 3, "oem": 3},
+    "livro": {"lang": OCR_LANG, "psm": 6, "oem": 1},
+    "artigo": {"lang": OCR_LANG, "psm": 3, "oem": 1},
+    "manual": {"lang": OCR_LANG, "psm": 4, "oem": 1},
+    # Idioma detectado pela escrita (OSD) — material com várias línguas
+    "multilingue": {"lang": "auto", "psm": 3, "oem": 1},
+}
+OCR_DEFAULT_PROFILE = "padrao"
+
+# Idioma "auto": escrita detectada (Tesseract OSD) → pacote de idioma
+OCR_SCRIPT_LANGS = {
+    "Latin": OCR_LANG,
+    "Cyrillic": "rus",
+    "Greek": "ell",
+    "Arabic": "ara",
+    "Hebrew": "heb",
+    "Devanagari": "hin",
+    "Han": "chi_sim",
+    "Japanese": "jpn",
+    "Hangul": "kor",
+    "Thai": "tha",
+}
+OCR_AUTO_SAMPLE_PAGES = 3  # Páginas analisadas antes de fixar os idiomas (0 = toda página)
+OCR_AUTO_MIN_SCRIPT_CONFIDENCE = 1.0  # Confiança mínima do OSD para aceitar a escrita
+
+# Auto-tune (aldemarvin-cli tune-ocr): configurações testadas nas amostras;
+# vence a mais rápida com confiança média >= OCR_TUNE_MIN_CONFIDENCE
+OCR_TUNE_CANDIDATES = [
+    {"psm": 3, "oem": 1},
+    {"psm": 4, "oem": 1},
+    {"psm": 6, "oem": 1},
+    {"psm": 11, "oem": 1},
+    {"psm": 3, "oem": 3},
+    {"psm": 6, "oem": 3},
+]
+OCR_TUNE_MIN_CONFIDENCE = 80.0  # 0–100 (média por caractere)
+
 # ─── Tradução ─────────────────────────────────────────────────────────────────
 TRANSLATE_SOURCE = "en"
 TRANSLATE_TARGET = "pt"
+
+# Provedor de tradução:
+#   "google" → Google Translate via deep-translator (online)
+#   "argos"  → Argos Translate / CTranslate2 (offline, requer modelos instalados)
+TRANSLATE_PROVIDER = "google"
+TRANSLATE_MAX_CHARS = 4500  # Limite de caracteres por requisição (Google ~5000)
+
+# Inferência offline (Argos) — modelo carregado uma vez por processo
+ARGOS_DEVICE = "cpu"
+ARGOS_BEAM_SIZE = 2
+ARGOS_MAX_BATCH_SIZE = 32  # Segmentos por lote de inferência
+ARGOS_THREADS = 0  # 0 = automático (CTranslate2 decide)
+
+# Cache de traduções por frase (evita retraduzir segmentos já vistos)
+TRANSLATION_CACHE_PATH = os.path.join(CACHE_DIR, "translations.json")
+TRANSLATION_CACHE_MAX_ENTRIES = 200_000
+
+# Tradução em massa ("Traduzir tudo")
+BULK_TRANSLATE_WORKERS = 4  # Blocos traduzidos em paralelo
+BULK_TRANSLATE_BATCH_PAGES = 10  # Páginas por bloco (e por escrita no banco)
+# Intervalo mínimo entre gravações do cache de frases durante o job (o cache
+# inteiro é regravado a cada vez; ao terminar, sempre grava)
+BULK_TRANSLATE_CACHE_SAVE_S = 30.0
+# O job grava no registro quem o executa (pid, máquina) e renova updated_at a
+# cada BULK_TRANSLATE_HEARTBEAT_S; um job "running" só é tratado como
+# interrompido se o processo dono morreu ou se o registro ficou
+# BULK_TRANSLATE_STALE_S sem renovar (outra máquina, processo travado).
+BULK_TRANSLATE_HEARTBEAT_S = 30.0
+BULK_TRANSLATE_STALE_S = 4 * BULK_TRANSLATE_HEARTBEAT_S
+
+# ─── Exportação ───────────────────────────────────────────────────────────────
+EXPORT_FORMATS = ("pdf", "txt", "md", "epub")
+# Conteúdo exportado: tradução (ou original, se a página não foi traduzida),
+# só o original, ou tradução + original linha a linha
+EXPORT_CONTENT_MODES = ("translated", "original", "merged")
+EXPORT_BATCH_PAGES = 200  # Páginas lidas do banco por vez nos exportadores
+# PDF em paralelo (export --jobs): processos usados por padrão e mínimo de
+# páginas por processo (livros menores são gerados num processo só)
+PDF_EXPORT_WORKERS = os.cpu_count() or 2
+PDF_PARALLEL_MIN_CHUNK_PAGES = 100
+# Abaixo disto o PDF é sempre sequencial. Medido (benchmarks/bench_pdf.py):
+# com 300 páginas, 4,58 s sequencial contra 4,09 s em paralelo (~11%, com
+# todos os núcleos ocupados); partida dos processos, fontes analisadas em
+# cada um e a junção das partes comem o resto do ganho em livros menores.
+PDF_PARALLEL_MIN_PAGES = 1000
+# Cache de exportações: arquivo reaproveitado enquanto o conteúdo da extração
+# (impressão digital) não muda. Limites de EXPORTS_DIR (0 = sem limite); os
+# arquivos usados há mais tempo saem primeiro.
+EXPORT_CACHE_INDEX = ".export_cache.json"
+EXPORTS_MAX_BYTES = 1024 * 1024 * 1024  # 1 GB
+EXPORTS_MAX_AGE_S = 30 * 24 * 3600  # 30 dias sem uso
+
+# ─── Fontes do PDF ────────────────────────────────────────────────────────────
+# Fonte TTF (Unicode) embutida no PDF, por estilo ("" regular, "B", "I").
+# None no regular = usa a primeira família de PDF_FONT_CANDIDATES que existir;
+# sem nenhuma, o PDF usa Helvetica (só Latin-1, o resto vira "?").
+# ALDEMARVIN_PDF_FONT=/caminho/fonte.ttf define o regular sem editar aqui.
+PDF_FONT_PATHS = {
+    "": os.environ.get("ALDEMARVIN_PDF_FONT") or None,
+    "B": None,
+    "I": None,
+}
+PDF_FONT_CANDIDATES = [
+    {
+        "": os.path.join(ASSETS_DIR, "fonts", "DejaVuSans.ttf"),
+        "B": os.path.join(ASSETS_DIR, "fonts", "DejaVuSans-Bold.ttf"),
+        "I": os.path.join(ASSETS_DIR, "fonts", "DejaVuSans-Oblique.ttf"),
+    },
+    {  # Linux (Debian/Ubuntu)
+        "": "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+        "B": "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+        "I": "/usr/share/fonts/truetype/dejavu/DejaVuSans-Oblique.ttf",
+    },
+    {  # Linux (Arch/Fedora)
+        "": "/usr/share/fonts/TTF/DejaVuSans.ttf",
+        "B": "/usr/share/fonts/TTF/DejaVuSans-Bold.ttf",
+        "I": "/usr/share/fonts/TTF/DejaVuSans-Oblique.ttf",
+    },
+    {  # Windows
+        "": r"C:\Windows\Fonts\arial.ttf",
+        "B": r"C:\Windows\Fonts\arialbd.ttf",
+        "I": r"C:\Windows\Fonts\ariali.ttf",
+    },
+    {  # macOS
+        "": "/System/Library/Fonts/Supplemental/Arial.ttf",
+        "B": "/System/Library/Fonts/Supplemental/Arial Bold.ttf",
+        "I": "/System/Library/Fonts/Supplemental/Arial Italic.ttf",
+    },
+]
+PDF_FONT_FAMILY = "aldemarvin"  # Nome da família registrada no fpdf2
+# Glifos guardados no subconjunto em cache por fonte (acima disso recomeça)
+PDF_FONT_WORKING_SET_MAX = 3000
+
+# ─── Servidor de jobs ─────────────────────────────────────────────────────────
+# Centraliza OCR / tradução / PDF numa máquina (aldemarvin-cli serve).
+JOB_SERVER_HOST = "127.0.0.1"
+JOB_SERVER_PORT = 8765
+JOB_SERVER_OCR_WORKERS = os.cpu_count() or 2
+JOB_SERVER_TRANSLATE_WORKERS = 4
+JOB_SERVER_PDF_WORKERS = 2
+JOB_SERVER_MAX_BODY = 50 * 1024 * 1024  # 50 MB por requisição
+JOB_SERVER_RETENTION_S = 3600  # Jobs concluídos ficam disponíveis por 1 hora
+# O stream de eventos repete o status a cada JOB_SERVER_HEARTBEAT_S sem mudanças
+# (jobs longos na fila ou rodando); o cliente desiste do stream depois de
+# JOB_CLIENT_EVENTS_IDLE_S sem nenhuma linha e passa a consultar o status a cada
+# JOB_CLIENT_POLL_S.
+JOB_SERVER_HEARTBEAT_S = 10.0
+JOB_CLIENT_EVENTS_IDLE_S = 3 * JOB_SERVER_HEARTBEAT_S
+JOB_CLIENT_POLL_S = 2.0
+
+# URL do servidor usado pela interface (None = processa localmente)
+# Ex.: "http://127.0.0.1:8765"
+JOB_SERVER_URL = None
+
+# ─── Pasta monitorada (aldemarvin-cli watch) ──────────────────────────────────
+WATCH_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".gif", ".webp")
+WATCH_SETTLE_S = 1.0  # Arquivo sem mudanças por este tempo = escrita concluída
+WATCH_POLL_INTERVAL_S = 1.0  # Intervalo de varredura quando não há inotify
+WATCH_WORKERS = os.cpu_count() or 2  # OCRs em paralelo
+WATCH_BATCH_PAGES = 5  # Páginas por escrita no banco
+WATCH_FLUSH_S = 3.0  # Grava o lote incompleto após este tempo
+WATCH_DONE_DIR = "importadas"  # Subpasta para imagens já incluídas
+WATCH_FAILED_DIR = "com_erro"  # Subpasta para imagens que falharam no OCR
+
+# ─── Instrumentação (tracing) ─────────────────────────────────────────────────
+# ALDEMARVIN_TRACE=1 liga o tracing e grava os spans em TRACES_DIR ao sair
+TRACE_ENABLED = os.environ.get("ALDEMARVIN_TRACE", "") not in ("", "0")
+TRACES_DIR = os.path.join(DATA_DIR, "traces")
+TRACE_MAX_SPANS = 100_000  # Spans guardados para exportação (os mais recentes)
+TRACE_MAX_SAMPLES = 10_000  # Durações por nome usadas nos percentis
+
+# ─── Watchdog da interface ────────────────────────────────────────────────────
+# Mede a latência do loop do Tk e registra os travamentos (com a pilha)
+WATCHDOG_ENABLED = True
+WATCHDOG_INTERVAL_MS = 100  # Intervalo do heartbeat (after)
+WATCHDOG_STALL_MS = 250  # Atraso a partir do qual conta como travamento
+WATCHDOG_LOG_PATH = os.path.join(LOGS_DIR, "ui_stalls.log")
+
+# ─── Profiling ────────────────────────────────────────────────────────────────
+# ALDEMARVIN_PROFILE=session | actions | sampling (ou --profile no app/CLI)
+PROFILE_MODE = os.environ.get("ALDEMARVIN_PROFILE", "")
+PROFILES_DIR = os.path.join(DATA_DIR, "profiles")
+PROFILE_SAMPLE_INTERVAL_S = 0.005  # Intervalo do profiler por amostragem
@@ -1,3 +1,4 @@
 from .db_manager import DatabaseManager
+from .image_store import ImageStore
 
-__all__ = ["DatabaseManager"]
+__all__ = ["DatabaseManager", "ImageStore"]
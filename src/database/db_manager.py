@@ -3,24 +3,201 @@ Gerenciador de banco de dados NoSQL usando TinyDB.
 Armazena extrações, páginas e metadados.
 """
 
+import contextlib
+import functools
+import os
+import threading
+import time
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Iterator, Optional
 
 from tinydb import TinyDB, Query
+from tinydb.storages import JSONStorage
 
-from src.config import DB_PATH
+from src.config import (
+    DB_JOB_RETENTION_S,
+    DB_JSON_COMPACT,
+    DB_PATH,
+    DB_STORAGE,
+    DB_WRITE_BACK,
+    DUPLICATE_POLICIES,
+    DUPLICATE_POLICY,
+    EXPORT_BATCH_PAGES,
+    IMAGES_DIR,
+    SIMILARITY_THRESHOLD,
+)
+from src.utils import tracing
+from src.database.image_store import ImageStore
+from src.database.similarity import MinHashIndex, jaccard, minhash, shingles
+from src.database.serializer import get_serializer
+from src.database.storage import DeltaLogStorage, WriteBackMiddleware, log_paths
+from src.database.stats import (
+    FINGERPRINT_FIELD,
+    STAT_FIELDS,
+    apply_delta,
+    compute_stats,
+    empty_stats,
+    has_stats,
+)
+
+# Campos de página que afetam as estatísticas (e a impressão digital) da extração
+_PAGE_CONTENT_FIELDS = ("page_number", "original_text", "translated_text")
+
+
+def _locked(method, write: bool = False):
+    """
+    Serializa o acesso ao banco entre threads (UI e jobs em background) e,
+    com DB_STORAGE = "log", entre processos: antes de ler, recarrega o que
+    outro processo gravou; para escrever (write=True, ver _writer), trava o
+    banco para este processo.
+    """
+    label = f"db.{method.__name__}"
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not tracing.is_enabled():
+            with self._lock, self._access(write):
+                return method(self, *args, **kwargs)
+
+        with tracing.span(label) as sp:
+            waited = time.perf_counter_ns()
+            with self._lock, self._access(write):
+                sp.set(lock_wait_ms=(time.perf_counter_ns() - waited) / 1e6)
+                return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _writer(method):
+    """_locked para métodos que alteram o banco (leitura e escrita atômicas entre processos)."""
+    return _locked(method, write=True)
 
 
 class DatabaseManager:
     """Gerencia todas as operações do banco de dados local."""
 
-    def __init__(self, db_path: str = DB_PATH):
-        self.db = TinyDB(db_path, indent=4, ensure_ascii=False)
+    def __init__(self, db_path: str = DB_PATH, images_dir: Optional[str] = None):
+        """
+        Args:
+            db_path: Arquivo do banco.
+            images_dir: Diretório das imagens das páginas (padrão: IMAGES_DIR
+                        para o banco padrão; "images" ao lado de outro banco).
+        """
+        self._lock = threading.RLock()
+        self._depth = 0  # Chamadas _locked aninhadas (só a externa sincroniza)
+        self.external_changes = 0  # Vezes que outro processo alterou o banco
+        self.db_path = db_path
+        if DB_STORAGE not in ("log", "json"):
+            raise ValueError(f"DB_STORAGE inválido: '{DB_STORAGE}'. Use log ou json.")
+        if DB_STORAGE == "log":
+            storage, options = DeltaLogStorage, {"serializer": get_serializer()}
+        else:
+            layout = {"separators": (",", ":")} if DB_JSON_COMPACT else {"indent": 4}
+            storage, options = JSONStorage, {"ensure_ascii": False, **layout}
+        if DB_WRITE_BACK:
+            storage = WriteBackMiddleware(storage)
+        self.db = TinyDB(db_path, storage=storage, **options)
         self.extractions = self.db.table("extractions")
         self.pages = self.db.table("pages")
+        self.jobs = self.db.table("jobs")
+        if images_dir is None:
+            images_dir = (
+                IMAGES_DIR
+                if os.path.abspath(db_path) == os.path.abspath(DB_PATH)
+                else os.path.join(os.path.dirname(os.path.abspath(db_path)), "images")
+            )
+        self.images = ImageStore(images_dir)
+        # Índice de páginas quase idênticas por extração (montado sob demanda)
+        self._similarity: dict[int, MinHashIndex] = {}
+        self._migrate_stats()
+
+    # ─── Escrita atômica ───────────────────────────────────────────────────
+
+    def _write_tables(self, updater: Callable[[dict, dict], None]) -> None:
+        """
+        Aplica uma alteração nas tabelas de extrações e páginas numa única
+        leitura/escrita do storage.
+
+        O TinyDB só atualiza uma tabela por escrita; aqui as duas tabelas
+        são alteradas juntas, garantindo que páginas e estatísticas da
+        extração nunca fiquem dessincronizadas no arquivo.
+
+        Args:
+            updater: Função que recebe (extractions, pages), dicts
+                     {doc_id (int): documento}, e os altera in place.
+        """
+        data = self.db.storage.read() or {}
+        tables = {}
+        for table in (self.extractions, self.pages):
+            raw = data.get(table.name, {})
+            tables[table.name] = {int(doc_id): doc for doc_id, doc in raw.items()}
+
+        updater(tables[self.extractions.name], tables[self.pages.name])
+
+        for name, table in tables.items():
+            data[name] = {str(doc_id): doc for doc_id, doc in table.items()}
+        self.db.storage.write(data)
+        self._clear_table_caches()
+
+    # ─── Vários processos ──────────────────────────────────────────────────
+
+    @contextlib.contextmanager
+    def _access(self, write: bool) -> Iterator[None]:
+        """
+        Coordenação com outros processos no mesmo banco (chamar com self._lock).
+
+        Escrita: trava o storage até o fim do método (com o cache write-back,
+        até o flush) e recarrega antes o que os outros gravaram. Leitura: só
+        recarrega, sem travar.
+        """
+        storage = self.db.storage
+        shared = hasattr(storage, "acquire")  # JSONStorage: sem coordenação
+        self._depth += 1
+        try:
+            if shared and write:
+                changed = storage.acquire()
+            elif shared and self._depth == 1:
+                changed = storage.sync()
+            else:
+                changed = False
+            if changed:
+                self._clear_table_caches()
+                self._similarity.clear()
+                self.external_changes += 1
+            try:
+                yield
+            finally:
+                if shared and write:
+                    storage.release()
+        finally:
+            self._depth -= 1
+
+    @_locked
+    def refresh(self) -> int:
+        """
+        Recarrega o que outros processos gravaram (as leituras já fazem isso).
+
+        Returns:
+            external_changes: se mudou desde a última consulta de quem
+            chama, outro processo alterou o banco (ex.: a interface
+            atualiza a tela).
+        """
+        return self.external_changes
+
+    def _clear_table_caches(self) -> None:
+        for table in (self.extractions, self.pages, self.jobs):
+            table.clear_cache()
+            # O próximo ID é recalculado a partir do conteúdo atual
+            table._next_id = None
+
+    @staticmethod
+    def _next_doc_id(table: dict) -> int:
+        """Retorna o próximo doc_id livre de uma tabela crua."""
+        return max(table.keys(), default=0) + 1
 
     # ─── Extrações ─────────────────────────────────────────────────────────
 
+    @_writer
     def create_extraction(self, name: str, version: str, doc_type: str) -> int:
         """
         Cria uma nova extração. A combinação (name + version + type) deve ser única.
@@ -45,11 +222,12 @@ class DatabaseManager:
                 "doc_type": doc_type,
                 "created_at": datetime.now().isoformat(),
                 "updated_at": datetime.now().isoformat(),
-                "page_count": 0,
+                **empty_stats(),
             }
         )
         return doc_id
 
+    @_locked
     def get_all_extractions(self) -> list[dict]:
         """Retorna todas as extrações ordenadas por data de criação."""
         items = self.extractions.all()
@@ -57,6 +235,7 @@ class DatabaseManager:
             item["id"] = item.doc_id
         return sorted(items, key=lambda x: x.get("created_at", ""), reverse=True)
 
+    @_locked
     def get_extraction(self, doc_id: int) -> Optional[dict]:
         """Retorna uma extração pelo ID."""
         doc = self.extractions.get(doc_id=doc_id)
@@ -64,19 +243,33 @@ class DatabaseManager:
             doc["id"] = doc.doc_id
         return doc
 
+    @_writer
     def update_extraction(self, doc_id: int, **kwargs) -> None:
         """Atualiza campos de uma extração."""
         kwargs["updated_at"] = datetime.now().isoformat()
         self.extractions.update(kwargs, doc_ids=[doc_id])
 
+    @_writer
     def delete_extraction(self, doc_id: int) -> None:
-        """Remove uma extração e todas as suas páginas."""
-        # Remove páginas associadas
-        Page = Query()
-        self.pages.remove(Page.extraction_id == doc_id)
-        # Remove a extração
-        self.extractions.remove(doc_ids=[doc_id])
+        """Remove uma extração, todas as suas páginas e as imagens delas."""
+        released = set()
+
+        def updater(extractions: dict, pages: dict):
+            # Remove páginas associadas
+            for page_id in [
+                pid for pid, p in pages.items() if p.get("extraction_id") == doc_id
+            ]:
+                released.add(pages.pop(page_id).get("image_hash"))
+            # Remove a extração
+            extractions.pop(doc_id, None)
 
+        self._write_tables(updater)
+        self._similarity.pop(doc_id, None)
+        Job = Query()
+        self.jobs.remove(Job.extraction_id == doc_id)
+        self._release_images(released)
+
+    @_locked
     def extraction_exists(self, name: str, version: str, doc_type: str) -> bool:
         """Verifica se uma extração com a combinação já existe."""
         Extraction = Query()
@@ -87,34 +280,173 @@ class DatabaseManager:
         )
         return len(result) > 0
 
+    # ─── Estatísticas ──────────────────────────────────────────────────────
+
+    @_locked
+    def get_stats(self, extraction_id: int) -> dict:
+        """Retorna as estatísticas desnormalizadas de uma extração."""
+        extraction = self.get_extraction(extraction_id)
+        if not extraction:
+            return empty_stats()
+        stats = {field: extraction.get(field, 0) for field in STAT_FIELDS}
+        stats[FINGERPRINT_FIELD] = extraction.get(FINGERPRINT_FIELD, "")
+        stats["updated_at"] = extraction.get("updated_at", "")
+        return stats
+
+    @_writer
+    def recompute_stats(self, extraction_id: Optional[int] = None) -> list[int]:
+        """
+        Recalcula as estatísticas a partir das páginas (comando de reparo).
+
+        Args:
+            extraction_id: Extração a reparar (None = todas).
+
+        Returns:
+            Lista de IDs das extrações cujas estatísticas estavam divergentes.
+        """
+        fixed = []
+
+        def updater(extractions: dict, pages: dict):
+            by_extraction = {}
+            for page in pages.values():
+                by_extraction.setdefault(page.get("extraction_id"), []).append(page)
+
+            for doc_id, extraction in extractions.items():
+                if extraction_id is not None and doc_id != extraction_id:
+                    continue
+                stats = compute_stats(by_extraction.get(doc_id, []))
+                if any(extraction.get(f) != v for f, v in stats.items()):
+                    extraction.update(stats)
+                    fixed.append(doc_id)
+
+        self._write_tables(updater)
+        return fixed
+
+    @_locked
+    def _migrate_stats(self) -> None:
+        """Preenche as estatísticas de extrações criadas antes delas existirem."""
+        if all(has_stats(e) for e in self.extractions.all()):
+            return
+        self.recompute_stats()
+
     # ─── Páginas ───────────────────────────────────────────────────────────
 
+    @_writer
     def add_page(
         self,
         extraction_id: int,
         page_number: int,
         original_text: str,
         translated_text: str = "",
+        image_hash: Optional[str] = None,
+        on_duplicate: str = DUPLICATE_POLICY,
     ) -> int:
-        """Adiciona uma nova página a uma extração."""
-        doc_id = self.pages.insert(
-            {
-                "extraction_id": extraction_id,
-                "page_number": page_number,
-                "original_text": original_text,
-                "translated_text": translated_text,
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
-            }
-        )
-        # Atualiza contagem de páginas na extração
-        extraction = self.get_extraction(extraction_id)
-        if extraction:
-            self.update_extraction(
-                extraction_id, page_count=extraction.get("page_count", 0) + 1
-            )
-        return doc_id
+        """
+        Adiciona uma nova página a uma extração.
+
+        image_hash: hash da imagem original em self.images (ImageStore.put).
+        on_duplicate: o que fazer se o texto repete uma página existente
+                      (ver DUPLICATE_POLICIES). Com "skip", nada é gravado e
+                      o ID retornado é o da página existente.
+        """
+        now = datetime.now().isoformat()
+        page = {
+            "extraction_id": extraction_id,
+            "page_number": page_number,
+            "original_text": original_text,
+            "translated_text": translated_text,
+            "created_at": now,
+            "updated_at": now,
+        }
+        if image_hash:
+            page["image_hash"] = image_hash
+        index = self._similarity_index(extraction_id)
+        existing = self._check_duplicate(index, page, on_duplicate, self._lookup_page)
+        if existing is not None:
+            return existing
+        result = {}
+
+        def updater(extractions: dict, pages: dict):
+            doc_id = self._next_doc_id(pages)
+            pages[doc_id] = page
+            result["doc_id"] = doc_id
+            # Atualiza estatísticas da extração na mesma escrita
+            extraction = extractions.get(extraction_id)
+            if extraction is not None:
+                apply_delta(extraction, added=page)
+                extraction["updated_at"] = now
+
+        self._write_tables(updater)
+        index.add(result["doc_id"], page["minhash"])
+        return result["doc_id"]
 
+    @_writer
+    def add_pages(
+        self, extraction_id: int, pages: list[dict], on_duplicate: str = DUPLICATE_POLICY
+    ) -> list[int]:
+        """
+        Adiciona várias páginas ao final de uma extração numa única escrita.
+
+        Args:
+            extraction_id: Extração de destino.
+            pages: Dicts com 'original_text' e, opcionalmente,
+                   'translated_text' e 'image_hash'. Os números de página são atribuídos
+                   em sequência após a última página existente.
+            on_duplicate: Política para páginas repetidas (inclusive dentro
+                          do próprio lote); ver add_page.
+
+        Returns:
+            Lista de doc_ids das páginas criadas, na mesma ordem (com
+            "skip", a página repetida recebe o ID da página existente).
+        """
+        now = datetime.now().isoformat()
+        doc_ids = []
+        index = self._similarity_index(extraction_id)
+
+        def updater(extractions: dict, table: dict):
+            numbers = [
+                p.get("page_number", 0)
+                for p in table.values()
+                if p.get("extraction_id") == extraction_id
+            ]
+            next_number = max(numbers, default=0) + 1
+            doc_id = self._next_doc_id(table)
+            extraction = extractions.get(extraction_id)
+            for data in pages:
+                page = {
+                    "extraction_id": extraction_id,
+                    "page_number": next_number,
+                    "original_text": data.get("original_text", ""),
+                    "translated_text": data.get("translated_text", ""),
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                if data.get("image_hash"):
+                    page["image_hash"] = data["image_hash"]
+                existing = self._check_duplicate(index, page, on_duplicate, table.get)
+                if existing is not None:
+                    doc_ids.append(existing)
+                    continue
+                table[doc_id] = page
+                doc_ids.append(doc_id)
+                # Indexada já: as páginas seguintes do lote são comparadas a ela
+                index.add(doc_id, page["minhash"])
+                if extraction is not None:
+                    apply_delta(extraction, added=page)
+                doc_id += 1
+                next_number += 1
+            if extraction is not None and pages:
+                extraction["updated_at"] = now
+
+        try:
+            self._write_tables(updater)
+        except Exception:
+            # O índice pode ter páginas que não foram gravadas
+            self._similarity.pop(extraction_id, None)
+            raise
+        return doc_ids
+
+    @_locked
     def get_pages(self, extraction_id: int) -> list[dict]:
         """Retorna todas as páginas de uma extração ordenadas por número."""
         Page = Query()
@@ -123,6 +455,36 @@ class DatabaseManager:
             page["id"] = page.doc_id
         return sorted(pages, key=lambda x: x.get("page_number", 0))
 
+    def iter_pages(
+        self, extraction_id: int, batch_size: int = EXPORT_BATCH_PAGES
+    ) -> Iterator[dict]:
+        """
+        Percorre as páginas de uma extração em ordem, em lotes.
+
+        Só a ordem (doc_id, número) é lida de uma vez; os documentos vêm em
+        lotes de `batch_size`, cada um lido com o lock e liberado antes do
+        próximo — quem consome (ex.: exportadores) mantém um lote na memória
+        e não bloqueia a interface durante a exportação inteira. Páginas
+        removidas no meio do caminho são puladas.
+        """
+        with self._lock, self._access(write=False):
+            Page = Query()
+            order = sorted(
+                (page.get("page_number", 0), page.doc_id)
+                for page in self.pages.search(Page.extraction_id == extraction_id)
+            )
+        for start in range(0, len(order), max(1, batch_size)):
+            doc_ids = [doc_id for _number, doc_id in order[start : start + batch_size]]
+            with self._lock, self._access(write=False):
+                docs = {doc.doc_id: doc for doc in self.pages.get(doc_ids=doc_ids)}
+            for doc_id in doc_ids:
+                doc = docs.pop(doc_id, None)
+                if doc is not None:
+                    page = dict(doc)
+                    page["id"] = doc_id
+                    yield page
+
+    @_locked
     def get_page(self, page_doc_id: int) -> Optional[dict]:
         """Retorna uma página pelo ID do documento."""
         doc = self.pages.get(doc_id=page_doc_id)
@@ -130,34 +492,115 @@ class DatabaseManager:
             doc["id"] = doc.doc_id
         return doc
 
+    @_writer
     def update_page(self, page_doc_id: int, **kwargs) -> None:
         """Atualiza campos de uma página."""
-        kwargs["updated_at"] = datetime.now().isoformat()
-        self.pages.update(kwargs, doc_ids=[page_doc_id])
+        if not any(field in kwargs for field in _PAGE_CONTENT_FIELDS):
+            kwargs["updated_at"] = datetime.now().isoformat()
+            self.pages.update(kwargs, doc_ids=[page_doc_id])
+            return
+        self.update_pages({page_doc_id: kwargs})
+
+    @_writer
+    def update_pages(self, updates: dict[int, dict]) -> None:
+        """
+        Atualiza várias páginas numa única escrita (estatísticas incluídas).
+
+        Args:
+            updates: {doc_id da página: campos a atualizar}.
+        """
+        if not updates:
+            return
+        now = datetime.now().isoformat()
+        signatures = {
+            page_doc_id: minhash(fields["original_text"] or "")
+            for page_doc_id, fields in updates.items()
+            if "original_text" in fields
+        }
+        reindex = []
 
+        def updater(extractions: dict, pages: dict):
+            for page_doc_id, fields in updates.items():
+                page = pages.get(page_doc_id)
+                if page is None:
+                    continue
+                old = dict(page)
+                page.update(fields, updated_at=now)
+                if page_doc_id in signatures:
+                    page["minhash"] = signatures[page_doc_id]
+                    reindex.append((page.get("extraction_id"), page_doc_id))
+                extraction = extractions.get(page.get("extraction_id"))
+                if extraction is not None:
+                    apply_delta(extraction, added=page, removed=old)
+                    extraction["updated_at"] = now
+
+        self._write_tables(updater)
+        for extraction_id, page_doc_id in reindex:
+            index = self._similarity.get(extraction_id)
+            if index is not None:
+                index.add(page_doc_id, signatures[page_doc_id])
+
+    @_locked
+    def get_untranslated_pages(self, extraction_id: int) -> list[dict]:
+        """Retorna as páginas sem tradução de uma extração, em ordem."""
+        return [
+            page
+            for page in self.get_pages(extraction_id)
+            if not (page.get("translated_text") or "").strip()
+        ]
+
+    @_writer
     def delete_page(self, page_doc_id: int) -> None:
-        """Remove uma página."""
-        page = self.get_page(page_doc_id)
-        if page:
-            extraction_id = page["extraction_id"]
-            self.pages.remove(doc_ids=[page_doc_id])
+        """Remove uma página (e a imagem dela, se nenhuma outra a usa)."""
+        now = datetime.now().isoformat()
+        released = set()
+        removed = []
+
+        def updater(extractions: dict, pages: dict):
+            page = pages.pop(page_doc_id, None)
+            if page is None:
+                return
+            released.add(page.get("image_hash"))
+            removed.append(page.get("extraction_id"))
             # Atualiza contagem
-            extraction = self.get_extraction(extraction_id)
-            if extraction:
-                count = max(0, extraction.get("page_count", 1) - 1)
-                self.update_extraction(extraction_id, page_count=count)
+            extraction = extractions.get(page.get("extraction_id"))
+            if extraction is not None:
+                apply_delta(extraction, removed=page)
+                extraction["updated_at"] = now
 
+        self._write_tables(updater)
+        # Índice só depois da escrita: uma falha nela não o deixa dessincronizado
+        for extraction_id in removed:
+            index = self._similarity.get(extraction_id)
+            if index is not None:
+                index.remove(page_doc_id)
+        self._release_images(released)
+
+    @_writer
     def reorder_pages(self, extraction_id: int, page_order: list[int]) -> None:
         """
         Reordena as páginas de uma extração.
         page_order: lista de doc_ids na nova ordem.
         """
-        for new_number, page_doc_id in enumerate(page_order, start=1):
-            self.pages.update(
-                {"page_number": new_number, "updated_at": datetime.now().isoformat()},
-                doc_ids=[page_doc_id],
-            )
+        now = datetime.now().isoformat()
+
+        def updater(extractions: dict, pages: dict):
+            extraction = extractions.get(extraction_id)
+            for new_number, page_doc_id in enumerate(page_order, start=1):
+                page = pages.get(page_doc_id)
+                if page is not None:
+                    old = dict(page)
+                    page["page_number"] = new_number
+                    page["updated_at"] = now
+                    if extraction is not None and old.get("page_number") != new_number:
+                        # Só a impressão digital muda (o número entra no hash)
+                        apply_delta(extraction, added=page, removed=old)
+            if extraction is not None:
+                extraction["updated_at"] = now
+
+        self._write_tables(updater)
 
+    @_locked
     def get_next_page_number(self, extraction_id: int) -> int:
         """Retorna o próximo número de página disponível."""
         pages = self.get_pages(extraction_id)
@@ -165,6 +608,286 @@ class DatabaseManager:
             return 1
         return max(p.get("page_number", 0) for p in pages) + 1
 
+    # ─── Páginas quase idênticas ───────────────────────────────────────────
+
+    def _similarity_index(self, extraction_id: int) -> MinHashIndex:
+        """Índice da extração; montado na primeira consulta a partir das páginas."""
+        index = self._similarity.get(extraction_id)
+        if index is None:
+            index = MinHashIndex()
+            Page = Query()
+            for page in self.pages.search(Page.extraction_id == extraction_id):
+                if "minhash" in page:
+                    signature = page["minhash"]
+                else:
+                    # Página gravada antes da assinatura existir
+                    signature = minhash(page.get("original_text", "") or "")
+                index.add(page.doc_id, signature)
+            self._similarity[extraction_id] = index
+        return index
+
+    @staticmethod
+    def _best_match(
+        index: MinHashIndex,
+        signature: Optional[str],
+        text: str,
+        lookup: Callable[[int], Optional[dict]],
+        exclude: Optional[int] = None,
+    ) -> Optional[tuple[int, float]]:
+        """
+        Confirma as candidatas do índice com o Jaccard exato dos textos.
+
+        Returns:
+            (ID da página mais parecida, semelhança) ou None.
+        """
+        candidates = index.candidates(signature, exclude)
+        if not candidates:
+            return None
+        items = shingles(text)
+        best = None
+        for page_id in candidates:
+            page = lookup(page_id)
+            if page is None:
+                continue
+            score = jaccard(items, shingles(page.get("original_text", "") or "") or set())
+            if score >= SIMILARITY_THRESHOLD and (best is None or score > best[1]):
+                best = (page_id, score)
+        return best
+
+    def _check_duplicate(
+        self,
+        index: MinHashIndex,
+        page: dict,
+        policy: str,
+        lookup: Callable[[int], Optional[dict]],
+    ) -> Optional[int]:
+        """
+        Calcula a assinatura da página nova e aplica a política de repetidas.
+
+        Returns:
+            ID da página existente se a nova deve ser descartada ("skip").
+        """
+        if policy not in DUPLICATE_POLICIES:
+            raise ValueError(
+                f"Política de páginas repetidas inválida: '{policy}'. "
+                f"Use: {', '.join(DUPLICATE_POLICIES)}."
+            )
+        page["minhash"] = minhash(page["original_text"] or "")
+        if policy == "keep":
+            return None
+        match = self._best_match(index, page["minhash"], page["original_text"] or "", lookup)
+        if match is None:
+            return None
+        if policy == "skip":
+            return match[0]
+        page["duplicate_of"] = match[0]
+        return None
+
+    def _lookup_page(self, page_doc_id: int) -> Optional[dict]:
+        return self.pages.get(doc_id=page_doc_id)
+
+    @_locked
+    def find_near_duplicate(
+        self, extraction_id: int, text: str, exclude: Optional[int] = None
+    ) -> Optional[dict]:
+        """
+        Página da extração com texto quase idêntico a `text` (ou None).
+        A página retornada inclui "similarity" (Jaccard, 0–1).
+        """
+        match = self._best_match(
+            self._similarity_index(extraction_id), minhash(text), text, self._lookup_page, exclude
+        )
+        if match is None:
+            return None
+        page = self.get_page(match[0])
+        page["similarity"] = round(match[1], 3)
+        return page
+
+    @_locked
+    def find_duplicate_pages(self, extraction_id: int) -> list[tuple[dict, dict, float]]:
+        """Pares de páginas quase idênticas da extração: (página, página, semelhança)."""
+        cache: dict[int, set] = {}
+
+        def items(page: dict) -> set:
+            if page.doc_id not in cache:
+                cache[page.doc_id] = shingles(page.get("original_text", "") or "") or set()
+            return cache[page.doc_id]
+
+        pairs = []
+        for first_id, second_id in self._similarity_index(extraction_id).candidate_pairs():
+            first, second = self.get_page(first_id), self.get_page(second_id)
+            if first is None or second is None:
+                continue
+            score = jaccard(items(first), items(second))
+            if score >= SIMILARITY_THRESHOLD:
+                pairs.append((first, second, round(score, 3)))
+        return sorted(pairs, key=lambda p: (p[0]["page_number"], p[1]["page_number"]))
+
+    # ─── Imagens das páginas ───────────────────────────────────────────────
+
+    @_locked
+    def get_image_hashes(self) -> set[str]:
+        """Hashes das imagens referenciadas por alguma página."""
+        return {p["image_hash"] for p in self.pages.all() if p.get("image_hash")}
+
+    def _release_images(self, hashes: set) -> None:
+        """Apaga as imagens de páginas removidas que nenhuma página usa mais."""
+        hashes.discard(None)
+        if not hashes:
+            return
+        for digest in hashes - self.get_image_hashes():
+            self.images.delete(digest)
+
+    @_locked
+    def collect_image_garbage(self, grace_s: Optional[float] = None) -> dict:
+        """Remove do armazenamento as imagens sem página (ver ImageStore.collect_garbage)."""
+        referenced = self.get_image_hashes()
+        if grace_s is None:
+            return self.images.collect_garbage(referenced)
+        return self.images.collect_garbage(referenced, grace_s)
+
+    # ─── Jobs em background ────────────────────────────────────────────────
+
+    @_writer
+    def create_job(self, kind: str, extraction_id: int, **kwargs) -> int:
+        """
+        Registra um job (ex.: "translate_all") com status "running".
+        O registro persiste para que jobs interrompidos possam ser retomados.
+        """
+        now = datetime.now().isoformat()
+        return self.jobs.insert(
+            {
+                "kind": kind,
+                "extraction_id": extraction_id,
+                "status": "running",
+                "done": 0,
+                "total": 0,
+                "error": "",
+                "created_at": now,
+                "updated_at": now,
+                **kwargs,
+            }
+        )
+
+    @_writer
+    def update_job(self, job_id: int, **kwargs) -> None:
+        """Atualiza campos de um job."""
+        kwargs["updated_at"] = datetime.now().isoformat()
+        self.jobs.update(kwargs, doc_ids=[job_id])
+
+    @_locked
+    def get_jobs(
+        self,
+        kind: Optional[str] = None,
+        status: Optional[str] = None,
+        extraction_id: Optional[int] = None,
+    ) -> list[dict]:
+        """Retorna jobs filtrados por tipo, status e/ou extração."""
+        Job = Query()
+        cond = Job.kind.exists()
+        if kind is not None:
+            cond &= Job.kind == kind
+        if status is not None:
+            cond &= Job.status == status
+        if extraction_id is not None:
+            cond &= Job.extraction_id == extraction_id
+        jobs = self.jobs.search(cond)
+        for job in jobs:
+            job["id"] = job.doc_id
+        return sorted(jobs, key=lambda x: x.get("created_at", ""))
+
+    # ─── Manutenção ────────────────────────────────────────────────────────
+
+    @_locked
+    def read_data(self) -> dict:
+        """Conteúdo completo do banco ({tabela: {doc_id: documento}}), para snapshots."""
+        return self.db.storage.read() or {}
+
+    @_writer
+    def replace_data(self, data: dict) -> None:
+        """Substitui todo o conteúdo do banco (restauração de snapshot)."""
+        self.db.storage.write(data)
+        self._clear_table_caches()
+        self._similarity.clear()
+
+    @_writer
+    def compact(self, job_retention_s: float = DB_JOB_RETENTION_S) -> dict:
+        """
+        Remove o que sobrou sem uso no banco: páginas e jobs de extrações
+        que não existem mais, jobs terminados há mais de job_retention_s e
+        tabelas vazias. Só grava se algo foi removido; com DB_STORAGE =
+        "log", o log é dobrado num checkpoint novo (o arquivo encolhe).
+
+        Returns:
+            Dict com as páginas, jobs e tabelas removidos e o tamanho do
+            arquivo antes e depois.
+        """
+        bytes_before = self._file_size()
+        data = self.db.storage.read() or {}
+        extraction_ids = set(data.get(self.extractions.name, {}))
+        cutoff = datetime.fromtimestamp(time.time() - job_retention_s).isoformat()
+        released = set()
+
+        pages = data.get(self.pages.name, {})
+        orphans = [
+            doc_id for doc_id, page in pages.items()
+            if str(page.get("extraction_id")) not in extraction_ids
+        ]
+        for doc_id in orphans:
+            released.add(pages.pop(doc_id).get("image_hash"))
+
+        jobs = data.get(self.jobs.name, {})
+        expired = [
+            doc_id for doc_id, job in jobs.items()
+            if str(job.get("extraction_id")) not in extraction_ids
+            or (job.get("status") != "running" and job.get("updated_at", "") < cutoff)
+        ]
+        for doc_id in expired:
+            jobs.pop(doc_id)
+
+        # Tabelas vazias (ex.: "_default", criada pelo TinyDB e nunca usada)
+        empty = [
+            name for name, table in data.items()
+            if not table and name not in (self.extractions.name, self.pages.name, self.jobs.name)
+        ]
+        for name in empty:
+            data.pop(name)
+
+        if orphans or expired or empty:
+            self.db.storage.write(data)
+            self._clear_table_caches()
+            self._similarity.clear()
+            self._release_images(released)
+        # Só o log: sem checkpoint, a remoção seria mais um registro no fim dele
+        checkpoint = getattr(self.db.storage, "checkpoint", None)
+        if checkpoint is not None:
+            checkpoint()
+        return {
+            "pages": len(orphans),
+            "jobs": len(expired),
+            "tables": len(empty),
+            "bytes_before": bytes_before,
+            "bytes_after": self._file_size(),
+        }
+
+    def _file_size(self) -> int:
+        """Tamanho do banco em disco (checkpoint + logs)."""
+        size = 0
+        for path in (self.db_path, *log_paths(self.db_path)):
+            try:
+                size += os.path.getsize(path)
+            except OSError:
+                pass
+        return size
+
+    @_locked
+    def flush(self) -> None:
+        """Grava no disco as escritas pendentes do cache write-back."""
+        flush = getattr(self.db.storage, "flush", None)
+        if flush is not None:
+            flush()
+
+    @_locked
     def close(self) -> None:
         """Fecha a conexão com o banco."""
         self.db.close()
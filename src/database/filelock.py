@@ -0,0 +1,170 @@
+"""
+Lock entre processos (advisory) num arquivo ao lado do banco.
+
+fcntl.flock no Linux/macOS e msvcrt.locking no Windows. O lock é do
+processo, não da thread nem do objeto: os FileLock de um mesmo arquivo
+dividem um registro do módulo (descritor e contador), então travar de novo
+o que o processo já travou - outro FileLock no mesmo caminho, como o de
+load_state() com o banco aberto - só incrementa o contador. A coordenação
+entre threads e objetos do processo fica com os locks de quem usa, e quem
+libera pode ser outra thread que não a que travou (ex.: o flush do cache
+write-back). Se o processo morre, o sistema libera o lock.
+
+Uso:
+    lock = FileLock("banco.json.lock")
+    lock.acquire()      # RuntimeError se outro processo não soltar a tempo
+    try:
+        ...
+    finally:
+        lock.release()
+"""
+
+import os
+import threading
+import time
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from src.config import DB_LOCK_TIMEOUT_S
+
+_POLL_S = 0.01
+
+
+class _PathLock:
+    """Estado do lock de um arquivo, compartilhado pelos FileLock do processo."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.mutex = threading.Lock()
+        self.count = 0  # acquire() sem release(), somando todos os FileLock
+        self.users = 0  # FileLock abertos neste caminho
+        self.fd: Optional[int] = None
+
+
+# Caminho real → estado do lock (flock é por descrição de arquivo aberta: dois
+# descritores no mesmo processo se bloqueariam um ao outro)
+_registry: dict[str, _PathLock] = {}
+_registry_lock = threading.Lock()
+
+
+class FileLock:
+    """Lock exclusivo e reentrante (por processo) sobre um arquivo."""
+
+    def __init__(self, path: str, timeout: Optional[float] = DB_LOCK_TIMEOUT_S):
+        """
+        Args:
+            path: Arquivo do lock (criado se não existir; o conteúdo não importa).
+            timeout: Espera máxima em acquire(), em segundos (None = sem limite).
+        """
+        self.path = path
+        self.timeout = timeout
+        self._count = 0
+        self._shared: Optional[_PathLock] = None
+
+    @property
+    def held(self) -> bool:
+        """Se este objeto está com o lock (acquire() sem release())."""
+        return self._count > 0
+
+    def acquire(self) -> bool:
+        """
+        Trava o arquivo (ou só incrementa o contador, se o processo já o travou).
+
+        Returns:
+            True se este objeto acabou de tomar o lock (o que ele protege pode
+            ter mudado desde a última vez, por outro processo ou por outro
+            FileLock deste); False se já era dele.
+
+        Raises:
+            RuntimeError: Outro processo segurou o lock por mais de `timeout`.
+        """
+        shared = self._attach()
+        with shared.mutex:
+            if not shared.count:
+                self._lock(shared)
+            shared.count += 1
+            self._count += 1
+            return self._count == 1
+
+    def release(self) -> None:
+        shared = self._shared
+        if shared is None or not self._count:
+            raise RuntimeError(f"Lock {self.path} liberado sem estar travado.")
+        with shared.mutex:
+            self._count -= 1
+            shared.count -= 1
+            if not shared.count:
+                self._unlock(shared)
+
+    def close(self) -> None:
+        """Solta o que este objeto travou e, se for o último no caminho, fecha o arquivo."""
+        with _registry_lock:
+            shared = self._shared
+            if shared is None:
+                return
+            self._shared = None
+            with shared.mutex:
+                if self._count:
+                    shared.count -= self._count
+                    self._count = 0
+                    if not shared.count:
+                        self._unlock(shared)
+                shared.users -= 1
+                if shared.users:
+                    return
+                if shared.fd is not None:
+                    os.close(shared.fd)
+                    shared.fd = None
+            del _registry[shared.path]
+
+    def _attach(self) -> _PathLock:
+        if self._shared is not None:
+            return self._shared
+        key = os.path.realpath(self.path)
+        with _registry_lock:
+            if self._shared is None:
+                shared = _registry.get(key)
+                if shared is None:
+                    shared = _registry[key] = _PathLock(key)
+                shared.users += 1
+                self._shared = shared
+        return self._shared
+
+    # ─── Sistema operacional ───────────────────────────────────────────────
+
+    def _lock(self, shared: _PathLock) -> None:
+        if shared.fd is None:
+            shared.fd = os.open(shared.path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while not self._try_lock(shared.fd):
+            if deadline is not None and time.monotonic() >= deadline:
+                raise RuntimeError(
+                    f"Banco em uso por outro processo: {self.path} travado há mais "
+                    f"de {self.timeout:g} s."
+                )
+            time.sleep(_POLL_S)
+
+    @staticmethod
+    def _try_lock(fd: int) -> bool:
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:  # BlockingIOError (fcntl), PermissionError (msvcrt)
+            return False
+        return True
+
+    @staticmethod
+    def _unlock(shared: _PathLock) -> None:
+        if fcntl is not None:
+            fcntl.flock(shared.fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(shared.fd, 0, os.SEEK_SET)
+            msvcrt.locking(shared.fd, msvcrt.LK_UNLCK, 1)
@@ -0,0 +1,247 @@
+"""
+Armazenamento das imagens originais das páginas, endereçado por conteúdo.
+
+Cada imagem é gravada uma única vez, com o nome igual ao hash SHA-256 dos
+seus pixels: a mesma captura colada duas vezes (ou vinda em outro formato)
+ocupa espaço uma vez só. O original é gravado sem perdas (WebP lossless ou
+PNG otimizado) e uma miniatura é gerada junto, para listagens.
+
+Estrutura:
+    images/originals/ab/abcdef....webp
+    images/thumbs/ab/abcdef....webp
+
+As páginas guardam só o hash ("image_hash"); o DatabaseManager apaga a
+imagem quando a última página que a usa é removida, e collect_garbage()
+remove arquivos que nenhuma página referencia.
+"""
+
+import hashlib
+import os
+import time
+import uuid
+from typing import Iterable, Optional
+
+from PIL import Image, features
+
+from src.config import (
+    IMAGE_GC_GRACE_S,
+    IMAGE_STORE_FORMAT,
+    IMAGE_THUMB_QUALITY,
+    IMAGE_THUMB_SIZE,
+    IMAGE_WEBP_METHOD,
+    IMAGES_DIR,
+)
+from src.utils import tracing
+
+_EXTENSIONS = (".webp", ".png")
+
+
+def _normalize(image: Image.Image) -> Image.Image:
+    """Converte para RGB/RGBA (modos que os dois formatos gravam sem perdas)."""
+    if image.mode in ("RGB", "RGBA"):
+        return image
+    has_alpha = image.mode in ("LA", "PA") or "transparency" in image.info
+    return image.convert("RGBA" if has_alpha else "RGB")
+
+
+def hash_image(image: Image.Image) -> str:
+    """Hash SHA-256 dos pixels (independe do formato do arquivo de origem)."""
+    image = _normalize(image)
+    digest = hashlib.sha256(f"{image.mode}:{image.width}x{image.height}:".encode())
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+class ImageStore:
+    """Imagens originais e miniaturas num diretório, endereçadas por hash."""
+
+    def __init__(self, root: str = IMAGES_DIR, image_format: str = IMAGE_STORE_FORMAT):
+        if image_format not in ("webp", "png"):
+            raise ValueError(f"Formato de imagem inválido: '{image_format}'. Use webp ou png.")
+        if image_format == "webp" and not features.check("webp"):
+            image_format = "png"  # Pillow sem suporte a WebP
+        self.root = root
+        self.format = image_format
+
+    # ─── Caminhos ──────────────────────────────────────────────────────────
+
+    def _path(self, kind: str, digest: str, ext: str) -> str:
+        return os.path.join(self.root, kind, digest[:2], digest + ext)
+
+    def _find(self, kind: str, digest: str) -> Optional[str]:
+        # O formato configurado pode ter mudado desde a gravação
+        for ext in _EXTENSIONS:
+            path = self._path(kind, digest, ext)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def original_path(self, digest: str) -> Optional[str]:
+        return self._find("originals", digest)
+
+    def thumbnail_path(self, digest: str) -> Optional[str]:
+        return self._find("thumbs", digest)
+
+    def has(self, digest: str) -> bool:
+        return self.original_path(digest) is not None
+
+    # ─── Gravação e leitura ────────────────────────────────────────────────
+
+    @staticmethod
+    def _save_atomic(image: Image.Image, path: str, **params) -> int:
+        """Grava num temporário e renomeia (leitores nunca veem arquivo parcial)."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            image.save(tmp, **params)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        return os.path.getsize(path)
+
+    def _params(self, lossless: bool) -> dict:
+        if self.format == "webp":
+            if lossless:
+                return {"format": "WEBP", "lossless": True, "method": IMAGE_WEBP_METHOD}
+            return {"format": "WEBP", "quality": IMAGE_THUMB_QUALITY}
+        return {"format": "PNG", "optimize": True}
+
+    def put(self, image: Image.Image) -> str:
+        """
+        Guarda a imagem (se ainda não existir) e gera a miniatura.
+
+        Returns:
+            Hash da imagem, para gravar na página ("image_hash").
+        """
+        image = _normalize(image)
+        digest = hash_image(image)
+        ext = "." + self.format
+
+        with tracing.span("images.put", pixels=image.width * image.height) as sp:
+            existing = self.original_path(digest)
+            if existing:
+                # Renova o mtime: a coleta de lixo poupa imagens recém-usadas
+                os.utime(existing)
+                sp.set(deduplicated=1)
+            else:
+                size = self._save_atomic(
+                    image, self._path("originals", digest, ext), **self._params(lossless=True)
+                )
+                sp.set(deduplicated=0, bytes=size)
+
+            if self.thumbnail_path(digest) is None:
+                thumb = image.copy()
+                thumb.thumbnail(IMAGE_THUMB_SIZE)
+                self._save_atomic(
+                    thumb, self._path("thumbs", digest, ext), **self._params(lossless=False)
+                )
+        return digest
+
+    def put_file(self, path: str) -> str:
+        """Guarda a imagem de um arquivo. Retorna o hash."""
+        with Image.open(path) as image:
+            image.load()
+            return self.put(image)
+
+    def open(self, digest: str) -> Image.Image:
+        """Abre a imagem original (levanta FileNotFoundError se não existir)."""
+        path = self.original_path(digest)
+        if path is None:
+            raise FileNotFoundError(f"Imagem não encontrada no armazenamento: {digest}")
+        return Image.open(path)
+
+    def open_thumbnail(self, digest: str) -> Image.Image:
+        """Abre a miniatura; se faltar, gera a partir do original."""
+        path = self.thumbnail_path(digest)
+        if path is None:
+            with self.open(digest) as image:
+                self.put(image)
+            path = self.thumbnail_path(digest)
+        return Image.open(path)
+
+    # ─── Remoção e coleta de lixo ──────────────────────────────────────────
+
+    def delete(self, digest: str) -> int:
+        """Remove original e miniatura. Retorna os bytes liberados."""
+        freed = 0
+        for kind in ("originals", "thumbs"):
+            for ext in _EXTENSIONS:
+                path = self._path(kind, digest, ext)
+                try:
+                    freed += os.path.getsize(path)
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+        return freed
+
+    def _entries(self, kind: str):
+        """(hash, caminho) de todos os arquivos de um tipo."""
+        base = os.path.join(self.root, kind)
+        if not os.path.isdir(base):
+            return
+        for prefix in os.listdir(base):
+            folder = os.path.join(base, prefix)
+            if not os.path.isdir(folder):
+                continue
+            for name in os.listdir(folder):
+                digest, ext = os.path.splitext(name)
+                if ext in _EXTENSIONS:
+                    yield digest, os.path.join(folder, name)
+
+    def hashes(self) -> set[str]:
+        """Hashes de todas as imagens guardadas."""
+        return {digest for digest, _path in self._entries("originals")}
+
+    def collect_garbage(
+        self, referenced: Iterable[str], grace_s: float = IMAGE_GC_GRACE_S
+    ) -> dict:
+        """
+        Remove imagens (e miniaturas) que nenhuma página referencia.
+
+        Args:
+            referenced: Hashes ainda usados por páginas.
+            grace_s: Poupa arquivos gravados/usados há menos tempo que isso
+                     (ex.: captura feita mas página ainda não salva).
+
+        Returns:
+            Dict com as imagens removidas e os bytes liberados.
+        """
+        referenced = set(referenced)
+        cutoff = time.time() - grace_s
+        removed = freed = 0
+        for kind in ("originals", "thumbs"):
+            for digest, path in list(self._entries(kind)):
+                if digest in referenced:
+                    continue
+                try:
+                    # Miniatura sem original é sempre lixo
+                    if kind == "originals" and os.path.getmtime(path) > cutoff:
+                        continue
+                    if kind == "thumbs" and self.has(digest):
+                        continue
+                    freed += os.path.getsize(path)
+                    os.remove(path)
+                except FileNotFoundError:
+                    continue
+                if kind == "originals":
+                    removed += 1
+        return {"removed": removed, "freed_bytes": freed}
+
+    def usage(self) -> dict:
+        """Quantidade de imagens e bytes ocupados (originais e miniaturas)."""
+        totals = {}
+        for kind in ("originals", "thumbs"):
+            count = size = 0
+            for _digest, path in self._entries(kind):
+                try:
+                    size += os.path.getsize(path)
+                    count += 1
+                except FileNotFoundError:
+                    pass
+            totals[kind] = (count, size)
+        return {
+            "images": totals["originals"][0],
+            "bytes": totals["originals"][1],
+            "thumbnail_bytes": totals["thumbs"][1],
+        }
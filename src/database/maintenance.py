@@ -0,0 +1,571 @@
+"""
+Manutenção do banco: snapshots incrementais, verificação e restauração.
+
+O banco é um único JSON: se ele corromper, tudo se perde. Os snapshots
+ficam em BACKUPS_DIR, com cada tabela dividida em segmentos de
+SNAPSHOT_SEGMENT_DOCS documentos (por faixa de doc_id) e cada segmento
+gravado uma única vez, com o nome igual ao hash do conteúdo. Editar uma
+página muda só o segmento dela: o snapshot seguinte grava esse segmento e
+um manifesto pequeno, não o banco inteiro.
+
+Estrutura:
+    backups/segments/ab/abcdef....json.gz
+    backups/snapshots/20261019-101500-123.json   (manifesto)
+
+O MaintenanceScheduler roda compactação e snapshot numa thread em
+background (a cada SNAPSHOT_INTERVAL_S e ao fechar o app); a thread só
+segura o lock do banco para ler o conteúdo.
+
+Uso como comando: aldemarvin-cli snapshot | verify | restore | compact
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from src.config import (
+    BACKUPS_DIR,
+    DB_PATH,
+    SNAPSHOT_CLOSE_MIN_AGE_S,
+    SNAPSHOT_CLOSE_TIMEOUT_S,
+    SNAPSHOT_INTERVAL_S,
+    SNAPSHOT_KEEP,
+    SNAPSHOT_ON_CLOSE,
+    SNAPSHOT_SEGMENT_DOCS,
+)
+from src.database.stats import FINGERPRINT_FIELD, STAT_FIELDS, compute_stats
+from src.database.storage import load_state, log_paths, write_checkpoint
+from src.utils import tracing
+
+logger = logging.getLogger(__name__)
+
+# Segmentos gravados há menos tempo não são apagados pela limpeza (um
+# snapshot pode estar em andamento em outro processo)
+_SEGMENT_GRACE_S = 3600
+# Espera extra de stop() depois de pedir à manutenção que interrompa o snapshot
+_CANCEL_WAIT_S = 1.0
+
+
+def backups_dir_for(db_path: str) -> str:
+    """Pasta dos snapshots: BACKUPS_DIR para o banco padrão; "backups" ao lado de outro banco."""
+    if os.path.abspath(db_path) == os.path.abspath(DB_PATH):
+        return BACKUPS_DIR
+    return os.path.join(os.path.dirname(os.path.abspath(db_path)), "backups")
+
+
+def _canonical(value) -> bytes:
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode()
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+# ─── Arquivo do banco ──────────────────────────────────────────────────────
+
+
+def read_database(db_path: str = DB_PATH) -> dict:
+    """
+    Lê o banco direto do disco (checkpoint + log de alterações), sem abrir
+    o DatabaseManager.
+
+    Raises:
+        FileNotFoundError: Se o arquivo não existe.
+        ValueError: Se o JSON ou o log está corrompido.
+    """
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"Banco não encontrado: {db_path}")
+    return load_state(db_path)
+
+
+def write_database(db_path: str, data: dict) -> None:
+    """Grava o banco de forma atômica, no mesmo formato do DatabaseManager (sem log)."""
+    write_checkpoint(db_path, data)
+
+
+def verify_data(data: dict) -> list[str]:
+    """
+    Confere a consistência do conteúdo do banco.
+
+    Returns:
+        Lista de problemas encontrados (vazia se está tudo certo).
+    """
+    problems = []
+    tables = {}
+    for name, table in data.items():
+        if not isinstance(table, dict):
+            problems.append(f"Tabela '{name}' não é um objeto.")
+            continue
+        bad = [doc_id for doc_id, doc in table.items() if not doc_id.isdigit() or not isinstance(doc, dict)]
+        if bad:
+            problems.append(f"Tabela '{name}': {len(bad)} documento(s) inválido(s) (ex.: {bad[0]}).")
+        tables[name] = {doc_id: doc for doc_id, doc in table.items() if isinstance(doc, dict)}
+
+    extractions = tables.get("extractions", {})
+    by_extraction: dict[str, list] = {}
+    for doc_id, page in tables.get("pages", {}).items():
+        extraction_id = str(page.get("extraction_id"))
+        if extraction_id not in extractions:
+            problems.append(f"Página {doc_id} aponta para a extração inexistente {extraction_id}.")
+            continue
+        by_extraction.setdefault(extraction_id, []).append(page)
+
+    for doc_id, extraction in extractions.items():
+        stats = compute_stats(by_extraction.get(doc_id, []))
+        wrong = [
+            field for field in (*STAT_FIELDS, FINGERPRINT_FIELD)
+            if extraction.get(field) != stats[field]
+        ]
+        if wrong:
+            problems.append(
+                f"Extração {doc_id}: estatísticas divergentes das páginas ({', '.join(wrong)})."
+            )
+
+    for doc_id, job in tables.get("jobs", {}).items():
+        if str(job.get("extraction_id")) not in extractions:
+            problems.append(f"Job {doc_id} aponta para a extração inexistente {job.get('extraction_id')}.")
+    return problems
+
+
+# ─── Snapshots ─────────────────────────────────────────────────────────────
+
+
+class SnapshotCancelled(Exception):
+    """Snapshot interrompido a pedido (ex.: o app está fechando)."""
+
+
+class SnapshotStore:
+    """Snapshots do banco em segmentos endereçados por conteúdo."""
+
+    _lock = threading.Lock()  # Snapshot e limpeza não rodam ao mesmo tempo
+
+    def __init__(self, root: str = BACKUPS_DIR, segment_docs: int = SNAPSHOT_SEGMENT_DOCS):
+        if segment_docs < 1:
+            raise ValueError("segment_docs deve ser pelo menos 1.")
+        self.root = root
+        self.segment_docs = segment_docs
+
+    # ─── Caminhos ──────────────────────────────────────────────────────────
+
+    def _segment_path(self, digest: str) -> str:
+        return os.path.join(self.root, "segments", digest[:2], f"{digest}.json.gz")
+
+    def _manifest_path(self, snapshot_id: str) -> str:
+        if not snapshot_id or os.sep in snapshot_id or "/" in snapshot_id:
+            raise ValueError(f"Snapshot inválido: '{snapshot_id}'.")
+        return os.path.join(self.root, "snapshots", f"{snapshot_id}.json")
+
+    # ─── Criação ───────────────────────────────────────────────────────────
+
+    def _segments(self, table: dict) -> list[dict]:
+        """Divide a tabela em faixas fixas de doc_id (editar um documento muda uma faixa)."""
+        ranges: dict[int, dict] = {}
+        for doc_id, doc in table.items():
+            ranges.setdefault((int(doc_id) - 1) // self.segment_docs, {})[doc_id] = doc
+        return [ranges[key] for key in sorted(ranges)]
+
+    def create(
+        self,
+        data: dict,
+        reason: str = "manual",
+        source: Optional[dict] = None,
+        cancel: Optional[threading.Event] = None,
+    ) -> dict:
+        """
+        Grava um snapshot do conteúdo do banco.
+
+        Se nenhum segmento mudou desde o último snapshot, nada é gravado e o
+        último é devolvido (com "unchanged": True).
+
+        Args:
+            data: Conteúdo do banco ({tabela: {doc_id: documento}}).
+            reason: Motivo registrado no manifesto ("manual", "schedule",
+                    "close", "pre-restore").
+            source: Informações do arquivo de origem (ex.: tamanho e mtime).
+            cancel: Se marcado, interrompe entre um segmento e outro (os
+                    segmentos já gravados ficam para o próximo snapshot).
+
+        Returns:
+            Manifesto do snapshot, com "new_segments" e "new_bytes" (o que
+            este snapshot gravou de fato).
+
+        Raises:
+            SnapshotCancelled: `cancel` foi marcado antes do manifesto.
+        """
+        with self._lock, tracing.span("db.snapshot", reason=reason) as sp:
+            tables = {}
+            new_segments = new_bytes = 0
+            for name in sorted(data):
+                digests = []
+                for segment in self._segments(data[name]):
+                    if cancel is not None and cancel.is_set():
+                        raise SnapshotCancelled()
+                    payload = _canonical(segment)
+                    digest = hashlib.sha256(payload).hexdigest()
+                    path = self._segment_path(digest)
+                    if not os.path.exists(path):
+                        compressed = gzip.compress(payload, compresslevel=6, mtime=0)
+                        _write_atomic(path, compressed)
+                        new_segments += 1
+                        new_bytes += len(compressed)
+                    digests.append(digest)
+                tables[name] = {"docs": len(data[name]), "segments": digests}
+
+            latest = self.latest()
+            if latest is not None and latest.get("tables") == tables:
+                sp.set(unchanged=1)
+                return {**latest, "unchanged": True, "new_segments": 0, "new_bytes": 0}
+
+            now = datetime.now()
+            snapshot_id = now.strftime("%Y%m%d-%H%M%S-") + f"{now.microsecond // 1000:03d}"
+            while os.path.exists(self._manifest_path(snapshot_id)):
+                snapshot_id += "x"
+            manifest = {
+                "id": snapshot_id,
+                "created_at": now.isoformat(),
+                "reason": reason,
+                "source": source or {},
+                "tables": tables,
+                "new_segments": new_segments,
+                "new_bytes": new_bytes,
+            }
+            _write_atomic(
+                self._manifest_path(snapshot_id),
+                json.dumps(manifest, ensure_ascii=False, indent=1).encode("utf-8"),
+            )
+            sp.set(new_segments=new_segments, new_bytes=new_bytes)
+        return manifest
+
+    # ─── Consulta ──────────────────────────────────────────────────────────
+
+    def snapshots(self) -> list[dict]:
+        """Manifestos dos snapshots, do mais antigo ao mais recente."""
+        folder = os.path.join(self.root, "snapshots")
+        try:
+            names = sorted(name for name in os.listdir(folder) if name.endswith(".json"))
+        except FileNotFoundError:
+            return []
+        manifests = []
+        for name in names:
+            try:
+                with open(os.path.join(folder, name), "r", encoding="utf-8") as f:
+                    manifests.append(json.load(f))
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning("Manifesto de snapshot ilegível (%s): %s", name, e)
+        return manifests
+
+    def latest(self) -> Optional[dict]:
+        manifests = self.snapshots()
+        return manifests[-1] if manifests else None
+
+    def get(self, snapshot_id: str) -> dict:
+        """Manifesto de um snapshot ("latest" = o mais recente)."""
+        if snapshot_id == "latest":
+            manifest = self.latest()
+            if manifest is None:
+                raise FileNotFoundError(f"Nenhum snapshot em {self.root}.")
+            return manifest
+        path = self._manifest_path(snapshot_id)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Snapshot não encontrado: {snapshot_id}")
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def load(self, snapshot_id: str) -> dict:
+        """
+        Remonta o conteúdo do banco de um snapshot, conferindo o hash de
+        cada segmento.
+
+        Raises:
+            FileNotFoundError: Snapshot ou segmento ausente.
+            ValueError: Segmento corrompido ou com documentos faltando.
+        """
+        manifest = self.get(snapshot_id)
+        data = {}
+        for name, table in manifest["tables"].items():
+            docs = {}
+            for digest in table["segments"]:
+                path = self._segment_path(digest)
+                try:
+                    with open(path, "rb") as f:
+                        payload = gzip.decompress(f.read())
+                except FileNotFoundError:
+                    raise FileNotFoundError(f"Segmento ausente no snapshot {manifest['id']}: {digest}")
+                except (OSError, EOFError) as e:
+                    raise ValueError(f"Segmento corrompido ({digest}): {e}") from e
+                if hashlib.sha256(payload).hexdigest() != digest:
+                    raise ValueError(f"Segmento corrompido (hash não confere): {digest}")
+                docs.update(json.loads(payload))
+            if len(docs) != table["docs"]:
+                raise ValueError(
+                    f"Tabela '{name}' do snapshot {manifest['id']}: "
+                    f"{len(docs)} documento(s), esperado(s) {table['docs']}."
+                )
+            data[name] = docs
+        return data
+
+    def verify(self, snapshot_id: str) -> list[str]:
+        """Problemas do snapshot: segmentos ausentes/corrompidos ou conteúdo inconsistente."""
+        try:
+            data = self.load(snapshot_id)
+        except (OSError, ValueError) as e:
+            return [str(e)]
+        return verify_data(data)
+
+    # ─── Limpeza ───────────────────────────────────────────────────────────
+
+    def prune(self, keep: int = SNAPSHOT_KEEP) -> dict:
+        """
+        Mantém os `keep` snapshots mais recentes e apaga os segmentos que
+        nenhum deles usa.
+
+        Returns:
+            Dict com os snapshots e segmentos removidos e os bytes liberados.
+        """
+        with self._lock:
+            manifests = self.snapshots()
+            removed = manifests[:-keep] if keep > 0 else []
+            for manifest in removed:
+                try:
+                    os.remove(self._manifest_path(manifest["id"]))
+                except FileNotFoundError:
+                    pass
+
+            referenced = {
+                digest
+                for manifest in manifests[len(removed):]
+                for table in manifest["tables"].values()
+                for digest in table["segments"]
+            }
+            segments = freed = 0
+            now = time.time()
+            for folder, _dirs, files in os.walk(os.path.join(self.root, "segments")):
+                for name in files:
+                    path = os.path.join(folder, name)
+                    digest = name.split(".", 1)[0]
+                    try:
+                        stat = os.stat(path)
+                        if digest in referenced or now - stat.st_mtime < _SEGMENT_GRACE_S:
+                            continue
+                        os.remove(path)
+                    except FileNotFoundError:
+                        continue
+                    segments += 1
+                    freed += stat.st_size
+        return {"snapshots": len(removed), "segments": segments, "freed_bytes": freed}
+
+    def usage(self) -> dict:
+        """Quantidade de snapshots e segmentos e bytes ocupados."""
+        segments = size = 0
+        for folder, _dirs, files in os.walk(os.path.join(self.root, "segments")):
+            for name in files:
+                try:
+                    size += os.path.getsize(os.path.join(folder, name))
+                except FileNotFoundError:
+                    continue
+                segments += 1
+        return {"snapshots": len(self.snapshots()), "segments": segments, "bytes": size}
+
+
+# ─── Operações ─────────────────────────────────────────────────────────────
+
+
+def _source_info(db_path: str) -> dict:
+    """Tamanho e mtime do banco e dos logs (mudam a cada escrita)."""
+    info = {"path": os.path.abspath(db_path)}
+    for key, path in zip(("db", "log", "old_log"), (db_path, *log_paths(db_path))):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        info[key] = [stat.st_size, stat.st_mtime_ns]
+    return info
+
+
+def take_snapshot(
+    db,
+    store: Optional[SnapshotStore] = None,
+    reason: str = "manual",
+    cancel: Optional[threading.Event] = None,
+) -> dict:
+    """
+    Snapshot do banco aberto. O lock do banco fica preso só durante a
+    leitura; segmentação e compressão rodam fora dele.
+
+    Raises:
+        SnapshotCancelled: `cancel` foi marcado (ver SnapshotStore.create).
+    """
+    store = store or SnapshotStore(backups_dir_for(db.db_path))
+    source = _source_info(db.db_path)
+    return store.create(db.read_data(), reason=reason, source=source, cancel=cancel)
+
+
+def restore_snapshot(
+    snapshot_id: str,
+    db=None,
+    db_path: str = DB_PATH,
+    store: Optional[SnapshotStore] = None,
+) -> dict:
+    """
+    Restaura o banco a partir de um snapshot.
+
+    O conteúdo atual vira antes um snapshot "pre-restore" (a restauração
+    pode ser desfeita); se ele estiver corrompido, o arquivo é preservado
+    ao lado do banco com o sufixo ".corrupt-<data>".
+
+    Args:
+        snapshot_id: ID do snapshot ou "latest".
+        db: DatabaseManager aberto (None = grava direto no arquivo, com o
+            lock do banco, para quando ele não abre; processos com o banco
+            aberto recarregam o conteúdo restaurado).
+        db_path: Arquivo do banco (usado quando db é None).
+
+    Raises:
+        ValueError: Se o snapshot está corrompido ou inconsistente.
+    """
+    if db is not None:
+        db_path = db.db_path
+    store = store or SnapshotStore(backups_dir_for(db_path))
+    manifest = store.get(snapshot_id)
+    data = store.load(manifest["id"])
+    problems = verify_data(data)
+    if problems:
+        raise ValueError(f"Snapshot {manifest['id']} inconsistente: {problems[0]}")
+
+    previous = None
+    try:
+        current = db.read_data() if db is not None else read_database(db_path)
+        previous = store.create(current, reason="pre-restore", source=_source_info(db_path))["id"]
+    except FileNotFoundError:
+        pass
+    except ValueError:
+        suffix = f".corrupt-{datetime.now():%Y%m%d-%H%M%S}"
+        for path in (db_path, *log_paths(db_path)):
+            if os.path.exists(path):
+                shutil.copy2(path, path + suffix)
+        logger.warning("Banco corrompido preservado em %s%s", db_path, suffix)
+
+    if db is not None:
+        db.replace_data(data)
+    else:
+        write_database(db_path, data)
+    return {
+        "snapshot": manifest["id"],
+        "previous": previous,
+        "documents": sum(len(table) for table in data.values()),
+    }
+
+
+# ─── Manutenção em background ──────────────────────────────────────────────
+
+
+class MaintenanceScheduler:
+    """Compactação + snapshot + limpeza dos snapshots numa thread em background."""
+
+    def __init__(
+        self,
+        db,
+        store: Optional[SnapshotStore] = None,
+        interval_s: float = SNAPSHOT_INTERVAL_S,
+        on_close: bool = SNAPSHOT_ON_CLOSE,
+        keep: int = SNAPSHOT_KEEP,
+    ):
+        self.db = db
+        self.store = store or SnapshotStore(backups_dir_for(db.db_path))
+        self.interval_s = interval_s
+        self.on_close = on_close
+        self.keep = keep
+        self._stop = threading.Event()
+        self._cancel = threading.Event()  # Interrompe o snapshot em andamento
+        self._thread: Optional[threading.Thread] = None
+        self._last_source: Optional[dict] = None
+        self._last_run_at: Optional[float] = None  # time.monotonic()
+        self._close_run = False
+
+    def start(self) -> "MaintenanceScheduler":
+        self._thread = threading.Thread(target=self._loop, name="db-maintenance", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = SNAPSHOT_CLOSE_TIMEOUT_S) -> bool:
+        """
+        Para a thread. O snapshot de fechamento (se configurado) roda nela,
+        depois da manutenção em andamento, e é pulado se houve uma há menos
+        de SNAPSHOT_CLOSE_MIN_AGE_S. Quem fecha (a thread do Tk) espera
+        `timeout` segundos; depois disso o snapshot em andamento é
+        interrompido.
+
+        Returns:
+            True se a thread terminou; False se ela continua usando o banco
+            (quem chamou não deve fechá-lo).
+        """
+        self._close_run = self.on_close and not self._ran_recently()
+        self._stop.set()
+        if self._thread is None and self._close_run:
+            self.start()  # Nunca iniciado: a thread só faz o fechamento
+        if self._thread is None:
+            return True
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning(
+                "Manutenção de fechamento ainda em andamento após %g s; interrompendo.", timeout
+            )
+            self._cancel.set()
+            self._thread.join(_CANCEL_WAIT_S)
+            if self._thread.is_alive():
+                return False
+        self._thread = None
+        return True
+
+    def _ran_recently(self) -> bool:
+        return (
+            self._last_run_at is not None
+            and time.monotonic() - self._last_run_at < SNAPSHOT_CLOSE_MIN_AGE_S
+        )
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            self.run_once(reason="schedule")
+        if self._close_run:
+            self.run_once(reason="close")
+
+    def run_once(self, reason: str = "schedule") -> Optional[dict]:
+        """
+        Compacta, tira o snapshot (se o arquivo mudou desde o último) e
+        apaga os snapshots além de `keep`. Erros são registrados no log,
+        sem derrubar o app.
+        """
+        try:
+            self.db.flush()  # Escritas pendentes no cache contam como mudança
+            source = _source_info(self.db.db_path)
+            if source == self._last_source:
+                self._last_run_at = time.monotonic()
+                return None
+            self.db.compact()
+            manifest = take_snapshot(self.db, self.store, reason, cancel=self._cancel)
+            self._last_source = _source_info(self.db.db_path)
+            self.store.prune(self.keep)
+            self._last_run_at = time.monotonic()
+            return manifest
+        except SnapshotCancelled:
+            logger.info("Snapshot do banco interrompido (%s)", reason)
+            return None
+        except Exception:
+            logger.exception("Falha na manutenção do banco")
+            return None
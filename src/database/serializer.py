@@ -0,0 +1,124 @@
+"""
+Serialização JSON do banco (checkpoint e log de alterações).
+
+O json da biblioteca padrão é o gargalo de abrir e gravar o checkpoint de
+um banco grande. Com orjson ou msgspec instalados (opcionais), o mesmo JSON
+sai várias vezes mais rápido; sem eles, cai no json. Em modo compacto o
+arquivo sai sem indentação (bem menor que o indent=4 do JSONStorage).
+
+Qualquer backend lê o que os outros gravaram, inclusive bancos antigos
+indentados: trocar DB_JSON_BACKEND ou DB_JSON_COMPACT vale a partir do
+próximo checkpoint.
+
+Uso:
+    serializer = get_serializer()
+    data = serializer.loads(raw)
+    raw = serializer.dumps(data)      # bytes UTF-8
+"""
+
+import json
+from typing import Any, Callable
+
+from src.config import DB_JSON_BACKEND, DB_JSON_COMPACT
+
+BACKENDS = ("orjson", "msgspec", "json")
+
+
+class Serializer:
+    """
+    Par dumps/loads de um backend: dumps devolve bytes UTF-8, loads aceita
+    bytes ou str e levanta ValueError em JSON inválido.
+    """
+
+    def __init__(self, name: str, compact: bool, dumps: Callable[[Any], bytes], loads: Callable):
+        self.name = name
+        self.compact = compact
+        self.dumps = dumps
+        self.loads = loads
+
+    def __repr__(self) -> str:
+        return f"Serializer({self.name}, compact={self.compact})"
+
+
+def _orjson(compact: bool) -> Serializer:
+    import orjson
+
+    # orjson só indenta com 2 espaços
+    option = 0 if compact else orjson.OPT_INDENT_2
+    return Serializer("orjson", compact, lambda obj: orjson.dumps(obj, option=option), orjson.loads)
+
+
+def _msgspec(compact: bool) -> Serializer:
+    import msgspec
+
+    encoder = msgspec.json.Encoder()
+    decoder = msgspec.json.Decoder()
+    if compact:
+        dumps = encoder.encode
+    else:
+        def dumps(obj: Any) -> bytes:
+            return msgspec.json.format(encoder.encode(obj), indent=4)
+
+    def loads(raw) -> Any:
+        # DecodeError do msgspec não é ValueError (o que o storage trata)
+        try:
+            return decoder.decode(raw)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    return Serializer("msgspec", compact, dumps, loads)
+
+
+def _stdlib(compact: bool) -> Serializer:
+    options = {"separators": (",", ":")} if compact else {"indent": 4}
+
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, **options).encode("utf-8")
+
+    return Serializer("json", compact, dumps, json.loads)
+
+
+_FACTORIES = {"orjson": _orjson, "msgspec": _msgspec, "json": _stdlib}
+
+
+def get_serializer(backend: str = DB_JSON_BACKEND, compact: bool = DB_JSON_COMPACT) -> Serializer:
+    """
+    Serializador do banco.
+
+    Args:
+        backend: "auto" (o primeiro instalado entre orjson, msgspec e json),
+                 ou um deles explicitamente.
+        compact: Sem indentação (False = legível, como o JSONStorage).
+
+    Raises:
+        ValueError: Backend desconhecido.
+        RuntimeError: Backend pedido explicitamente e não instalado.
+    """
+    if backend == "auto":
+        for name in BACKENDS:
+            try:
+                return _FACTORIES[name](compact)
+            except ImportError:
+                continue
+    if backend not in _FACTORIES:
+        raise ValueError(
+            f"Serializador inválido: '{backend}'. Use auto, {', '.join(BACKENDS)}."
+        )
+    try:
+        return _FACTORIES[backend](compact)
+    except ImportError:
+        raise RuntimeError(
+            f"Serializador '{backend}' indisponível: instale-o (pip install {backend})."
+        )
+
+
+def available() -> list[str]:
+    """Backends instalados neste ambiente."""
+    names = []
+    for name in BACKENDS:
+        try:
+            _FACTORIES[name](True)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
@@ -0,0 +1,131 @@
+"""
+Detecção de páginas quase idênticas (a mesma tela capturada duas vezes).
+
+O texto de cada página vira um conjunto de "shingles" (sequências de 3
+palavras). A semelhança entre duas páginas é o índice de Jaccard desses
+conjuntos, mas compará-las par a par seria O(n) a cada página nova. Por isso
+cada página recebe uma assinatura MinHash, dividida em MINHASH_BANDS faixas
+(campo "minhash" da página): páginas parecidas quase sempre coincidem em
+alguma faixa inteira (LSH). A busca olha só as páginas que compartilham uma
+faixa e confirma com o Jaccard exato dos textos.
+"""
+
+import hashlib
+import re
+import struct
+from typing import Iterable, Optional
+
+from src.config import (
+    MINHASH_BANDS,
+    MINHASH_PERMUTATIONS,
+    SIMILARITY_MIN_WORDS,
+)
+
+_WORD_RE = re.compile(r"\w+")
+# Palavras por shingle (sequências curtas preservam a ordem do texto)
+_SHINGLE = 3
+# Uma chamada SHAKE-128 por shingle dá as MINHASH_PERMUTATIONS funções de
+# hash (32 bits cada); o mínimo por coluna fica com zip/min, em C
+_UNPACK = struct.Struct(f"<{MINHASH_PERMUTATIONS}I").unpack
+_DIGEST_SIZE = MINHASH_PERMUTATIONS * 4
+_ROWS = MINHASH_PERMUTATIONS // MINHASH_BANDS
+# Largura de cada faixa gravada, em caracteres hexadecimais
+_BAND_HEX = 8
+
+
+def shingles(text: str) -> Optional[set[str]]:
+    """
+    Shingles de 3 palavras do texto (sem caixa nem pontuação).
+
+    Returns:
+        O conjunto, ou None para textos curtos demais (menos de
+        SIMILARITY_MIN_WORDS palavras), que gerariam falsos positivos.
+    """
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < SIMILARITY_MIN_WORDS:
+        return None
+    return {" ".join(words[i : i + _SHINGLE]) for i in range(len(words) - _SHINGLE + 1)}
+
+
+def jaccard(a: set, b: set) -> float:
+    """Semelhança de Jaccard entre dois conjuntos de shingles."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def minhash(text: str) -> Optional[str]:
+    """
+    Assinatura MinHash do texto, já dividida em faixas para o índice.
+
+    Returns:
+        String hexadecimal (MINHASH_BANDS faixas de 8 caracteres), ou None
+        para textos curtos demais.
+    """
+    items = shingles(text)
+    if items is None:
+        return None
+    rows = [_UNPACK(hashlib.shake_128(s.encode()).digest(_DIGEST_SIZE)) for s in items]
+    signature = list(map(min, zip(*rows)))
+
+    bands = []
+    for start in range(0, MINHASH_PERMUTATIONS, _ROWS):
+        values = ",".join(map(str, signature[start : start + _ROWS])).encode()
+        bands.append(hashlib.blake2b(values, digest_size=_BAND_HEX // 2).hexdigest())
+    return "".join(bands)
+
+
+def _bands(signature: str) -> Iterable[tuple[int, str]]:
+    for band in range(len(signature) // _BAND_HEX):
+        yield band, signature[band * _BAND_HEX : (band + 1) * _BAND_HEX]
+
+
+class MinHashIndex:
+    """Índice LSH: page_id → assinatura, (faixa, valor) → page_ids."""
+
+    def __init__(self):
+        self._signatures: dict[int, str] = {}
+        self._buckets: dict[tuple[int, str], set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def add(self, page_id: int, signature: Optional[str]) -> None:
+        self.remove(page_id)
+        if signature is None:
+            return
+        self._signatures[page_id] = signature
+        for key in _bands(signature):
+            self._buckets.setdefault(key, set()).add(page_id)
+
+    def remove(self, page_id: int) -> None:
+        signature = self._signatures.pop(page_id, None)
+        if signature is None:
+            return
+        for key in _bands(signature):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(page_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    def candidates(self, signature: Optional[str], exclude: Optional[int] = None) -> list[int]:
+        """Páginas que coincidem em alguma faixa (mais faixas em comum primeiro)."""
+        if signature is None:
+            return []
+        shared: dict[int, int] = {}
+        for key in _bands(signature):
+            for page_id in self._buckets.get(key, ()):
+                if page_id != exclude:
+                    shared[page_id] = shared.get(page_id, 0) + 1
+        return sorted(shared, key=lambda page_id: (-shared[page_id], page_id))
+
+    def candidate_pairs(self) -> set[tuple[int, int]]:
+        """Todos os pares (menor ID, maior ID) que coincidem em alguma faixa."""
+        pairs = set()
+        for bucket in self._buckets.values():
+            ordered = sorted(bucket)
+            for i, first in enumerate(ordered):
+                for second in ordered[i + 1 :]:
+                    pairs.add((first, second))
+        return pairs
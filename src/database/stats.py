@@ -0,0 +1,133 @@
+"""
+Estatísticas desnormalizadas por extração.
+Mantidas incrementalmente a cada escrita de página, para que a listagem
+nunca precise varrer as páginas.
+
+Junto delas fica a impressão digital do conteúdo ("fingerprint"): o XOR dos
+hashes de todas as páginas (número + textos). Incluir, alterar, remover ou
+renumerar uma página muda a impressão digital sem reler as outras - é ela
+que diz se uma exportação em cache ainda vale.
+
+Uso como comando de reparo: python -m src.database.stats
+"""
+
+import hashlib
+from typing import Iterable, Mapping, Optional
+
+# Campos de estatística gravados no documento da extração
+STAT_FIELDS = (
+    "page_count",
+    "char_count",
+    "word_count",
+    "translated_count",
+    "untranslated_count",
+)
+# Impressão digital do conteúdo (hex de 16 caracteres; XOR dos page_hash)
+FINGERPRINT_FIELD = "fingerprint"
+EMPTY_FINGERPRINT = "0" * 16
+
+
+def empty_stats() -> dict:
+    """Retorna as estatísticas de uma extração sem páginas."""
+    stats = {field: 0 for field in STAT_FIELDS}
+    stats[FINGERPRINT_FIELD] = EMPTY_FINGERPRINT
+    return stats
+
+
+def page_hash(page: Optional[Mapping]) -> int:
+    """Hash de 64 bits do que a página contribui para uma exportação."""
+    if not page:
+        return 0
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(str(page.get("page_number", "")).encode())
+    for field in ("original_text", "translated_text"):
+        digest.update(b"\x00")
+        digest.update((page.get(field, "") or "").encode("utf-8", "surrogatepass"))
+    return int.from_bytes(digest.digest(), "big")
+
+
+def _xor_fingerprint(fingerprint: Optional[str], value: int) -> str:
+    current = int(fingerprint or EMPTY_FINGERPRINT, 16)
+    return f"{current ^ value:016x}"
+
+
+def page_stats(page: Optional[Mapping]) -> dict:
+    """
+    Calcula a contribuição de uma página para as estatísticas da extração.
+
+    Args:
+        page: Documento da página (ou None para contribuição nula).
+
+    Returns:
+        Dict com os mesmos campos de STAT_FIELDS.
+    """
+    if not page:
+        return {field: 0 for field in STAT_FIELDS}
+
+    original = page.get("original_text", "") or ""
+    translated = (page.get("translated_text", "") or "").strip()
+    return {
+        "page_count": 1,
+        "char_count": len(original),
+        "word_count": len(original.split()),
+        "translated_count": 1 if translated else 0,
+        "untranslated_count": 0 if translated else 1,
+    }
+
+
+def apply_delta(
+    extraction: dict,
+    added: Optional[Mapping] = None,
+    removed: Optional[Mapping] = None,
+) -> None:
+    """
+    Aplica (in place) a diferença entre uma página nova e uma antiga.
+
+    Args:
+        extraction: Documento da extração a ser atualizado.
+        added: Página incluída (ou estado novo da página).
+        removed: Página removida (ou estado antigo da página).
+    """
+    plus = page_stats(added)
+    minus = page_stats(removed)
+    for field in STAT_FIELDS:
+        value = extraction.get(field, 0) + plus[field] - minus[field]
+        extraction[field] = max(0, value)
+    extraction[FINGERPRINT_FIELD] = _xor_fingerprint(
+        extraction.get(FINGERPRINT_FIELD), page_hash(added) ^ page_hash(removed)
+    )
+
+
+def compute_stats(pages: Iterable[Mapping]) -> dict:
+    """Recalcula as estatísticas do zero a partir das páginas."""
+    stats = empty_stats()
+    fingerprint = 0
+    for page in pages:
+        for field, value in page_stats(page).items():
+            stats[field] += value
+        fingerprint ^= page_hash(page)
+    stats[FINGERPRINT_FIELD] = f"{fingerprint:016x}"
+    return stats
+
+
+def has_stats(extraction: Mapping) -> bool:
+    """Indica se o documento já possui todos os campos de estatística."""
+    return all(field in extraction for field in (*STAT_FIELDS, FINGERPRINT_FIELD))
+
+
+def main():
+    """Recalcula as estatísticas de todas as extrações do banco local."""
+    from src.database.db_manager import DatabaseManager
+
+    db = DatabaseManager()
+    try:
+        fixed = db.recompute_stats()
+        print(f"Estatísticas recalculadas. Extrações corrigidas: {len(fixed)}")
+        for extraction_id in fixed:
+            print(f"  - extração {extraction_id}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
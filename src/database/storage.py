@@ -0,0 +1,869 @@
+"""
+Storage do TinyDB com log de alterações (append-only).
+
+O JSONStorage padrão regrava o arquivo inteiro a cada escrita: com alguns
+milhares de páginas, salvar uma tradução custa centenas de ms. Aqui o
+arquivo do banco vira um checkpoint, e cada escrita acrescenta ao log
+(`<banco>.log`) só os documentos que mudaram, numa linha JSON:
+
+    {"set": {"pages": {"12": {...}}}, "del": {"jobs": ["3"]}, "drop": []}
+
+Ao abrir, o checkpoint é lido e o log reaplicado. Quando o log passa de
+DB_LOG_CHECKPOINT_BYTES (e de DB_LOG_CHECKPOINT_RATIO do checkpoint), uma
+thread grava um checkpoint novo: o log é renomeado para `<banco>.log.old`,
+as escritas seguem num log novo e, com o checkpoint gravado, o antigo é
+apagado. Os registros gravam o documento inteiro, então reaplicar um log
+que já está no checkpoint não muda nada - um crash em qualquer ponto
+deixa checkpoint + logs consistentes. Uma linha cortada no fim do log
+(crash no meio da escrita) é descartada.
+
+O checkpoint é JSON comum (compacto ou indentado, ver DB_JSON_COMPACT),
+gravado pelo serializador de database/serializer.py: o banco continua
+legível pelo JSONStorage depois de um fechamento normal (o fechamento grava
+o checkpoint).
+
+Vários processos (app, CLI, servidor de jobs) podem usar o mesmo banco com
+um escritor por vez: gravar o log, girá-lo e gravar o checkpoint só com
+`<banco>.lock` travado (FileLock), e quem trava primeiro reaplica o que os
+outros gravaram. As leituras não travam: cada processo confere as
+assinaturas (inode, tamanho, mtime) dos arquivos e reaplica o fim do log
+ou relê tudo.
+
+O WriteBackMiddleware fica na frente do storage: as escritas do TinyDB
+ficam em memória e vão para o storage juntas (uma linha de log e um fsync
+para várias escritas) quando o banco fica ocioso, por tempo, por
+quantidade, ao fechar e na saída do processo. Enquanto houver escritas
+pendentes, o processo continua com o lock.
+"""
+
+import atexit
+import copy
+import json
+import logging
+import os
+import shutil
+import signal
+import threading
+import time
+import uuid
+import weakref
+from typing import Any, Callable, Optional
+
+from tinydb.middlewares import Middleware
+from tinydb.storages import Storage, touch
+
+from src.config import (
+    DB_LOG_CHECKPOINT_BYTES,
+    DB_LOG_CHECKPOINT_RATIO,
+    DB_LOG_FSYNC,
+    DB_WRITE_BACK_IDLE_S,
+    DB_WRITE_BACK_LEASE_S,
+    DB_WRITE_BACK_MAX_DELAY_S,
+    DB_WRITE_BACK_MAX_PENDING,
+)
+from src.database.filelock import FileLock
+from src.database.serializer import Serializer, get_serializer
+from src.utils import tracing
+
+logger = logging.getLogger(__name__)
+
+# Leituras sem lock refeitas quando outro processo troca os arquivos no meio
+_LOAD_ATTEMPTS = 5
+_POLL_S = 0.01
+
+
+def log_paths(path: str) -> tuple[str, str]:
+    """Log atual e log em checkpoint de um banco."""
+    return f"{path}.log", f"{path}.log.old"
+
+
+def lock_path(path: str) -> str:
+    """Arquivo do lock entre processos de um banco (ver FileLock)."""
+    return f"{path}.lock"
+
+
+def _copy_doc(doc: dict) -> dict:
+    """Cópia de um documento (campos com listas/dicts copiados a fundo)."""
+    copied = doc.copy()
+    for key, value in copied.items():
+        if isinstance(value, (dict, list)):
+            copied[key] = copy.deepcopy(value)
+    return copied
+
+
+class _Tables(dict):
+    """
+    Tabelas devolvidas por read(): cada uma é copiada do estado só quando é
+    acessada. O TinyDB lê o banco inteiro para consultar ou alterar uma
+    tabela; sem isso, listar as extrações copiaria também todas as páginas.
+    As tabelas não acessadas continuam sendo as do estado (não alterar o
+    que vier de dict.items() / {**tabelas}).
+    """
+
+    def __init__(self, state: dict):
+        super().__init__(state)
+        self._copied: set = set()
+
+    def _table(self, name: str) -> dict:
+        table = dict.__getitem__(self, name)
+        if name not in self._copied:
+            table = {doc_id: _copy_doc(doc) for doc_id, doc in table.items()}
+            dict.__setitem__(self, name, table)
+            self._copied.add(name)
+        return table
+
+    def __getitem__(self, name: str) -> dict:
+        return self._table(name)
+
+    def __setitem__(self, name: str, table: dict) -> None:
+        self._copied.add(name)
+        dict.__setitem__(self, name, table)
+
+    def get(self, name: str, default=None):
+        return self._table(name) if name in self else default
+
+    def setdefault(self, name: str, default=None):
+        if name not in self:
+            self[name] = default
+        return self._table(name)
+
+    def pop(self, name: str, *default):
+        if name in self:
+            self._table(name)
+        return dict.pop(self, name, *default)
+
+    def items(self):
+        return [(name, self._table(name)) for name in list(self)]
+
+    def values(self):
+        return [self._table(name) for name in list(self)]
+
+
+def _apply(state: dict, record: dict) -> None:
+    """Aplica um registro do log ao estado."""
+    for name in record.get("drop", ()):
+        state.pop(name, None)
+    for name, docs in record.get("set", {}).items():
+        state.setdefault(name, {}).update(docs)
+    for name, doc_ids in record.get("del", {}).items():
+        table = state.get(name)
+        if table is not None:
+            for doc_id in doc_ids:
+                table.pop(doc_id, None)
+
+
+def _replay(
+    state: dict, log_path: str, repair: bool, loads: Callable = json.loads, start: int = 0
+) -> int:
+    """
+    Reaplica um log ao estado.
+
+    Args:
+        repair: Trunca o log numa linha final cortada (crash no meio da
+                escrita); sem isso, ela só é ignorada (pode ser a escrita em
+                andamento de outro processo).
+        start: Posição do log a partir da qual reaplicar (começo de registro).
+
+    Returns:
+        Posição no log logo depois do último registro aplicado.
+
+    Raises:
+        ValueError: Linha inválida no meio do log (corrupção, não crash).
+    """
+    try:
+        with open(log_path, "rb") as f:
+            f.seek(start)
+            content = f.read()
+    except FileNotFoundError:
+        return 0
+    offset = start
+    for line in content.splitlines(keepends=True):
+        try:
+            if not line.endswith(b"\n"):
+                raise ValueError("linha incompleta")
+            record = loads(line)
+        except ValueError:
+            if offset + len(line) < start + len(content):
+                raise ValueError(f"Log do banco corrompido ({log_path}, byte {offset}).")
+            if repair:
+                logger.warning("Descartando registro incompleto no fim de %s", log_path)
+                with open(log_path, "r+b") as f:
+                    f.truncate(offset)
+            break
+        _apply(state, record)
+        offset += len(line)
+    return offset
+
+
+def _read_checkpoint(path: str, loads: Callable = json.loads) -> dict:
+    try:
+        with open(path, "rb") as f:
+            content = f.read()
+    except FileNotFoundError:
+        return {}
+    if not content.strip():
+        return {}
+    try:
+        data = loads(content)
+    except ValueError as e:
+        raise ValueError(f"Banco corrompido ({path}): {e}") from e
+    if not isinstance(data, dict):
+        raise ValueError(f"Banco corrompido ({path}): esperado um objeto JSON.")
+    return data
+
+
+def _signature(path: str) -> Optional[tuple]:
+    """(inode, tamanho, mtime) do arquivo, ou None se ele não existe."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_size, st.st_mtime_ns
+
+
+def _inode(path: str) -> Optional[int]:
+    sig = _signature(path)
+    return sig[0] if sig else None
+
+
+def _load(path: str, loads: Callable, lock: FileLock, repair: bool = False) -> tuple:
+    """
+    Lê checkpoint + logs de forma consistente sem travar o banco.
+
+    Outro processo pode trocar o checkpoint ou girar o log no meio da
+    leitura; nesse caso as assinaturas dos arquivos mudam e a leitura é
+    refeita. A última tentativa é feita com o lock (repair exige o lock).
+
+    Returns:
+        (estado, assinaturas vistas, posição no log): as assinaturas são as
+        de DeltaLogStorage._seen.
+    """
+    log_path, old_log_path = log_paths(path)
+    for attempt in range(_LOAD_ATTEMPTS):
+        last = attempt == _LOAD_ATTEMPTS - 1
+        if last:
+            lock.acquire()
+        try:
+            seen = (_signature(path), _signature(old_log_path), _inode(log_path))
+            state = _read_checkpoint(path, loads)
+            _replay(state, old_log_path, repair, loads)  # .log.old antes do .log
+            log_size = _replay(state, log_path, repair, loads)
+            # .log só pelo inode: ele pode crescer (o que veio a mais fica para depois)
+            if last or seen == (_signature(path), _signature(old_log_path), _inode(log_path)):
+                return state, seen, log_size
+        finally:
+            if last:
+                lock.release()
+        time.sleep(_POLL_S * (attempt + 1))
+
+
+def load_state(path: str, repair: bool = False, serializer: Optional[Serializer] = None) -> dict:
+    """
+    Conteúdo do banco: checkpoint + logs (sem abrir o storage).
+
+    Raises:
+        ValueError: Checkpoint ou log corrompido.
+        RuntimeError: Outro processo travou o banco por tempo demais.
+    """
+    lock = FileLock(lock_path(path))
+    try:
+        state, _seen, _log_size = _load(path, (serializer or get_serializer()).loads, lock, repair)
+    finally:
+        lock.close()
+    return state
+
+
+def write_checkpoint(path: str, data: dict, serializer: Optional[Serializer] = None) -> None:
+    """
+    Grava o banco inteiro como checkpoint e descarta os logs (ex.: restauração
+    com o banco fechado). Processos com o banco aberto recarregam o conteúdo
+    novo na próxima leitura.
+
+    Raises:
+        RuntimeError: Outro processo travou o banco por tempo demais.
+    """
+    content = (serializer or get_serializer()).dumps(data)
+    lock = FileLock(lock_path(path))
+    lock.acquire()
+    tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        # Logs antes do replace: reaplicados sobre o conteúdo novo, eles o desfariam
+        for log_path in log_paths(path):
+            if os.path.exists(log_path):
+                os.remove(log_path)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        lock.close()
+
+
+class DeltaLogStorage(Storage):
+    """
+    Storage do TinyDB: checkpoint JSON + log de alterações.
+
+    O estado fica em memória; read() devolve uma cópia (o TinyDB altera o
+    que lê antes de gravar) e write() compara com o estado para gravar só
+    os documentos alterados.
+
+    Vários processos podem abrir o mesmo banco. Quem grava trava
+    `<banco>.lock` (ver FileLock), entre acquire() e release(): o
+    checkpoint e o log só mudam com o lock, e acquire() recarrega antes o
+    que os outros gravaram. Leituras não travam: sync() confere as
+    assinaturas dos arquivos e reaplica só o fim do log quando ele apenas
+    cresceu. Para a leitura-alteração-escrita ser atômica entre processos,
+    o read() que a precede tem que estar entre acquire() e release() (o
+    DatabaseManager faz isso); um write() sem acquire() trava só durante a
+    própria escrita.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        create_dirs: bool = False,
+        encoding: Optional[str] = None,
+        checkpoint_bytes: int = DB_LOG_CHECKPOINT_BYTES,
+        checkpoint_ratio: float = DB_LOG_CHECKPOINT_RATIO,
+        fsync: bool = DB_LOG_FSYNC,
+        serializer: Optional[Serializer] = None,
+        **kwargs,
+    ):
+        """
+        Args:
+            path: Arquivo do checkpoint (o log fica em `<path>.log`).
+            checkpoint_bytes / checkpoint_ratio: O checkpoint roda quando o
+                log passa dos dois limites (bytes e fração do checkpoint).
+            fsync: fsync a cada escrita (como o JSONStorage).
+            serializer: JSON do checkpoint e do log (padrão: get_serializer(),
+                ver DB_JSON_BACKEND e DB_JSON_COMPACT).
+            kwargs: Opções do JSONStorage (indent, ensure_ascii), ignoradas:
+                o formato do checkpoint vem do serializador.
+
+        Raises:
+            RuntimeError: Outro processo travou o banco por tempo demais.
+        """
+        super().__init__()
+        self.path = path
+        self.log_path, self.old_log_path = log_paths(path)
+        self.checkpoint_bytes = checkpoint_bytes
+        self.checkpoint_ratio = checkpoint_ratio
+        self.fsync = fsync
+        self.serializer = serializer or get_serializer()
+        # O log é sempre uma linha por registro, mesmo com checkpoint indentado
+        self._dumps_line = (
+            self.serializer
+            if self.serializer.compact
+            else get_serializer(self.serializer.name, compact=True)
+        ).dumps
+        self._lock = threading.Lock()
+        self._checkpointing: Optional[threading.Thread] = None
+        if encoding not in (None, "utf-8", "utf8"):
+            raise ValueError("DeltaLogStorage grava sempre em UTF-8.")
+
+        touch(path, create_dirs=create_dirs)
+        self.lock = FileLock(lock_path(path))
+        # Com o lock: o reparo do log e o fim de um checkpoint interrompido
+        # não podem correr junto com a escrita de outro processo
+        self.lock.acquire()
+        try:
+            self._log = None
+            self._state: dict = {}
+            self._reload(repair=True)
+            if os.path.exists(self.old_log_path):
+                # Checkpoint interrompido por um crash: termina agora
+                self._checkpoint()
+        except BaseException:
+            if self._log is not None:
+                self._log.close()
+            self.lock.close()
+            raise
+        finally:
+            if self.lock.held:
+                self.lock.release()
+
+    # ─── Interface do TinyDB ───────────────────────────────────────────────
+
+    def read(self) -> Optional[dict[str, dict[str, Any]]]:
+        with self._lock:
+            if not self._state:
+                return None
+            return _Tables(self._state)
+
+    def write(self, data: dict[str, dict[str, Any]]) -> None:
+        self.acquire()
+        try:
+            with self._lock:
+                record = self._diff(data)
+                if not record:
+                    return
+                encoded = self._dumps_line(record) + b"\n"
+                self._log.write(encoded)
+                self._log.flush()
+                if self.fsync:
+                    os.fsync(self._log.fileno())
+                self._log_size += len(encoded)
+                # Só depois de gravado no log (uma falha acima não altera o estado)
+                _apply(self._state, self._copy_record(record))
+                tracing.annotate(log_bytes=len(encoded))
+                self._maybe_checkpoint()
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        """Espera o checkpoint em andamento e grava o final (o log fica vazio)."""
+        thread = self._checkpointing
+        if thread is not None:
+            thread.join()
+        try:
+            self.acquire()
+        except RuntimeError:
+            # O log fica como está: é reaplicado na próxima abertura
+            logger.warning("Banco travado por outro processo: fechando sem checkpoint")
+        else:
+            try:
+                with self._lock:
+                    if self._log_size:
+                        self._checkpoint()
+            finally:
+                self.release()
+        with self._lock:
+            self._log.close()
+            self.lock.close()
+
+    # ─── Vários processos ──────────────────────────────────────────────────
+
+    def acquire(self) -> bool:
+        """
+        Trava o banco para escrever (reentrante) e recarrega o que outros
+        processos gravaram.
+
+        Returns:
+            True se o estado mudou (caches de quem leu antes ficam velhos).
+
+        Raises:
+            RuntimeError: Outro processo travou o banco por tempo demais.
+        """
+        if not self.lock.acquire():
+            return False  # Já era nosso: ninguém mais gravou
+        try:
+            with self._lock:
+                return self._sync()
+        except BaseException:
+            self.lock.release()
+            raise
+
+    def release(self) -> None:
+        self.lock.release()
+
+    def sync(self) -> bool:
+        """
+        Recarrega, sem travar, o que outros processos gravaram desde a
+        última leitura (com o lock nas mãos, não há o que recarregar).
+
+        Returns:
+            True se o estado mudou.
+        """
+        with self._lock:
+            if self.lock.held:
+                return False
+            return self._sync()
+
+    def _sync(self) -> bool:
+        seen = (_signature(self.path), _signature(self.old_log_path), _inode(self.log_path))
+        if seen == self._seen:
+            log = _signature(self.log_path)
+            if log is None or log[1] == self._log_size:
+                return False
+            if log[1] > self._log_size:
+                # Outro processo só acrescentou ao log: reaplica o fim
+                start = self._log_size
+                self._log_size = _replay(
+                    self._state, self.log_path, False, self.serializer.loads, start
+                )
+                tracing.annotate(log_bytes_replayed=self._log_size - start)
+                return self._log_size != start
+        with tracing.span("db.reload"):
+            self._reload()
+        return True
+
+    def _reload(self, repair: bool = False) -> None:
+        """Relê checkpoint + logs (chamar com self._lock, ou no __init__)."""
+        self._state, self._seen, self._log_size = _load(
+            self.path, self.serializer.loads, self.lock, repair
+        )
+        self._checkpoint_size = self._seen[0][1] if self._seen[0] else 0
+        if self._log is not None and not self._log.closed:
+            if os.fstat(self._log.fileno()).st_ino == self._seen[2]:
+                return
+            self._log.close()  # Log girado por outro processo
+        self._log = open(self.log_path, "ab")
+        if self._seen[2] is None:
+            # Log criado agora: o próximo sync não deve tomá-lo por um log novo
+            self._seen = (*self._seen[:2], os.fstat(self._log.fileno()).st_ino)
+
+    # ─── Diferença ─────────────────────────────────────────────────────────
+
+    def _diff(self, data: dict) -> dict:
+        """Registro com o que mudou entre o estado e `data` ({} = nada)."""
+        changed: dict[str, dict] = {}
+        deleted: dict[str, list] = {}
+        dropped = [name for name in self._state if name not in data]
+        # dict.items: sem copiar as tabelas de um _Tables que ninguém acessou
+        for name, table in dict.items(data):
+            current = self._state.get(name)
+            if table is current:
+                continue  # Tabela não acessada desde o read()
+            if current is None:
+                changed[name] = dict(table)  # Tabela nova (mesmo vazia)
+                continue
+            docs = {doc_id: doc for doc_id, doc in table.items() if current.get(doc_id) != doc}
+            if docs:
+                changed[name] = docs
+            added = sum(1 for doc_id in docs if doc_id not in current)
+            if len(current) + added != len(table):
+                removed = [doc_id for doc_id in current if doc_id not in table]
+                if removed:
+                    deleted[name] = removed
+        record = {}
+        if changed:
+            record["set"] = changed
+        if deleted:
+            record["del"] = deleted
+        if dropped:
+            record["drop"] = dropped
+        return record
+
+    @staticmethod
+    def _copy_record(record: dict) -> dict:
+        # O estado não pode compartilhar documentos com quem chamou write()
+        return {
+            **record,
+            "set": {
+                name: {doc_id: _copy_doc(doc) for doc_id, doc in docs.items()}
+                for name, docs in record.get("set", {}).items()
+            },
+        }
+
+    # ─── Checkpoint ────────────────────────────────────────────────────────
+
+    def _maybe_checkpoint(self) -> None:
+        limit = max(self.checkpoint_bytes, self._checkpoint_size * self.checkpoint_ratio)
+        if self._log_size < limit or self._checkpointing is not None:
+            return
+        snapshot = self._rotate()
+        self._checkpointing = threading.Thread(
+            target=self._write_snapshot, args=(snapshot,), name="db-checkpoint", daemon=True
+        )
+        self._checkpointing.start()
+
+    def _rotate(self) -> dict:
+        """
+        Troca o log por um novo e devolve o estado atual (chamar com os
+        locks). O lock entre processos fica preso até o _write_snapshot
+        terminar: outro processo não pode girar o log nem gravar um
+        checkpoint mais velho por cima deste.
+        """
+        self._log.close()
+        if os.path.exists(self.old_log_path):
+            # Checkpoint anterior não terminou: o log atual vai para o fim do antigo
+            with open(self.log_path, "rb") as src, open(self.old_log_path, "ab") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(self.log_path)
+        else:
+            os.replace(self.log_path, self.old_log_path)
+        self._log = open(self.log_path, "ab")
+        self._log_size = 0
+        self.lock.acquire()
+        self._seen = (
+            self._seen[0],
+            _signature(self.old_log_path),
+            os.fstat(self._log.fileno()).st_ino,
+        )
+        # Cópia rasa: os documentos do estado nunca são alterados no lugar
+        return {name: dict(table) for name, table in self._state.items()}
+
+    def _write_snapshot(self, snapshot: dict) -> None:
+        """Grava o checkpoint (fora do lock: as escritas seguem no log novo)."""
+        try:
+            with tracing.span("db.checkpoint") as sp:
+                tmp = f"{self.path}.{uuid.uuid4().hex}.tmp"
+                try:
+                    with open(tmp, "wb") as f:
+                        f.write(self.serializer.dumps(snapshot))
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp, self.path)
+                finally:
+                    if os.path.exists(tmp):
+                        os.remove(tmp)
+                os.remove(self.old_log_path)
+                checkpoint = _signature(self.path)
+                self._seen = (checkpoint, None, self._seen[2])
+                self._checkpoint_size = checkpoint[1]
+                sp.set(bytes=self._checkpoint_size)
+        except OSError:
+            # O .log.old continua lá: é reaplicado na próxima abertura
+            logger.exception("Falha ao gravar o checkpoint do banco")
+        finally:
+            self._checkpointing = None
+            self.lock.release()
+
+    def checkpoint(self) -> None:
+        """
+        Grava um checkpoint agora e esvazia o log (ex.: compactação).
+
+        Raises:
+            RuntimeError: Outro processo travou o banco por tempo demais.
+        """
+        thread = self._checkpointing
+        if thread is not None:
+            thread.join()
+        self.acquire()
+        try:
+            with self._lock:
+                if self._log_size or os.path.exists(self.old_log_path):
+                    self._checkpoint()
+        finally:
+            self.release()
+
+    def _checkpoint(self) -> None:
+        """Checkpoint síncrono (abertura após crash, fechamento e checkpoint())."""
+        self._write_snapshot(self._rotate())
+
+
+# ─── Cache write-back ──────────────────────────────────────────────────────
+
+_open_caches: "weakref.WeakSet[WriteBackMiddleware]" = weakref.WeakSet()
+_exit_hooks_installed = False
+_exit_hooks_lock = threading.Lock()
+
+
+def flush_all() -> None:
+    """Grava as escritas pendentes de todos os bancos abertos (saída do processo)."""
+    for cache in list(_open_caches):
+        try:
+            cache.flush()
+        except Exception:
+            logger.exception("Falha ao gravar as escritas pendentes do banco")
+
+
+def _on_signal(signum, frame, previous) -> None:
+    flush_all()
+    if callable(previous):
+        previous(signum, frame)
+        return
+    # Comportamento padrão do sinal (encerrar), agora com o banco gravado
+    signal.signal(signum, signal.SIG_DFL)
+    os.kill(os.getpid(), signum)
+
+
+def _install_exit_hooks() -> None:
+    """atexit + SIGTERM/SIGHUP: sinais matam o processo sem passar pelo atexit."""
+    global _exit_hooks_installed
+    with _exit_hooks_lock:
+        if _exit_hooks_installed:
+            return
+        _exit_hooks_installed = True
+        atexit.register(flush_all)
+        if threading.current_thread() is not threading.main_thread():
+            return  # signal.signal só funciona na thread principal
+        for name in ("SIGTERM", "SIGHUP"):
+            signum = getattr(signal, name, None)
+            if signum is None:
+                continue
+            previous = signal.getsignal(signum)
+            if previous is signal.SIG_IGN:
+                continue
+            signal.signal(
+                signum, lambda s, f, previous=previous: _on_signal(s, f, previous)
+            )
+
+
+class WriteBackMiddleware(Middleware):
+    """
+    Cache write-back na frente de um storage do TinyDB.
+
+    As tabelas ficam em memória: read() não toca o storage depois da
+    primeira leitura e write() só troca o cache. As escritas pendentes vão
+    para o storage, numa escrita só:
+      - depois de `idle_s` sem novas escritas;
+      - no máximo `max_delay_s` depois da primeira pendente;
+      - a cada `max_pending` escritas (na própria escrita);
+      - em flush(), close(), na saída do processo (atexit) e no SIGTERM.
+
+    Como no DeltaLogStorage, read() devolve tabelas copiadas no acesso: um
+    _write_tables que falhe no meio não deixa o cache alterado pela metade.
+
+    acquire()/release() repassam o lock entre processos do storage (se ele
+    tiver), que fica preso do primeiro acquire() até o flush das escritas
+    pendentes: outro processo não grava por baixo de um cache sujo. Com o
+    lock preso, o flush vem no máximo `lease_s` depois da primeira pendente,
+    assim que não houver acquire() sem release().
+    """
+
+    def __init__(
+        self,
+        storage_cls,
+        idle_s: float = DB_WRITE_BACK_IDLE_S,
+        max_delay_s: float = DB_WRITE_BACK_MAX_DELAY_S,
+        max_pending: int = DB_WRITE_BACK_MAX_PENDING,
+        lease_s: float = DB_WRITE_BACK_LEASE_S,
+    ):
+        super().__init__(storage_cls)
+        self.idle_s = idle_s
+        self.max_delay_s = max_delay_s
+        self.max_pending = max_pending
+        self.lease_s = lease_s
+        self._lock = threading.RLock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._cache: Optional[dict] = None
+        self._pending = 0
+        self._first_pending = self._last_write = 0.0
+        self._closed = False
+        self._writers = 0  # acquire() sem release()
+        self._leased = False  # Com o lock do storage
+
+    def __call__(self, *args, **kwargs):
+        super().__call__(*args, **kwargs)
+        self._thread = threading.Thread(target=self._loop, name="db-write-back", daemon=True)
+        self._thread.start()
+        _open_caches.add(self)
+        _install_exit_hooks()
+        return self
+
+    # ─── Interface do TinyDB ───────────────────────────────────────────────
+
+    def read(self) -> Optional[dict[str, dict[str, Any]]]:
+        with self._lock:
+            if self._cache is None:
+                data = self.storage.read() or {}
+                # Tabelas próprias: o cache não compartilha dicts com o storage
+                self._cache = {name: dict(table) for name, table in dict.items(data)}
+            if not self._cache:
+                return None
+            return _Tables(self._cache)
+
+    def write(self, data: dict[str, dict[str, Any]]) -> None:
+        with self._lock:
+            # dict.items: tabelas não acessadas continuam as do cache (sem cópia)
+            self._cache = dict(dict.items(data))
+            now = time.monotonic()
+            if not self._pending:
+                self._first_pending = now
+            self._last_write = now
+            self._pending += 1
+            if self._pending >= self.max_pending:
+                self._flush()
+                return
+        self._wake.set()
+
+    def flush(self) -> None:
+        """Grava as escritas pendentes no storage."""
+        with self._lock:
+            self._flush()
+
+    def checkpoint(self) -> None:
+        """Grava as pendentes e, se o storage tiver checkpoint(), dobra o log nele."""
+        checkpoint = getattr(self.storage, "checkpoint", None)
+        with self._lock:
+            self._flush()
+            if checkpoint is not None:
+                checkpoint()
+
+    # ─── Vários processos ──────────────────────────────────────────────────
+
+    def acquire(self) -> bool:
+        """
+        Início de uma escrita: trava o storage (ver DeltaLogStorage.acquire).
+
+        Returns:
+            True se o storage recarregou o que outro processo gravou.
+        """
+        acquire = getattr(self.storage, "acquire", None)
+        with self._lock:
+            self._writers += 1
+            if self._leased or acquire is None:
+                return False
+            try:
+                changed = acquire()
+            except BaseException:
+                self._writers -= 1
+                raise
+            self._leased = True
+            if changed:
+                self._cache = None
+            return changed
+
+    def release(self) -> None:
+        """Fim de uma escrita: o lock sai no flush das pendentes."""
+        with self._lock:
+            self._writers -= 1
+            self._release_idle()
+        self._wake.set()  # O prazo do lock pode ter vencido durante a escrita
+
+    def sync(self) -> bool:
+        """Recarrega o que outros processos gravaram (ver DeltaLogStorage.sync)."""
+        sync = getattr(self.storage, "sync", None)
+        with self._lock:
+            if self._leased or sync is None or not sync():
+                return False
+            self._cache = None
+            return True
+
+    def _release_idle(self) -> None:
+        if self._leased and not self._writers and not self._pending:
+            self._leased = False
+            self.storage.release()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+        with self._lock:
+            self._flush()
+            _open_caches.discard(self)
+            self.storage.close()
+
+    # ─── Gravação ──────────────────────────────────────────────────────────
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        with tracing.span("db.flush", writes=self._pending):
+            self.storage.write(self._cache)
+        self._pending = 0
+        self._release_idle()
+
+    def _loop(self) -> None:
+        while True:
+            with self._lock:
+                if self._closed:
+                    return
+                delay = None
+                if self._pending:
+                    due = min(
+                        self._last_write + self.idle_s,
+                        self._first_pending + self.max_delay_s,
+                    )
+                    # Lock preso: outros processos esperam por ele; no meio de
+                    # uma escrita, o release() acorda a thread de novo
+                    if self._leased and not self._writers:
+                        due = min(due, self._first_pending + self.lease_s)
+                    delay = due - time.monotonic()
+                    if delay <= 0:
+                        try:
+                            self._flush()
+                        except Exception:
+                            # Continua pendente: tenta de novo no próximo prazo
+                            logger.exception("Falha ao gravar as escritas pendentes do banco")
+                            self._first_pending = self._last_write = time.monotonic()
+                        continue
+            self._wake.wait(delay)
+            self._wake.clear()
@@ -3,7 +3,9 @@ Ponto de entrada principal do sistema Aldemarvin Extractor.
 Gerencia a navegação entre telas e ciclo de vida da aplicação.
 """
 
+import argparse
 import tkinter as tk
+from tkinter import messagebox
 import sys
 import os
 
@@ -20,13 +22,23 @@ from src.config import (
     WINDOW_TITLE,
     WINDOW_MIN_WIDTH,
     WINDOW_MIN_HEIGHT,
+    WATCHDOG_ENABLED,
+    PROFILE_MODE,
 )
 from src.database.db_manager import DatabaseManager
+from src.database.maintenance import MaintenanceScheduler
+from src.services.bulk_translate import (
+    BulkTranslateJob,
+    get_interrupted_jobs,
+    get_running_jobs,
+)
 from src.ui.splash_screen import SplashScreen
 from src.ui.main_screen import MainScreen
 from src.ui.extraction_form import ExtractionFormDialog
 from src.ui.image_capture_screen import ImageCaptureScreen
 from src.ui.text_editor_screen import TextEditorScreen
+from src.ui.watchdog import UIWatchdog
+from src.utils import profiling
 
 
 class AldeMarvinApp:
@@ -44,6 +56,8 @@ class AldeMarvinApp:
 
         # Banco de dados
         self.db = DatabaseManager()
+        # Compactação e snapshots incrementais em background (e ao fechar)
+        self.maintenance = MaintenanceScheduler(self.db).start()
 
         # Frame container para troca de telas
         self.container = tk.Frame(self.root, bg=COLORS["bg_primary"])
@@ -51,6 +65,9 @@ class AldeMarvinApp:
 
         self.current_screen = None
 
+        # Mede a latência do loop do Tk e registra travamentos
+        self.watchdog = UIWatchdog(self.root).start() if WATCHDOG_ENABLED else None
+
         # Protocolo de fechamento
         self.root.protocol("WM_DELETE_WINDOW", self._on_close)
 
@@ -121,7 +138,20 @@ class AldeMarvinApp:
 
     def _on_close(self):
         """Fecha a aplicação de forma limpa."""
-        self.db.close()
+        # Jobs em background gravam o bloco atual e param; o restante
+        # é retomado na próxima abertura.
+        for job in get_running_jobs():
+            job.cancel()
+        for job in get_running_jobs():
+            job.join(timeout=5)
+        if self.watchdog:
+            self.watchdog.stop()
+        # Grava o que está no cache write-back antes do snapshot de fechamento
+        self.db.flush()
+        if self.maintenance.stop():
+            self.db.close()
+        # Senão a manutenção ainda usa o banco: fica sem o checkpoint final (o
+        # log é reaplicado na próxima abertura) e o atexit grava as pendentes
         self.root.destroy()
 
     def run(self):
@@ -134,12 +164,55 @@ class AldeMarvinApp:
         """Callback após splash — mostra janela principal."""
         self.root.deiconify()  # Mostra a janela principal
         self.show_main_screen()
+        self._resume_interrupted_jobs()
+
+    def _resume_interrupted_jobs(self):
+        """Oferece retomar traduções em massa interrompidas (ex.: queda do app)."""
+        jobs = get_interrupted_jobs(self.db)
+        if not jobs:
+            return
+        names = []
+        for job in jobs:
+            extraction = self.db.get_extraction(job["extraction_id"])
+            if extraction:
+                names.append(f"• {extraction['name']} ({job.get('done', 0)}/{job.get('total', 0)})")
+        resume = messagebox.askyesno(
+            "Traduções interrompidas",
+            "Há traduções em massa que não terminaram:\n\n"
+            + "\n".join(names)
+            + "\n\nDeseja retomá-las agora?",
+        )
+        for job in jobs:
+            if resume:
+                BulkTranslateJob(self.db, job["extraction_id"]).start()
+            else:
+                self.db.update_job(job["id"], status="cancelled")
+        if resume and isinstance(self.current_screen, MainScreen):
+            self.current_screen.refresh_list()
 
 
-def main():
+def main(argv: list[str] | None = None):
     """Função de entrada."""
-    app = AldeMarvinApp()
-    app.run()
+    parser = argparse.ArgumentParser(description=WINDOW_TITLE)
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="session",
+        default=PROFILE_MODE or None,
+        choices=profiling.MODES,
+        help="Grava perfis de desempenho em data/profiles (padrão: session)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        profiling.enable(args.profile)
+    try:
+        app = AldeMarvinApp()
+        app.run()
+    finally:
+        path = profiling.finish("app")
+        if path:
+            print(f"Perfil gravado em {path}", file=sys.stderr)
 
 
 if __name__ == "__main__":
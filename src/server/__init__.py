@@ -0,0 +1,4 @@
+from .client import JobClient
+from .job_server import JobServer, run_server
+
+__all__ = ["JobClient", "JobServer", "run_server"]
@@ -0,0 +1,221 @@
+"""
+Cliente do servidor de jobs (urllib, sem dependências extras).
+
+Também expõe adaptadores com a mesma interface dos serviços locais
+(extract_from_image / translate / generate_pdf), usados pela interface
+quando JOB_SERVER_URL está configurado.
+"""
+
+import http.client
+import io
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+from typing import Callable, Optional
+from urllib.parse import urlencode
+
+from src.config import EXPORTS_DIR, JOB_CLIENT_EVENTS_IDLE_S, JOB_CLIENT_POLL_S
+
+
+class JobClient:
+    """Submete jobs ao servidor e aguarda o resultado."""
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 30.0,
+        events_idle_s: float = JOB_CLIENT_EVENTS_IDLE_S,
+        poll_s: float = JOB_CLIENT_POLL_S,
+    ):
+        """
+        Args:
+            base_url: Endereço do servidor (ex.: "http://127.0.0.1:8765").
+            timeout: Espera máxima por resposta das requisições comuns.
+            events_idle_s: Espera máxima por uma linha do stream de eventos
+                           (o servidor manda heartbeats; o job pode demorar
+                           bem mais que isso).
+            poll_s: Intervalo das consultas de status sem o stream.
+        """
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.events_idle_s = events_idle_s
+        self.poll_s = poll_s
+
+    # ─── HTTP ──────────────────────────────────────────────────────────────
+
+    def _request(
+        self,
+        method: str,
+        path: str,
+        body: bytes = None,
+        content_type: str = None,
+        timeout: Optional[float] = None,
+    ):
+        request = urllib.request.Request(self.base_url + path, data=body, method=method)
+        if content_type:
+            request.add_header("Content-Type", content_type)
+        try:
+            return urllib.request.urlopen(request, timeout=timeout or self.timeout)
+        except urllib.error.HTTPError as e:
+            try:
+                message = json.loads(e.read()).get("error", e.reason)
+            except ValueError:
+                message = e.reason
+            raise RuntimeError(f"Servidor de jobs: {message}") from None
+        except urllib.error.URLError as e:
+            raise RuntimeError(f"Servidor de jobs indisponível: {e.reason}") from None
+
+    def _json(self, method: str, path: str, payload=None, body: bytes = None, content_type=None) -> dict:
+        if payload is not None:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            content_type = "application/json"
+        with self._request(method, path, body, content_type) as response:
+            return json.loads(response.read())
+
+    # ─── Jobs ──────────────────────────────────────────────────────────────
+
+    def health(self) -> dict:
+        return self._json("GET", "/health")
+
+    def submit_ocr(self, image_bytes: bytes, profile: Optional[dict] = None) -> dict:
+        query = urlencode(profile or {})
+        return self._json(
+            "POST", f"/jobs/ocr?{query}", body=image_bytes, content_type="application/octet-stream"
+        )
+
+    def submit_translate(self, texts: list[str]) -> dict:
+        return self._json("POST", "/jobs/translate", {"texts": texts})
+
+    def submit_export(self, title: str, pages: list[dict], filename: str = None) -> dict:
+        # Só os campos usados na geração do PDF
+        fields = ("page_number", "original_text", "translated_text", "merged_text")
+        slim = [{k: p.get(k, "") for k in fields} for p in pages]
+        return self._json(
+            "POST", "/jobs/export", {"title": title, "pages": slim, "filename": filename}
+        )
+
+    def status(self, job_id: str) -> dict:
+        return self._json("GET", f"/jobs/{job_id}")
+
+    def wait(
+        self, job_id: str, on_event: Optional[Callable[[dict], None]] = None
+    ) -> dict:
+        """
+        Acompanha o stream de eventos até o job terminar. Se o stream parar
+        (sem linhas por `events_idle_s`) ou fechar antes do fim, consulta o
+        status a cada `poll_s`.
+
+        Returns:
+            Resultado do job (campo "result").
+
+        Raises:
+            RuntimeError: Se o job falhar ou o servidor ficar indisponível.
+        """
+        job = None
+        try:
+            with self._request(
+                "GET", f"/jobs/{job_id}/events", timeout=self.events_idle_s
+            ) as response:
+                for line in response:
+                    if not line.strip():
+                        continue
+                    job = json.loads(line)
+                    if on_event:
+                        on_event(job)
+                    if job["status"] in ("done", "failed"):
+                        break
+        except (OSError, http.client.HTTPException):
+            pass  # Stream parado ou cortado (socket.timeout é OSError): consulta o status
+
+        while job is None or job["status"] not in ("done", "failed"):
+            if job is not None:
+                time.sleep(self.poll_s)
+            job = self.status(job_id)
+            if on_event:
+                on_event(job)
+        if job["status"] == "failed":
+            raise RuntimeError(job.get("error") or "Job falhou no servidor.")
+        return job.get("result", {})
+
+    def download(self, job_id: str) -> bytes:
+        with self._request("GET", f"/jobs/{job_id}/file") as response:
+            return response.read()
+
+    # ─── Atalhos (submete e aguarda) ───────────────────────────────────────
+
+    def ocr(self, image, profile: Optional[dict] = None) -> str:
+        """OCR remoto de uma PIL.Image ou bytes de imagem."""
+        if not isinstance(image, (bytes, bytearray)):
+            buffer = io.BytesIO()
+            image.save(buffer, format="PNG")
+            image = buffer.getvalue()
+        job = self.submit_ocr(bytes(image), profile)
+        return self.wait(job["id"])["text"]
+
+    def translate_many(self, texts: list[str]) -> list[str]:
+        job = self.submit_translate(texts)
+        return self.wait(job["id"])["translations"]
+
+    def export(self, title: str, pages: list[dict], filename: str = None) -> bytes:
+        job = self.submit_export(title, pages, filename)
+        self.wait(job["id"])
+        return self.download(job["id"])
+
+
+# ─── Adaptadores para a interface ──────────────────────────────────────────
+
+
+class RemoteOCRService:
+    """Mesma interface do OCRService, executando no servidor de jobs."""
+
+    def __init__(self, client: JobClient, profile: Optional[dict] = None):
+        self.client = client
+        self.profile = dict(profile or {})
+
+    def extract_from_image(self, image, lang: Optional[str] = None) -> str:
+        profile = {**self.profile, "lang": lang} if lang else self.profile
+        return self.client.ocr(image, profile)
+
+
+class RemoteTranslationService:
+    """Mesma interface do TranslationService, executando no servidor de jobs."""
+
+    def __init__(self, client: JobClient):
+        self.client = client
+
+    def translate(self, text: str) -> str:
+        if not text or not text.strip():
+            return ""
+        return self.translate_many([text])[0]
+
+    def translate_many(self, texts: list[str]) -> list[str]:
+        return self.client.translate_many(texts)
+
+
+class RemotePDFService:
+    """Gera o PDF no servidor e salva a cópia local em EXPORTS_DIR."""
+
+    def __init__(self, client: JobClient, exports_dir: str = EXPORTS_DIR):
+        from src.services.pdf_service import PDFService
+
+        self.client = client
+        self.exports_dir = exports_dir
+        # Reaproveita a abertura do PDF local
+        self._local = PDFService(exports_dir=exports_dir)
+
+    def generate_pdf(
+        self, title: str, pages: list[dict], output_filename: str = None, workers: int = 1
+    ) -> str:
+        # `workers` fica a cargo do servidor (mesma assinatura do PDFService)
+        job = self.client.submit_export(title, pages, output_filename)
+        result = self.client.wait(job["id"])
+        # Mesmo nome de arquivo gerado pelo servidor
+        path = os.path.join(self.exports_dir, os.path.basename(result["path"]))
+        with open(path, "wb") as f:
+            f.write(self.client.download(job["id"]))
+        return path
+
+    def open_pdf(self, pdf_path: str) -> None:
+        self._local.open_pdf(pdf_path)
@@ -0,0 +1,417 @@
+"""
+Servidor local de jobs (asyncio) - Recebe imagens/páginas via HTTP, enfileira
+OCR, tradução e geração de PDF em pools de workers e transmite o status.
+
+Endpoints (JSON, exceto quando indicado):
+    GET  /health                   → estado das filas
+    POST /jobs/ocr?lang=eng&psm=6  → corpo: bytes da imagem
+    POST /jobs/translate           → {"texts": [...]}
+    POST /jobs/export              → {"title": ..., "pages": [...], "filename": ...}
+    GET  /jobs/<id>                → status do job
+    GET  /jobs/<id>/events         → stream NDJSON (chunked) até o job terminar;
+                                     sem mudanças, repete o status a cada
+                                     JOB_SERVER_HEARTBEAT_S
+    GET  /jobs/<id>/file           → PDF gerado (jobs de export)
+
+Uso: aldemarvin-cli serve [--host 127.0.0.1] [--port 8765]
+"""
+
+import asyncio
+import json
+import os
+import time
+import uuid
+from concurrent.futures import (
+    BrokenExecutor,
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from http import HTTPStatus
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+from src.config import (
+    EXPORTS_DIR,
+    JOB_SERVER_HEARTBEAT_S,
+    JOB_SERVER_HOST,
+    JOB_SERVER_MAX_BODY,
+    JOB_SERVER_OCR_WORKERS,
+    JOB_SERVER_PDF_WORKERS,
+    JOB_SERVER_PORT,
+    JOB_SERVER_RETENTION_S,
+    JOB_SERVER_TRANSLATE_WORKERS,
+)
+from src.server import tasks
+from src.services.export_cache import ExportCache, manages
+
+# Status finais
+_FINAL = ("done", "failed")
+
+
+class HttpError(Exception):
+    """Erro que vira uma resposta HTTP com status e mensagem."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class Job:
+    """Um job enfileirado no servidor."""
+
+    def __init__(self, kind: str, args: tuple):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.args = args
+        self.status = "queued"
+        self.result: Optional[dict] = None
+        self.error = ""
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        # Incrementado a cada mudança; acorda quem acompanha o stream
+        self.version = 0
+        self.changed = asyncio.Condition()
+
+    @property
+    def is_final(self) -> bool:
+        return self.status in _FINAL
+
+    def to_dict(self) -> dict:
+        data = {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if self.result is not None:
+            data["result"] = self.result
+        return data
+
+
+class JobServer:
+    """Fila de jobs + servidor HTTP mínimo sobre asyncio.start_server."""
+
+    def __init__(
+        self,
+        host: str = JOB_SERVER_HOST,
+        port: int = JOB_SERVER_PORT,
+        ocr_workers: int = JOB_SERVER_OCR_WORKERS,
+        translate_workers: int = JOB_SERVER_TRANSLATE_WORKERS,
+        pdf_workers: int = JOB_SERVER_PDF_WORKERS,
+        exports_dir: str = EXPORTS_DIR,
+        heartbeat_s: float = JOB_SERVER_HEARTBEAT_S,
+    ):
+        self.host = host
+        self.port = port
+        self.exports_dir = exports_dir
+        self.heartbeat_s = heartbeat_s
+        # tipo → (função, nº de workers, tipo de pool)
+        self._kinds = {
+            "ocr": (tasks.run_ocr, ocr_workers, ProcessPoolExecutor),
+            "translate": (tasks.run_translate, translate_workers, ThreadPoolExecutor),
+            "export": (tasks.run_export, pdf_workers, ProcessPoolExecutor),
+        }
+        self.jobs: dict[str, Job] = {}
+        self._queues: dict[str, asyncio.Queue] = {}
+        self._pools: dict[str, Executor] = {}
+        self._tasks: list[asyncio.Task] = []
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    # ─── Ciclo de vida ─────────────────────────────────────────────────────
+
+    async def start(self) -> None:
+        """Cria pools, workers e começa a aceitar conexões."""
+        for kind, (_fn, workers, pool_cls) in self._kinds.items():
+            workers = max(1, workers)
+            self._pools[kind] = pool_cls(max_workers=workers)
+            self._queues[kind] = asyncio.Queue()
+            for _ in range(workers):
+                self._tasks.append(asyncio.create_task(self._worker(kind)))
+        self._tasks.append(asyncio.create_task(self._prune_loop()))
+
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        # Porta real (quando port=0, o SO escolhe)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """Para de aceitar conexões, cancela workers e encerra os pools."""
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        for pool in self._pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    # ─── Fila ──────────────────────────────────────────────────────────────
+
+    async def submit(self, kind: str, *args) -> Job:
+        """Enfileira um job e retorna imediatamente."""
+        job = Job(kind, args)
+        self.jobs[job.id] = job
+        await self._queues[kind].put(job)
+        return job
+
+    async def _update(self, job: Job, **fields) -> None:
+        for key, value in fields.items():
+            setattr(job, key, value)
+        job.version += 1
+        async with job.changed:
+            job.changed.notify_all()
+
+    async def _worker(self, kind: str) -> None:
+        fn = self._kinds[kind][0]
+        queue = self._queues[kind]
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await queue.get()
+            pool = self._pools[kind]
+            try:
+                await self._update(job, status="running", started_at=time.time())
+                result = await loop.run_in_executor(pool, fn, *job.args)
+                if kind == "export":
+                    await loop.run_in_executor(None, self._register_export, result["path"])
+                await self._update(job, status="done", result=result, finished_at=time.time())
+            except asyncio.CancelledError:
+                raise
+            except BrokenExecutor as e:
+                # Um processo do pool morreu: recria o pool para os próximos jobs
+                await self._update(job, status="failed", error=str(e), finished_at=time.time())
+                if self._pools[kind] is pool:
+                    self._restart_pool(kind)
+            except Exception as e:
+                await self._update(job, status="failed", error=str(e), finished_at=time.time())
+            finally:
+                # Libera a entrada (imagem, páginas) da memória
+                job.args = ()
+                queue.task_done()
+
+    def _register_export(self, path: str) -> None:
+        """
+        Registra o PDF no índice de EXPORTS_DIR, para a limpeza da pasta
+        alcançá-lo (sem chave: o servidor não reaproveita exportações).
+        """
+        if manages(self.exports_dir):
+            ExportCache(self.exports_dir).put(path, None)
+
+    def _restart_pool(self, kind: str) -> None:
+        _fn, workers, pool_cls = self._kinds[kind]
+        old = self._pools[kind]
+        self._pools[kind] = pool_cls(max_workers=max(1, workers))
+        old.shutdown(wait=False, cancel_futures=True)
+
+    async def _prune_loop(self) -> None:
+        """Remove periodicamente jobs concluídos há mais que a retenção."""
+        while True:
+            await asyncio.sleep(60)
+            limit = time.time() - JOB_SERVER_RETENTION_S
+            for job_id in [
+                j.id for j in self.jobs.values() if j.is_final and j.finished_at < limit
+            ]:
+                del self.jobs[job_id]
+
+    # ─── HTTP ──────────────────────────────────────────────────────────────
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            method, path, query, body = await self._read_request(reader)
+            await self._route(writer, method, path, query, body)
+        except HttpError as e:
+            await self._send_json(writer, e.status, {"error": str(e)})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            await self._send_json(writer, 500, {"error": str(e)})
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        request_line = await reader.readline()
+        try:
+            method, target, _version = request_line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise HttpError(400, "Requisição inválida.")
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            headers[key.strip().lower()] = value.strip()
+
+        length = int(headers.get("content-length") or 0)
+        if length > JOB_SERVER_MAX_BODY:
+            raise HttpError(413, "Corpo da requisição muito grande.")
+        body = await reader.readexactly(length) if length else b""
+
+        url = urlsplit(target)
+        return method.upper(), url.path.rstrip("/") or "/", parse_qs(url.query), body
+
+    async def _route(self, writer, method: str, path: str, query: dict, body: bytes):
+        parts = path.strip("/").split("/")
+
+        if method == "GET" and path == "/health":
+            await self._send_json(
+                writer,
+                200,
+                {
+                    "ok": True,
+                    "queued": {k: q.qsize() for k, q in self._queues.items()},
+                    "jobs": len(self.jobs),
+                },
+            )
+            return
+
+        if method == "POST" and len(parts) == 2 and parts[0] == "jobs":
+            job = await self._submit_from_request(parts[1], query, body)
+            await self._send_json(writer, 202, job.to_dict())
+            return
+
+        if method == "GET" and len(parts) >= 2 and parts[0] == "jobs":
+            job = self.jobs.get(parts[1])
+            if job is None:
+                raise HttpError(404, "Job não encontrado.")
+            if len(parts) == 2:
+                await self._send_json(writer, 200, job.to_dict())
+            elif parts[2] == "events":
+                await self._stream_events(writer, job)
+            elif parts[2] == "file":
+                await self._send_file(writer, job)
+            else:
+                raise HttpError(404, "Rota não encontrada.")
+            return
+
+        raise HttpError(404, "Rota não encontrada.")
+
+    async def _submit_from_request(self, kind: str, query: dict, body: bytes) -> Job:
+        if kind == "ocr":
+            if not body:
+                raise HttpError(400, "Envie os bytes da imagem no corpo.")
+            # Perfil de OCR: lang, psm e oem opcionais na query string
+            profile = {}
+            try:
+                for key, cast in (("lang", str), ("psm", int), ("oem", int)):
+                    if key in query:
+                        profile[key] = cast(query[key][0])
+            except ValueError:
+                raise HttpError(400, "Parâmetros de OCR inválidos.")
+            return await self.submit("ocr", body, profile)
+
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            raise HttpError(400, "JSON inválido.")
+
+        if kind == "translate":
+            texts = payload.get("texts")
+            if not isinstance(texts, list):
+                raise HttpError(400, "Campo 'texts' (lista) é obrigatório.")
+            return await self.submit("translate", texts)
+
+        if kind == "export":
+            pages = payload.get("pages")
+            if not isinstance(pages, list):
+                raise HttpError(400, "Campo 'pages' (lista) é obrigatório.")
+            title = payload.get("title", "")
+            # Só o nome do arquivo: nunca grava fora do diretório de exportação
+            filename = os.path.basename(payload.get("filename") or "") or None
+            return await self.submit("export", title, pages, filename, self.exports_dir)
+
+        raise HttpError(404, f"Tipo de job desconhecido: '{kind}'.")
+
+    async def _stream_events(self, writer, job: Job) -> None:
+        """
+        Envia o status como NDJSON a cada mudança, até o job terminar. Sem
+        mudanças por `heartbeat_s`, reenvia o mesmo status: o cliente distingue
+        um job demorado de uma conexão parada.
+        """
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: application/x-ndjson\r\n"
+            b"Transfer-Encoding: chunked\r\n"
+            b"Connection: close\r\n\r\n"
+        )
+        seen = -1
+        while True:
+            async with job.changed:
+                if job.version == seen:
+                    try:
+                        await asyncio.wait_for(job.changed.wait(), self.heartbeat_s)
+                    except asyncio.TimeoutError:
+                        pass  # Heartbeat
+            seen = job.version
+            line = json.dumps(job.to_dict(), ensure_ascii=False).encode("utf-8") + b"\n"
+            writer.write(f"{len(line):X}\r\n".encode("ascii") + line + b"\r\n")
+            await writer.drain()
+            if job.is_final:
+                break
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    async def _send_file(self, writer, job: Job) -> None:
+        if job.kind != "export" or job.status != "done":
+            raise HttpError(409, "O arquivo ainda não está disponível.")
+        try:
+            with open(job.result["path"], "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            raise HttpError(410, "O arquivo já foi removido da pasta de exportações.")
+        await self._send(writer, 200, data, "application/pdf")
+
+    async def _send_json(self, writer, status: int, payload: dict) -> None:
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        await self._send(writer, status, data, "application/json; charset=utf-8")
+
+    async def _send(self, writer, status: int, data: bytes, content_type: str) -> None:
+        reason = HTTPStatus(status).phrase
+        writer.write(
+            (
+                f"HTTP/1.1 {status} {reason}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(data)}\r\n"
+                "Connection: close\r\n\r\n"
+            ).encode("latin-1")
+            + data
+        )
+        await writer.drain()
+
+
+def run_server(host: str = JOB_SERVER_HOST, port: int = JOB_SERVER_PORT, **kwargs) -> None:
+    """Executa o servidor até Ctrl+C (bloqueante)."""
+    server = JobServer(host=host, port=port, **kwargs)
+
+    async def main():
+        await server.start()
+        print(f"Servidor de jobs em {server.url} (Ctrl+C para encerrar)", flush=True)
+        try:
+            await server._server.serve_forever()
+        finally:
+            await server.stop()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,59 @@
+"""
+Tarefas executadas pelos workers do servidor de jobs.
+Funções de módulo (serializáveis) para rodar em pools de processos/threads.
+"""
+
+import functools
+import io
+import os
+
+from typing import Optional
+
+
+def _portable_errors(fn):
+    """
+    Converte exceções em RuntimeError: algumas exceções de bibliotecas não
+    são serializáveis e derrubariam o worker do pool de processos.
+    """
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            raise RuntimeError(str(e) or type(e).__name__) from None
+
+    return wrapper
+
+
+@_portable_errors
+def run_ocr(image_bytes: bytes, profile: Optional[dict] = None) -> dict:
+    """Decodifica a imagem e extrai o texto com o Tesseract (perfil de OCR)."""
+    from PIL import Image
+
+    from src.services.ocr_service import OCRService
+
+    image = Image.open(io.BytesIO(image_bytes))
+    text = OCRService(profile).extract_from_image(image)
+    return {"text": text}
+
+
+@_portable_errors
+def run_translate(texts: list[str]) -> dict:
+    """Traduz uma lista de textos com o provedor configurado no servidor."""
+    from src.services.translation_cache import get_translation_cache
+    from src.services.translation_service import TranslationService
+
+    cache = get_translation_cache()
+    translations = TranslationService(cache=cache).translate_many(texts)
+    cache.save()
+    return {"translations": translations}
+
+
+@_portable_errors
+def run_export(title: str, pages: list[dict], filename: str, exports_dir: str) -> dict:
+    """Gera o PDF no diretório de exportação do servidor."""
+    from src.services.pdf_service import PDFService
+
+    path = PDFService(exports_dir=exports_dir).generate_pdf(title, pages, filename)
+    return {"path": path, "size": os.path.getsize(path)}
@@ -0,0 +1,288 @@
+"""
+Tradução em massa - Traduz todas as páginas sem tradução de uma extração.
+Roda em background, traduz blocos de páginas em paralelo, usa o cache de
+frases e grava cada bloco numa única escrita no banco.
+
+Retomada após falha: o progresso fica nas próprias páginas (só páginas sem
+tradução são processadas) e o job fica registrado na tabela "jobs" com
+status "running" até terminar. O registro guarda o dono (pid e máquina) e é
+renovado periodicamente: um job "running" cujo dono morreu ou que parou de
+renovar foi interrompido e pode ser retomado; os demais estão rodando em
+outro processo (ex.: aldemarvin-cli translate).
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Callable, Optional
+
+from src.config import (
+    BULK_TRANSLATE_BATCH_PAGES,
+    BULK_TRANSLATE_CACHE_SAVE_S,
+    BULK_TRANSLATE_HEARTBEAT_S,
+    BULK_TRANSLATE_STALE_S,
+    BULK_TRANSLATE_WORKERS,
+)
+from src.services.translation_cache import get_translation_cache
+from src.services.translation_service import TranslationService
+from src.utils import profiling
+
+logger = logging.getLogger(__name__)
+
+JOB_KIND = "translate_all"
+
+# Jobs ativos neste processo: extraction_id → job
+_running: dict[int, "BulkTranslateJob"] = {}
+_running_lock = threading.Lock()
+
+
+def get_running_job(extraction_id: int) -> Optional["BulkTranslateJob"]:
+    """Retorna o job de tradução em execução para a extração, se houver."""
+    with _running_lock:
+        return _running.get(extraction_id)
+
+
+def get_running_jobs() -> list["BulkTranslateJob"]:
+    """Retorna todos os jobs de tradução em execução neste processo."""
+    with _running_lock:
+        return list(_running.values())
+
+
+def get_interrupted_jobs(db_manager) -> list[dict]:
+    """Jobs gravados como "running" que nenhum processo está executando."""
+    return [
+        job
+        for job in db_manager.get_jobs(kind=JOB_KIND, status="running")
+        if get_running_job(job["extraction_id"]) is None and is_interrupted(job)
+    ]
+
+
+def is_interrupted(job: dict, stale_s: float = BULK_TRANSLATE_STALE_S) -> bool:
+    """
+    Se o job "running" ficou sem dono: o processo que o registrou morreu
+    (mesma máquina) ou o registro não é renovado há mais de `stale_s`.
+    """
+    owner = job.get("owner") or {}
+    if owner.get("host") == socket.gethostname():
+        pid = owner.get("pid")
+        if pid == os.getpid():
+            return True  # Deste processo, mas fora de _running: terminou sem atualizar
+        if pid is not None and _pid_alive(pid) is False:
+            return True
+    try:
+        updated = datetime.fromisoformat(job.get("updated_at") or "")
+    except ValueError:
+        return True
+    return (datetime.now() - updated).total_seconds() > stale_s
+
+
+def _pid_alive(pid: int) -> Optional[bool]:
+    """Se o processo existe (None = não dá para saber nesta plataforma)."""
+    if os.name == "nt":
+        return None  # os.kill(pid, 0) encerraria o processo no Windows
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Existe, de outro usuário
+    return True
+
+
+class BulkTranslateJob:
+    """Job de tradução de todas as páginas não traduzidas de uma extração."""
+
+    def __init__(
+        self,
+        db_manager,
+        extraction_id: int,
+        translator: Optional[TranslationService] = None,
+        workers: int = BULK_TRANSLATE_WORKERS,
+        batch_pages: int = BULK_TRANSLATE_BATCH_PAGES,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ):
+        self.db = db_manager
+        self.extraction_id = extraction_id
+        self.translator = translator or TranslationService(
+            cache=get_translation_cache()
+        )
+        self.workers = max(1, workers)
+        self.batch_pages = max(1, batch_pages)
+        self.on_progress = on_progress
+
+        self.done = 0
+        self.total = 0
+        self.status = "pending"
+        self.error = ""
+        self.job_id: Optional[int] = None
+        self._cancel = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._cache_saved_at = time.monotonic()
+        self._heartbeat_at = time.monotonic()
+
+    # ─── Controle ──────────────────────────────────────────────────────────
+
+    def start(self) -> "BulkTranslateJob":
+        """
+        Executa o job numa thread em background.
+
+        O job é registrado antes de a thread começar: um segundo start() para
+        a mesma extração falha aqui, na thread de quem chamou.
+
+        Raises:
+            RuntimeError: Já existe uma tradução em andamento para a extração.
+        """
+        self._claim()
+        self.status = "running"
+        try:
+            self._thread = threading.Thread(target=self.run, daemon=True)
+            self._thread.start()
+        except Exception:
+            self._release()
+            self.status = "failed"
+            raise
+        return self
+
+    def cancel(self) -> None:
+        """Pede o cancelamento (blocos já enviados terminam e são gravados)."""
+        self._cancel.set()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        if self._thread:
+            self._thread.join(timeout)
+
+    @property
+    def is_running(self) -> bool:
+        return self.status == "running"
+
+    # ─── Execução ──────────────────────────────────────────────────────────
+
+    @profiling.profiled("translate_all")
+    def run(self) -> None:
+        """Executa o job (bloqueante)."""
+        self._claim()
+        self.status = "running"
+        try:
+            self._attach_job_record()
+            pages = self.db.get_untranslated_pages(self.extraction_id)
+            self.total = len(pages)
+            self.db.update_job(self.job_id, total=self.total, done=0)
+            self._notify()
+
+            self._translate_pages(pages)
+
+            self.status = "cancelled" if self._cancel.is_set() else "done"
+        except Exception as e:
+            self.status = "failed"
+            self.error = str(e)
+        finally:
+            try:
+                if self.job_id is not None:
+                    self.db.update_job(
+                        self.job_id, status=self.status, done=self.done, error=self.error
+                    )
+            finally:
+                self._release()
+                self._save_cache()
+                self._notify()
+
+    def _claim(self) -> None:
+        """Registra o job como o ativo da extração (idempotente para o próprio job)."""
+        with _running_lock:
+            current = _running.get(self.extraction_id)
+            if current is not None and current is not self:
+                raise RuntimeError("Já existe uma tradução em andamento para esta extração.")
+            _running[self.extraction_id] = self
+
+    def _release(self) -> None:
+        with _running_lock:
+            if _running.get(self.extraction_id) is self:
+                del _running[self.extraction_id]
+
+    def _attach_job_record(self) -> None:
+        """
+        Reaproveita o registro de um job interrompido ou cria um novo.
+
+        Raises:
+            RuntimeError: Outro processo está traduzindo a extração.
+        """
+        previous = self.db.get_jobs(
+            kind=JOB_KIND, status="running", extraction_id=self.extraction_id
+        )
+        if any(not is_interrupted(job) for job in previous):
+            raise RuntimeError("Outro processo já está traduzindo esta extração.")
+        owner = {"pid": os.getpid(), "host": socket.gethostname()}
+        if previous:
+            self.job_id = previous[-1]["id"]
+            self.db.update_job(self.job_id, owner=owner)
+        else:
+            self.job_id = self.db.create_job(JOB_KIND, self.extraction_id, owner=owner)
+        self._heartbeat_at = time.monotonic()
+
+    def _translate_pages(self, pages: list[dict]) -> None:
+        """Traduz blocos de páginas em paralelo e grava cada bloco concluído."""
+        chunks = [
+            pages[i : i + self.batch_pages]
+            for i in range(0, len(pages), self.batch_pages)
+        ]
+        chunks.reverse()  # pop() entrega na ordem original
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            in_flight = {}
+            while chunks or in_flight:
+                while chunks and len(in_flight) < self.workers and not self._cancel.is_set():
+                    chunk = chunks.pop()
+                    future = pool.submit(
+                        self.translator.translate_many,
+                        [p.get("original_text", "") for p in chunk],
+                    )
+                    in_flight[future] = chunk
+                if not in_flight:
+                    break
+
+                finished, _ = wait(
+                    in_flight, timeout=BULK_TRANSLATE_HEARTBEAT_S, return_when=FIRST_COMPLETED
+                )
+                if time.monotonic() - self._heartbeat_at >= BULK_TRANSLATE_HEARTBEAT_S:
+                    # Blocos demorados: renova o registro (ver is_interrupted)
+                    self.db.update_job(self.job_id, done=self.done)
+                    self._heartbeat_at = time.monotonic()
+                for future in finished:
+                    chunk = in_flight.pop(future)
+                    translations = future.result()
+                    self._save_chunk(chunk, translations)
+
+    def _save_chunk(self, chunk: list[dict], translations: list[str]) -> None:
+        """Grava um bloco de traduções numa única escrita."""
+        updates = {
+            page["id"]: {"translated_text": text}
+            for page, text in zip(chunk, translations)
+            if text
+        }
+        self.db.update_pages(updates)
+        self.done += len(chunk)
+        self.db.update_job(self.job_id, done=self.done)
+        self._heartbeat_at = time.monotonic()
+        # O cache é regravado inteiro: só de tempos em tempos (e no fim do job)
+        now = time.monotonic()
+        if now - self._cache_saved_at >= BULK_TRANSLATE_CACHE_SAVE_S:
+            self._save_cache()
+            self._cache_saved_at = now
+        self._notify()
+
+    def _save_cache(self) -> None:
+        """Grava o cache de frases; uma falha não afeta o job (só perde o cache)."""
+        if self.translator.cache is None:
+            return
+        try:
+            self.translator.cache.save()
+        except OSError as e:
+            logger.warning("Falha ao gravar o cache de traduções: %s", e)
+
+    def _notify(self) -> None:
+        if self.on_progress:
+            self.on_progress(self.done, self.total)
@@ -0,0 +1,236 @@
+"""
+Cache das exportações em EXPORTS_DIR.
+
+Cada arquivo exportado fica registrado num índice (EXPORT_CACHE_INDEX) com a
+chave do que o gerou: impressão digital do conteúdo da extração (mantida
+pelo DatabaseManager a cada escrita de página), título, formato e modo de
+conteúdo. Exportar de novo algo que não mudou devolve o arquivo existente
+em vez de refazer o layout.
+
+A pasta também tem limite: evict() apaga exportações sem uso há mais de
+EXPORTS_MAX_AGE_S e, se ainda passar de EXPORTS_MAX_BYTES, as usadas há mais
+tempo primeiro. O uso é marcado no mtime do arquivo.
+
+Só arquivos registrados no índice são apagados, e o cache só vale para a
+pasta gerenciada (EXPORTS_DIR, ver manages()): exportar para uma pasta do
+usuário grava o arquivo e não mexe em mais nada.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from typing import Iterable, Optional
+
+from src.config import (
+    EXPORT_CACHE_INDEX,
+    EXPORTS_DIR,
+    EXPORTS_MAX_AGE_S,
+    EXPORTS_MAX_BYTES,
+)
+from src.database.stats import FINGERPRINT_FIELD
+from src.utils import tracing
+
+# Sobras de exportações interrompidas: os temporários "<arquivo>.<uuid>.tmp"
+# e as partes do PDF paralelo (nunca outros .tmp que estejam na pasta)
+_STALE_PREFIXES = (".pdf-parts-",)
+_STALE_NAME = re.compile(r"\.[0-9a-f]{32}\.tmp$")
+_STALE_AGE_S = 3600
+
+
+def manages(exports_dir: str) -> bool:
+    """Se a pasta é a de exportações do app (a única com cache e limpeza)."""
+    return os.path.realpath(exports_dir) == os.path.realpath(EXPORTS_DIR)
+
+
+def export_key(extraction: dict, fmt: str, content: str, *extra) -> Optional[str]:
+    """
+    Chave de cache de uma exportação, ou None se a extração ainda não tem
+    impressão digital (banco antigo antes da migração).
+
+    Args:
+        extraction: Documento da extração.
+        fmt: Formato ("pdf", "txt", ...).
+        content: Modo de conteúdo (ver EXPORT_CONTENT_MODES).
+        extra: O que mais muda o arquivo (ex.: fontes do PDF).
+    """
+    fingerprint = extraction.get(FINGERPRINT_FIELD)
+    if not fingerprint:
+        return None
+    parts = [
+        fingerprint,
+        fmt,
+        content,
+        extraction.get("name", ""),
+        str(extraction.get("version", "")),
+        *map(str, extra),
+    ]
+    return hashlib.blake2b("\x00".join(parts).encode(), digest_size=16).hexdigest()
+
+
+class ExportCache:
+    """Índice dos arquivos exportados e política de limpeza da pasta."""
+
+    _lock = threading.Lock()  # Um índice por pasta, compartilhado entre instâncias
+
+    def __init__(
+        self,
+        exports_dir: str = EXPORTS_DIR,
+        max_bytes: int = EXPORTS_MAX_BYTES,
+        max_age_s: float = EXPORTS_MAX_AGE_S,
+    ):
+        self.exports_dir = exports_dir
+        self.max_bytes = max_bytes
+        self.max_age_s = max_age_s
+        self.index_path = os.path.join(exports_dir, EXPORT_CACHE_INDEX)
+
+    # ─── Índice ────────────────────────────────────────────────────────────
+
+    def _load(self) -> dict:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _save(self, index: dict) -> None:
+        os.makedirs(self.exports_dir, exist_ok=True)
+        tmp = f"{self.index_path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(index, f, ensure_ascii=False, indent=1)
+            os.replace(tmp, self.index_path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    # ─── Consulta e registro ───────────────────────────────────────────────
+
+    def get(self, path: str, key: Optional[str]) -> Optional[str]:
+        """
+        Caminho do arquivo se ele existe e foi gerado com a mesma chave
+        (e não foi alterado depois); None se precisa gerar de novo.
+        """
+        if key is None:
+            return None
+        name = os.path.basename(path)
+        with self._lock:
+            entry = self._load().get(name)
+        if not entry or entry.get("key") != key:
+            return None
+        try:
+            if os.path.getsize(path) != entry.get("size"):
+                return None
+            os.utime(path)  # Marca o uso (a limpeza apaga os menos usados)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, path: str, key: Optional[str]) -> None:
+        """
+        Registra o arquivo recém-gerado e aplica a política de limpeza.
+        Sem chave (key=None) o arquivo nunca é devolvido por get(), mas
+        continua sujeito à limpeza.
+        """
+        name = os.path.basename(path)
+        with self._lock:
+            index = self._load()
+            index[name] = {
+                "key": key,
+                "size": os.path.getsize(path),
+                "created_at": time.time(),
+            }
+            self._save(index)
+        self.evict(keep=[path])
+
+    # ─── Limpeza ───────────────────────────────────────────────────────────
+
+    def _exports(self) -> list[tuple[str, int, float]]:
+        """(caminho, bytes, último uso) dos arquivos registrados no índice."""
+        with self._lock:
+            names = list(self._load())
+        files = []
+        for name in names:
+            path = os.path.join(self.exports_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            files.append((path, stat.st_size, stat.st_mtime))
+        return files
+
+    def _remove_stale(self, now: float) -> int:
+        """Apaga temporários e partes de exportações interrompidas."""
+        freed = 0
+        try:
+            entries = list(os.scandir(self.exports_dir))
+        except FileNotFoundError:
+            return freed
+        for entry in entries:
+            if entry.is_dir():
+                stale = entry.name.startswith(_STALE_PREFIXES)
+            else:
+                stale = _STALE_NAME.search(entry.name) is not None
+            try:
+                if not stale or now - entry.stat().st_mtime < _STALE_AGE_S:
+                    continue
+                if entry.is_dir():
+                    shutil.rmtree(entry.path, ignore_errors=True)
+                else:
+                    freed += entry.stat().st_size
+                    os.remove(entry.path)
+            except FileNotFoundError:
+                continue
+        return freed
+
+    def evict(self, keep: Iterable[str] = ()) -> dict:
+        """
+        Aplica os limites de idade e tamanho da pasta.
+
+        Args:
+            keep: Arquivos que não podem ser apagados (ex.: o recém-gerado).
+
+        Returns:
+            Dict com os arquivos removidos, os bytes liberados e o total
+            que ficou na pasta.
+        """
+        keep = {os.path.abspath(path) for path in keep}
+        now = time.time()
+        with tracing.span("exports.evict") as sp:
+            freed = self._remove_stale(now)
+            files = sorted(self._exports(), key=lambda item: item[2])  # Menos usados primeiro
+            total = sum(size for _path, size, _used in files)
+            removed = []
+            for path, size, used in files:
+                if os.path.abspath(path) in keep:
+                    continue
+                too_old = self.max_age_s and now - used > self.max_age_s
+                too_big = self.max_bytes and total > self.max_bytes
+                if not (too_old or too_big):
+                    continue
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                removed.append(os.path.basename(path))
+                total -= size
+                freed += size
+
+            if removed:
+                with self._lock:
+                    index = self._load()
+                    for name in removed:
+                        index.pop(name, None)
+                    self._save(index)
+            sp.set(removed=len(removed), freed_bytes=freed)
+        return {"removed": len(removed), "freed_bytes": freed, "bytes": total}
+
+    def usage(self) -> dict:
+        """Quantidade de arquivos exportados e bytes ocupados."""
+        files = self._exports()
+        return {"files": len(files), "bytes": sum(size for _path, size, _used in files)}
@@ -0,0 +1,344 @@
+"""
+Exportadores de texto - TXT, Markdown e EPUB sem o custo de layout do PDF.
+
+Recebem as páginas de um iterador (DatabaseManager.iter_pages) e escrevem
+direto no arquivo, uma página por vez: a memória usada não cresce com o
+tamanho do livro. O arquivo é gravado num temporário e renomeado no fim,
+então uma exportação interrompida não deixa arquivo pela metade.
+
+Uso:
+    path = export_extraction(db, 3, "epub", content="merged")
+"""
+
+import html
+import os
+import uuid
+import zipfile
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+from src.config import EXPORT_CONTENT_MODES, EXPORTS_DIR
+from src.services.export_cache import ExportCache, export_key, manages
+from src.services.translation_service import TranslationService
+from src.utils import tracing
+
+
+def page_text(page: dict, content: str = "translated") -> str:
+    """
+    Texto da página no modo pedido.
+
+    Args:
+        page: Documento da página.
+        content: "translated" (tradução ou, se não houver, o original),
+                 "original" ou "merged" (tradução + original linha a linha).
+    """
+    original = page.get("original_text", "") or ""
+    translated = page.get("translated_text", "") or ""
+    if content == "translated":
+        return translated or original
+    if content == "original":
+        return original
+    if content == "merged":
+        return TranslationService.merge_texts(original, translated)
+    raise ValueError(
+        f"Conteúdo de exportação inválido: '{content}'. "
+        f"Use: {', '.join(EXPORT_CONTENT_MODES)}."
+    )
+
+
+def safe_filename(name: str) -> str:
+    """Nome de arquivo sem caracteres problemáticos (como no PDF)."""
+    return "".join(c if c.isalnum() or c in (" ", "-", "_") else "_" for c in name).strip()
+
+
+class Exporter:
+    """Base: abre o temporário, escreve cabeçalho, páginas e rodapé, renomeia."""
+
+    extension = ""
+
+    def export(
+        self,
+        title: str,
+        pages: Iterable[dict],
+        output_path: str,
+        content: str = "translated",
+    ) -> str:
+        """
+        Exporta as páginas (na ordem do iterador) para `output_path`.
+
+        Returns:
+            Caminho do arquivo gerado.
+        """
+        page_text({}, content)  # Valida o modo antes de criar o arquivo
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        tmp = f"{output_path}.{uuid.uuid4().hex}.tmp"
+        count = 0
+        with tracing.span(f"export.{self.extension}", content=content) as sp:
+            try:
+                with self._open(tmp) as out:
+                    self.begin(out, title)
+                    for page in pages:
+                        self.write_page(out, page, page_text(page, content))
+                        count += 1
+                    self.end(out, title, count)
+                os.replace(tmp, output_path)
+            finally:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+            sp.set(pages=count, bytes=os.path.getsize(output_path))
+        return output_path
+
+    def _open(self, path: str):
+        return open(path, "w", encoding="utf-8", newline="\n")
+
+    def begin(self, out, title: str) -> None:
+        pass
+
+    def write_page(self, out, page: dict, text: str) -> None:
+        raise NotImplementedError
+
+    def end(self, out, title: str, count: int) -> None:
+        pass
+
+
+class TextExporter(Exporter):
+    """Texto puro, com um separador por página."""
+
+    extension = "txt"
+
+    def begin(self, out, title: str) -> None:
+        out.write(f"{title}\n{'=' * len(title)}\n")
+
+    def write_page(self, out, page: dict, text: str) -> None:
+        out.write(f"\n--- Página {page.get('page_number', '?')} ---\n\n")
+        out.write(text.strip())
+        out.write("\n")
+
+
+class MarkdownExporter(Exporter):
+    """Markdown: uma seção por página, quebras de linha do OCR preservadas."""
+
+    extension = "md"
+
+    def begin(self, out, title: str) -> None:
+        out.write(f"# {title}\n")
+
+    def write_page(self, out, page: dict, text: str) -> None:
+        out.write(f"\n## Página {page.get('page_number', '?')}\n\n")
+        for line in text.strip().splitlines():
+            line = line.rstrip()
+            # "#", ">", "-" no início da linha do OCR não viram formatação
+            if line[:1] in ("#", ">", "-", "+", "*", "="):
+                line = "\\" + line
+            line = line.replace("<", "\\<")  # Sem HTML embutido
+            # Dois espaços no fim = quebra de linha (sem juntar em parágrafo)
+            out.write(f"{line}  \n" if line else "\n")
+
+
+class EpubExporter(Exporter):
+    """
+    EPUB 3 (com toc.ncx para leitores EPUB 2): um XHTML por página, gravado
+    no zip assim que é gerado; só o índice fica na memória até o fim.
+    """
+
+    extension = "epub"
+
+    def __init__(self, language: str = "pt-BR"):
+        self.language = language
+        self._entries: list[tuple[str, str]] = []  # (id do arquivo, rótulo)
+
+    def _open(self, path: str):
+        return zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED)
+
+    def _xhtml(self, title: str, body: str) -> str:
+        return (
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            '<!DOCTYPE html>\n'
+            f'<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops" '
+            f'xml:lang="{self.language}" lang="{self.language}">\n'
+            f"<head><title>{html.escape(title)}</title></head>\n"
+            f"<body>\n{body}\n</body>\n</html>\n"
+        )
+
+    def begin(self, out: zipfile.ZipFile, title: str) -> None:
+        self._entries = []
+        # O mimetype precisa ser o primeiro arquivo, sem compressão
+        out.writestr("mimetype", "application/epub+zip", compress_type=zipfile.ZIP_STORED)
+        out.writestr(
+            "META-INF/container.xml",
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            '<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">\n'
+            '  <rootfiles>\n'
+            '    <rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/>\n'
+            "  </rootfiles>\n"
+            "</container>\n",
+        )
+
+    def write_page(self, out: zipfile.ZipFile, page: dict, text: str) -> None:
+        number = page.get("page_number", "?")
+        file_id = f"page_{len(self._entries) + 1:05d}"
+        label = f"Página {number}"
+        paragraphs = "\n".join(
+            "<p>" + "<br/>".join(html.escape(line.strip()) for line in block.splitlines()) + "</p>"
+            for block in text.strip().split("\n\n")
+            if block.strip()
+        )
+        out.writestr(
+            f"OEBPS/{file_id}.xhtml",
+            self._xhtml(label, f"<h2>{html.escape(label)}</h2>\n{paragraphs}"),
+        )
+        self._entries.append((file_id, label))
+
+    def end(self, out: zipfile.ZipFile, title: str, count: int) -> None:
+        escaped = html.escape(title)
+        book_id = f"urn:uuid:{uuid.uuid4()}"
+        modified = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+        out.writestr(
+            "OEBPS/title.xhtml",
+            self._xhtml(
+                title,
+                f"<h1>{escaped}</h1>\n<p>Total de páginas: {count}</p>\n"
+                "<p><em>Gerado por Aldemarvin Extractor</em></p>",
+            ),
+        )
+        nav_items = "\n".join(
+            f'<li><a href="{file_id}.xhtml">{html.escape(label)}</a></li>'
+            for file_id, label in self._entries
+        )
+        out.writestr(
+            "OEBPS/nav.xhtml",
+            self._xhtml(title, f'<nav epub:type="toc"><h1>{escaped}</h1>\n<ol>\n{nav_items}\n</ol></nav>'),
+        )
+        nav_points = "\n".join(
+            f'<navPoint id="{file_id}" playOrder="{i}"><navLabel><text>{html.escape(label)}</text>'
+            f'</navLabel><content src="{file_id}.xhtml"/></navPoint>'
+            for i, (file_id, label) in enumerate(self._entries, start=1)
+        )
+        out.writestr(
+            "OEBPS/toc.ncx",
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            '<ncx xmlns="http://www.daisy.org/z3986/2005/ncx/" version="2005-1">\n'
+            f'<head><meta name="dtb:uid" content="{book_id}"/></head>\n'
+            f"<docTitle><text>{escaped}</text></docTitle>\n"
+            f"<navMap>\n{nav_points}\n</navMap>\n</ncx>\n",
+        )
+
+        manifest = "\n".join(
+            f'    <item id="{file_id}" href="{file_id}.xhtml" media-type="application/xhtml+xml"/>'
+            for file_id, _label in self._entries
+        )
+        spine = "\n".join(f'    <itemref idref="{file_id}"/>' for file_id, _label in self._entries)
+        out.writestr(
+            "OEBPS/content.opf",
+            '<?xml version="1.0" encoding="utf-8"?>\n'
+            '<package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="book-id">\n'
+            '  <metadata xmlns:dc="http://purl.org/dc/elements/1.1/">\n'
+            f'    <dc:identifier id="book-id">{book_id}</dc:identifier>\n'
+            f"    <dc:title>{escaped}</dc:title>\n"
+            f"    <dc:language>{self.language}</dc:language>\n"
+            f'    <meta property="dcterms:modified">{modified}</meta>\n'
+            "  </metadata>\n"
+            "  <manifest>\n"
+            '    <item id="title" href="title.xhtml" media-type="application/xhtml+xml"/>\n'
+            '    <item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>\n'
+            '    <item id="ncx" href="toc.ncx" media-type="application/x-dtbncx+xml"/>\n'
+            f"{manifest}\n"
+            "  </manifest>\n"
+            '  <spine toc="ncx">\n'
+            '    <itemref idref="title"/>\n'
+            f"{spine}\n"
+            "  </spine>\n"
+            "</package>\n",
+        )
+        self._entries = []
+
+
+EXPORTERS = {
+    "txt": TextExporter,
+    "md": MarkdownExporter,
+    "epub": EpubExporter,
+}
+
+
+def export_extraction(
+    db_manager,
+    extraction_id: int,
+    fmt: str = "pdf",
+    content: str = "translated",
+    exports_dir: str = EXPORTS_DIR,
+    filename: Optional[str] = None,
+    workers: int = 1,
+    pdf_service=None,
+    use_cache: bool = True,
+) -> str:
+    """
+    Exporta uma extração no formato pedido ("pdf", "txt", "md" ou "epub").
+
+    Os formatos de texto leem as páginas em lotes (iter_pages); o PDF
+    continua montado em memória pelo PDFService, em `workers` processos.
+    Se o arquivo já foi exportado com o mesmo conteúdo (impressão digital
+    da extração), ele é devolvido sem gerar de novo (ver export_cache).
+    Cache e limpeza só valem para EXPORTS_DIR: noutra pasta o arquivo é
+    apenas gravado.
+
+    Args:
+        pdf_service: Serviço de PDF a usar (ex.: RemotePDFService); o
+                     padrão é um PDFService local em exports_dir.
+        use_cache: False força gerar o arquivo de novo.
+
+    Returns:
+        Caminho do arquivo gerado.
+    """
+    extraction = db_manager.get_extraction(extraction_id)
+    if not extraction:
+        raise ValueError(f"Extração {extraction_id} não encontrada.")
+    title = f"{extraction['name']} - v{extraction.get('version', '')}"
+    if filename is None:
+        filename = safe_filename(
+            f"{extraction['name']}_{extraction.get('version', '')}_{extraction.get('doc_type', '')}"
+        )
+
+    extra = [filename]
+    if fmt == "pdf":
+        if pdf_service is None:
+            from src.services.pdf_service import PDFService
+
+            pdf_service = PDFService(exports_dir=exports_dir)
+        exports_dir = pdf_service.exports_dir
+        fonts = getattr(pdf_service, "fonts", None)
+        if fonts is not None:
+            extra.append(sorted(fonts.faces().items()))  # Outra fonte, outro PDF
+        output_path = os.path.join(exports_dir, f"{filename}.pdf")
+    else:
+        exporter_class = EXPORTERS.get(fmt)
+        if exporter_class is None:
+            raise ValueError(
+                f"Formato de exportação inválido: '{fmt}'. Use: pdf, {', '.join(EXPORTERS)}."
+            )
+        output_path = os.path.join(exports_dir, f"{filename}.{exporter_class.extension}")
+    page_text({}, content)
+
+    # A chave usa a impressão digital lida antes das páginas: se uma página
+    # mudar durante a exportação, a próxima verá outra impressão e refaz.
+    cache = ExportCache(exports_dir) if manages(exports_dir) else None
+    key = export_key(extraction, fmt, content, *extra) if use_cache else None
+    with tracing.span("export.extraction", format=fmt) as sp:
+        cached = cache.get(output_path, key) if cache is not None else None
+        sp.set(cache_hit=int(cached is not None))
+        if cached is not None:
+            return cached
+
+        if fmt == "pdf":
+            pages = [
+                {**page, "translated_text": page_text(page, content)}
+                for page in db_manager.iter_pages(extraction_id)
+            ]
+            path = pdf_service.generate_pdf(title, pages, filename, workers=workers)
+        else:
+            path = exporter_class().export(
+                title, db_manager.iter_pages(extraction_id), output_path, content
+            )
+        if cache is not None:
+            cache.put(path, key)
+    return path
@@ -0,0 +1,361 @@
+"""
+Pasta monitorada - Inclui como páginas as imagens salvas numa pasta.
+
+Detecta arquivos novos com inotify (Linux) ou, na falta dele, varrendo a
+pasta periodicamente. Um arquivo só é processado depois de ficar
+WATCH_SETTLE_S sem mudar de tamanho/data (evita ler imagens pela metade).
+O OCR (e a tradução, opcional) roda num pool de workers; as páginas são
+gravadas em lotes, sempre na ordem de chegada, e as imagens incluídas são
+movidas para a subpasta WATCH_DONE_DIR.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from src.config import (
+    WATCH_BATCH_PAGES,
+    WATCH_DONE_DIR,
+    WATCH_EXTENSIONS,
+    WATCH_FAILED_DIR,
+    WATCH_FLUSH_S,
+    WATCH_POLL_INTERVAL_S,
+    WATCH_SETTLE_S,
+    WATCH_WORKERS,
+)
+
+
+def _is_image(name: str) -> bool:
+    return name.lower().endswith(WATCH_EXTENSIONS) and not name.startswith(".")
+
+
+# ─── Fontes de eventos ─────────────────────────────────────────────────────
+
+
+class _PollingSource:
+    """Varre a pasta e devolve todos os arquivos de imagem presentes."""
+
+    def __init__(self, folder: str, interval: float = WATCH_POLL_INTERVAL_S):
+        self.folder = folder
+        self.interval = interval
+
+    def wait(self, timeout: float) -> list[str]:
+        time.sleep(min(timeout, self.interval))
+        try:
+            with os.scandir(self.folder) as entries:
+                return [e.name for e in entries if e.is_file() and _is_image(e.name)]
+        except FileNotFoundError:
+            return []
+
+    def close(self) -> None:
+        pass
+
+
+class _InotifySource:
+    """Eventos de escrita concluída / arquivo movido para a pasta (Linux)."""
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    _EVENT = struct.Struct("iIII")  # wd, mask, cookie, len
+
+    def __init__(self, folder: str):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 falhou")
+        wd = libc.inotify_add_watch(
+            self.fd, os.fsencode(folder), self.IN_CLOSE_WRITE | self.IN_MOVED_TO
+        )
+        if wd < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch falhou para {folder}")
+
+    def wait(self, timeout: float) -> list[str]:
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        names = []
+        offset = 0
+        while offset < len(data):
+            _wd, _mask, _cookie, length = self._EVENT.unpack_from(data, offset)
+            offset += self._EVENT.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+            if _is_image(name):
+                names.append(name)
+        return names
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def _open_source(folder: str, polling: bool):
+    """inotify quando disponível; senão, polling."""
+    if not polling and hasattr(os, "O_CLOEXEC"):
+        try:
+            return _InotifySource(folder)
+        except (OSError, AttributeError):
+            pass
+    return _PollingSource(folder)
+
+
+# ─── Watcher ───────────────────────────────────────────────────────────────
+
+
+class FolderWatcher:
+    """Monitora a pasta de uma extração e inclui as imagens novas como páginas."""
+
+    def __init__(
+        self,
+        db_manager,
+        extraction_id: int,
+        folder: str,
+        translate: bool = False,
+        workers: int = WATCH_WORKERS,
+        batch_pages: int = WATCH_BATCH_PAGES,
+        settle_s: float = WATCH_SETTLE_S,
+        flush_s: float = WATCH_FLUSH_S,
+        polling: bool = False,
+        lang: Optional[str] = None,
+        ocr=None,
+        translator=None,
+        on_event: Optional[Callable[..., None]] = None,
+    ):
+        if not os.path.isdir(folder):
+            raise FileNotFoundError(f"Pasta não encontrada: {folder}")
+
+        self.db = db_manager
+        self.extraction_id = extraction_id
+        self.folder = os.path.abspath(folder)
+        self.translate = translate
+        self.workers = max(1, workers)
+        self.batch_pages = max(1, batch_pages)
+        self.settle_s = settle_s
+        self.flush_s = flush_s
+        self.polling = polling
+        self.lang = lang
+        self.on_event = on_event
+
+        if ocr is None:
+            from src.services.ocr_service import ocr_for_extraction
+
+            ocr = ocr_for_extraction(db_manager, extraction_id)
+        self.ocr = ocr
+        if translate and translator is None:
+            from src.services.translation_cache import get_translation_cache
+            from src.services.translation_service import TranslationService
+
+            translator = TranslationService(cache=get_translation_cache())
+        self.translator = translator
+
+        self.pages_added = 0
+        self.failed = 0
+        self.mode = ""
+        self._cancel = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        # nome → (tamanho, mtime, instante da última mudança), em ordem de detecção
+        self._pending: dict[str, tuple[int, float, float]] = {}
+        # Arquivos já enviados ao pool nesta execução
+        self._seen: set[str] = set()
+        # Ordem de chegada → future; resultados gravados estritamente em ordem
+        self._futures: dict[int, tuple[str, Future]] = {}
+        self._next_seq = 0
+        self._next_commit = 0
+        self._buffer: list[tuple[str, dict]] = []
+        self._last_flush = time.monotonic()
+
+    # ─── Controle ──────────────────────────────────────────────────────────
+
+    def start(self, until_idle: bool = False) -> "FolderWatcher":
+        """Executa o watcher numa thread em background."""
+        self._thread = threading.Thread(target=self.run, args=(until_idle,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Pede a parada (OCRs em andamento terminam e são gravados)."""
+        self._cancel.set()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        if self._thread:
+            self._thread.join(timeout)
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    # ─── Execução ──────────────────────────────────────────────────────────
+
+    def run(self, until_idle: bool = False) -> None:
+        """
+        Loop de monitoramento (bloqueante, até stop()).
+
+        Args:
+            until_idle: Encerra sozinho quando não houver mais imagens
+                        pendentes (processa o que está na pasta e sai).
+        """
+        source = _open_source(self.folder, self.polling)
+        self.mode = "polling" if isinstance(source, _PollingSource) else "inotify"
+        self._emit("started", folder=self.folder, mode=self.mode)
+
+        # Imagens que já estavam na pasta entram primeiro, por data
+        self._detect(self._existing_images())
+
+        tick = min(self.settle_s / 2 or 0.1, WATCH_POLL_INTERVAL_S)
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            try:
+                while not self._cancel.is_set():
+                    self._detect(source.wait(tick))
+                    self._submit_ready(pool)
+                    self._collect()
+                    if until_idle and not self._pending and not self._futures:
+                        break
+            finally:
+                source.close()
+                # Aguarda o que já foi enviado e grava o restante
+                for _name, future in list(self._futures.values()):
+                    future.exception()
+                self._collect(final=True)
+                if self.translator is not None and self.translator.cache is not None:
+                    self.translator.cache.save()
+                self._emit("stopped", pages_added=self.pages_added, failed=self.failed)
+
+    def _existing_images(self) -> list[str]:
+        entries = []
+        with os.scandir(self.folder) as it:
+            for entry in it:
+                if entry.is_file() and _is_image(entry.name):
+                    entries.append((entry.stat().st_mtime, entry.name))
+        return [name for _mtime, name in sorted(entries)]
+
+    def _detect(self, names: list[str]) -> None:
+        for name in names:
+            if name not in self._seen and name not in self._pending:
+                self._pending[name] = (-1, 0.0, time.monotonic())
+
+    def _submit_ready(self, pool: ThreadPoolExecutor) -> None:
+        """Envia ao pool os arquivos estáveis há WATCH_SETTLE_S."""
+        now = time.monotonic()
+        ready = []
+        for name, (size, mtime, changed_at) in list(self._pending.items()):
+            try:
+                st = os.stat(os.path.join(self.folder, name))
+            except FileNotFoundError:
+                del self._pending[name]  # Removido antes de ser processado
+                continue
+
+            if (st.st_size, st.st_mtime) != (size, mtime):
+                self._pending[name] = (st.st_size, st.st_mtime, now)
+                continue
+            if st.st_size == 0 or now - changed_at < self.settle_s:
+                continue
+            ready.append((st.st_mtime, name))
+
+        # Arquivos liberados juntos seguem a data de gravação
+        for _mtime, name in sorted(ready):
+            del self._pending[name]
+            self._seen.add(name)
+            future = pool.submit(self._process, os.path.join(self.folder, name))
+            self._futures[self._next_seq] = (name, future)
+            self._next_seq += 1
+
+    def _process(self, path: str) -> dict:
+        """OCR (+ tradução) de uma imagem — executa no pool."""
+        from PIL import Image
+
+        with Image.open(path) as image:
+            image.load()
+            text = self.ocr.extract_from_image(image, lang=self.lang)
+            image_hash = self.db.images.put(image)
+        page = {"original_text": text, "image_hash": image_hash}
+        if self.translator is not None and text:
+            page["translated_text"] = self.translator.translate(text)
+        return page
+
+    def _collect(self, final: bool = False) -> None:
+        """Move resultados prontos (em ordem) para o lote e grava quando cheio."""
+        while self._next_commit in self._futures:
+            name, future = self._futures[self._next_commit]
+            if not future.done():
+                break
+            del self._futures[self._next_commit]
+            self._next_commit += 1
+
+            error = future.exception()
+            if error is not None:
+                self.failed += 1
+                self._move(name, WATCH_FAILED_DIR)
+                self._emit("error", file=name, message=str(error))
+            else:
+                self._buffer.append((name, future.result()))
+
+        due = time.monotonic() - self._last_flush >= self.flush_s
+        if self._buffer and (final or due or len(self._buffer) >= self.batch_pages):
+            self._flush()
+
+    def _flush(self) -> None:
+        """
+        Grava o lote numa única escrita e move as imagens incluídas.
+
+        Se a escrita falhar, nada sai do lote antes da hora: as imagens não
+        gravadas continuam na pasta e voltam para a fila de espera (são
+        processadas de novo, nesta execução ou na próxima).
+        """
+        while self._buffer:
+            batch = self._buffer[: self.batch_pages]
+            try:
+                page_ids = self.db.add_pages(
+                    self.extraction_id, [page for _name, page in batch]
+                )
+            except Exception as e:
+                self._requeue(e)
+                break
+            del self._buffer[: self.batch_pages]
+            self.pages_added += len(page_ids)
+            for (name, _page), page_id in zip(batch, page_ids):
+                self._move(name, WATCH_DONE_DIR)
+                self._emit("page", file=name, page_id=page_id)
+        if self.translator is not None and self.translator.cache is not None:
+            self.translator.cache.save()
+        self._last_flush = time.monotonic()
+
+    def _requeue(self, error: Exception) -> None:
+        """Devolve as imagens do lote não gravado para a fila de espera."""
+        now = time.monotonic()
+        for name, _page in self._buffer:
+            self._emit("error", file=name, message=f"Falha ao gravar no banco: {error}")
+            self._seen.discard(name)
+            self._pending[name] = (-1, 0.0, now)
+        self._buffer.clear()
+
+    def _move(self, name: str, subdir: str) -> None:
+        """Move a imagem para a subpasta, sem sobrescrever arquivos existentes."""
+        target_dir = os.path.join(self.folder, subdir)
+        os.makedirs(target_dir, exist_ok=True)
+        target = os.path.join(target_dir, name)
+        if os.path.exists(target):
+            stem, ext = os.path.splitext(name)
+            target = os.path.join(target_dir, f"{stem}_{time.strftime('%Y%m%d_%H%M%S')}{ext}")
+        try:
+            os.replace(os.path.join(self.folder, name), target)
+        except FileNotFoundError:
+            pass
+        # O nome pode voltar a ser usado por uma nova captura
+        self._seen.discard(name)
+
+    def _emit(self, event: str, **data) -> None:
+        if self.on_event:
+            self.on_event(event, extraction_id=self.extraction_id, **data)
@@ -0,0 +1,144 @@
+"""
+Detecção de escrita para OCR multilíngue (idioma "auto" no perfil de OCR).
+
+Carregar vários pacotes de idioma (ex.: "eng+rus+ell") em toda página deixa
+o Tesseract bem mais lento. Aqui o OSD do Tesseract identifica a escrita
+(Latin, Cyrillic, ...) das primeiras páginas de uma extração; depois de
+OCR_AUTO_SAMPLE_PAGES amostras, o conjunto mínimo de idiomas fica gravado
+na extração ("ocr_auto_lang") e as páginas seguintes não rodam mais o OSD.
+"""
+
+import functools
+import re
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Optional
+
+import pytesseract
+
+from src.config import (
+    OCR_AUTO_MIN_SCRIPT_CONFIDENCE,
+    OCR_AUTO_SAMPLE_PAGES,
+    OCR_LANG,
+    OCR_SCRIPT_LANGS,
+)
+
+AUTO_LANG = "auto"
+
+_SCRIPT_RE = re.compile(r"^Script:\s*(\S+)", re.MULTILINE)
+_CONFIDENCE_RE = re.compile(r"^Script confidence:\s*([\d.]+)", re.MULTILINE)
+
+
+@functools.lru_cache(maxsize=1)
+def installed_languages() -> frozenset:
+    """Pacotes de idioma instalados no Tesseract (consultado uma vez)."""
+    try:
+        return frozenset(pytesseract.get_languages(config=""))
+    except Exception:
+        return frozenset()
+
+
+def detect_script(image) -> tuple[Optional[str], float]:
+    """
+    Escrita predominante da imagem pelo OSD do Tesseract.
+
+    Returns:
+        (escrita, confiança); (None, 0.0) se o OSD falhar (pouco texto,
+        osd.traineddata ausente).
+    """
+    try:
+        osd = pytesseract.image_to_osd(image, config="--psm 0")
+    except pytesseract.TesseractError:
+        return None, 0.0
+    script = _SCRIPT_RE.search(osd)
+    confidence = _CONFIDENCE_RE.search(osd)
+    if not script:
+        return None, 0.0
+    return script.group(1), float(confidence.group(1)) if confidence else 0.0
+
+
+def langs_for_scripts(scripts) -> str:
+    """
+    Conjunto mínimo de idiomas ("eng+rus") para as escritas, da mais
+    frequente para a menos; ignora idiomas não instalados.
+    """
+    installed = installed_languages()
+    langs = []
+    for script in scripts:
+        lang = OCR_SCRIPT_LANGS.get(script)
+        if lang and lang not in langs and (not installed or lang in installed):
+            langs.append(lang)
+    return "+".join(langs) or OCR_LANG
+
+
+class ExtractionLanguages:
+    """
+    Escolha de idiomas de uma extração: detecta nas primeiras páginas,
+    depois usa a decisão gravada. Seguro para uso entre threads.
+    """
+
+    def __init__(
+        self,
+        db_manager=None,
+        extraction_id: Optional[int] = None,
+        sample_pages: int = OCR_AUTO_SAMPLE_PAGES,
+    ):
+        self.db = db_manager
+        self.extraction_id = extraction_id
+        self.sample_pages = sample_pages
+        self._lock = threading.Lock()
+
+        state = {}
+        if db_manager is not None and extraction_id is not None:
+            extraction = db_manager.get_extraction(extraction_id) or {}
+            state = extraction.get("ocr_auto_lang") or {}
+        self.scripts = Counter(state.get("scripts", {}))
+        self.samples = state.get("samples", 0)
+        self.lang: Optional[str] = state.get("lang") if state.get("decided") else None
+
+    @property
+    def decided(self) -> bool:
+        return self.lang is not None
+
+    def lang_for(self, image) -> str:
+        """Idiomas para o OCR desta página."""
+        with self._lock:
+            if self.lang is not None:
+                return self.lang
+
+        script, confidence = detect_script(image)
+        if script is None or confidence < OCR_AUTO_MIN_SCRIPT_CONFIDENCE:
+            # Sem detecção confiável: usa o que já foi visto (ou o padrão)
+            with self._lock:
+                return langs_for_scripts(s for s, _ in self.scripts.most_common())
+
+        with self._lock:
+            self.scripts[script] += 1
+            self.samples += 1
+            if self.sample_pages and self.samples >= self.sample_pages:
+                self.lang = langs_for_scripts(s for s, _ in self.scripts.most_common())
+            self._save()
+        return langs_for_scripts([script])
+
+    def reset(self) -> None:
+        """Descarta a decisão (ex.: novas páginas em outra língua)."""
+        with self._lock:
+            self.scripts.clear()
+            self.samples = 0
+            self.lang = None
+            self._save()
+
+    def _save(self) -> None:
+        if self.db is None or self.extraction_id is None:
+            return
+        self.db.update_extraction(
+            self.extraction_id,
+            ocr_auto_lang={
+                "scripts": dict(self.scripts),
+                "samples": self.samples,
+                "decided": self.lang is not None,
+                "lang": self.lang,
+                "updated_at": datetime.now().isoformat(),
+            },
+        )
@@ -2,21 +2,82 @@
 Serviço de OCR - Extração de texto a partir de imagens.
 Utiliza Tesseract OCR via pytesseract.
 Busca o Tesseract embutido (build .exe), instalado no sistema, ou no PATH.
+Os parâmetros do Tesseract (idioma, --psm, --oem) vêm de um perfil de OCR.
 """
 
 import platform
 import os
+from typing import Optional
+
 from PIL import Image, ImageGrab
 import pytesseract
 
-from src.config import TESSERACT_PATHS_WIN, TESSERACT_CMD_LINUX, OCR_LANG
+from src.config import (
+    OCR_DEFAULT_PROFILE,
+    OCR_PROFILES,
+    TESSERACT_PATHS_WIN,
+    TESSERACT_CMD_LINUX,
+)
+from src.services.ocr_language import AUTO_LANG, ExtractionLanguages
+from src.utils import tracing
+
+
+def resolve_profile(extraction: Optional[dict] = None) -> dict:
+    """
+    Perfil de OCR de uma extração, nesta ordem: configuração gravada pelo
+    auto-tune ("ocr_config"), perfil escolhido ("ocr_profile"), perfil com o
+    nome do doc_type e, por fim, OCR_DEFAULT_PROFILE.
+    """
+    profile = dict(OCR_PROFILES[OCR_DEFAULT_PROFILE])
+    if not extraction:
+        return profile
+    if extraction.get("ocr_config"):
+        profile.update(extraction["ocr_config"])
+        return profile
+    for name in (extraction.get("ocr_profile"), (extraction.get("doc_type") or "").lower()):
+        if name in OCR_PROFILES:
+            profile.update(OCR_PROFILES[name])
+            break
+    return profile
+
+
+def ocr_for_extraction(db_manager, extraction_id: int) -> "OCRService":
+    """OCRService com o perfil da extração (e a detecção de idioma dela, se "auto")."""
+    profile = resolve_profile(db_manager.get_extraction(extraction_id))
+    languages = None
+    if profile["lang"] == AUTO_LANG:
+        languages = ExtractionLanguages(db_manager, extraction_id)
+    return OCRService(profile, languages)
 
 
 class OCRService:
     """Serviço responsável pela extração de texto de imagens."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        profile: Optional[dict] = None,
+        languages: Optional[ExtractionLanguages] = None,
+    ):
+        """
+        Args:
+            profile: Perfil de OCR ({"lang", "psm", "oem"}); campos ausentes
+                     vêm de OCR_DEFAULT_PROFILE.
+            languages: Escolha de idiomas da extração, para lang "auto"
+                       (sem ela, a escrita é detectada em toda página).
+        """
         self._configure_tesseract()
+        self.profile = {**OCR_PROFILES[OCR_DEFAULT_PROFILE], **(profile or {})}
+        self._config = f"--psm {int(self.profile['psm'])} --oem {int(self.profile['oem'])}"
+        if self.profile["lang"] == AUTO_LANG and languages is None:
+            languages = ExtractionLanguages(sample_pages=0)
+        self.languages = languages
+
+    def _lang(self, image: Image.Image, lang: Optional[str]) -> str:
+        """Idioma explícito, o do perfil ou, com "auto", o detectado pela escrita."""
+        lang = lang or self.profile["lang"]
+        if lang == AUTO_LANG:
+            return self.languages.lang_for(image)
+        return lang
 
     def _configure_tesseract(self) -> None:
         """
@@ -40,13 +101,13 @@ class OCRService:
             if os.path.exists(TESSERACT_CMD_LINUX):
                 pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD_LINUX
 
-    def extract_from_file(self, file_path: str, lang: str = OCR_LANG) -> str:
+    def extract_from_file(self, file_path: str, lang: Optional[str] = None) -> str:
         """
         Extrai texto de um arquivo de imagem.
 
         Args:
             file_path: Caminho do arquivo de imagem.
-            lang: Idioma para OCR (padrão: inglês).
+            lang: Idioma para OCR (padrão: o do perfil).
 
         Returns:
             Texto extraído da imagem.
@@ -55,29 +116,58 @@ class OCRService:
             raise FileNotFoundError(f"Arquivo não encontrado: {file_path}")
 
         image = Image.open(file_path)
-        text = pytesseract.image_to_string(image, lang=lang)
-        return text.strip()
+        lang = self._lang(image, lang)
+        with tracing.span("ocr.extract_from_file", lang=lang, config=self._config) as sp:
+            text = pytesseract.image_to_string(image, lang=lang, config=self._config).strip()
+            sp.set(pixels=image.width * image.height, chars=len(text))
+        return text
 
-    def extract_from_image(self, image: Image.Image, lang: str = OCR_LANG) -> str:
+    def extract_from_image(self, image: Image.Image, lang: Optional[str] = None) -> str:
         """
         Extrai texto de um objeto PIL Image.
 
         Args:
             image: Objeto PIL Image.
-            lang: Idioma para OCR (padrão: inglês).
+            lang: Idioma para OCR (padrão: o do perfil).
 
         Returns:
             Texto extraído da imagem.
         """
-        text = pytesseract.image_to_string(image, lang=lang)
-        return text.strip()
-
-    def extract_from_clipboard(self, lang: str = OCR_LANG) -> str:
+        lang = self._lang(image, lang)
+        with tracing.span("ocr.extract_from_image", lang=lang, config=self._config) as sp:
+            text = pytesseract.image_to_string(image, lang=lang, config=self._config).strip()
+            sp.set(pixels=image.width * image.height, chars=len(text))
+        return text
+
+    def extract_with_confidence(
+        self, image: Image.Image, lang: Optional[str] = None
+    ) -> tuple[str, float]:
+        """
+        Extrai o texto e a confiança média do Tesseract (0–100), ponderada
+        pelo tamanho de cada palavra. Usado pelo auto-tune de perfis.
+        """
+        lang = self._lang(image, lang)
+        data = pytesseract.image_to_data(
+            image, lang=lang, config=self._config, output_type=pytesseract.Output.DICT
+        )
+        words, weighted, chars = [], 0.0, 0
+        for word, conf in zip(data["text"], data["conf"]):
+            word = (word or "").strip()
+            conf = float(conf)
+            if not word or conf < 0:
+                continue
+            words.append(word)
+            weighted += conf * len(word)
+            chars += len(word)
+        confidence = weighted / chars if chars else 0.0
+        return " ".join(words), confidence
+
+    def extract_from_clipboard(self, lang: Optional[str] = None) -> str:
         """
         Extrai texto de uma imagem na área de transferência (clipboard).
 
         Args:
-            lang: Idioma para OCR (padrão: inglês).
+            lang: Idioma para OCR (padrão: o do perfil).
 
         Returns:
             Texto extraído da imagem do clipboard.
@@ -101,8 +191,7 @@ class OCRService:
                 "O conteúdo da área de transferência não é uma imagem válida."
             )
 
-        text = pytesseract.image_to_string(image, lang=lang)
-        return text.strip()
+        return self.extract_from_image(image, lang)
 
     @staticmethod
     def is_tesseract_available() -> bool:
@@ -0,0 +1,128 @@
+"""
+Auto-tune de perfis de OCR - Escolhe os parâmetros do Tesseract por documento.
+
+Roda cada configuração candidata (psm/oem) sobre páginas de amostra, mede o
+tempo e a confiança média do Tesseract e escolhe a configuração mais rápida
+que atinge a confiança mínima. A escolha fica gravada na extração
+("ocr_config") e passa a ser usada em todo OCR dela.
+
+Uso: aldemarvin-cli tune-ocr 3 amostras/*.png [--min-confidence 85]
+"""
+
+import time
+from datetime import datetime
+from typing import Callable, Optional
+
+from PIL import Image
+
+from src.config import OCR_TUNE_CANDIDATES, OCR_TUNE_MIN_CONFIDENCE
+from src.services.ocr_language import AUTO_LANG, detect_script, langs_for_scripts
+from src.services.ocr_service import OCRService, resolve_profile
+
+
+def evaluate(images: list[Image.Image], profile: dict, ocr_factory=OCRService) -> dict:
+    """
+    Roda o OCR de todas as amostras com um perfil.
+
+    Returns:
+        Dict com o perfil, o tempo total (s), a confiança média (ponderada
+        pelos caracteres reconhecidos) e o total de caracteres.
+    """
+    service = ocr_factory(profile)
+    weighted = 0.0
+    chars = 0
+    started = time.perf_counter()
+    for image in images:
+        text, confidence = service.extract_with_confidence(image)
+        weighted += confidence * len(text)
+        chars += len(text)
+    return {
+        "profile": dict(profile),
+        "seconds": round(time.perf_counter() - started, 4),
+        "confidence": round(weighted / chars, 2) if chars else 0.0,
+        "chars": chars,
+    }
+
+
+def pick_best(results: list[dict], min_confidence: float = OCR_TUNE_MIN_CONFIDENCE) -> dict:
+    """
+    A mais rápida entre as que atingem a confiança mínima; se nenhuma
+    atingir, a de maior confiança.
+    """
+    if not results:
+        raise ValueError("Nenhuma configuração avaliada.")
+    accepted = [r for r in results if r["confidence"] >= min_confidence and r["chars"]]
+    if accepted:
+        return min(accepted, key=lambda r: r["seconds"])
+    return max(results, key=lambda r: (r["confidence"], -r["seconds"]))
+
+
+def tune(
+    images: list[Image.Image],
+    base_profile: dict,
+    candidates: Optional[list[dict]] = None,
+    min_confidence: float = OCR_TUNE_MIN_CONFIDENCE,
+    ocr_factory=OCRService,
+    on_result: Optional[Callable[[dict], None]] = None,
+) -> tuple[dict, list[dict]]:
+    """
+    Avalia cada candidata (sobre o perfil base, que define o idioma).
+
+    Returns:
+        (melhor resultado, todos os resultados na ordem avaliada)
+    """
+    if not images:
+        raise ValueError("Informe ao menos uma página de amostra.")
+
+    results = []
+    for candidate in candidates or OCR_TUNE_CANDIDATES:
+        result = evaluate(images, {**base_profile, **candidate}, ocr_factory)
+        results.append(result)
+        if on_result:
+            on_result(result)
+    return pick_best(results, min_confidence), results
+
+
+def tune_extraction(
+    db_manager,
+    extraction_id: int,
+    image_paths: list[str],
+    candidates: Optional[list[dict]] = None,
+    min_confidence: float = OCR_TUNE_MIN_CONFIDENCE,
+    ocr_factory=OCRService,
+    on_result: Optional[Callable[[dict], None]] = None,
+) -> tuple[dict, list[dict]]:
+    """Roda o auto-tune com as imagens de amostra e grava a escolha na extração."""
+    extraction = db_manager.get_extraction(extraction_id)
+    if not extraction:
+        raise ValueError(f"Extração {extraction_id} não encontrada.")
+
+    # Parte do perfil nomeado (idioma), ignorando um auto-tune anterior
+    base = resolve_profile({**extraction, "ocr_config": None})
+
+    images = []
+    for path in image_paths:
+        with Image.open(path) as image:
+            image.load()
+            images.append(image)
+
+    auto_lang = base["lang"] == AUTO_LANG
+    if auto_lang:
+        # Idioma fixo durante as medições (o OSD não entra no tempo das candidatas)
+        base["lang"] = langs_for_scripts({detect_script(image)[0] for image in images} - {None})
+
+    best, results = tune(images, base, candidates, min_confidence, ocr_factory, on_result)
+    profile = {**best["profile"], "lang": AUTO_LANG} if auto_lang else best["profile"]
+    db_manager.update_extraction(
+        extraction_id,
+        ocr_config=profile,
+        ocr_tuning={
+            "seconds": best["seconds"],
+            "confidence": best["confidence"],
+            "min_confidence": min_confidence,
+            "samples": len(images),
+            "met_threshold": best["confidence"] >= min_confidence,
+            "tuned_at": datetime.now().isoformat(),
+        },
+    )
+    return best, results
@@ -0,0 +1,328 @@
+"""
+Fontes TrueType do PDF (texto Unicode vindo do OCR e da tradução).
+
+As fontes padrão do PDF (Helvetica) só codificam Latin-1: travessão, aspas
+curvas, cirílico, grego... quebram a exportação. Uma fonte TTF resolve, mas
+o add_font() do fpdf2 relê e analisa o arquivo inteiro a cada PDF (dezenas
+de ms para a DejaVu Sans). Aqui cada fonte é analisada uma vez por processo:
+cmap, larguras e descritor ficam num protótipo, e cada documento recebe uma
+cópia leve dele. O PDF embute só os glifos usados, e esse subconjunto é
+montado a partir de uma versão reduzida da fonte guardada em cache (os
+glifos já usados neste processo), não do arquivo inteiro.
+
+Uso:
+    fonts = get_font_manager()
+    family = fonts.apply(pdf)          # registra regular, negrito e itálico
+    pdf.set_font(family, "B", 12)
+    pdf.multi_cell(0, 6, fonts.text(texto))
+    fonts.prepare(pdf)                 # logo antes de pdf.output()
+"""
+
+import copy
+import logging
+import os
+import threading
+from io import BytesIO
+from typing import Optional
+
+from fontTools import subset as ftsubset
+from fontTools import ttLib
+from fpdf import FPDF, FPDF_VERSION
+from fpdf.fonts import TTFFont
+
+try:
+    from fpdf.fonts import SubsetMap
+except ImportError:  # Outra versão do fpdf2: clone() cai no add_font
+    SubsetMap = None
+
+from src.config import (
+    PDF_FONT_CANDIDATES,
+    PDF_FONT_FAMILY,
+    PDF_FONT_PATHS,
+    PDF_FONT_WORKING_SET_MAX,
+)
+from src.utils import tracing
+
+logger = logging.getLogger(__name__)
+
+# Estilos usados pelo PDFService; estilo sem arquivo próprio usa o regular
+STYLES = ("", "B", "I")
+# Fonte padrão do PDF, usada quando nenhuma TTF está disponível
+CORE_FAMILY = "Helvetica"
+
+# Versões do fpdf2 em que o clone das fontes foi testado, [mín, máx): ele
+# depende de estruturas internas do TTFFont (_hbfont, color_font, subset,
+# is_cff, emphasis). Fora desse intervalo, apply() usa o add_font normal.
+FPDF_TESTED_VERSIONS = ((2, 8), (2, 9))
+
+# Erros de estrutura interna diferente da esperada (atributo, tipo, assinatura)
+_INTERNALS_ERRORS = (AttributeError, TypeError, KeyError, ValueError)
+
+# Tabelas que o fpdf2 remove ao embutir a fonte (sem shaping, não são usadas)
+_DROP_TABLES = [
+    "FFTM", "GDEF", "GPOS", "GSUB", "MATH", "hdmx", "meta", "sbix", "CBDT",
+    "CBLC", "EBDT", "EBLC", "EBSC", "SVG ", "CPAL", "COLR",
+]
+
+
+def clone_supported(version: Optional[str] = None) -> bool:
+    """Se a versão do fpdf2 (padrão: a instalada) está no intervalo testado do clone."""
+    version = version or FPDF_VERSION
+    try:
+        current = tuple(int(part) for part in version.split(".")[:2])
+    except ValueError:
+        return False
+    low, high = FPDF_TESTED_VERSIONS
+    return low <= current < high
+
+
+class _ParsedFont:
+    """
+    Uma fonte analisada: bytes do arquivo, protótipo com as métricas e o
+    "conjunto de trabalho" - subconjunto com os glifos já usados pelos PDFs
+    deste processo.
+
+    A saída do fpdf2 lê as tabelas da fonte inteira (glyf, post, cmap...)
+    para montar o subconjunto de cada PDF: ~30 ms por estilo na DejaVu Sans,
+    mesmo para meia dúzia de glifos. Partindo do conjunto de trabalho (umas
+    centenas de glifos), esse passo fica quase de graça; a fonte inteira só
+    é lida de novo quando um PDF usa um glifo ainda não visto.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self.data = f.read()
+        # O protótipo analisa cmap e larguras de todos os glifos (a parte cara)
+        self.prototype = TTFFont(FPDF(), BytesIO(self.data), "", "")
+        self.prototype.ttffile = path
+        self.prototype.ttfont.close()
+        self._lock = threading.Lock()
+        self._working_glyphs: frozenset = frozenset()
+        self._working_data: Optional[bytes] = None
+
+    def _open(self, data: bytes) -> ttLib.TTFont:
+        return ttLib.TTFont(BytesIO(data), recalcBBoxes=False, recalcTimestamp=False, lazy=True)
+
+    def clone(self, pdf: FPDF, fontkey: str, style: str) -> TTFFont:
+        """
+        Cópia do protótipo para um documento.
+
+        O cmap é compartilhado (só leitura). Larguras, glifos usados e o
+        TTFont são do documento, porque a saída do fpdf2 faz o subconjunto
+        da fonte no próprio objeto; o descritor também, porque vira um
+        objeto do PDF (recebe o número do objeto na saída).
+        """
+        font = copy.copy(self.prototype)
+        font.i = len(pdf.fonts) + 1
+        font.fontkey = fontkey
+        font.emphasis = type(self.prototype.emphasis).coerce(style)
+        font.ttfont = self._open(self.data)
+        font.desc = copy.copy(self.prototype.desc)
+        font.cw = self.prototype.cw.copy()
+        font.glyph_ids = dict(self.prototype.glyph_ids)
+        font.missing_glyphs = []
+        font.biggest_size_pt = 0
+        font._hbfont = None
+        font.color_font = None
+        font.subset = SubsetMap(font)
+        return font
+
+    def register(self, pdf: FPDF, fontkey: str, style: str) -> None:
+        """Registra no documento uma cópia do protótipo (ver clone())."""
+        font = self.clone(pdf, fontkey, style)
+        if font.is_cff and font.is_cid_keyed:
+            pdf._set_min_pdf_version("1.6")
+        pdf.fonts[fontkey] = font
+
+    def prepare(self, font: TTFFont, max_glyphs: int = PDF_FONT_WORKING_SET_MAX) -> bool:
+        """
+        Troca o TTFont do documento pelo conjunto de trabalho (antes da saída).
+
+        Returns:
+            True se os glifos já estavam no conjunto (sem ler a fonte inteira).
+        """
+        if font.is_cff:
+            return False  # CFF com CID usa o número do glifo da fonte original
+        glyphs = frozenset(font.subset.get_all_glyph_names())
+        with self._lock:
+            hit = self._working_data is not None and glyphs <= self._working_glyphs
+            if not hit:
+                wanted = glyphs | self._working_glyphs
+                if len(wanted) > max_glyphs:
+                    wanted = glyphs  # Recomeça em vez de crescer sem limite
+                self._working_data = self._subset(wanted)
+                self._working_glyphs = wanted
+            data = self._working_data
+        font.ttfont.close()
+        font.ttfont = self._open(data)
+        return hit
+
+    def _subset(self, glyphs) -> bytes:
+        # Mesmas opções da saída do fpdf2, mas mantendo os nomes dos glifos:
+        # o cmap do protótipo e a saída localizam os glifos pelo nome
+        options = ftsubset.Options(
+            notdef_outline=True, recommended_glyphs=True, glyph_names=True
+        )
+        options.drop_tables += _DROP_TABLES
+        subsetter = ftsubset.Subsetter(options)
+        subsetter.populate(glyphs=sorted(glyphs))
+        with self._open(self.data) as ttfont:
+            subsetter.subset(ttfont)
+            buffer = BytesIO()
+            ttfont.save(buffer)
+        return buffer.getvalue()
+
+
+class FontManager:
+    """
+    Fontes TTF configuradas, analisadas uma vez e reaproveitadas entre PDFs.
+    Seguro para uso entre threads (o servidor de jobs gera PDFs em paralelo).
+    """
+
+    def __init__(
+        self,
+        paths: Optional[dict] = None,
+        candidates: Optional[dict] = None,
+        family: str = PDF_FONT_FAMILY,
+    ):
+        self.paths = PDF_FONT_PATHS if paths is None else paths
+        self.candidates = PDF_FONT_CANDIDATES if candidates is None else candidates
+        self.family = family
+        self._lock = threading.Lock()
+        self._faces: Optional[dict[str, str]] = None
+        self._parsed: dict[str, _ParsedFont] = {}
+        # Sem o clone (versão não testada ou falha), tudo passa pelo add_font
+        self._clone_failed = not clone_supported()
+
+    # ─── Resolução dos arquivos ────────────────────────────────────────────
+
+    def faces(self) -> dict[str, str]:
+        """
+        Arquivo de cada estilo (vazio se não há TTF: usa Helvetica).
+
+        Com o regular configurado em PDF_FONT_PATHS, estilos sem arquivo
+        próprio usam o mesmo arquivo (não mistura famílias). Sem
+        configuração, procura a primeira família disponível em
+        PDF_FONT_CANDIDATES.
+        """
+        with self._lock:
+            if self._faces is None:
+                self._faces = self._resolve()
+            return self._faces
+
+    def _resolve(self) -> dict[str, str]:
+        regular = self.paths.get("")
+        if regular:
+            if not os.path.isfile(regular):
+                raise FileNotFoundError(f"Fonte do PDF não encontrada: {regular}")
+            faces = {}
+            for style in STYLES:
+                path = self.paths.get(style) or regular
+                faces[style] = path if os.path.isfile(path) else regular
+            return faces
+
+        for family_files in self.candidates:
+            regular = family_files.get("")
+            if regular and os.path.isfile(regular):
+                return {
+                    style: (
+                        family_files.get(style)
+                        if family_files.get(style) and os.path.isfile(family_files[style])
+                        else regular
+                    )
+                    for style in STYLES
+                }
+        return {}
+
+    @property
+    def unicode(self) -> bool:
+        """True se há uma TTF (texto Unicode); False = Helvetica (Latin-1)."""
+        return bool(self.faces())
+
+    # ─── Registro no documento ─────────────────────────────────────────────
+
+    def _get(self, path: str) -> _ParsedFont:
+        with self._lock:
+            parsed = self._parsed.get(path)
+            if parsed is None:
+                with tracing.span("pdf.font_load", bytes=os.path.getsize(path)):
+                    parsed = _ParsedFont(path)
+                self._parsed[path] = parsed
+            return parsed
+
+    def apply(self, pdf: FPDF) -> str:
+        """
+        Registra as fontes no documento.
+
+        Returns:
+            Família para usar em pdf.set_font() (a TTF ou Helvetica).
+        """
+        faces = self.faces()
+        if not faces:
+            return CORE_FAMILY
+        for style in STYLES:
+            fontkey = f"{self.family.lower()}{style}"
+            if fontkey in pdf.fonts:
+                continue
+            if not self._clone_failed:
+                try:
+                    self._get(faces[style]).register(pdf, fontkey, style)
+                    continue
+                except _INTERNALS_ERRORS as e:
+                    self._disable_clone(e)
+                    pdf.fonts.pop(fontkey, None)
+            pdf.add_font(self.family, style, faces[style])
+        return self.family
+
+    def _disable_clone(self, error: Exception) -> None:
+        # Outra versão do fpdf2 com estrutura interna diferente
+        logger.warning("Cache de fontes desativado (%s); usando add_font.", error)
+        self._clone_failed = True
+
+    def prepare(self, pdf: FPDF) -> None:
+        """
+        Chamar logo antes de pdf.output(): o subconjunto de cada fonte parte
+        do conjunto de trabalho em cache, não da fonte inteira.
+        """
+        if self._clone_failed:
+            return
+        for style in STYLES:
+            font = pdf.fonts.get(f"{self.family.lower()}{style}")
+            parsed = self._parsed.get(getattr(font, "ttffile", None))
+            if parsed is None or not isinstance(font, TTFFont):
+                continue
+            with tracing.span("pdf.font_subset", style=style or "R") as sp:
+                try:
+                    sp.set(cached=int(parsed.prepare(font)))
+                except _INTERNALS_ERRORS as e:
+                    # A fonte continua com o TTFont completo: a saída faz
+                    # o subconjunto do jeito normal
+                    self._disable_clone(e)
+                    return
+
+    def text(self, text: str) -> str:
+        """Texto pronto para o PDF: com Helvetica, o que não é Latin-1 vira "?"."""
+        if self.unicode:
+            return text
+        return text.encode("latin-1", "replace").decode("latin-1")
+
+    def clear(self) -> None:
+        """Esquece as fontes carregadas (ex.: depois de mudar a configuração)."""
+        with self._lock:
+            self._faces = None
+            self._parsed.clear()
+            self._clone_failed = not clone_supported()
+
+
+_manager: Optional[FontManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_font_manager() -> FontManager:
+    """Gerenciador de fontes do processo (as fontes são analisadas uma vez)."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = FontManager()
+        return _manager
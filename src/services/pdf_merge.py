@@ -0,0 +1,279 @@
+"""
+Junção de PDFs gerados pelo fpdf2 (partes de uma exportação paralela).
+
+Não é um leitor de PDF genérico: entende o que o fpdf2 grava - tabela xref
+clássica, objetos "N 0 obj ... endobj", streams com /Length direto e uma
+árvore de páginas de um nível (/Pages com /Kids). Os objetos de cada parte
+são copiados byte a byte (streams inclusive) com os números renumerados; o
+catálogo e a raiz /Pages de cada parte dão lugar a uma raiz única, com as
+páginas na ordem das partes.
+
+Uso:
+    merge_pdfs(["parte1.pdf", "parte2.pdf"], "livro.pdf")
+"""
+
+import os
+import re
+import uuid
+
+_HEADER_RE = re.compile(rb"%PDF-(\d\.\d)")
+_STARTXREF_RE = re.compile(rb"startxref\s+(\d+)\s+%%EOF\s*$")
+_XREF_SECTION_RE = re.compile(rb"(\d+) (\d+)\s*\n")
+_XREF_ENTRY_RE = re.compile(rb"(\d{10}) (\d{5}) ([nf])")
+_OBJ_RE = re.compile(rb"(\d+) (\d+) obj\s")
+_REF_RE = re.compile(rb"(\d+) (\d+) R\b")
+_LENGTH_RE = re.compile(rb"/Length (\d+)(?!\s+\d+\s+R)")
+_WHITESPACE = b" \t\r\n\f\x00"
+
+
+class _Part:
+    """Objetos de um PDF: número → (valor, stream ou None)."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self.raw = f.read()
+        header = _HEADER_RE.match(self.raw)
+        if not header:
+            raise ValueError(f"Arquivo não é um PDF: {path}")
+        self.version = header.group(1).decode()
+        self.objects: dict[int, tuple[bytes, bytes | None]] = {}
+        for number, offset in self._xref(path).items():
+            self.objects[number] = self._read_object(offset, number, path)
+
+        trailer = self.raw[self.raw.rindex(b"trailer") :]
+        self.root = self._ref(trailer, rb"/Root", path)
+        self.info = self._ref(trailer, rb"/Info", path, required=False)
+        self.pages_root = self._ref(self.objects[self.root][0], rb"/Pages", path)
+        pages_dict = self.objects[self.pages_root][0]
+        kids = re.search(rb"/Kids\s*\[([^\]]*)\]", pages_dict)
+        if kids is None:
+            raise ValueError(f"Árvore de páginas não suportada: {path}")
+        self.pages = [int(m.group(1)) for m in _REF_RE.finditer(kids.group(1))]
+        media_box = re.search(rb"/MediaBox\s*\[[^\]]*\]", pages_dict)
+        self.media_box = media_box.group(0) if media_box else None
+
+    def _xref(self, path: str) -> dict[int, int]:
+        match = _STARTXREF_RE.search(self.raw[-64:])
+        if not match:
+            raise ValueError(f"PDF sem startxref: {path}")
+        pos = int(match.group(1))
+        if not self.raw.startswith(b"xref", pos):
+            # Xref em stream (PDF 1.5+) não é gerada pelo fpdf2
+            raise ValueError(f"Tabela xref não suportada: {path}")
+        pos += 4
+        offsets = {}
+        while True:
+            while self.raw[pos : pos + 1] in (b"\r", b"\n", b" "):
+                pos += 1
+            section = _XREF_SECTION_RE.match(self.raw, pos)
+            if not section:
+                break
+            first, count = int(section.group(1)), int(section.group(2))
+            pos = section.end()
+            for i in range(count):
+                entry = _XREF_ENTRY_RE.match(self.raw, pos)
+                if not entry:
+                    raise ValueError(f"Entrada xref inválida: {path}")
+                if entry.group(3) == b"n":
+                    offsets[first + i] = int(entry.group(1))
+                pos += 20
+        return offsets
+
+    def _read_object(self, offset: int, number: int, path: str) -> tuple[bytes, bytes | None]:
+        header = _OBJ_RE.match(self.raw, offset)
+        if not header or int(header.group(1)) != number:
+            raise ValueError(f"Objeto {number} fora da posição indicada na xref: {path}")
+        start = header.end()
+        end = _value_end(self.raw, start)
+        value = self.raw[start:end].strip(_WHITESPACE)
+        if self.raw.startswith(b"stream", end):
+            data_start = end + len(b"stream")
+            if self.raw.startswith(b"\r\n", data_start):
+                data_start += 2
+            elif self.raw.startswith(b"\n", data_start):
+                data_start += 1
+            length = _LENGTH_RE.search(value)
+            if length is None:
+                raise ValueError(f"Stream sem /Length direto (objeto {number}): {path}")
+            data = self.raw[data_start : data_start + int(length.group(1))]
+            return value, data
+        return value, None
+
+    def _ref(self, data: bytes, key: bytes, path: str, required: bool = True) -> int | None:
+        match = re.search(re.escape(key) + rb"\s+(\d+) \d+ R", data)
+        if match:
+            return int(match.group(1))
+        if required:
+            raise ValueError(f"{key.decode()} não encontrado: {path}")
+        return None
+
+
+def _value_end(raw: bytes, pos: int) -> int:
+    """Posição da palavra "stream" ou "endobj" que encerra o valor do objeto."""
+    depth = 0
+    size = len(raw)
+    while pos < size:
+        char = raw[pos : pos + 1]
+        if char == b"(":
+            pos = _string_end(raw, pos)
+            continue
+        if raw.startswith(b"<<", pos):
+            depth += 1
+            pos += 2
+            continue
+        if raw.startswith(b">>", pos):
+            depth -= 1
+            pos += 2
+            continue
+        if char == b"<":
+            pos = raw.index(b">", pos) + 1  # String hexadecimal
+            continue
+        if char == b"%":
+            pos = raw.index(b"\n", pos)  # Comentário
+            continue
+        if depth == 0 and (raw.startswith(b"stream", pos) or raw.startswith(b"endobj", pos)):
+            return pos
+        pos += 1
+    raise ValueError("Objeto PDF sem endobj.")
+
+
+def _string_end(raw: bytes, pos: int) -> int:
+    """Fim de uma string literal (com parênteses aninhados e escapes)."""
+    depth = 0
+    while True:
+        char = raw[pos : pos + 1]
+        if not char:
+            raise ValueError("String PDF sem fechamento.")
+        if char == b"\\":
+            pos += 2
+            continue
+        if char == b"(":
+            depth += 1
+        elif char == b")":
+            depth -= 1
+            if depth == 0:
+                return pos + 1
+        pos += 1
+
+
+def _renumber(value: bytes, mapping: dict[int, int]) -> bytes:
+    """Troca as referências "N 0 R" fora de strings pelos números novos."""
+
+    def replace(match: re.Match) -> bytes:
+        old = int(match.group(1))
+        if old not in mapping:
+            raise ValueError(f"Referência a objeto removido na junção: {old}")
+        return b"%d 0 R" % mapping[old]
+
+    out = []
+    pos = 0
+    while True:
+        string_start = _next_string(value, pos)
+        out.append(_REF_RE.sub(replace, value[pos:string_start]))
+        if string_start >= len(value):
+            break
+        if value[string_start : string_start + 1] == b"(":
+            string_end = _string_end(value, string_start)
+        else:
+            string_end = value.index(b">", string_start) + 1
+        out.append(value[string_start:string_end])
+        pos = string_end
+    return b"".join(out)
+
+
+def _next_string(value: bytes, pos: int) -> int:
+    """Início da próxima string (literal ou hexadecimal) a partir de pos."""
+    while pos < len(value):
+        char = value[pos : pos + 1]
+        if char == b"(":
+            return pos
+        if char == b"<":
+            if value.startswith(b"<<", pos):
+                pos += 2
+                continue
+            return pos
+        pos += 1
+    return len(value)
+
+
+def merge_pdfs(parts: list[str], output_path: str) -> str:
+    """
+    Junta os PDFs (gerados pelo fpdf2) num só, na ordem da lista.
+
+    Returns:
+        Caminho do PDF gerado.
+    """
+    if not parts:
+        raise ValueError("Nenhum PDF para juntar.")
+    loaded = [_Part(path) for path in parts]
+
+    # 1 = raiz /Pages, 2 = catálogo; os objetos das partes vêm depois
+    next_number = 3
+    body: list[tuple[int, bytes, bytes | None]] = []
+    kids: list[int] = []
+    info = None
+    for index, part in enumerate(loaded):
+        dropped = {part.root, part.pages_root}
+        if index > 0 and part.info is not None:
+            dropped.add(part.info)  # Só as informações da primeira parte
+        mapping = {part.pages_root: 1, part.root: 2}
+        for number in sorted(part.objects):
+            if number not in dropped:
+                mapping[number] = next_number
+                next_number += 1
+        if index == 0 and part.info is not None:
+            info = mapping[part.info]
+
+        pages = set(part.pages)
+        for number in sorted(part.objects):
+            if number in dropped:
+                continue
+            value, stream = part.objects[number]
+            if number in pages and part.media_box and b"/MediaBox" not in value:
+                # Tamanho herdado da raiz da parte passa para a página
+                value = value.replace(b"<<", b"<<\n" + part.media_box, 1)
+            body.append((mapping[number], _renumber(value, mapping), stream))
+        kids.extend(mapping[number] for number in part.pages)
+
+    version = max(part.version for part in loaded)
+    media_box = loaded[0].media_box or b""
+    body.append((
+        1,
+        b"<<\n/Count %d\n/Kids [%s]\n%s\n/Type /Pages\n>>"
+        % (len(kids), b" ".join(b"%d 0 R" % kid for kid in kids), media_box),
+        None,
+    ))
+    open_action = b"/OpenAction [%d 0 R /FitH null]\n" % kids[0] if kids else b""
+    body.append((
+        2,
+        b"<<\n%s/PageLayout /OneColumn\n/Pages 1 0 R\n/Type /Catalog\n>>" % open_action,
+        None,
+    ))
+    body.sort(key=lambda item: item[0])
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    tmp = f"{output_path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp, "wb") as out:
+            out.write(b"%%PDF-%s\n%%\xe9\xeb\xf1\xbf\n" % version.encode())
+            offsets = []
+            for number, value, stream in body:
+                offsets.append(out.tell())
+                out.write(b"%d 0 obj\n%s\n" % (number, value))
+                if stream is not None:
+                    out.write(b"stream\n%s\nendstream\n" % stream)
+                out.write(b"endobj\n")
+            xref = out.tell()
+            out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(offsets) + 1))
+            for offset in offsets:
+                out.write(b"%010d 00000 n \n" % offset)
+            info_ref = b"/Info %d 0 R\n" % info if info is not None else b""
+            out.write(
+                b"trailer\n<<\n/Size %d\n/Root 2 0 R\n%s>>\nstartxref\n%d\n%%%%EOF\n"
+                % (len(offsets) + 1, info_ref, xref)
+            )
+        os.replace(tmp, output_path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return output_path
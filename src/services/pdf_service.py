@@ -1,28 +1,105 @@
 """
 Serviço de PDF - Gera PDFs a partir das páginas de uma extração.
-Utiliza fpdf2.
+Utiliza fpdf2, com uma fonte TTF (Unicode) carregada uma vez por processo
+(ver pdf_fonts).
+
+Livros grandes podem ser gerados em paralelo (workers > 1): as páginas são
+divididas em blocos de tamanho de texto parecido, cada bloco vira um PDF
+num processo separado (a capa vai no primeiro) e as partes são juntadas
+no fim (ver pdf_merge).
 """
 
+import logging
 import os
 import platform
+import shutil
 import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 from fpdf import FPDF
 
-from src.config import EXPORTS_DIR
+from src.config import EXPORTS_DIR, PDF_PARALLEL_MIN_CHUNK_PAGES, PDF_PARALLEL_MIN_PAGES
+from src.services.pdf_fonts import FontManager, get_font_manager
+from src.services.pdf_merge import merge_pdfs
+from src.utils import tracing
+
+logger = logging.getLogger(__name__)
+
+
+def split_chunks(pages: list[dict], chunks: int) -> list[list[dict]]:
+    """
+    Divide as páginas (em ordem) em até `chunks` blocos com quantidade de
+    texto parecida - o tempo de layout acompanha o tamanho do texto.
+    """
+    if chunks <= 1 or len(pages) <= 1:
+        return [pages] if pages else []
+    sizes = [len(_page_text(page)) + 1 for page in pages]
+    target = sum(sizes) / chunks
+    result, current, filled = [], [], 0
+    for page, size in zip(pages, sizes):
+        current.append(page)
+        filled += size
+        if filled >= target * (len(result) + 1) and len(result) < chunks - 1:
+            result.append(current)
+            current = []
+    if current:
+        result.append(current)
+    return result
+
+
+def _page_text(page: dict) -> str:
+    # Prioriza o texto traduzido, senão usa o original
+    return page.get("translated_text") or page.get("original_text", "")
+
+
+# Fontes dos processos do pool, por configuração (analisadas uma vez por processo)
+_worker_fonts: dict[tuple, FontManager] = {}
+
+
+def _render_chunk(
+    exports_dir: str,
+    title: str,
+    pages: list[dict],
+    total_pages: int,
+    cover: bool,
+    path: str,
+    font_config: tuple,
+) -> str:
+    """
+    Gera uma parte do PDF (executado nos processos do pool).
+
+    Args:
+        font_config: (família, arquivos por estilo) das fontes do serviço que
+                     dividiu o livro: as partes saem com as mesmas fontes.
+    """
+    fonts = _worker_fonts.get(font_config)
+    if fonts is None:
+        family, faces = font_config
+        # Arquivos já resolvidos; sem arquivos = Helvetica, como no serviço
+        fonts = FontManager(paths=dict(faces), candidates=[], family=family)
+        _worker_fonts[font_config] = fonts
+    service = PDFService(exports_dir=exports_dir, fonts=fonts)
+    service._write(service._render(title, pages, total_pages, cover), path)
+    return path
 
 
 class PDFService:
     """Serviço responsável pela geração e visualização de PDFs."""
 
-    def __init__(self):
-        os.makedirs(EXPORTS_DIR, exist_ok=True)
+    def __init__(self, exports_dir: str = EXPORTS_DIR, fonts: FontManager | None = None):
+        self.exports_dir = exports_dir
+        self.fonts = fonts or get_font_manager()
+        os.makedirs(exports_dir, exist_ok=True)
 
+    @tracing.traced("pdf.generate_pdf")
     def generate_pdf(
         self,
         title: str,
         pages: list[dict],
         output_filename: str | None = None,
+        workers: int = 1,
     ) -> str:
         """
         Gera um PDF a partir das páginas de uma extração.
@@ -32,6 +109,10 @@ class PDFService:
             pages: Lista de dicts com 'page_number' e 'translated_text'
                    (ou 'original_text' se não traduzido).
             output_filename: Nome do arquivo de saída (sem extensão).
+            workers: Processos para gerar em paralelo, só em livros com
+                     PDF_PARALLEL_MIN_PAGES páginas ou mais. Cada um recebe
+                     pelo menos PDF_PARALLEL_MIN_CHUNK_PAGES páginas; livros
+                     menores são gerados aqui mesmo.
 
         Returns:
             Caminho completo do PDF gerado.
@@ -41,35 +122,93 @@ class PDFService:
                 c if c.isalnum() or c in (" ", "-", "_") else "_" for c in title
             )
             output_filename = safe_title.strip()
+        output_path = os.path.join(self.exports_dir, f"{output_filename}.pdf")
+
+        chunks = 1
+        if len(pages) >= PDF_PARALLEL_MIN_PAGES:
+            chunks = min(workers, len(pages) // PDF_PARALLEL_MIN_CHUNK_PAGES)
+        if chunks > 1:
+            try:
+                self._generate_parallel(title, pages, output_path, chunks)
+            except (BrokenProcessPool, OSError) as e:
+                # Sem processos disponíveis (ou um worker morreu): gera aqui
+                logger.warning("PDF em paralelo falhou (%s); gerando sequencialmente.", e)
+                chunks = 1
+        if chunks <= 1:
+            self._write(self._render(title, pages, len(pages)), output_path)
+        tracing.annotate(
+            pages=len(pages), chunks=max(chunks, 1), bytes=os.path.getsize(output_path)
+        )
+        return output_path
 
+    def _generate_parallel(
+        self, title: str, pages: list[dict], output_path: str, chunks: int
+    ) -> None:
+        """Gera os blocos em processos separados e junta as partes."""
+        # Só os campos usados no layout vão para os processos
+        slim = [
+            {"page_number": page.get("page_number", "?"), "translated_text": _page_text(page)}
+            for page in pages
+        ]
+        parts_dir = tempfile.mkdtemp(prefix=".pdf-parts-", dir=self.exports_dir)
+        try:
+            blocks = split_chunks(slim, chunks)
+            font_config = (self.fonts.family, tuple(sorted(self.fonts.faces().items())))
+            with ProcessPoolExecutor(max_workers=len(blocks)) as pool:
+                futures = [
+                    pool.submit(
+                        _render_chunk,
+                        parts_dir,
+                        title,
+                        block,
+                        len(pages),
+                        index == 0,
+                        os.path.join(parts_dir, f"{index:04d}.pdf"),
+                        font_config,
+                    )
+                    for index, block in enumerate(blocks)
+                ]
+                parts = [future.result() for future in futures]
+            with tracing.span("pdf.merge", parts=len(parts)):
+                merge_pdfs(parts, output_path)
+        finally:
+            shutil.rmtree(parts_dir, ignore_errors=True)
+
+    def _render(
+        self, title: str, pages: list[dict], total_pages: int, cover: bool = True
+    ) -> FPDF:
+        """Monta o documento (capa opcional + uma seção por página)."""
         pdf = FPDF()
         pdf.set_auto_page_break(auto=True, margin=20)
+        family = self.fonts.apply(pdf)
+        text_for = self.fonts.text
 
         # ── Capa ───────────────────────────────────────────────────────────
-        pdf.add_page()
-        pdf.set_font("Helvetica", "B", 28)
-        pdf.ln(80)
-        pdf.cell(0, 20, title, align="C", new_x="LMARGIN", new_y="NEXT")
-        pdf.set_font("Helvetica", "", 12)
-        pdf.ln(10)
-        pdf.cell(
-            0,
-            10,
-            f"Total de páginas: {len(pages)}",
-            align="C",
-            new_x="LMARGIN",
-            new_y="NEXT",
-        )
-        pdf.ln(20)
-        pdf.set_font("Helvetica", "I", 10)
-        pdf.cell(
-            0,
-            10,
-            "Gerado por Aldemarvin Extractor",
-            align="C",
-            new_x="LMARGIN",
-            new_y="NEXT",
-        )
+        if cover:
+            pdf.add_page()
+            pdf.set_font(family, "B", 28)
+            pdf.ln(80)
+            pdf.cell(0, 20, text_for(title), align="C", new_x="LMARGIN", new_y="NEXT")
+            pdf.set_font(family, "", 12)
+            pdf.ln(10)
+            pdf.cell(
+                0,
+                10,
+                f"Total de páginas: {total_pages}",
+                align="C",
+                new_x="LMARGIN",
+                new_y="NEXT",
+            )
+            pdf.ln(20)
+            pdf.set_font(family, "I", 10)
+            pdf.cell(
+                0,
+                10,
+                "Gerado por Aldemarvin Extractor",
+                align="C",
+                new_x="LMARGIN",
+                new_y="NEXT",
+            )
 
         # ── Páginas ────────────────────────────────────────────────────────
         for page in pages:
@@ -77,7 +216,7 @@ class PDFService:
             page_num = page.get("page_number", "?")
 
             # Cabeçalho da página
-            pdf.set_font("Helvetica", "B", 10)
+            pdf.set_font(family, "B", 10)
             pdf.cell(
                 0,
                 8,
@@ -89,15 +228,16 @@ class PDFService:
             pdf.ln(5)
 
             # Texto (prioriza traduzido, senão usa original)
-            text = page.get("translated_text") or page.get("original_text", "")
-            pdf.set_font("Helvetica", "", 11)
+            text = _page_text(page)
+            pdf.set_font(family, "", 11)
             # Usa multi_cell para texto longo com quebra automática
-            pdf.multi_cell(0, 6, text)
+            pdf.multi_cell(0, 6, text_for(text))
 
-        # ── Salva ──────────────────────────────────────────────────────────
-        output_path = os.path.join(EXPORTS_DIR, f"{output_filename}.pdf")
-        pdf.output(output_path)
-        return output_path
+        return pdf
+
+    def _write(self, pdf: FPDF, path: str) -> None:
+        self.fonts.prepare(pdf)
+        pdf.output(path)
 
     @staticmethod
     def open_pdf(file_path: str) -> None:
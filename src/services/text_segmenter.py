@@ -0,0 +1,177 @@
+"""
+Segmentação de texto para tradução em lote.
+Divide o texto em frases, remove segmentos repetidos, empacota os segmentos
+em blocos de até N caracteres, na ordem do documento, e remonta o resultado
+na estrutura original de linhas.
+"""
+
+import re
+from typing import Optional
+
+# Separador entre segmentos dentro de um bloco enviado ao tradutor
+SEGMENT_SEPARATOR = "\n"
+
+# Abreviações comuns que terminam em ponto mas não encerram a frase
+_ABBREVIATIONS = {
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "etc", "fig",
+    "e.g", "i.e", "no", "vol", "p", "pp", "ch", "ed", "inc", "ltd", "co",
+    "u.s", "u.k", "approx", "dept", "est", "jan", "feb", "mar", "apr", "jun",
+    "jul", "aug", "sep", "sept", "oct", "nov", "dec",
+}
+
+# Fim de frase: pontuação terminal (com aspas/parênteses de fechamento
+# opcionais) seguida de espaço e de um início de frase plausível.
+_SENTENCE_END = re.compile(r"(?<=[.!?…])[\"')\]]*\s+(?=[\"'(\[]?[A-Z0-9À-Ý])")
+
+
+def split_sentences(line: str) -> list[str]:
+    """
+    Divide uma linha em frases.
+
+    Args:
+        line: Texto sem quebras de linha.
+
+    Returns:
+        Lista de frases (sem espaços nas pontas), na ordem original.
+    """
+    line = line.strip()
+    if not line:
+        return []
+
+    sentences = []
+    start = 0
+    for match in _SENTENCE_END.finditer(line):
+        candidate = line[start:match.start()]
+        last_word = candidate.rsplit(None, 1)[-1] if candidate.strip() else ""
+        if last_word.rstrip(".").lower() in _ABBREVIATIONS:
+            continue
+        # Mantém aspas/parênteses de fechamento junto da frase
+        end = match.start() + len(match.group().rstrip())
+        sentences.append(line[start:end].strip())
+        start = match.end()
+
+    tail = line[start:].strip()
+    if tail:
+        sentences.append(tail)
+    return sentences
+
+
+def split_long(segment: str, max_chars: int) -> list[str]:
+    """
+    Quebra um segmento maior que max_chars em pedaços por palavra
+    (e, em último caso, no meio da palavra).
+    """
+    if len(segment) <= max_chars:
+        return [segment]
+
+    pieces = []
+    current = ""
+    for word in segment.split():
+        while len(word) > max_chars:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(word[:max_chars])
+            word = word[max_chars:]
+        if not current:
+            current = word
+        elif len(current) + 1 + len(word) <= max_chars:
+            current += " " + word
+        else:
+            pieces.append(current)
+            current = word
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+class SegmentedText:
+    """
+    Resultado da segmentação de um ou mais textos.
+
+    Attributes:
+        segments: Segmentos únicos (cada um com até max_chars caracteres).
+        layouts: Para cada texto, lista de linhas; cada linha é a lista de
+                 índices em `segments` que a compõem (linha vazia = []).
+    """
+
+    def __init__(self, max_chars: int):
+        self.max_chars = max_chars
+        self.segments: list[str] = []
+        self.layouts: list[list[list[int]]] = []
+        self._index: dict[str, int] = {}
+
+    def add_text(self, text: str) -> None:
+        """Segmenta um texto e registra seus segmentos (deduplicados)."""
+        layout = []
+        for line in (text or "").splitlines():
+            indexes = []
+            for sentence in split_sentences(line):
+                for piece in split_long(sentence, self.max_chars):
+                    indexes.append(self._intern(piece))
+            layout.append(indexes)
+        # Remove linhas vazias nas pontas (equivalente ao strip() do texto)
+        while layout and not layout[-1]:
+            layout.pop()
+        while layout and not layout[0]:
+            layout.pop(0)
+        self.layouts.append(layout)
+
+    def _intern(self, segment: str) -> int:
+        # Segmentos com separador interno quebrariam o mapeamento de volta
+        segment = segment.replace(SEGMENT_SEPARATOR, " ")
+        index = self._index.get(segment)
+        if index is None:
+            index = len(self.segments)
+            self.segments.append(segment)
+            self._index[segment] = index
+        return index
+
+    def batches(self, indexes: Optional[list[int]] = None) -> list[list[int]]:
+        """
+        Empacota os segmentos únicos em blocos de até max_chars caracteres
+        (contando separadores), na ordem do documento: cada bloco recebe os
+        segmentos seguintes enquanto couberem. Um bloco é um trecho contínuo
+        do texto, o que dá contexto ao tradutor (ordenar por tamanho daria
+        menos blocos, mas misturaria frases de partes distantes do livro).
+
+        Args:
+            indexes: Subconjunto de segmentos a empacotar (padrão: todos).
+        """
+        sep = len(SEGMENT_SEPARATOR)
+        if indexes is None:
+            indexes = range(len(self.segments))
+        batches: list[list[int]] = []
+        size = 0
+        for i in sorted(indexes):  # Índice = ordem da primeira ocorrência
+            length = len(self.segments[i])
+            if batches and size + sep + length <= self.max_chars:
+                batches[-1].append(i)
+                size += sep + length
+            else:
+                batches.append([i])
+                size = length
+        return batches
+
+    def batch_texts(self) -> list[str]:
+        """Retorna o texto de cada bloco, pronto para envio."""
+        return [
+            SEGMENT_SEPARATOR.join(self.segments[i] for i in batch)
+            for batch in self.batches()
+        ]
+
+    def rebuild(self, translations: list[str]) -> list[str]:
+        """
+        Remonta cada texto original a partir das traduções dos segmentos.
+
+        Args:
+            translations: Tradução de cada segmento (mesmo índice de segments).
+
+        Returns:
+            Um texto traduzido por texto adicionado.
+        """
+        results = []
+        for layout in self.layouts:
+            lines = [" ".join(translations[i] for i in line) for line in layout]
+            results.append("\n".join(lines))
+        return results
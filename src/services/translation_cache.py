@@ -0,0 +1,122 @@
+"""
+Cache de traduções por segmento (frase).
+Persistido em JSON no diretório de cache; compartilhado entre threads.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import uuid
+from typing import Optional
+
+from src.config import TRANSLATION_CACHE_MAX_ENTRIES, TRANSLATION_CACHE_PATH
+from src.utils import tracing
+
+
+class TranslationCache:
+    """Mapa (provedor, idiomas, frase) → tradução, com limite de entradas."""
+
+    def __init__(
+        self,
+        path: Optional[str] = TRANSLATION_CACHE_PATH,
+        max_entries: int = TRANSLATION_CACHE_MAX_ENTRIES,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # Serializa as gravações em disco sem bloquear get/put durante o I/O
+        self._save_lock = threading.Lock()
+        self._entries: dict[str, str] = {}
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    @staticmethod
+    def _key(namespace: str, segment: str) -> str:
+        digest = hashlib.sha1(segment.encode("utf-8")).hexdigest()
+        return f"{namespace}:{digest}"
+
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError):
+            # Cache corrompido não é fatal: recomeça vazio
+            self._entries = {}
+
+    def get_many(self, namespace: str, segments: list[str]) -> dict[int, str]:
+        """
+        Busca traduções em cache.
+
+        Returns:
+            {índice do segmento: tradução} apenas para os encontrados.
+        """
+        found = {}
+        with self._lock:
+            for i, segment in enumerate(segments):
+                value = self._entries.get(self._key(namespace, segment))
+                if value is not None:
+                    found[i] = value
+            self.hits += len(found)
+            self.misses += len(segments) - len(found)
+        return found
+
+    def put_many(self, namespace: str, items: dict[str, str]) -> None:
+        """Grava traduções {segmento: tradução} no cache."""
+        if not items:
+            return
+        with self._lock:
+            for segment, translation in items.items():
+                self._entries[self._key(namespace, segment)] = translation
+            # Descarta as entradas mais antigas (ordem de inserção)
+            overflow = len(self._entries) - self.max_entries
+            if overflow > 0:
+                for key in list(self._entries)[:overflow]:
+                    del self._entries[key]
+            self._dirty = True
+
+    def save(self) -> None:
+        """Grava o cache em disco (escrita atômica), se houve mudanças."""
+        if not self.path:
+            return
+        # Uma gravação por vez: a cópia tirada depois nunca é sobrescrita
+        # por uma anterior que termine por último
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                payload = json.dumps(self._entries, ensure_ascii=False)
+                self._dirty = False
+            with tracing.span("translation_cache.save", chars=len(payload)):
+                tmp_path = f"{self.path}.{uuid.uuid4().hex}.tmp"
+                try:
+                    with open(tmp_path, "w", encoding="utf-8") as f:
+                        f.write(payload)
+                    os.replace(tmp_path, self.path)
+                except OSError:
+                    with self._lock:
+                        self._dirty = True  # Tenta de novo na próxima gravação
+                    raise
+                finally:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_shared: Optional[TranslationCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_translation_cache() -> TranslationCache:
+    """Retorna o cache compartilhado do processo (carregado uma vez)."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = TranslationCache()
+    return _shared
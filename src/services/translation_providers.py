@@ -0,0 +1,193 @@
+"""
+Provedores de tradução - Backends plugáveis usados pelo TranslationService.
+Google (online, deep-translator) e Argos/CTranslate2 (offline, CPU).
+O provedor ativo é escolhido em TRANSLATE_PROVIDER no config.py.
+"""
+
+import threading
+
+from src.config import (
+    ARGOS_BEAM_SIZE,
+    ARGOS_DEVICE,
+    ARGOS_MAX_BATCH_SIZE,
+    ARGOS_THREADS,
+    TRANSLATE_MAX_CHARS,
+    TRANSLATE_PROVIDER,
+    TRANSLATE_SOURCE,
+    TRANSLATE_TARGET,
+)
+
+
+class TranslationProvider:
+    """
+    Interface de um backend de tradução.
+
+    Subclasses implementam translate(); translate_batch() pode ser
+    sobrescrito quando o backend suporta inferência em lote.
+    """
+
+    name = ""
+    # Tamanho máximo (em caracteres) de um texto por chamada
+    max_chars = TRANSLATE_MAX_CHARS
+    # True: translate_batch() recebe os segmentos avulsos, já em lote. False:
+    # o TranslationService junta segmentos em blocos (menos requisições) e
+    # separa o resultado pelas quebras de linha.
+    native_batching = False
+
+    def __init__(self, source: str, target: str):
+        self.source = source
+        self.target = target
+
+    def translate(self, text: str) -> str:
+        """Traduz um único texto (até max_chars caracteres)."""
+        raise NotImplementedError
+
+    def translate_batch(self, texts: list[str]) -> list[str]:
+        """Traduz uma lista de textos, preservando a ordem."""
+        return [self.translate(text) for text in texts]
+
+
+class GoogleProvider(TranslationProvider):
+    """Google Translate via deep-translator (uma requisição HTTP por texto)."""
+
+    name = "google"
+    max_chars = TRANSLATE_MAX_CHARS
+
+    def __init__(self, source: str, target: str):
+        super().__init__(source, target)
+        # GoogleTranslator guarda estado da requisição na instância,
+        # então cada thread usa a sua.
+        self._local = threading.local()
+
+    def _translator(self):
+        translator = getattr(self._local, "translator", None)
+        if translator is None:
+            from deep_translator import GoogleTranslator
+
+            translator = GoogleTranslator(source=self.source, target=self.target)
+            self._local.translator = translator
+        return translator
+
+    def translate(self, text: str) -> str:
+        return self._translator().translate(text) or ""
+
+
+class ArgosProvider(TranslationProvider):
+    """
+    Tradução offline com modelos do Argos Translate executados pelo
+    CTranslate2 na CPU.
+
+    O modelo e o tokenizador são carregados uma única vez (na primeira
+    tradução) e reutilizados; translate_batch() envia todos os segmentos
+    num único lote de inferência. Os segmentos vão como itens do lote, não
+    juntados por quebra de linha: o SentencePiece normaliza as quebras e a
+    saída não teria o mesmo número de linhas.
+    """
+
+    name = "argos"
+    native_batching = True
+    # Modelos são treinados por frase; blocos menores traduzem melhor
+    max_chars = 1000
+
+    def __init__(self, source: str, target: str):
+        super().__init__(source, target)
+        self._lock = threading.Lock()
+        self._translator = None
+        self._tokenizer = None
+
+    def _load(self):
+        """Carrega o modelo CTranslate2 e o SentencePiece do pacote Argos."""
+        with self._lock:
+            if self._translator is not None:
+                return
+            try:
+                import ctranslate2
+                import sentencepiece
+                from argostranslate import package
+            except ImportError:
+                raise RuntimeError(
+                    "Tradução offline indisponível: instale 'argostranslate' "
+                    "(pip install argostranslate)."
+                )
+
+            pkg = next(
+                (
+                    p
+                    for p in package.get_installed_packages()
+                    if p.from_code == self.source and p.to_code == self.target
+                ),
+                None,
+            )
+            if pkg is None:
+                raise RuntimeError(
+                    f"Modelo Argos {self.source} → {self.target} não instalado. "
+                    "Instale o pacote de idioma com argospm."
+                )
+
+            self._tokenizer = sentencepiece.SentencePieceProcessor(
+                model_file=str(pkg.package_path / "sentencepiece.model")
+            )
+            self._translator = ctranslate2.Translator(
+                str(pkg.package_path / "model"),
+                device=ARGOS_DEVICE,
+                inter_threads=1,
+                intra_threads=ARGOS_THREADS,
+            )
+
+    def translate(self, text: str) -> str:
+        return self.translate_batch([text])[0]
+
+    def translate_batch(self, texts: list[str]) -> list[str]:
+        if self._translator is None:
+            self._load()
+
+        # Textos vazios não vão para o modelo
+        indexes = [i for i, t in enumerate(texts) if t and t.strip()]
+        results = [""] * len(texts)
+        if not indexes:
+            return results
+
+        tokens = self._tokenizer.encode([texts[i] for i in indexes], out_type=str)
+        outputs = self._translator.translate_batch(
+            tokens,
+            beam_size=ARGOS_BEAM_SIZE,
+            max_batch_size=ARGOS_MAX_BATCH_SIZE,
+        )
+        for i, output in zip(indexes, outputs):
+            results[i] = self._tokenizer.decode(output.hypotheses[0])
+        return results
+
+
+PROVIDERS = {
+    GoogleProvider.name: GoogleProvider,
+    ArgosProvider.name: ArgosProvider,
+}
+
+# Instâncias compartilhadas por processo: (nome, origem, destino) → provedor
+_instances: dict[tuple[str, str, str], TranslationProvider] = {}
+_instances_lock = threading.Lock()
+
+
+def get_provider(
+    name: str = TRANSLATE_PROVIDER,
+    source: str = TRANSLATE_SOURCE,
+    target: str = TRANSLATE_TARGET,
+) -> TranslationProvider:
+    """
+    Retorna o provedor de tradução (reutilizado entre chamadas).
+
+    Raises:
+        ValueError: Se o nome do provedor não for conhecido.
+    """
+    if name not in PROVIDERS:
+        raise ValueError(
+            f"Provedor de tradução desconhecido: '{name}'. "
+            f"Opções: {', '.join(PROVIDERS)}."
+        )
+    key = (name, source, target)
+    with _instances_lock:
+        provider = _instances.get(key)
+        if provider is None:
+            provider = PROVIDERS[name](source, target)
+            _instances[key] = provider
+    return provider
@@ -1,11 +1,15 @@
 """
 Serviço de Tradução - Traduz textos do inglês para o português.
-Utiliza deep-translator (Google Translate gratuito).
+O backend (Google online ou Argos offline) vem de translation_providers.
 """
 
-from deep_translator import GoogleTranslator
+from src.config import TRANSLATE_PROVIDER, TRANSLATE_SOURCE, TRANSLATE_TARGET
+from typing import Optional
 
-from src.config import TRANSLATE_SOURCE, TRANSLATE_TARGET
+from src.services.text_segmenter import SEGMENT_SEPARATOR, SegmentedText
+from src.services.translation_cache import TranslationCache
+from src.services.translation_providers import TranslationProvider, get_provider
+from src.utils import tracing
 
 
 class TranslationService:
@@ -15,10 +19,16 @@ class TranslationService:
         self,
         source: str = TRANSLATE_SOURCE,
         target: str = TRANSLATE_TARGET,
+        provider: str | TranslationProvider = TRANSLATE_PROVIDER,
+        cache: Optional[TranslationCache] = None,
     ):
         self.source = source
         self.target = target
-        self.translator = GoogleTranslator(source=source, target=target)
+        if isinstance(provider, str):
+            provider = get_provider(provider, source, target)
+        self.provider = provider
+        self.cache = cache
+        self._cache_namespace = f"{provider.name}:{source}:{target}"
 
     def translate(self, text: str) -> str:
         """
@@ -32,41 +42,97 @@ class TranslationService:
         """
         if not text or not text.strip():
             return ""
+        return self.translate_many([text])[0]
 
-        # deep-translator tem limite de ~5000 chars por request
-        # Dividimos em blocos se necessário
-        max_chars = 4500
-        if len(text) <= max_chars:
-            raw = self.translator.translate(text)
-            return self._sanitize_for_pdf(raw)
+    def translate_many(self, texts: list[str]) -> list[str]:
+        """
+        Traduz vários textos de uma vez (ex.: todas as páginas de um livro).
 
-        # Divide em blocos respeitando quebras de linha
-        blocks = self._split_text(text, max_chars)
-        translated_blocks = []
-        for block in blocks:
-            translated = self.translator.translate(block)
-            translated_blocks.append(self._sanitize_for_pdf(translated))
+        Os textos são divididos em frases; frases repetidas são traduzidas
+        uma única vez e os segmentos são empacotados em blocos cheios, o que
+        minimiza o número de requisições ao provedor.
 
-        return "\n".join(translated_blocks)
+        Args:
+            texts: Textos a serem traduzidos.
 
-    def _split_text(self, text: str, max_chars: int) -> list[str]:
-        """Divide texto em blocos menores respeitando parágrafos."""
-        paragraphs = text.split("\n")
-        blocks = []
-        current_block = ""
-
-        for paragraph in paragraphs:
-            if len(current_block) + len(paragraph) + 1 > max_chars:
-                if current_block:
-                    blocks.append(current_block.strip())
-                current_block = paragraph
+        Returns:
+            Lista de textos traduzidos, na mesma ordem e estrutura de linhas.
+        """
+        with tracing.span("translation.translate_many", texts=len(texts)) as sp:
+            segmented = SegmentedText(self.provider.max_chars)
+            for text in texts:
+                segmented.add_text(text)
+            sp.set(
+                chars=sum(len(t) for t in texts if t),
+                segments=len(segmented.segments),
+            )
+            translations = self._translate_segments(segmented)
+            return segmented.rebuild(translations)
+
+    def _translate_segments(self, segmented: SegmentedText) -> list[str]:
+        """Traduz os segmentos únicos, bloco a bloco (consultando o cache)."""
+        segments = segmented.segments
+        translations = [""] * len(segments)
+
+        pending = None
+        if self.cache is not None:
+            cached = self.cache.get_many(self._cache_namespace, segments)
+            for i, value in cached.items():
+                translations[i] = value
+            pending = [i for i in range(len(segments)) if i not in cached]
+            tracing.annotate(cache_hits=len(cached), cache_misses=len(pending))
+            if not pending:
+                return translations
+
+        if self.provider.native_batching:
+            # O próprio provedor faz o lote: cada segmento é um item
+            batches = [[i] for i in (range(len(segments)) if pending is None else pending)]
+        else:
+            batches = segmented.batches(pending)
+        bodies = [SEGMENT_SEPARATOR.join(segments[i] for i in b) for b in batches]
+
+        with tracing.span(
+            "translation.provider",
+            provider=self.provider.name,
+            batches=len(bodies),
+            chars=sum(len(b) for b in bodies),
+        ):
+            results = self.provider.translate_batch(bodies)
+
+        retry = []
+        for batch, result in zip(batches, results):
+            if self.provider.native_batching:
+                parts = [(result or "").replace(SEGMENT_SEPARATOR, " ")]
             else:
-                current_block += "\n" + paragraph if current_block else paragraph
-
-        if current_block.strip():
-            blocks.append(current_block.strip())
+                parts = (result or "").split(SEGMENT_SEPARATOR)
+            if len(parts) != len(batch):
+                # O provedor juntou/quebrou linhas: traduz os segmentos avulsos
+                retry.extend(batch)
+                continue
+            for i, part in zip(batch, parts):
+                translations[i] = self._sanitize_for_pdf(part.strip())
+
+        if retry:
+            with tracing.span(
+                "translation.provider_retry", provider=self.provider.name, segments=len(retry)
+            ):
+                results = self.provider.translate_batch([segments[i] for i in retry])
+            for i, result in zip(retry, results):
+                text = (result or "").replace(SEGMENT_SEPARATOR, " ").strip()
+                translations[i] = self._sanitize_for_pdf(text)
+
+        if self.cache is not None:
+            self.cache.put_many(
+                self._cache_namespace,
+                {segments[i]: translations[i] for i in pending if translations[i]},
+            )
+        return translations
 
-        return blocks
+    def _split_text(self, text: str, max_chars: int) -> list[str]:
+        """Divide texto em blocos de até max_chars, quebrando por frases."""
+        segmented = SegmentedText(max_chars)
+        segmented.add_text(text)
+        return segmented.batch_texts()
 
     @staticmethod
     def merge_texts(original: str, translated: str) -> str:
@@ -4,15 +4,20 @@ Permite colar print screen do clipboard ou selecionar arquivo.
 Após extração: texto original à esquerda, botão traduzir, texto traduzido à direita.
 """
 
+import logging
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from PIL import Image, ImageTk
 
-from src.config import COLORS, FONTS
-from src.services.ocr_service import OCRService
+from src.config import COLORS, FONTS, JOB_SERVER_URL
+from src.services.ocr_service import ocr_for_extraction, resolve_profile
 from src.services.translation_service import TranslationService
+from src.utils import profiling
+from src.utils.image_preview import PreviewLoader
 from src.ui.base import StyledButton, StyledFrame, StyledLabel, StyledText
 
+logger = logging.getLogger(__name__)
+
 
 class ImageCaptureScreen(tk.Frame):
     """Tela de captura e processamento de imagem."""
@@ -22,13 +27,33 @@ class ImageCaptureScreen(tk.Frame):
         self.db = db_manager
         self.extraction_id = extraction_id
         self.on_back = on_back
-        self.ocr = OCRService()
-        self.translator = TranslationService()
-        self.current_image = None
-        self.image_photo = None
 
         extraction = self.db.get_extraction(extraction_id)
         self.extraction_name = extraction["name"] if extraction else "Sem nome"
+        ocr_profile = resolve_profile(extraction)
+
+        if JOB_SERVER_URL:
+            # OCR e tradução executados no servidor de jobs
+            from src.server.client import (
+                JobClient,
+                RemoteOCRService,
+                RemoteTranslationService,
+            )
+
+            client = JobClient(JOB_SERVER_URL)
+            self.ocr = RemoteOCRService(client, ocr_profile)
+            self.translator = RemoteTranslationService(client)
+        else:
+            self.ocr = ocr_for_extraction(self.db, extraction_id)
+            self.translator = TranslationService()
+        # Imagem completa: decodificada só quando o OCR (ou o salvamento) precisa
+        self.current_image = None
+        self.current_path = None
+        self.image_photo = None
+        self.preview_loader = PreviewLoader()
+        self._saving = False
+        self._save_poll = None  # after() do acompanhamento do salvamento
+        self._pending_save = None  # (future, dados) do salvamento em andamento
 
         self._build_ui()
 
@@ -201,6 +226,7 @@ class ImageCaptureScreen(tk.Frame):
             image = ImageGrab.grabclipboard()
             if image and isinstance(image, Image.Image):
                 self.current_image = image
+                self.current_path = None
                 self._show_preview(image)
                 self.extract_btn.config(state="normal")
             else:
@@ -223,20 +249,44 @@ class ImageCaptureScreen(tk.Frame):
         )
         if file_path:
             try:
-                self.current_image = Image.open(file_path)
-                self._show_preview(self.current_image)
-                self.extract_btn.config(state="normal")
+                # Só lê o cabeçalho; a decodificação fica para o OCR
+                with Image.open(file_path):
+                    pass
             except Exception as e:
                 messagebox.showerror("Erro", f"Erro ao abrir imagem: {str(e)}")
-
-    def _show_preview(self, image: Image.Image):
-        """Mostra preview da imagem selecionada."""
-        # Redimensiona para caber no preview
-        max_w, max_h = 700, 150
-        img_w, img_h = image.size
-        ratio = min(max_w / img_w, max_h / img_h, 1.0)
-        new_size = (int(img_w * ratio), int(img_h * ratio))
-        preview = image.resize(new_size, Image.LANCZOS)
+                return
+            self.current_image = None
+            self.current_path = file_path
+            self._show_preview(file_path)
+            self.extract_btn.config(state="normal")
+
+    def _full_image(self) -> Image.Image | None:
+        """Imagem em resolução completa (decodifica o arquivo na primeira vez)."""
+        if self.current_image is None and self.current_path:
+            with Image.open(self.current_path) as image:
+                image.load()
+            self.current_image = image
+        return self.current_image
+
+    def _show_preview(self, source):
+        """Gera o preview (arquivo ou imagem) fora da thread do Tk e o exibe."""
+        self.image_label.config(image="", text="Carregando preview...")
+        self._poll_preview(self.preview_loader.request(source))
+
+    def _poll_preview(self, future):
+        if not self.winfo_exists():
+            return  # Tela fechada
+        if not self.preview_loader.is_current(future) or future.cancelled():
+            return  # Outra imagem foi escolhida nesse meio-tempo
+        if not future.done():
+            self.after(20, self._poll_preview, future)
+            return
+        try:
+            preview = future.result()
+        except Exception as e:
+            self.image_label.config(text="Nenhuma imagem selecionada")
+            messagebox.showerror("Erro", f"Erro ao abrir imagem: {str(e)}")
+            return
 
         self.image_photo = ImageTk.PhotoImage(preview)
         self.image_label.config(
@@ -245,9 +295,10 @@ class ImageCaptureScreen(tk.Frame):
             height=0,
         )
 
+    @profiling.profiled("ocr")
     def _extract_text(self):
         """Extrai texto da imagem usando OCR."""
-        if not self.current_image:
+        if not (self.current_image or self.current_path):
             messagebox.showwarning("Aviso", "Selecione uma imagem primeiro.")
             return
 
@@ -255,7 +306,7 @@ class ImageCaptureScreen(tk.Frame):
             self.extract_btn.config(text="⏳ Extraindo...", state="disabled")
             self.update_idletasks()
 
-            text = self.ocr.extract_from_image(self.current_image)
+            text = self.ocr.extract_from_image(self._full_image())
 
             self.original_text.delete("1.0", tk.END)
             self.original_text.insert("1.0", text)
@@ -273,6 +324,7 @@ class ImageCaptureScreen(tk.Frame):
             self.extract_btn.config(text="🔍 Extrair Texto", state="normal")
             messagebox.showerror("Erro OCR", f"Erro na extração: {str(e)}")
 
+    @profiling.profiled("translate")
     def _translate_text(self):
         """Traduz o texto original para portugues e gera texto mesclado."""
         text = self.original_text.get("1.0", tk.END).strip()
@@ -323,29 +375,98 @@ class ImageCaptureScreen(tk.Frame):
             )
             return None
 
-        return {
-            "original_text": original,
-            "translated_text": translated,
-        }
+        duplicate = self.db.find_near_duplicate(self.extraction_id, original)
+        if duplicate and not messagebox.askyesno(
+            "Página repetida",
+            f"O texto é quase igual ao da página {duplicate['page_number']}.\n"
+            "Salvar mesmo assim?",
+        ):
+            return None
 
-    def _save_and_new(self):
-        """Salva a página atual e limpa para uma nova."""
+        return {"original_text": original, "translated_text": translated}
+
+    @staticmethod
+    def _store_capture(images, image: Image.Image | None, path: str | None) -> str | None:
+        """
+        Decodifica (se preciso) e grava a captura original no armazenamento de
+        imagens — executa na thread de imagens, não na do Tk.
+        """
+        if image is None and path:
+            with Image.open(path) as decoded:
+                decoded.load()
+            image = decoded
+        return images.put(image) if image is not None else None
+
+    def _save_page(self, on_saved: callable) -> bool:
+        """
+        Salva a página atual. A codificação da imagem roda na thread de
+        imagens; a página é gravada e `on_saved` chamado na thread do Tk.
+        Se a tela fechar antes, a página é gravada mesmo assim (o usuário já
+        pediu para salvar), sem `on_saved` (ver destroy).
+
+        Returns:
+            False se não há o que salvar (ou o usuário desistiu).
+        """
+        if self._saving:
+            return True  # Já em andamento: o clique repetido é ignorado
         data = self._get_page_data()
         if not data:
+            return False
+
+        self._saving = True
+        # Guarda a captura original (permite refazer o OCR depois)
+        future = self.preview_loader.submit(
+            self._store_capture, self.db.images, self.current_image, self.current_path
+        )
+        self._pending_save = (future, data)
+        self._poll_save(future, data, on_saved)
+        return True
+
+    def _poll_save(self, future, data: dict, on_saved: callable) -> None:
+        self._save_poll = None
+        if not self.winfo_exists():
+            return  # Tela fechada: destroy() termina o salvamento
+        if not future.done():
+            self._save_poll = self.after(20, self._poll_save, future, data, on_saved)
             return
+        self._saving = False
+        self._pending_save = None
+        try:
+            page_num = self._add_page(data, future.result())
+        except Exception as e:
+            messagebox.showerror("Erro", f"Erro ao salvar a página: {str(e)}")
+            return
+        on_saved(page_num)
 
+    def _add_page(self, data: dict, image_hash: str | None) -> int:
+        """Grava a página no fim da extração e devolve o número dela."""
         page_num = self.db.get_next_page_number(self.extraction_id)
         self.db.add_page(
             extraction_id=self.extraction_id,
             page_number=page_num,
             original_text=data["original_text"],
             translated_text=data["translated_text"],
+            image_hash=image_hash,
         )
+        return page_num
+
+    def _finish_detached_save(self, future, data: dict) -> None:
+        """Grava a página de um salvamento que a tela fechada não acompanha mais."""
+        try:
+            self._add_page(data, future.result())
+        except Exception:
+            logger.exception("Falha ao salvar a página após fechar a captura")
+
+    def _save_and_new(self):
+        """Salva a página atual e limpa para uma nova."""
+        self._save_page(self._clear_for_new)
 
+    def _clear_for_new(self, page_num: int):
         messagebox.showinfo("Sucesso", f"Página {page_num} salva com sucesso!")
 
         # Limpa tudo para nova página
         self.current_image = None
+        self.current_path = None
         self.image_photo = None
         self.image_label.config(
             image="",
@@ -361,14 +482,17 @@ class ImageCaptureScreen(tk.Frame):
 
     def _save_and_finish(self):
         """Salva a página atual e retorna à listagem."""
-        data = self._get_page_data()
-        if data:
-            page_num = self.db.get_next_page_number(self.extraction_id)
-            self.db.add_page(
-                extraction_id=self.extraction_id,
-                page_number=page_num,
-                original_text=data["original_text"],
-                translated_text=data["translated_text"],
-            )
-
-        self.on_back()
+        if not self._save_page(lambda _page_num: self.on_back()):
+            self.on_back()
+
+    def destroy(self):
+        if self._save_poll is not None:
+            self.after_cancel(self._save_poll)
+            self._save_poll = None
+        if self._pending_save is not None:
+            # Termina na thread de imagens, sem tocar nos widgets
+            future, data = self._pending_save
+            self._pending_save = None
+            future.add_done_callback(lambda f: self._finish_detached_save(f, data))
+        self.preview_loader.shutdown()
+        super().destroy()
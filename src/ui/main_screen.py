@@ -1,6 +1,7 @@
 """
 Tela principal - Lista de Extrações Disponíveis.
-Exibe todas as extrações com ações: Editar, Deletar, Visualizar PDF, Continuar.
+Exibe todas as extrações com ações: Editar, Deletar, Visualizar PDF, Continuar
+e Traduzir tudo (tradução em massa em background).
 Botão lateral direito para Nova Extração.
 """
 
@@ -8,8 +9,11 @@ import tkinter as tk
 from tkinter import messagebox
 from datetime import datetime
 
-from src.config import COLORS, FONTS
+from src.config import COLORS, DB_REFRESH_INTERVAL_S, FONTS, JOB_SERVER_URL
+from src.services.bulk_translate import BulkTranslateJob, get_running_job
+from src.services.exporters import export_extraction
 from src.services.pdf_service import PDFService
+from src.utils import profiling
 from src.ui.base import (
     StyledButton,
     StyledFrame,
@@ -34,7 +38,17 @@ class MainScreen(tk.Frame):
         self.on_new_extraction = on_new_extraction
         self.on_edit = on_edit
         self.on_continue = on_continue
-        self.pdf_service = PDFService()
+        if JOB_SERVER_URL:
+            # PDF gerado no servidor de jobs e salvo localmente
+            from src.server.client import JobClient, RemotePDFService
+
+            self.pdf_service = RemotePDFService(JobClient(JOB_SERVER_URL))
+        else:
+            self.pdf_service = PDFService()
+        # Labels de progresso dos jobs de tradução: extraction_id → label
+        self._job_labels = {}
+        self._poll_id = None
+        self._db_changes = 0  # external_changes do banco na última listagem
 
         self._build_ui()
         self.refresh_list()
@@ -97,21 +111,25 @@ class MainScreen(tk.Frame):
         self.list_container = ScrollableFrame(self)
         self.list_container.pack(expand=True, fill="both", padx=25, pady=(5, 20))
 
+    @profiling.profiled("refresh_list")
     def refresh_list(self):
         """Recarrega a lista de extrações do banco."""
         # Limpa a lista atual
         for widget in self.list_container.scrollable.winfo_children():
             widget.destroy()
+        self._job_labels = {}
 
         extractions = self.db.get_all_extractions()
+        self._db_changes = self.db.external_changes
         self.count_label.config(text=f"{len(extractions)} extração(ões) encontrada(s)")
 
         if not extractions:
             self._show_empty_state()
-            return
-
         for extraction in extractions:
             self._create_card(extraction)
+        # Sempre: com a lista vazia, o polling ainda percebe extrações
+        # criadas por outro processo (CLI, servidor de jobs)
+        self._poll_jobs()
 
     def _show_empty_state(self):
         """Mostra mensagem quando não há extrações."""
@@ -177,16 +195,18 @@ class MainScreen(tk.Frame):
             anchor="w",
         ).pack(anchor="w")
 
-        # Detalhes
+        # Detalhes (estatísticas desnormalizadas — não varre as páginas)
         page_count = extraction.get("page_count", 0)
-        created = extraction.get("created_at", "")
-        try:
-            created_dt = datetime.fromisoformat(created)
-            created_str = created_dt.strftime("%d/%m/%Y %H:%M")
-        except (ValueError, TypeError):
-            created_str = created
-
-        detail_text = f"📄 {page_count} página(s)  •  📅 Criado em {created_str}"
+        translated_count = extraction.get("translated_count", 0)
+        word_count = extraction.get("word_count", 0)
+        created_str = self._format_date(extraction.get("created_at", ""))
+        updated_str = self._format_date(extraction.get("updated_at", ""))
+
+        detail_text = (
+            f"📄 {page_count} página(s)  •  🌐 {translated_count}/{page_count} "
+            f"traduzida(s)  •  🔤 {word_count} palavra(s)  •  "
+            f"📅 Criado em {created_str}  •  🕒 Modificado em {updated_str}"
+        )
         tk.Label(
             info_frame,
             text=detail_text,
@@ -196,12 +216,24 @@ class MainScreen(tk.Frame):
             anchor="w",
         ).pack(anchor="w", pady=(3, 0))
 
+        doc_id = extraction.get("id", extraction.doc_id)
+
+        # Progresso da tradução em massa (preenchido pelo polling)
+        job_label = tk.Label(
+            info_frame,
+            text="",
+            font=FONTS["small"],
+            bg=COLORS["bg_card"],
+            fg=COLORS["warning"],
+            anchor="w",
+        )
+        job_label.pack(anchor="w")
+        self._job_labels[doc_id] = job_label
+
         # ── Botões (lado direito) ──────────────────────────────────────────
         btn_frame = tk.Frame(card, bg=COLORS["bg_card"])
         btn_frame.pack(side="right")
 
-        doc_id = extraction.get("id", extraction.doc_id)
-
         # Visualizar PDF
         StyledButton(
             btn_frame,
@@ -218,6 +250,15 @@ class MainScreen(tk.Frame):
             style="success",
         ).pack(side="left", padx=(0, 5))
 
+        # Traduzir todas as páginas sem tradução
+        if extraction.get("untranslated_count", 0):
+            StyledButton(
+                btn_frame,
+                text="🌐 Traduzir tudo",
+                command=lambda eid=doc_id: self._translate_all(eid),
+                style="secondary",
+            ).pack(side="left", padx=(0, 5))
+
         # Editar
         StyledButton(
             btn_frame,
@@ -234,6 +275,15 @@ class MainScreen(tk.Frame):
             style="danger",
         ).pack(side="left")
 
+    @staticmethod
+    def _format_date(value: str) -> str:
+        """Formata uma data ISO para exibição (dd/mm/aaaa hh:mm)."""
+        try:
+            return datetime.fromisoformat(value).strftime("%d/%m/%Y %H:%M")
+        except (ValueError, TypeError):
+            return value
+
+    @profiling.profiled("export_pdf")
     def _view_pdf(self, extraction_id: int):
         """Gera e abre o PDF da extração."""
         extraction = self.db.get_extraction(extraction_id)
@@ -241,21 +291,68 @@ class MainScreen(tk.Frame):
             messagebox.showerror("Erro", "Extração não encontrada.")
             return
 
-        pages = self.db.get_pages(extraction_id)
-        if not pages:
+        if not extraction.get("page_count"):
             messagebox.showwarning(
                 "Aviso", "Esta extração não possui páginas para visualizar."
             )
             return
 
         try:
-            title = f"{extraction['name']} - v{extraction.get('version', '')}"
-            filename = f"{extraction['name']}_{extraction.get('version', '')}_{extraction.get('doc_type', '')}"
-            pdf_path = self.pdf_service.generate_pdf(title, pages, filename)
+            # Reaproveita o PDF já exportado se o conteúdo não mudou
+            pdf_path = export_extraction(
+                self.db, extraction_id, "pdf", pdf_service=self.pdf_service
+            )
             self.pdf_service.open_pdf(pdf_path)
         except Exception as e:
             messagebox.showerror("Erro", f"Erro ao gerar PDF: {str(e)}")
 
+    def _translate_all(self, extraction_id: int):
+        """Inicia a tradução em massa das páginas sem tradução."""
+        try:
+            # start() registra o job antes da thread: um clique duplo cai aqui
+            BulkTranslateJob(self.db, extraction_id).start()
+        except RuntimeError:
+            messagebox.showinfo("Aviso", "A tradução desta extração já está em andamento.")
+            return
+        label = self._job_labels.get(extraction_id)
+        if label is not None:
+            # Mostra o job já, mesmo que termine antes do primeiro polling
+            label.config(text="⏳ Traduzindo...")
+        self._poll_jobs()
+
+    def _poll_jobs(self):
+        """
+        Atualiza o progresso dos jobs de tradução e, se outro processo
+        alterou o banco, a lista (executa na thread do Tk).
+        """
+        if self._poll_id:
+            self.after_cancel(self._poll_id)
+            self._poll_id = None
+
+        active = False
+        finished = False
+        for extraction_id, label in self._job_labels.items():
+            job = get_running_job(extraction_id)
+            if job:
+                active = True
+                label.config(text=f"⏳ Traduzindo: {job.done}/{job.total} página(s)")
+            elif label.cget("text"):
+                # Job terminou desde o último polling
+                finished = True
+
+        if finished or self.db.refresh() != self._db_changes:
+            # Job terminou ou outro processo (CLI, servidor de jobs) alterou o banco
+            self.refresh_list()
+        else:
+            delay_ms = 500 if active else int(DB_REFRESH_INTERVAL_S * 1000)
+            self._poll_id = self.after(delay_ms, self._poll_jobs)
+
+    def destroy(self):
+        if self._poll_id:
+            self.after_cancel(self._poll_id)
+            self._poll_id = None
+        super().destroy()
+
     def _delete(self, extraction_id: int, name: str):
         """Abre diálogo de confirmação para deletar."""
         from src.ui.delete_dialog import DeleteConfirmDialog
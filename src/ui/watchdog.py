@@ -0,0 +1,235 @@
+"""
+Watchdog da interface - Detecta travamentos do loop de eventos do Tk.
+
+Um heartbeat agendado com after() mede o atraso do loop. Uma thread
+monitora o último heartbeat: quando o atraso passa do limite, ela captura a
+pilha da thread principal (sys._current_frames) enquanto o travamento dura.
+Ao terminar, o travamento é registrado em WATCHDOG_LOG_PATH com a duração,
+o callback responsável (ex.: _translate_text, _view_pdf) e a pilha. Ao
+fechar o app, grava um resumo por callback.
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from typing import Optional
+
+from src.config import (
+    WATCHDOG_INTERVAL_MS,
+    WATCHDOG_LOG_PATH,
+    WATCHDOG_STALL_MS,
+)
+
+_SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_THIS_FILE = os.path.abspath(__file__)
+# Pilhas guardadas por travamento (a ~20/s, cobre 10 s)
+_MAX_SAMPLES = 200
+
+
+def _is_app_frame(frame: traceback.FrameSummary) -> bool:
+    path = os.path.abspath(frame.filename)
+    return path.startswith(_SRC_DIR) and path != _THIS_FILE
+
+
+def _responsible_callback(stack: traceback.StackSummary) -> str:
+    """
+    Identifica o callback do app que está executando: o primeiro frame do
+    app depois da última chamada do Tkinter (CallWrapper / after).
+    """
+    start = 0
+    for i, frame in enumerate(stack):
+        if "tkinter" in frame.filename and frame.name in ("__call__", "callit"):
+            start = i + 1
+    for frame in stack[start:]:
+        if _is_app_frame(frame):
+            return frame.name
+    return "desconhecido"
+
+
+def _innermost_app_frame(stack: traceback.StackSummary) -> str:
+    """Frame mais interno do app (onde o tempo está sendo gasto)."""
+    for frame in reversed(stack):
+        if _is_app_frame(frame):
+            return f"{os.path.relpath(frame.filename, _SRC_DIR)}:{frame.lineno} {frame.name}"
+    return "desconhecido"
+
+
+def _create_logger(path: str) -> logging.Logger:
+    logger = logging.getLogger("aldemarvin.watchdog")
+    if not logger.handlers:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handler = logging.FileHandler(path, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+class UIWatchdog:
+    """Heartbeat no loop do Tk + thread monitora que captura a pilha nos travamentos."""
+
+    def __init__(
+        self,
+        root,
+        interval_ms: int = WATCHDOG_INTERVAL_MS,
+        stall_ms: int = WATCHDOG_STALL_MS,
+        log_path: str = WATCHDOG_LOG_PATH,
+    ):
+        self.root = root
+        self.interval = interval_ms / 1000
+        self.stall_threshold = stall_ms / 1000
+        self.log_path = log_path
+        self.logger = _create_logger(log_path)
+        # Criado na thread do Tk: é a thread monitorada
+        self._main_thread_id = threading.get_ident()
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+        self._after_id = None
+        self._last_beat = 0.0
+        # Amostras de pilha do travamento em andamento
+        self._samples: list[traceback.StackSummary] = []
+
+        # Estatísticas
+        self.beats = 0
+        # Atrasos dos últimos heartbeats (~1 h com o intervalo padrão)
+        self.latencies = deque(maxlen=36_000)
+        self.stalls: list[dict] = []
+        self._started_at = 0.0
+
+    # ─── Controle ──────────────────────────────────────────────────────────
+
+    def start(self) -> "UIWatchdog":
+        self._started_at = self._last_beat = time.monotonic()
+        self._after_id = self.root.after(int(self.interval * 1000), self._heartbeat)
+        self._monitor = threading.Thread(target=self._monitor_loop, daemon=True)
+        self._monitor.start()
+        return self
+
+    def stop(self) -> dict:
+        """Para o watchdog, grava o resumo no log e o retorna."""
+        self._stop.set()
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass  # Janela já destruída
+            self._after_id = None
+        if self._monitor:
+            self._monitor.join(timeout=1)
+
+        report = self.summary()
+        self.logger.info("Resumo da sessão:\n%s", self.format_summary(report))
+        return report
+
+    # ─── Heartbeat (thread do Tk) ──────────────────────────────────────────
+
+    def _heartbeat(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            lateness = max(0.0, now - self._last_beat - self.interval)
+            self._last_beat = now
+            samples, self._samples = self._samples, []
+
+        self.beats += 1
+        self.latencies.append(lateness)
+        if lateness >= self.stall_threshold:
+            self._record_stall(lateness, samples)
+
+        if not self._stop.is_set():
+            self._after_id = self.root.after(int(self.interval * 1000), self._heartbeat)
+
+    def _record_stall(self, duration: float, samples: list) -> None:
+        if samples:
+            callback = _responsible_callback(samples[0])
+            hotspot, _ = Counter(_innermost_app_frame(s) for s in samples).most_common(1)[0]
+            stack = "".join(samples[0].format())
+        else:
+            # Travamento curto demais para a thread monitora amostrar
+            callback, hotspot, stack = "desconhecido", "desconhecido", ""
+
+        self.stalls.append({"duration": duration, "callback": callback, "hotspot": hotspot})
+        self.logger.warning(
+            "Interface travada por %.0f ms — callback: %s — ponto quente: %s (%d amostra(s))\n%s",
+            duration * 1000,
+            callback,
+            hotspot,
+            len(samples),
+            stack,
+        )
+
+    # ─── Monitor (thread separada) ─────────────────────────────────────────
+
+    def _monitor_loop(self) -> None:
+        tick = self.interval / 2
+        while not self._stop.wait(tick):
+            with self._lock:
+                overdue = time.monotonic() - self._last_beat - self.interval
+                full = len(self._samples) >= _MAX_SAMPLES
+            if overdue < self.stall_threshold or full:
+                continue
+
+            frame = sys._current_frames().get(self._main_thread_id)
+            if frame is None:
+                continue
+            stack = traceback.extract_stack(frame)
+            with self._lock:
+                # Heartbeat pode ter voltado enquanto a pilha era lida
+                if time.monotonic() - self._last_beat - self.interval >= self.stall_threshold:
+                    self._samples.append(stack)
+
+    # ─── Relatório ─────────────────────────────────────────────────────────
+
+    def summary(self) -> dict:
+        """Latência do loop e travamentos agrupados por callback."""
+        ordered = sorted(self.latencies)
+
+        def pct(q: float) -> float:
+            if not ordered:
+                return 0.0
+            return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))] * 1000
+
+        by_callback: dict[str, dict] = {}
+        for stall in self.stalls:
+            entry = by_callback.setdefault(
+                stall["callback"], {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+            )
+            ms = stall["duration"] * 1000
+            entry["count"] += 1
+            entry["total_ms"] += ms
+            entry["max_ms"] = max(entry["max_ms"], ms)
+
+        return {
+            "session_s": round(time.monotonic() - self._started_at, 1),
+            "beats": self.beats,
+            "latency_p50_ms": round(pct(50), 1),
+            "latency_p95_ms": round(pct(95), 1),
+            "latency_max_ms": round(ordered[-1] * 1000 if ordered else 0.0, 1),
+            "stalls": len(self.stalls),
+            "stalled_ms": round(sum(s["duration"] for s in self.stalls) * 1000, 1),
+            "by_callback": by_callback,
+        }
+
+    @staticmethod
+    def format_summary(report: dict) -> str:
+        lines = [
+            f"Sessão: {report['session_s']} s, {report['beats']} heartbeats",
+            f"Latência do loop: p50 {report['latency_p50_ms']} ms, "
+            f"p95 {report['latency_p95_ms']} ms, máx. {report['latency_max_ms']} ms",
+            f"Travamentos: {report['stalls']} ({report['stalled_ms']:.0f} ms no total)",
+        ]
+        ranked = sorted(
+            report["by_callback"].items(), key=lambda item: item[1]["total_ms"], reverse=True
+        )
+        for callback, entry in ranked:
+            lines.append(
+                f"  {callback}: {entry['count']}x, total {entry['total_ms']:.0f} ms, "
+                f"máx. {entry['max_ms']:.0f} ms"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,76 @@
+"""
+Preview rápido de imagens para a interface.
+
+Fotos de celular têm dezenas de megapixels: decodificar a imagem inteira e
+redimensionar com LANCZOS na thread do Tk trava a tela por centenas de ms.
+Aqui o preview é gerado numa thread separada e decodifica só o necessário:
+JPEG via draft() (o decodificador já entrega 1/2, 1/4 ou 1/8 da resolução),
+os demais formatos via reduce() antes do filtro final do thumbnail().
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Union
+
+from PIL import Image
+
+from src.config import IMAGE_PREVIEW_SIZE
+from src.utils import tracing
+
+
+def make_preview(
+    source: Union[str, Image.Image], size: tuple[int, int] = IMAGE_PREVIEW_SIZE
+) -> Image.Image:
+    """
+    Miniatura que cabe em `size`, sem decodificar a resolução completa.
+
+    Args:
+        source: Caminho do arquivo ou imagem já carregada (ex.: do clipboard).
+        size: Tamanho máximo (largura, altura).
+    """
+    with tracing.span("preview.make") as sp:
+        if isinstance(source, Image.Image):
+            # Imagem já decodificada: reduce() por fator inteiro antes do filtro
+            factor = max(1, min(source.width // (size[0] * 2), source.height // (size[1] * 2)))
+            preview = source.reduce(factor) if factor > 1 else source.copy()
+            preview.thumbnail(size, Image.LANCZOS)
+        else:
+            with Image.open(source) as image:
+                # thumbnail() chama draft() antes de decodificar (JPEG)
+                image.thumbnail(size, Image.LANCZOS, reducing_gap=2.0)
+                preview = image.copy()
+        sp.set(pixels=preview.width * preview.height)
+    return preview
+
+
+class PreviewLoader:
+    """
+    Gera previews numa thread dedicada. Só o pedido mais recente importa:
+    pedir um novo cancela o anterior se ele ainda não começou.
+
+    A mesma thread executa outros trabalhos pesados de imagem da tela
+    (submit()), que nunca são cancelados por um novo preview.
+    """
+
+    def __init__(self, size: tuple[int, int] = IMAGE_PREVIEW_SIZE):
+        self.size = size
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="preview")
+        self._current: Future | None = None
+
+    def request(self, source: Union[str, Image.Image]) -> Future:
+        """Agenda o preview; o resultado é a imagem (PIL) reduzida."""
+        if self._current is not None:
+            self._current.cancel()
+        self._current = self._pool.submit(make_preview, source, self.size)
+        return self._current
+
+    def submit(self, fn, *args) -> Future:
+        """Executa fn(*args) na thread de imagens (ex.: decodificar e gravar)."""
+        return self._pool.submit(fn, *args)
+
+    def is_current(self, future: Future) -> bool:
+        return future is self._current
+
+    def shutdown(self) -> None:
+        if self._current is not None:
+            self._current.cancel()
+        self._pool.shutdown(wait=False)
@@ -0,0 +1,285 @@
+"""
+Profiling embutido - Perfis de desempenho sem alterar o código.
+
+Modos (ALDEMARVIN_PROFILE ou --profile no app e no CLI):
+    session   cProfile da sessão inteira (thread principal)
+    actions   cProfile de cada ação marcada com @profiled (ex.: export_pdf)
+    sampling  amostragem de pilhas de todas as threads da sessão (tempo de
+              relógio, inclui esperas de rede/subprocesso)
+
+Os perfis são gravados em PROFILES_DIR. Para ver as funções mais caras:
+    python -m src.utils.profiling list
+    python -m src.utils.profiling view data/profiles/action_export_pdf_....prof
+"""
+
+import argparse
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+from src.config import PROFILE_SAMPLE_INTERVAL_S, PROFILES_DIR
+
+MODES = ("session", "actions", "sampling")
+
+_mode = ""
+_session = None  # cProfile.Profile ou SamplingProfiler da sessão
+_local = threading.local()
+
+
+def _profile_path(kind: str, name: str, ext: str) -> str:
+    os.makedirs(PROFILES_DIR, exist_ok=True)
+    stamp = time.strftime("%Y%m%d_%H%M%S")
+    safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in name)
+    return os.path.join(PROFILES_DIR, f"{kind}_{safe}_{stamp}_{os.getpid()}{ext}")
+
+
+# ─── Profiler por amostragem ───────────────────────────────────────────────
+
+
+class SamplingProfiler:
+    """Amostra periodicamente as pilhas de todas as threads (sys._current_frames)."""
+
+    def __init__(self, interval: float = PROFILE_SAMPLE_INTERVAL_S):
+        self.interval = interval
+        self.samples = 0
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started_at = 0.0
+        self.duration = 0.0
+
+    def start(self) -> "SamplingProfiler":
+        self._started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self.duration = time.monotonic() - self._started_at
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                    frame = frame.f_back
+                stack.reverse()
+                self.stacks[tuple(stack)] += 1
+            self.samples += 1
+
+    def dump(self, path: str) -> str:
+        """Grava as pilhas agregadas (da mais externa para a mais interna) em JSON."""
+        data = {
+            "format": "aldemarvin-sampling",
+            "interval_s": self.interval,
+            "duration_s": round(self.duration, 3),
+            "samples": self.samples,
+            "stacks": [
+                {"stack": [f"{f}:{line}({name})" for f, line, name in stack], "count": count}
+                for stack, count in self.stacks.most_common()
+            ],
+        }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        return path
+
+
+# ─── Sessão ────────────────────────────────────────────────────────────────
+
+
+def enable(mode: str = "session") -> None:
+    """Ativa o profiling; nos modos session/sampling a medição começa já."""
+    global _mode, _session
+    if mode not in MODES:
+        raise ValueError(f"Modo de profiling inválido: '{mode}'. Use: {', '.join(MODES)}.")
+    _mode = mode
+    if mode == "session":
+        _session = cProfile.Profile()
+        _session.enable()
+    elif mode == "sampling":
+        _session = SamplingProfiler().start()
+
+
+def is_enabled() -> bool:
+    return bool(_mode)
+
+
+def finish(name: str = "session") -> Optional[str]:
+    """Encerra o profiling da sessão e grava o arquivo. Retorna o caminho."""
+    global _mode, _session
+    session, mode = _session, _mode
+    _session, _mode = None, ""
+    if session is None:
+        return None
+    if mode == "sampling":
+        session.stop()
+        return session.dump(_profile_path("sampling", name, ".json"))
+    session.disable()
+    path = _profile_path("session", name, ".prof")
+    session.dump_stats(path)
+    return path
+
+
+# ─── Ações ─────────────────────────────────────────────────────────────────
+
+
+@contextmanager
+def profile_action(name: str):
+    """
+    Perfila um bloco como uma ação (só no modo "actions"). Ações aninhadas
+    entram no perfil da ação mais externa.
+    """
+    if _mode != "actions" or getattr(_local, "active", False):
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Outro profiler já ativo (Python 3.12+ permite só um por vez)
+        yield
+        return
+
+    _local.active = True
+    try:
+        yield
+    finally:
+        profiler.disable()
+        _local.active = False
+        profiler.dump_stats(_profile_path("action", name, ".prof"))
+
+
+def profiled(name: str) -> Callable:
+    """Decorator: perfila cada chamada como a ação `name` (modo "actions")."""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _mode != "actions":
+                return fn(*args, **kwargs)
+            with profile_action(name):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# ─── Visualizador ──────────────────────────────────────────────────────────
+
+
+def _short(location: str) -> str:
+    """Encurta caminhos do projeto e da stdlib para leitura."""
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if location.startswith(root):
+        return os.path.relpath(location, root)
+    for marker in ("site-packages" + os.sep, "lib" + os.sep + "python"):
+        index = location.find(marker)
+        if index >= 0:
+            return location[index:]
+    return location
+
+
+def summarize_sampling(path: str, limit: int = 25) -> str:
+    """Funções com mais amostras (próprias e acumuladas) num perfil por amostragem."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    own, total = Counter(), Counter()
+    for entry in data["stacks"]:
+        stack, count = entry["stack"], entry["count"]
+        if not stack:
+            continue
+        own[stack[-1]] += count
+        for location in set(stack):
+            total[location] += count
+
+    all_samples = sum(e["count"] for e in data["stacks"]) or 1
+    lines = [
+        f"{data['samples']} amostras em {data['duration_s']} s "
+        f"(a cada {data['interval_s'] * 1000:g} ms, todas as threads)",
+        "",
+        f"{'próprio':>8} {'acumul.':>8}  função",
+    ]
+    for location, count in total.most_common(limit):
+        lines.append(
+            f"{own[location] / all_samples:>8.1%} {count / all_samples:>8.1%}  {_short(location)}"
+        )
+    return "\n".join(lines)
+
+
+def summarize_cprofile(path: str, sort: str = "cumulative", limit: int = 25) -> str:
+    """Top funções de um arquivo .prof (pstats)."""
+    out = io.StringIO()
+    stats = pstats.Stats(path, stream=out)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return out.getvalue()
+
+
+def summarize(path: str, sort: str = "cumulative", limit: int = 25) -> str:
+    if path.endswith(".json"):
+        return summarize_sampling(path, limit)
+    return summarize_cprofile(path, sort, limit)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.utils.profiling",
+        description="Lista e resume os perfis gravados em data/profiles.",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="Perfis gravados (mais recentes primeiro)")
+    view = sub.add_parser("view", help="Funções mais caras de um perfil")
+    view.add_argument("path", nargs="?", help="Arquivo do perfil (padrão: o mais recente)")
+    view.add_argument(
+        "--sort", default="cumulative", help="Ordem para .prof: cumulative, tottime, ncalls..."
+    )
+    view.add_argument("--limit", "-n", type=int, default=25)
+    args = parser.parse_args(argv)
+
+    files = []
+    if os.path.isdir(PROFILES_DIR):
+        files = sorted(
+            (os.path.join(PROFILES_DIR, name) for name in os.listdir(PROFILES_DIR)),
+            key=os.path.getmtime,
+            reverse=True,
+        )
+
+    if args.command == "list":
+        for path in files:
+            modified = time.strftime("%d/%m/%Y %H:%M", time.localtime(os.path.getmtime(path)))
+            size_kb = os.path.getsize(path) / 1024
+            print(f"{modified}  {size_kb:8.1f} KB  {os.path.basename(path)}")
+        if not files:
+            print("Nenhum perfil gravado.")
+        return 0
+
+    path = args.path or (files[0] if files else None)
+    if not path or not os.path.isfile(path):
+        print("Perfil não encontrado.", file=sys.stderr)
+        return 1
+    print(f"== {path}")
+    print(summarize(path, args.sort, args.limit))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,331 @@
+"""
+Tracing - Spans com duração, tamanho de payload e acertos de cache.
+
+Desligado por padrão: span() devolve um objeto nulo e traced() chama a
+função direto, então o custo nos caminhos quentes é uma checagem de flag.
+Ligado (ALDEMARVIN_TRACE=1, enable() ou --trace no CLI), cada span é
+agregado por nome (contagem, total, percentis, somas de atributos
+numéricos) e pode ser exportado em JSON ou no formato Chrome trace
+(chrome://tracing, Perfetto).
+
+Uso:
+    with tracing.span("ocr.extract", pixels=w * h) as sp:
+        text = ...
+        sp.set(chars=len(text))
+
+    @tracing.traced("pdf.generate_pdf")
+    def generate_pdf(...):
+        tracing.annotate(pages=len(pages))
+"""
+
+import atexit
+import functools
+import json
+import math
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+from src.config import TRACE_ENABLED, TRACE_MAX_SAMPLES, TRACE_MAX_SPANS, TRACES_DIR
+
+_enabled = False
+_local = threading.local()
+
+
+def _stack() -> list:
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+# ─── Spans ─────────────────────────────────────────────────────────────────
+
+
+class _NullSpan:
+    """Span usado com o tracing desligado: não mede nem grava nada."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attrs) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """Intervalo medido de uma operação, com atributos livres."""
+
+    __slots__ = ("name", "attrs", "start_ns", "duration_ns", "thread_id")
+
+    def __init__(self, name: str, attrs: dict):
+        self.name = name
+        self.attrs = attrs
+        self.start_ns = 0
+        self.duration_ns = 0
+        self.thread_id = 0
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+    def __enter__(self):
+        _stack().append(self)
+        self.thread_id = threading.get_ident()
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration_ns = time.perf_counter_ns() - self.start_ns
+        stack = _stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        _recorder.record(self)
+        return False
+
+
+def span(name: str, **attrs):
+    """Abre um span (use com `with`). Custo mínimo com o tracing desligado."""
+    if not _enabled:
+        return _NULL_SPAN
+    return Span(name, attrs)
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Decorator: mede cada chamada da função como um span."""
+
+    def decorator(fn):
+        label = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with Span(label, {}):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def annotate(**attrs) -> None:
+    """Adiciona atributos ao span ativo mais interno desta thread."""
+    if not _enabled:
+        return
+    stack = _stack()
+    if stack:
+        stack[-1].attrs.update(attrs)
+
+
+# ─── Agregação ─────────────────────────────────────────────────────────────
+
+
+class _Stat:
+    """Agregado de todos os spans com o mesmo nome."""
+
+    __slots__ = ("count", "total_ns", "max_ns", "samples", "totals")
+
+    def __init__(self, max_samples: int):
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.samples = deque(maxlen=max_samples)
+        self.totals: dict[str, float] = {}
+
+    def add(self, duration_ns: int, attrs: dict) -> None:
+        self.count += 1
+        self.total_ns += duration_ns
+        self.max_ns = max(self.max_ns, duration_ns)
+        self.samples.append(duration_ns)
+        for key, value in attrs.items():
+            # Soma só atributos numéricos (chars, bytes, cache_hits, ...)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                self.totals[key] = self.totals.get(key, 0) + value
+
+
+def _percentile(ordered: list, q: float) -> float:
+    """Percentil (nearest-rank) de durações já ordenadas, em ms."""
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))
+    return ordered[index] / 1e6
+
+
+class _Recorder:
+    def __init__(self, max_spans: int = TRACE_MAX_SPANS, max_samples: int = TRACE_MAX_SAMPLES):
+        self._lock = threading.Lock()
+        self.max_samples = max_samples
+        self.spans = deque(maxlen=max_spans)
+        self.stats: dict[str, _Stat] = {}
+        self.origin_ns = time.perf_counter_ns()
+
+    def record(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(
+                (span.name, span.start_ns, span.duration_ns, span.thread_id, span.attrs)
+            )
+            stat = self.stats.get(span.name)
+            if stat is None:
+                stat = self.stats[span.name] = _Stat(self.max_samples)
+            stat.add(span.duration_ns, span.attrs)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.spans.clear()
+            self.stats.clear()
+            self.origin_ns = time.perf_counter_ns()
+
+
+_recorder = _Recorder()
+
+
+# ─── API ───────────────────────────────────────────────────────────────────
+
+
+def enable(dump_at_exit: bool = False) -> None:
+    """Liga o tracing (opcionalmente grava os arquivos ao encerrar)."""
+    global _enabled
+    _enabled = True
+    if dump_at_exit:
+        atexit.register(_dump_at_exit)
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset() -> None:
+    """Descarta spans e agregados já gravados."""
+    _recorder.reset()
+
+
+def summary() -> dict:
+    """Agregados por nome: contagem, tempos (ms), percentis e somas de atributos."""
+    with _recorder._lock:
+        stats = [
+            (name, s.count, s.total_ns, s.max_ns, list(s.samples), dict(s.totals))
+            for name, s in _recorder.stats.items()
+        ]
+    result = {}
+    for name, count, total_ns, max_ns, samples, totals in stats:
+        samples.sort()
+        result[name] = {
+            "count": count,
+            "total_ms": round(total_ns / 1e6, 3),
+            "mean_ms": round(total_ns / count / 1e6, 3),
+            "p50_ms": round(_percentile(samples, 50), 3),
+            "p90_ms": round(_percentile(samples, 90), 3),
+            "p99_ms": round(_percentile(samples, 99), 3),
+            "max_ms": round(max_ns / 1e6, 3),
+            "totals": totals,
+        }
+    return result
+
+
+def format_summary() -> str:
+    """Tabela legível do summary(), ordenada pelo tempo total."""
+    rows = sorted(summary().items(), key=lambda item: item[1]["total_ms"], reverse=True)
+    if not rows:
+        return "(nenhum span registrado)"
+    width = max(len(name) for name, _ in rows)
+    lines = [
+        f"{'span':<{width}}  {'n':>7}  {'total ms':>10}  {'p50':>8}  {'p90':>8}  {'p99':>8}  {'max':>8}"
+    ]
+    for name, s in rows:
+        line = (
+            f"{name:<{width}}  {s['count']:>7}  {s['total_ms']:>10.1f}  "
+            f"{s['p50_ms']:>8.2f}  {s['p90_ms']:>8.2f}  {s['p99_ms']:>8.2f}  {s['max_ms']:>8.2f}"
+        )
+        if s["totals"]:
+            line += "  " + " ".join(f"{k}={v:g}" for k, v in sorted(s["totals"].items()))
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _snapshot() -> tuple[list, int]:
+    with _recorder._lock:
+        return list(_recorder.spans), _recorder.origin_ns
+
+
+def dump_json(path: str) -> str:
+    """Grava agregados e spans (tempos em ms desde o início) em JSON."""
+    spans, origin = _snapshot()
+    data = {
+        "summary": summary(),
+        "spans": [
+            {
+                "name": name,
+                "start_ms": round((start - origin) / 1e6, 3),
+                "duration_ms": round(duration / 1e6, 3),
+                "thread": thread_id,
+                "attrs": attrs,
+            }
+            for name, start, duration, thread_id, attrs in spans
+        ],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=1, default=str)
+    return path
+
+
+def dump_chrome(path: str) -> str:
+    """Grava os spans no formato Chrome trace (eventos "X", tempos em µs)."""
+    spans, origin = _snapshot()
+    pid = os.getpid()
+    events = [
+        {
+            "name": name,
+            "cat": name.split(".", 1)[0],
+            "ph": "X",
+            "ts": (start - origin) / 1000,
+            "dur": duration / 1000,
+            "pid": pid,
+            "tid": thread_id,
+            "args": attrs,
+        }
+        for name, start, duration, thread_id, attrs in spans
+    ]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"traceEvents": events, "displayTimeUnit": "ms"},
+            f,
+            ensure_ascii=False,
+            default=str,
+        )
+    return path
+
+
+def dump(directory: str = TRACES_DIR) -> tuple[str, str]:
+    """Grava trace_<data>.json e trace_<data>.chrome.json no diretório."""
+    os.makedirs(directory, exist_ok=True)
+    stamp = time.strftime("%Y%m%d_%H%M%S")
+    base = os.path.join(directory, f"trace_{stamp}_{os.getpid()}")
+    return dump_json(base + ".json"), dump_chrome(base + ".chrome.json")
+
+
+def _dump_at_exit() -> None:
+    if not _recorder.stats:
+        return
+    json_path, chrome_path = dump()
+    sys.stderr.write(f"{format_summary()}\nTrace gravado em {json_path} e {chrome_path}\n")
+
+
+if TRACE_ENABLED:
+    enable(dump_at_exit=True)
@@ -0,0 +1,26 @@
+"""
+Fixtures compartilhadas: bancos temporários (nunca o banco em data/).
+"""
+
+import os
+
+import pytest
+
+from src.database.db_manager import DatabaseManager
+
+
+@pytest.fixture
+def db_path(tmp_path) -> str:
+    return str(tmp_path / "db.json")
+
+
+@pytest.fixture
+def db(db_path, tmp_path):
+    manager = DatabaseManager(db_path, images_dir=os.path.join(tmp_path, "images"))
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def extraction_id(db) -> int:
+    return db.create_extraction("Livro", "1", "livro")
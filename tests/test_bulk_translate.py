@@ -0,0 +1,135 @@
+"""
+Tradução em massa e cache de frases (provedor falso, sem rede).
+"""
+
+import json
+import socket
+import subprocess
+import sys
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.config import BULK_TRANSLATE_STALE_S
+from src.services.bulk_translate import (
+    JOB_KIND,
+    BulkTranslateJob,
+    get_interrupted_jobs,
+    get_running_job,
+    is_interrupted,
+)
+from src.services.translation_cache import TranslationCache
+from src.services.translation_providers import TranslationProvider
+from src.services.translation_service import TranslationService
+
+
+class _GatedProvider(TranslationProvider):
+    """Só responde depois que o teste libera o portão."""
+
+    name = "gated"
+
+    def __init__(self):
+        super().__init__("en", "pt")
+        self.gate = threading.Event()
+
+    def translate(self, text: str) -> str:
+        self.gate.wait(5)
+        return text.upper()
+
+
+def test_second_start_fails_in_caller(db, extraction_id):
+    db.add_page(extraction_id, 1, "Some text to translate.")
+    provider = _GatedProvider()
+    job = BulkTranslateJob(db, extraction_id, TranslationService(provider=provider))
+    job.start()
+    try:
+        # Registrado antes de a thread rodar: o segundo start falha na hora
+        assert get_running_job(extraction_id) is job
+        with pytest.raises(RuntimeError):
+            BulkTranslateJob(db, extraction_id, TranslationService(provider=provider)).start()
+    finally:
+        provider.gate.set()
+        job.join(5)
+
+    assert job.status == "done"
+    assert get_running_job(extraction_id) is None
+    assert db.get_pages(extraction_id)[0]["translated_text"] == "SOME TEXT TO TRANSLATE."
+
+
+def test_concurrent_cache_saves(tmp_path):
+    path = tmp_path / "translations.json"
+    cache = TranslationCache(str(path))
+    errors = []
+
+    def worker(n: int):
+        try:
+            for i in range(25):
+                cache.put_many("ns", {f"{n}-{i}": f"t{n}-{i}"})
+                cache.save()
+        except Exception as e:  # pragma: no cover - falha do teste
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(json.loads(path.read_text(encoding="utf-8"))) == 100
+    assert [p.name for p in tmp_path.iterdir()] == ["translations.json"]
+
+
+def _dead_pid() -> int:
+    child = subprocess.Popen([sys.executable, "-c", "pass"])
+    child.wait()
+    return child.pid
+
+
+def test_live_job_in_another_process_is_not_interrupted(db, extraction_id):
+    here = socket.gethostname()
+    other = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    try:
+        live = db.create_job(JOB_KIND, extraction_id, owner={"pid": other.pid, "host": here})
+        assert get_interrupted_jobs(db) == []
+        # A retomada não cria uma segunda tradução no mesmo registro
+        job = BulkTranslateJob(db, extraction_id, TranslationService(provider=_GatedProvider()))
+        job.run()
+        assert job.status == "failed" and "Outro processo" in job.error
+        assert db.get_jobs(kind=JOB_KIND)[0]["status"] == "running"
+    finally:
+        other.kill()
+        other.wait()
+
+    db.update_job(live, owner={"pid": _dead_pid(), "host": here})
+    assert [job["id"] for job in get_interrupted_jobs(db)] == [live]
+
+
+def test_stale_heartbeat_is_interrupted(db, extraction_id):
+    job_id = db.create_job(JOB_KIND, extraction_id, owner={"pid": 1, "host": "outra-maquina"})
+    assert get_interrupted_jobs(db) == []  # Renovado agora
+    job = db.get_jobs(kind=JOB_KIND)[0]
+    old = (datetime.now() - timedelta(seconds=BULK_TRANSLATE_STALE_S + 1)).isoformat()
+    assert is_interrupted({**job, "updated_at": old})
+    assert not is_interrupted(job)
+    # Registro antigo, sem dono: decide pelo updated_at
+    assert is_interrupted({"id": job_id, "updated_at": old})
+
+
+class _FullDiskCache(TranslationCache):
+    def save(self) -> None:
+        raise OSError(28, "No space left on device")
+
+
+def test_cache_save_failure_still_finishes_the_job(db, extraction_id, tmp_path):
+    db.add_page(extraction_id, 1, "Some text.")
+    provider = _GatedProvider()
+    provider.gate.set()
+    cache = _FullDiskCache(str(tmp_path / "translations.json"))
+    job = BulkTranslateJob(db, extraction_id, TranslationService(provider=provider, cache=cache))
+    job.run()
+
+    assert job.status == "done"
+    assert get_running_job(extraction_id) is None  # Pode ser iniciado de novo
+    assert db.get_jobs(kind=JOB_KIND)[0]["status"] == "done"
@@ -0,0 +1,18 @@
+"""
+aldemarvin-cli: erros ao abrir o banco respeitam o contrato do --json.
+"""
+
+import json
+
+from src.cli import main
+
+
+def test_corrupt_database_is_a_json_error(tmp_path, capsys):
+    path = tmp_path / "db.json"
+    path.write_text("{corrompido", encoding="utf-8")
+
+    assert main(["--json", "--db", str(path), "stats"]) == 1
+
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [line["event"] for line in lines] == ["error"]
+    assert lines[0]["message"]
@@ -0,0 +1,79 @@
+"""
+Cache de exportações e limpeza da pasta (só arquivos do índice, só em EXPORTS_DIR).
+"""
+
+import os
+import time
+
+import pytest
+
+from src.config import EXPORT_CACHE_INDEX
+from src.services import export_cache
+from src.services.export_cache import ExportCache
+from src.services.exporters import export_extraction
+
+
+@pytest.fixture
+def exports_dir(tmp_path, monkeypatch):
+    path = tmp_path / "exports"
+    path.mkdir()
+    monkeypatch.setattr(export_cache, "EXPORTS_DIR", str(path))
+    return path
+
+
+@pytest.fixture
+def book(db, extraction_id):
+    db.add_page(extraction_id, 1, "Primeira página", "First page")
+    db.add_page(extraction_id, 2, "Segunda página", "Second page")
+    return extraction_id
+
+
+def _age(path, seconds: float) -> None:
+    old = time.time() - seconds
+    os.utime(path, (old, old))
+
+
+def test_second_export_is_a_cache_hit(db, book, exports_dir):
+    path = export_extraction(db, book, "txt", exports_dir=str(exports_dir))
+    mtime = os.stat(path).st_mtime_ns
+    _age(path, 10)
+
+    assert export_extraction(db, book, "txt", exports_dir=str(exports_dir)) == path
+    assert os.stat(path).st_mtime_ns != mtime  # Só marcou o uso, não refez
+
+    db.add_page(book, 3, "Terceira página")
+    export_extraction(db, book, "txt", exports_dir=str(exports_dir))
+    assert "Terceira" in open(path, encoding="utf-8").read()
+
+
+def test_evict_only_removes_indexed_files(db, book, exports_dir):
+    thesis = exports_dir / "my_thesis.pdf"
+    notes = exports_dir / "notes.tmp"
+    leftover = exports_dir / f"book.txt.{'a' * 32}.tmp"
+    for path in (thesis, notes, leftover):
+        path.write_text("do usuário")
+        _age(path, 10 * 86400)
+
+    exported = export_extraction(db, book, "txt", exports_dir=str(exports_dir))
+    _age(exported, 10 * 86400)
+    outcome = ExportCache(str(exports_dir), max_bytes=1, max_age_s=60).evict()
+
+    assert outcome["removed"] == 1
+    assert not os.path.exists(exported)
+    assert not leftover.exists()  # Temporário de exportação interrompida
+    assert thesis.exists() and notes.exists()
+
+
+def test_output_folder_has_no_cache(db, book, exports_dir, tmp_path):
+    output = tmp_path / "output"
+    output.mkdir()
+    thesis = output / "my_thesis.pdf"
+    thesis.write_text("do usuário")
+    _age(thesis, 10 * 86400)
+
+    path = export_extraction(db, book, "md", exports_dir=str(output))
+
+    assert os.path.dirname(path) == str(output)
+    assert not (output / EXPORT_CACHE_INDEX).exists()
+    assert thesis.exists()
+    assert ExportCache(str(output)).get(path, "qualquer") is None
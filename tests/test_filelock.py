@@ -0,0 +1,126 @@
+"""
+Lock entre processos do banco: reentrante no processo, exclusivo entre processos.
+"""
+
+import subprocess
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+import pytest
+from tinydb import TinyDB
+
+from src.database.filelock import FileLock
+from src.database.storage import (
+    DeltaLogStorage,
+    WriteBackMiddleware,
+    load_state,
+    lock_path,
+    write_checkpoint,
+)
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_two_locks_on_the_same_path_do_not_block(tmp_path):
+    path = str(tmp_path / "db.json.lock")
+    first, second = FileLock(path, timeout=0.2), FileLock(path, timeout=0.2)
+    try:
+        assert first.acquire()
+        assert second.acquire()  # Mesmo processo: não espera o timeout
+        assert not second.acquire()  # Já era dele
+        second.release()
+        second.release()
+        assert first.held and not second.held
+        first.release()
+    finally:
+        first.close()
+        second.close()
+
+
+def test_load_state_and_write_checkpoint_with_the_database_open(db, db_path, extraction_id):
+    db.add_page(extraction_id, 1, "um dois três")
+    db.flush()
+    lock = db.db.storage.storage.lock
+    lock.acquire()  # Como no meio de uma escrita do DatabaseManager
+    try:
+        started = time.monotonic()
+        state = load_state(db_path)
+        write_checkpoint(db_path, state)
+        assert time.monotonic() - started < 5
+    finally:
+        lock.release()
+    assert len(state["pages"]) == 1
+
+
+_HOLDER = textwrap.dedent(
+    """
+    import sys
+    from src.database.filelock import FileLock
+
+    lock = FileLock(sys.argv[1])
+    lock.acquire()
+    print("travado", flush=True)
+    sys.stdin.readline()
+    lock.release()
+    print("solto", flush=True)
+    sys.stdin.readline()
+    """
+)
+
+
+def test_lock_held_by_another_process(tmp_path):
+    path = str(tmp_path / "db.json.lock")
+    child = subprocess.Popen(
+        [sys.executable, "-c", _HOLDER, path],
+        cwd=ROOT,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    lock = FileLock(path, timeout=0.2)
+    try:
+        assert child.stdout.readline().strip() == "travado"
+        with pytest.raises(RuntimeError, match="outro processo"):
+            lock.acquire()
+        assert not lock.held
+
+        child.stdin.write("\n")
+        child.stdin.flush()
+        assert child.stdout.readline().strip() == "solto"
+        assert lock.acquire()
+        lock.release()
+    finally:
+        lock.close()
+        child.stdin.close()
+        child.wait(timeout=30)
+
+
+def test_write_back_releases_the_lock_between_flushes(tmp_path):
+    path = tmp_path / "db.json"
+    middleware = WriteBackMiddleware(
+        DeltaLogStorage, idle_s=60, max_delay_s=60, lease_s=0.1
+    )
+    db = TinyDB(str(path), storage=middleware)
+    lock = middleware.storage.lock
+    try:
+        middleware.acquire()
+        db.insert({"n": 1})
+        time.sleep(0.3)
+        assert lock.held  # Escrita em andamento: o prazo do lock espera o release()
+
+        middleware.release()
+        deadline = time.monotonic() + 1.0
+        while lock.held and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert not lock.held  # Bem antes de idle_s/max_delay_s
+        other = FileLock(lock_path(str(path)), timeout=0)
+        try:
+            assert other.acquire()
+            other.release()
+        finally:
+            other.close()
+        assert [doc["n"] for doc in load_state(str(path))["_default"].values()] == [1]
+    finally:
+        db.close()
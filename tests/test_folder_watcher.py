@@ -0,0 +1,74 @@
+"""
+Pasta monitorada: imagens viram páginas, e uma falha na gravação não as perde.
+"""
+
+from PIL import Image
+
+from src.config import WATCH_DONE_DIR
+from src.services.folder_watcher import FolderWatcher
+
+
+class _FakeOCR:
+    def extract_from_image(self, image, lang=None) -> str:
+        return f"Página de {image.width} pixels de largura."
+
+
+def _images(folder, count: int) -> None:
+    for i in range(count):
+        Image.new("RGB", (10 + i, 10), "white").save(folder / f"scan_{i}.png")
+
+
+def _watch(db, extraction_id, folder, events) -> FolderWatcher:
+    return FolderWatcher(
+        db,
+        extraction_id,
+        str(folder),
+        workers=2,
+        batch_pages=2,
+        settle_s=0.01,
+        flush_s=0.0,
+        polling=True,
+        ocr=_FakeOCR(),
+        on_event=lambda event, **data: events.append((event, data.get("file"))),
+    )
+
+
+def test_images_become_pages(db, extraction_id, tmp_path):
+    folder = tmp_path / "scans"
+    folder.mkdir()
+    _images(folder, 3)
+    events = []
+
+    _watch(db, extraction_id, folder, events).run(until_idle=True)
+
+    assert db.get_stats(extraction_id)["page_count"] == 3
+    assert sorted(p.name for p in (folder / WATCH_DONE_DIR).iterdir()) == [
+        "scan_0.png",
+        "scan_1.png",
+        "scan_2.png",
+    ]
+
+
+def test_failed_write_requeues_images(db, extraction_id, tmp_path, monkeypatch):
+    folder = tmp_path / "scans"
+    folder.mkdir()
+    _images(folder, 3)
+    events = []
+    add_pages = db.add_pages
+    calls = []
+
+    def flaky(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 1:
+            raise OSError("disco cheio")
+        return add_pages(*args, **kwargs)
+
+    monkeypatch.setattr(db, "add_pages", flaky)
+    _watch(db, extraction_id, folder, events).run(until_idle=True)
+
+    assert any(event == "error" for event, _file in events)
+    # Nada perdido nem duplicado: as imagens do lote que falhou foram refeitas
+    pages = db.get_pages(extraction_id)
+    assert len(pages) == 3
+    assert len({page["original_text"] for page in pages}) == 3
+    assert len(list((folder / WATCH_DONE_DIR).iterdir())) == 3
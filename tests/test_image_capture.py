@@ -0,0 +1,77 @@
+"""
+Gravação da captura fora da thread do Tk e depois de a tela fechar (sem abrir
+janelas).
+"""
+
+import threading
+import time
+import tkinter as tk
+
+from PIL import Image
+
+from src.ui.image_capture_screen import ImageCaptureScreen
+from src.utils.image_preview import PreviewLoader
+
+
+def test_capture_is_decoded_and_stored_in_loader_thread(db, tmp_path, monkeypatch):
+    path = tmp_path / "scan.png"
+    Image.new("RGB", (64, 48), "white").save(path)
+    threads = []
+    put = db.images.put
+
+    def recording_put(image):
+        threads.append(threading.current_thread())
+        return put(image)
+
+    monkeypatch.setattr(db.images, "put", recording_put)
+    loader = PreviewLoader()
+    try:
+        digest = loader.submit(ImageCaptureScreen._store_capture, db.images, None, str(path)).result(10)
+    finally:
+        loader.shutdown()
+
+    assert digest and db.images.has(digest)
+    assert threads and threads[0] is not threading.main_thread()
+
+
+def test_capture_without_image_stores_nothing(db):
+    assert ImageCaptureScreen._store_capture(db.images, None, None) is None
+
+
+def _headless_screen(db, extraction_id, monkeypatch) -> ImageCaptureScreen:
+    """Tela sem janela: só o estado usado pelo salvamento."""
+    screen = object.__new__(ImageCaptureScreen)
+    screen.db = db
+    screen.extraction_id = extraction_id
+    screen.preview_loader = PreviewLoader()
+    screen._saving = True
+    screen._save_poll = "after#1"
+    screen._pending_save = None
+    cancelled = []
+    monkeypatch.setattr(screen, "after_cancel", cancelled.append, raising=False)
+    monkeypatch.setattr(screen, "winfo_exists", lambda: False, raising=False)
+    monkeypatch.setattr(tk.Frame, "destroy", lambda self: None)
+    screen.cancelled = cancelled
+    return screen
+
+
+def test_save_in_flight_finishes_after_the_screen_closes(db, extraction_id, monkeypatch):
+    screen = _headless_screen(db, extraction_id, monkeypatch)
+    gate = threading.Event()
+    future = screen.preview_loader.submit(lambda: gate.wait(5) and None)
+    data = {"original_text": "texto capturado", "translated_text": "captured text"}
+    screen._pending_save = (future, data)
+
+    screen.destroy()
+    assert screen.cancelled == ["after#1"]  # O after() do acompanhamento sai da fila
+    saved = []
+    screen._poll_save(future, data, saved.append)  # Um after() já disparado
+    gate.set()
+    future.result(5)
+
+    deadline = time.monotonic() + 5
+    while not db.get_pages(extraction_id) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    pages = db.get_pages(extraction_id)
+    assert [page["original_text"] for page in pages] == ["texto capturado"]  # Gravada uma vez
+    assert saved == []  # Sem tocar nos widgets da tela fechada
@@ -0,0 +1,147 @@
+"""
+Servidor de jobs em localhost (porta 0), com pools de threads e tarefas falsas.
+"""
+
+import asyncio
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.config import EXPORT_CACHE_INDEX
+from src.server import tasks
+from src.server.client import JobClient
+from src.server.job_server import JobServer
+from src.services import export_cache
+
+
+def _fake_ocr(image_bytes: bytes, profile=None) -> dict:
+    return {"text": f"{len(image_bytes)} bytes"}
+
+
+def _fake_translate(texts: list[str]) -> dict:
+    if "falha" in texts:
+        raise RuntimeError("provedor fora do ar")
+    if "lento" in texts:
+        time.sleep(1.5)
+    return {"translations": [text.upper() for text in texts]}
+
+
+@pytest.fixture
+def exports_dir(tmp_path, monkeypatch):
+    path = tmp_path / "exports"
+    path.mkdir()
+    monkeypatch.setattr(export_cache, "EXPORTS_DIR", str(path))
+    return path
+
+
+@pytest.fixture
+def server(exports_dir):
+    server = JobServer(host="127.0.0.1", port=0, exports_dir=str(exports_dir))
+    # Threads no lugar de processos; OCR e tradução sem Tesseract nem rede
+    server._kinds = {
+        "ocr": (_fake_ocr, 1, ThreadPoolExecutor),
+        "translate": (_fake_translate, 1, ThreadPoolExecutor),
+        "export": (tasks.run_export, 1, ThreadPoolExecutor),
+    }
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    asyncio.run_coroutine_threadsafe(server.start(), loop).result(10)
+    yield server
+    asyncio.run_coroutine_threadsafe(server.stop(), loop).result(10)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    loop.close()
+
+
+@pytest.fixture
+def client(server):
+    return JobClient(server.url, timeout=10)
+
+
+def _status(server, method: str, path: str, body: bytes = None) -> tuple[int, dict]:
+    request = urllib.request.Request(server.url + path, data=body, method=method)
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_translate_streams_events_until_done(client):
+    job = client.submit_translate(["um", "dois"])
+    assert job["status"] == "queued"
+
+    events = []
+    result = client.wait(job["id"], on_event=events.append)
+
+    assert result == {"translations": ["UM", "DOIS"]}
+    assert events[-1]["status"] == "done"
+    assert client.status(job["id"])["status"] == "done"
+
+
+def test_long_job_outlives_the_stream_idle_timeout(server):
+    # O job demora mais que a espera do cliente por uma linha do stream
+    server.heartbeat_s = 0.2
+    client = JobClient(server.url, timeout=10, events_idle_s=0.5)
+    job = client.submit_translate(["lento"])
+
+    events = []
+    assert client.wait(job["id"], on_event=events.append) == {"translations": ["LENTO"]}
+    assert [e["status"] for e in events].count("running") > 2  # Heartbeats
+
+
+def test_silent_stream_falls_back_to_polling(server):
+    server.heartbeat_s = 60  # Servidor sem heartbeat a tempo
+    client = JobClient(server.url, timeout=10, events_idle_s=0.3, poll_s=0.1)
+    job = client.submit_translate(["lento"])
+
+    assert client.wait(job["id"]) == {"translations": ["LENTO"]}
+
+
+def test_failed_job_reports_error(client):
+    job = client.submit_translate(["falha"])
+    with pytest.raises(RuntimeError, match="provedor fora do ar"):
+        client.wait(job["id"])
+
+
+def test_ocr_receives_body_bytes(client):
+    assert client.ocr(b"12345") == "5 bytes"
+
+
+def test_export_download_and_eviction_index(client, exports_dir):
+    pages = [{"page_number": 1, "original_text": "Texto", "translated_text": "Text"}]
+    data = client.export("Livro", pages, filename="../livro")
+
+    assert data.startswith(b"%PDF")
+    # Só o nome do arquivo, dentro da pasta; registrado para a limpeza
+    index = json.loads((exports_dir / EXPORT_CACHE_INDEX).read_text(encoding="utf-8"))
+    assert list(index) == ["livro.pdf"]
+
+    (exports_dir / "livro.pdf").unlink()
+    job_id = client.submit_export("Livro", pages, filename="livro")["id"]
+    client.wait(job_id)
+    (exports_dir / "livro.pdf").unlink()
+    with pytest.raises(RuntimeError, match="removido"):
+        client.download(job_id)
+
+
+def test_error_responses(server, client):
+    assert _status(server, "GET", "/health")[0] == 200
+    assert _status(server, "POST", "/jobs/unknown", b"{}")[0] == 404
+    assert _status(server, "POST", "/jobs/translate", b"{nope")[0] == 400
+    assert _status(server, "POST", "/jobs/translate", b"{}")[0] == 400
+    assert _status(server, "POST", "/jobs/ocr")[0] == 400
+    assert _status(server, "POST", "/jobs/ocr?psm=x", b"img")[0] == 400
+    assert _status(server, "GET", "/jobs/missing")[0] == 404
+    assert _status(server, "GET", "/nowhere")[0] == 404
+
+    job_id = client.submit_translate(["um"])["id"]
+    client.wait(job_id)
+    status, payload = _status(server, "GET", f"/jobs/{job_id}/file")
+    assert status == 409 and payload["error"]
@@ -0,0 +1,93 @@
+"""
+Agendador de manutenção: o snapshot de fechamento não roda na thread de quem
+fecha e é interrompido se demorar; compactação do banco.
+"""
+
+import os
+import threading
+import time
+
+import pytest
+
+from src.database import maintenance
+from src.database.maintenance import MaintenanceScheduler, SnapshotCancelled, SnapshotStore
+from src.database.storage import load_state, log_paths
+
+
+def _scheduler(db, tmp_path) -> MaintenanceScheduler:
+    return MaintenanceScheduler(db, SnapshotStore(str(tmp_path / "backups")), interval_s=3600)
+
+
+def test_close_snapshot_runs_in_maintenance_thread(db, extraction_id, tmp_path, monkeypatch):
+    threads = []
+    take = maintenance.take_snapshot
+
+    def recording(*args, **kwargs):
+        threads.append((threading.current_thread(), args[-1]))
+        return take(*args, **kwargs)
+
+    monkeypatch.setattr(maintenance, "take_snapshot", recording)
+    scheduler = _scheduler(db, tmp_path).start()
+    scheduler.stop()
+
+    assert [reason for _thread, reason in threads] == ["close"]
+    assert threads[0][0] is not threading.current_thread()
+    assert len(scheduler.store.snapshots()) == 1
+
+
+def test_stop_waits_at_most_the_timeout(db, extraction_id, tmp_path, monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(maintenance, "take_snapshot", lambda *args, **kwargs: release.wait(10))
+    scheduler = _scheduler(db, tmp_path).start()
+
+    started = time.monotonic()
+    # A manutenção não atende à interrupção: quem fecha não pode fechar o banco
+    assert scheduler.stop(timeout=0.2) is False
+    assert time.monotonic() - started < 3
+    release.set()
+
+
+def test_stop_interrupts_a_slow_close_snapshot(db, extraction_id, tmp_path, monkeypatch):
+    def slow(*args, cancel):
+        cancel.wait(10)
+        raise SnapshotCancelled()
+
+    monkeypatch.setattr(maintenance, "take_snapshot", slow)
+    scheduler = _scheduler(db, tmp_path).start()
+
+    started = time.monotonic()
+    assert scheduler.stop(timeout=0.2) is True  # Banco livre para fechar
+    assert time.monotonic() - started < 2
+
+
+def test_cancelled_snapshot_writes_no_manifest(db, extraction_id, tmp_path):
+    store = SnapshotStore(str(tmp_path / "backups"))
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(SnapshotCancelled):
+        maintenance.take_snapshot(db, store, cancel=cancel)
+    assert store.snapshots() == []
+
+
+def test_close_snapshot_skipped_after_recent_run(db, extraction_id, tmp_path):
+    scheduler = _scheduler(db, tmp_path)
+    assert scheduler.run_once() is not None
+    db.add_page(extraction_id, 1, "mudança depois do snapshot")
+
+    scheduler.stop()
+    assert len(scheduler.store.snapshots()) == 1
+
+
+def test_compact_folds_the_log_into_the_checkpoint(db, db_path, extraction_id):
+    for number in range(1, 31):
+        db.add_page(extraction_id, number, f"página {number} " * 20)
+        db.flush()  # Um registro no log por página
+    db.delete_extraction(extraction_id)
+    db.flush()
+    assert os.path.getsize(log_paths(db_path)[0]) > 0
+
+    outcome = db.compact()
+
+    assert outcome["bytes_after"] < outcome["bytes_before"] / 10
+    assert all(not os.path.exists(p) or os.path.getsize(p) == 0 for p in log_paths(db_path))
+    assert load_state(db_path)["pages"] == {}
@@ -0,0 +1,60 @@
+"""
+Dois processos gravando no mesmo banco ao mesmo tempo.
+"""
+
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+from src.database.stats import FINGERPRINT_FIELD, STAT_FIELDS, compute_stats
+from src.database.storage import load_state
+
+ROOT = Path(__file__).resolve().parents[1]
+PAGES_PER_PROCESS = 40
+
+_WRITER = textwrap.dedent(
+    """
+    import os, sys
+    from src.database.db_manager import DatabaseManager
+
+    path, extraction_id, tag, count = sys.argv[1], int(sys.argv[2]), sys.argv[3], int(sys.argv[4])
+    db = DatabaseManager(path, images_dir=os.path.join(os.path.dirname(path), "images"))
+    for i in range(count):
+        db.add_pages(
+            extraction_id,
+            [{"original_text": f"processo {tag} página {i} " + tag * (i % 7 + 1)}],
+            on_duplicate="keep",
+        )
+    db.close()
+    """
+)
+
+
+def test_two_processes_add_pages(db, db_path, extraction_id):
+    db.flush()
+    writers = [
+        subprocess.Popen(
+            [sys.executable, "-c", _WRITER, db_path, str(extraction_id), tag, str(PAGES_PER_PROCESS)],
+            cwd=ROOT,
+        )
+        for tag in ("a", "b")
+    ]
+    assert [writer.wait(timeout=120) for writer in writers] == [0, 0]
+
+    # O processo do teste continua com o banco aberto: a leitura recarrega
+    pages = db.get_pages(extraction_id)
+    extraction = db.get_extraction(extraction_id)
+
+    expected = {
+        f"processo {tag} página {i} " + tag * (i % 7 + 1)
+        for tag in ("a", "b")
+        for i in range(PAGES_PER_PROCESS)
+    }
+    assert {page["original_text"] for page in pages} == expected  # Nenhuma perdida
+    assert len(pages) == 2 * PAGES_PER_PROCESS
+    assert sorted(page["page_number"] for page in pages) == list(range(1, len(pages) + 1))
+    assert extraction["page_count"] == 2 * PAGES_PER_PROCESS
+    stored = {field: extraction[field] for field in (*STAT_FIELDS, FINGERPRINT_FIELD)}
+    assert stored == compute_stats(pages)
+    assert len(load_state(db_path)["pages"]) == len(pages)
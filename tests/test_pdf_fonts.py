@@ -0,0 +1,70 @@
+"""
+Fontes do PDF: clone do protótipo e volta ao add_font quando o fpdf2 muda.
+"""
+
+import pytest
+from fpdf import FPDF
+
+from src.services import pdf_fonts
+from src.services.pdf_fonts import FontManager, clone_supported
+
+TEXT = "Citação — “aspas” e Ωμέγα"
+
+
+@pytest.fixture
+def fonts():
+    manager = FontManager()
+    if not manager.unicode:
+        pytest.skip("Nenhuma fonte TTF disponível")
+    return manager
+
+
+def _render(fonts: FontManager) -> bytes:
+    pdf = FPDF()
+    family = fonts.apply(pdf)
+    pdf.add_page()
+    pdf.set_font(family, "", 12)
+    pdf.multi_cell(0, 6, fonts.text(TEXT), new_x="LMARGIN", new_y="NEXT")
+    pdf.set_font(family, "B", 12)
+    pdf.multi_cell(0, 6, fonts.text(TEXT), new_x="LMARGIN", new_y="NEXT")
+    fonts.prepare(pdf)
+    return bytes(pdf.output())
+
+
+def test_tested_versions():
+    assert clone_supported("2.8.9")
+    assert not clone_supported("2.7.9")
+    assert not clone_supported("2.9.0")
+    assert not clone_supported("dev")
+
+
+def test_cloned_fonts_render(fonts):
+    assert _render(fonts).startswith(b"%PDF")
+    assert not fonts._clone_failed
+
+
+def test_clone_error_falls_back_to_add_font(fonts, monkeypatch):
+    def broken(*args):
+        raise AttributeError("_hbfont")
+
+    monkeypatch.setattr(pdf_fonts._ParsedFont, "clone", broken)
+    assert _render(fonts).startswith(b"%PDF")
+    assert fonts._clone_failed
+
+
+def test_prepare_error_keeps_full_font(fonts, monkeypatch):
+    def broken(*args):
+        raise AttributeError("is_cff")
+
+    monkeypatch.setattr(pdf_fonts._ParsedFont, "prepare", broken)
+    assert _render(fonts).startswith(b"%PDF")
+    assert fonts._clone_failed
+
+
+def test_untested_fpdf_uses_add_font(monkeypatch):
+    monkeypatch.setattr(pdf_fonts, "FPDF_VERSION", "3.0.0")
+    manager = FontManager()
+    if not manager.unicode:
+        pytest.skip("Nenhuma fonte TTF disponível")
+    assert manager._clone_failed
+    assert _render(manager).startswith(b"%PDF")
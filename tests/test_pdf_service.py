@@ -0,0 +1,38 @@
+"""
+PDF em paralelo: limiar de páginas e fontes do serviço repassadas às partes.
+"""
+
+from src.services import pdf_service
+from src.services.pdf_fonts import FontManager
+from src.services.pdf_service import PDFService
+
+
+def _pages(count: int) -> list[dict]:
+    return [{"page_number": i + 1, "translated_text": f"Página {i + 1}."} for i in range(count)]
+
+
+def test_small_books_stay_sequential(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        PDFService, "_generate_parallel", lambda self, *args: calls.append(args)
+    )
+    monkeypatch.setattr(pdf_service, "PDF_PARALLEL_MIN_PAGES", 50)
+    monkeypatch.setattr(pdf_service, "PDF_PARALLEL_MIN_CHUNK_PAGES", 10)
+    service = PDFService(exports_dir=str(tmp_path))
+
+    service.generate_pdf("Livro", _pages(40), "pequeno", workers=4)
+    assert calls == []  # 40 páginas: dariam 4 blocos, mas abaixo do limiar
+
+
+def test_parallel_parts_use_the_service_fonts(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf_service, "PDF_PARALLEL_MIN_PAGES", 20)
+    monkeypatch.setattr(pdf_service, "PDF_PARALLEL_MIN_CHUNK_PAGES", 10)
+    # Sem TTF (Helvetica), ao contrário do gerenciador padrão do processo
+    fonts = FontManager(paths={}, candidates=[], family="custom")
+    service = PDFService(exports_dir=str(tmp_path), fonts=fonts)
+
+    path = service.generate_pdf("Livro", _pages(20), "paralelo", workers=2)
+
+    data = open(path, "rb").read()
+    assert b"/Helvetica" in data
+    assert b"FontFile2" not in data  # Nenhuma TTF embutida pelas partes
@@ -0,0 +1,87 @@
+"""
+Estatísticas desnormalizadas e impressão digital das extrações.
+"""
+
+import pytest
+
+from src.database.stats import EMPTY_FINGERPRINT, FINGERPRINT_FIELD, STAT_FIELDS, compute_stats
+
+
+def _stored(db, extraction_id: int) -> dict:
+    extraction = db.get_extraction(extraction_id)
+    return {field: extraction[field] for field in (*STAT_FIELDS, FINGERPRINT_FIELD)}
+
+
+def _recomputed(db, extraction_id: int) -> dict:
+    return compute_stats(db.get_pages(extraction_id))
+
+
+def test_new_extraction_has_empty_stats(db, extraction_id):
+    stats = _stored(db, extraction_id)
+    assert stats[FINGERPRINT_FIELD] == EMPTY_FINGERPRINT
+    assert all(stats[field] == 0 for field in STAT_FIELDS)
+
+
+def test_incremental_stats_match_recompute(db, extraction_id):
+    first = db.add_page(extraction_id, 1, "um dois três", on_duplicate="keep")
+    second = db.add_page(extraction_id, 2, "quatro cinco", "four five", on_duplicate="keep")
+    db.add_pages(
+        extraction_id,
+        [{"original_text": "seis sete oito nove"}, {"original_text": "dez", "translated_text": "ten"}],
+        on_duplicate="keep",
+    )
+    assert _stored(db, extraction_id) == _recomputed(db, extraction_id)
+
+    db.update_page(first, translated_text="one two three")
+    db.update_pages({second: {"original_text": "quatro cinco seis"}})
+    db.delete_page(first)
+    pages = db.get_pages(extraction_id)
+    db.reorder_pages(extraction_id, [page["id"] for page in reversed(pages)])
+
+    stats = _stored(db, extraction_id)
+    assert stats == _recomputed(db, extraction_id)
+    assert stats["page_count"] == 3
+    assert stats["translated_count"] == 2
+    # Nada a corrigir: o incremental bate com o recálculo do zero
+    assert db.recompute_stats() == []
+
+
+def test_fingerprint_tracks_content(db, extraction_id):
+    page = db.add_page(extraction_id, 1, "texto original")
+    before = db.get_stats(extraction_id)[FINGERPRINT_FIELD]
+
+    db.update_page(page, translated_text="tradução")
+    changed = db.get_stats(extraction_id)[FINGERPRINT_FIELD]
+    assert changed != before
+
+    # Voltar ao conteúdo anterior volta à mesma impressão digital (XOR)
+    db.update_page(page, translated_text="")
+    assert db.get_stats(extraction_id)[FINGERPRINT_FIELD] == before
+
+
+def test_recompute_repairs_drifted_stats(db, extraction_id):
+    db.add_page(extraction_id, 1, "alguma coisa escrita")
+    db.update_extraction(extraction_id, page_count=99, **{FINGERPRINT_FIELD: EMPTY_FINGERPRINT})
+
+    assert db.recompute_stats() == [extraction_id]
+    assert _stored(db, extraction_id) == _recomputed(db, extraction_id)
+
+
+def test_failed_delete_keeps_similarity_index(db, extraction_id, monkeypatch):
+    text = "uma página com texto suficiente para gerar a assinatura de similaridade " * 3
+    page = db.add_page(extraction_id, 1, text)
+    index = db._similarity_index(extraction_id)
+    assert len(index) == 1
+
+    def fail(_data):
+        raise OSError("disco cheio")
+
+    monkeypatch.setattr(db.db.storage, "write", fail)
+    with pytest.raises(OSError):
+        db.delete_page(page)
+    monkeypatch.undo()
+
+    assert db.get_page(page) is not None
+    assert len(index) == 1
+    db.delete_page(page)
+    assert len(index) == 0
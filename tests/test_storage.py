@@ -0,0 +1,83 @@
+"""
+Log de alterações do banco: reabertura depois de um crash.
+"""
+
+import json
+import os
+
+import pytest
+
+from src.database.storage import DeltaLogStorage, load_state, log_paths
+
+
+def _doc(text: str) -> dict:
+    return {"original_text": text}
+
+
+def _line(record: dict) -> bytes:
+    return json.dumps(record).encode("utf-8") + b"\n"
+
+
+def _write(path, data: bytes) -> None:
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "db.json")
+
+
+def test_torn_last_line_is_discarded(path):
+    log_path, _old = log_paths(path)
+    _write(path, json.dumps({"pages": {"1": _doc("um")}}).encode())
+    first = _line({"set": {"pages": {"2": _doc("dois")}}})
+    torn = _line({"set": {"pages": {"3": _doc("três")}}})[:-7]  # Crash no meio da escrita
+    _write(log_path, first + torn)
+
+    storage = DeltaLogStorage(path)
+    try:
+        assert set(storage.read()["pages"]) == {"1", "2"}
+        # O fim cortado sai do log: a próxima escrita começa numa linha nova
+        assert os.path.getsize(log_path) == len(first)
+        storage.write({"pages": {"1": _doc("um"), "2": _doc("dois"), "4": _doc("quatro")}})
+    finally:
+        storage.close()
+
+    assert set(load_state(path)["pages"]) == {"1", "2", "4"}
+
+
+def test_corrupt_line_in_the_middle_is_an_error(path):
+    log_path, _old = log_paths(path)
+    _write(path, b"{}")
+    _write(log_path, b"{not json}\n" + _line({"set": {"pages": {"1": _doc("um")}}}))
+
+    with pytest.raises(ValueError, match="corrompido"):
+        DeltaLogStorage(path)
+
+
+@pytest.mark.parametrize("checkpoint_written", [False, True])
+def test_crash_between_checkpoint_and_log_removal(path, checkpoint_written):
+    log_path, old_log_path = log_paths(path)
+    rotated = _line({"set": {"pages": {"2": _doc("dois")}}}) + _line({"del": {"pages": ["1"]}})
+    newer = _line({"set": {"pages": {"3": _doc("três")}}})
+    if checkpoint_written:
+        # Checkpoint novo já gravado, mas o .log.old ainda não foi apagado
+        _write(path, json.dumps({"pages": {"2": _doc("dois")}}).encode())
+    else:
+        _write(path, json.dumps({"pages": {"1": _doc("um")}}).encode())
+    _write(old_log_path, rotated)
+    _write(log_path, newer)
+
+    storage = DeltaLogStorage(path)
+    try:
+        # Reaplicar o .log.old sobre o checkpoint novo não muda nada
+        assert set(storage.read()["pages"]) == {"2", "3"}
+        # A abertura termina o checkpoint interrompido
+        assert not os.path.exists(old_log_path)
+    finally:
+        storage.close()
+
+    assert not os.path.exists(log_path) or os.path.getsize(log_path) == 0
+    with open(path, encoding="utf-8") as f:
+        assert set(json.load(f)["pages"]) == {"2", "3"}
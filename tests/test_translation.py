@@ -0,0 +1,81 @@
+"""
+Segmentação e envio em lote ao provedor de tradução (provedores falsos, sem rede).
+"""
+
+from src.services.translation_providers import TranslationProvider
+from src.services.translation_service import TranslationService
+
+TEXT = (
+    "The first sentence is here. A second one follows it.\n"
+    "\n"
+    "A new paragraph starts. The first sentence is here."
+)
+
+
+class _LineProvider(TranslationProvider):
+    """Como o Google: recebe blocos juntados por quebra de linha e as preserva."""
+
+    name = "lines"
+
+    def __init__(self):
+        super().__init__("en", "pt")
+        self.calls: list[list[str]] = []
+
+    def translate(self, text: str) -> str:
+        return text.upper()
+
+    def translate_batch(self, texts: list[str]) -> list[str]:
+        self.calls.append(list(texts))
+        return super().translate_batch(texts)
+
+
+class _NativeProvider(_LineProvider):
+    """Como o Argos: lote próprio, e as quebras de linha somem na saída."""
+
+    name = "native"
+    native_batching = True
+
+    def translate(self, text: str) -> str:
+        return " ".join(text.split()).upper()
+
+
+def test_line_provider_gets_joined_blocks():
+    provider = _LineProvider()
+    result = TranslationService(provider=provider).translate(TEXT)
+
+    assert result == TEXT.upper()
+    assert len(provider.calls) == 1
+    assert len(provider.calls[0]) == 1  # Um bloco com todos os segmentos
+    assert "\n" in provider.calls[0][0]
+
+
+def test_native_provider_gets_segments_without_retry():
+    provider = _NativeProvider()
+    result = TranslationService(provider=provider).translate(TEXT)
+
+    assert result == TEXT.upper()
+    # Uma única chamada (sem a nova tentativa segmento a segmento), com os
+    # segmentos únicos avulsos
+    assert provider.calls == [
+        [
+            "The first sentence is here.",
+            "A second one follows it.",
+            "A new paragraph starts.",
+        ]
+    ]
+
+
+def test_batches_follow_document_order():
+    from src.services.text_segmenter import SEGMENT_SEPARATOR, SegmentedText
+
+    segmented = SegmentedText(max_chars=40)
+    segmented.add_text("Short one. " + "A much longer sentence that fills a block. " + "Tiny. End.")
+    segmented.add_text("Next page here. Another short one.")
+    batches = segmented.batches()
+
+    # Cada bloco é um trecho contínuo, e os blocos seguem a ordem do texto
+    flat = [i for batch in batches for i in batch]
+    assert flat == list(range(len(segmented.segments)))
+    for batch in batches:
+        body = SEGMENT_SEPARATOR.join(segmented.segments[i] for i in batch)
+        assert len(body) <= 40 or len(batch) == 1
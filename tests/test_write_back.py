@@ -0,0 +1,102 @@
+"""
+Cache write-back do banco: quando as escritas pendentes chegam ao disco.
+"""
+
+import signal
+import subprocess
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+import pytest
+from tinydb import TinyDB
+
+from src.database.storage import DeltaLogStorage, WriteBackMiddleware, load_state
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _open(path, **options) -> TinyDB:
+    return TinyDB(str(path), storage=WriteBackMiddleware(DeltaLogStorage, **options))
+
+
+def _on_disk(path) -> list:
+    return sorted(doc["n"] for doc in load_state(str(path)).get("_default", {}).values())
+
+
+def _wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_close_flushes_pending_writes(tmp_path):
+    path = tmp_path / "db.json"
+    db = _open(path, idle_s=60, max_delay_s=60)
+    db.insert({"n": 1})
+    assert _on_disk(path) == []  # Ainda só na memória
+    db.close()
+    assert _on_disk(path) == [1]
+
+
+def test_max_delay_flushes_a_busy_database(tmp_path):
+    path = tmp_path / "db.json"
+    db = _open(path, idle_s=60, max_delay_s=0.2, max_pending=10_000)
+    try:
+        # Escritas seguidas nunca deixam o banco ocioso: vale o prazo máximo
+        started = time.monotonic()
+        n = 0
+        while time.monotonic() - started < 0.6:
+            n += 1
+            db.insert({"n": n})
+            time.sleep(0.02)
+        assert _on_disk(path)
+    finally:
+        db.close()
+
+
+def test_idle_flushes_pending_writes(tmp_path):
+    path = tmp_path / "db.json"
+    db = _open(path, idle_s=0.1, max_delay_s=60)
+    try:
+        db.insert({"n": 1})
+        assert _wait_for(lambda: _on_disk(path) == [1])
+    finally:
+        db.close()
+
+
+_CHILD = textwrap.dedent(
+    """
+    import os, signal, sys
+    from tinydb import TinyDB
+    from src.database.storage import DeltaLogStorage, WriteBackMiddleware
+
+    db = TinyDB(sys.argv[1], storage=WriteBackMiddleware(DeltaLogStorage, idle_s=60, max_delay_s=60))
+    db.insert({"n": 1})
+    db.insert({"n": 2})
+    if sys.argv[2] == "sigterm":
+        os.kill(os.getpid(), signal.SIGTERM)
+        signal.pause()
+    # "exit": sai sem fechar o banco (só o atexit grava)
+    """
+)
+
+
+@pytest.mark.parametrize("how", ["exit", "sigterm"])
+def test_process_exit_flushes_pending_writes(tmp_path, how):
+    if how == "sigterm" and not hasattr(signal, "SIGTERM"):
+        pytest.skip("Sem SIGTERM nesta plataforma")
+    path = tmp_path / "db.json"
+    result = subprocess.run(
+        [sys.executable, "-c", _CHILD, str(path), how], cwd=ROOT, timeout=60
+    )
+
+    if how == "sigterm":
+        assert result.returncode == -signal.SIGTERM  # Continua morrendo pelo sinal
+    else:
+        assert result.returncode == 0
+    assert _on_disk(path) == [1, 2]